@@ -4,40 +4,46 @@ Core package for Pomera AI Commander
 This package contains all the core utility modules for the application.
 """
 
-from .statistics_update_manager import (
-    StatisticsUpdateManager,
-    UpdatePriority,
-    VisibilityState,
-    UpdateRequest,
-    ComponentInfo,
-    get_statistics_update_manager,
-    create_statistics_update_manager
-)
+import importlib
 
-from .event_consolidator import (
-    EventConsolidator,
-    EventType,
-    DebounceStrategy,
-    DebounceConfig,
-    get_event_consolidator,
-    create_event_consolidator
-)
+# Re-exports are resolved lazily (PEP 562) so that importing any core.*
+# submodule (e.g. the MCP server) does not pull in tkinter and the GUI
+# statistics/performance machinery.
+_LAZY_EXPORTS = {
+    'StatisticsUpdateManager': 'statistics_update_manager',
+    'UpdatePriority': 'statistics_update_manager',
+    'VisibilityState': 'statistics_update_manager',
+    'UpdateRequest': 'statistics_update_manager',
+    'ComponentInfo': 'statistics_update_manager',
+    'get_statistics_update_manager': 'statistics_update_manager',
+    'create_statistics_update_manager': 'statistics_update_manager',
+    'EventConsolidator': 'event_consolidator',
+    'EventType': 'event_consolidator',
+    'DebounceStrategy': 'event_consolidator',
+    'DebounceConfig': 'event_consolidator',
+    'get_event_consolidator': 'event_consolidator',
+    'create_event_consolidator': 'event_consolidator',
+    'ProgressiveStatsCalculator': 'progressive_stats_calculator',
+    'CalculationStatus': 'progressive_stats_calculator',
+    'ProgressInfo': 'progressive_stats_calculator',
+    'TextStats': 'progressive_stats_calculator',
+    'CalculationTask': 'progressive_stats_calculator',
+    'get_progressive_stats_calculator': 'progressive_stats_calculator',
+    'create_progressive_stats_calculator': 'progressive_stats_calculator',
+    'OptimizedPatternEngine': 'optimized_pattern_engine',
+    'TextStructure': 'optimized_pattern_engine',
+    'get_pattern_engine': 'optimized_pattern_engine',
+}
 
-from .progressive_stats_calculator import (
-    ProgressiveStatsCalculator,
-    CalculationStatus,
-    ProgressInfo,
-    TextStats,
-    CalculationTask,
-    get_progressive_stats_calculator,
-    create_progressive_stats_calculator
-)
 
-from .optimized_pattern_engine import (
-    OptimizedPatternEngine,
-    TextStructure,
-    get_pattern_engine
-)
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'StatisticsUpdateManager',
@@ -0,0 +1,165 @@
+"""
+AI HTTP Sessions - Pooled keep-alive connections for AI provider calls
+
+AIToolsEngine and AIResearchEngine used to call the module-level
+requests.post() for every prompt, which opens a new TCP connection and
+TLS handshake each time, and passed timeout=None, so a stalled provider
+could hang a call forever. This module keeps one requests.Session per
+provider with a tuned connection pool, default connect/read timeouts and
+automatic retry with exponential backoff on 429 and gateway errors.
+
+Features:
+- One long-lived session per provider (get_ai_session)
+- Keep-alive connection pool sized for concurrent MCP calls
+- Connect/read timeouts by default; override per call or with the
+  POMERA_AI_CONNECT_TIMEOUT / POMERA_AI_READ_TIMEOUT environment variables
+- Retries on 429/502/503/504 honoring Retry-After, and on connection errors
+- Connection-reuse statistics (get_ai_session_stats)
+
+Usage:
+    from core.ai_http import ai_post
+
+    response = ai_post("OpenAI", url, json=payload, headers=headers)
+
+Author: Pomera AI Commander
+"""
+
+import os
+import atexit
+import logging
+import threading
+from typing import Dict, Any, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Connection pool per host; MCP calls may run concurrently (--workers)
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+# Upper bound for a stalled call; reasoning models can take many minutes
+DEFAULT_READ_TIMEOUT = 900.0
+
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1.0
+# Statuses where the provider did not process the request
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={os.environ.get(name)!r}")
+        return default
+
+
+def default_timeout() -> Tuple[float, float]:
+    """(connect, read) timeout applied when a call does not pass one."""
+    return (_env_float("POMERA_AI_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            _env_float("POMERA_AI_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))
+
+
+class AISession(requests.Session):
+    """
+    requests.Session for one AI provider.
+
+    Mounts a pooled, retrying adapter for http and https and applies the
+    default timeout when a request does not specify one (or passes None,
+    which the engines used to do).
+    """
+
+    def __init__(self, provider: str):
+        super().__init__()
+        self.provider = provider
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        retry = Retry(
+            total=RETRY_TOTAL,
+            connect=RETRY_TOTAL,
+            read=0,
+            status=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,  # POST too: listed statuses mean "not processed"
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                   pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = default_timeout()
+        with self._count_lock:
+            self.request_count += 1
+        return super().request(method, url, *args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics across this session's host pools."""
+        connections = 0
+        attempts = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            attempts += pool.num_requests
+        return {
+            "provider": self.provider,
+            "requests": self.request_count,
+            "http_attempts": attempts,
+            "connections_opened": connections,
+            "connections_reused": max(0, attempts - connections),
+            "reuse_rate": f"{(attempts - connections) / attempts * 100:.1f}%" if attempts else "n/a",
+        }
+
+
+_sessions: Dict[str, AISession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_ai_session(provider: str) -> AISession:
+    """Get the shared session for an AI provider (created on first use)."""
+    session = _sessions.get(provider)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(provider)
+            if session is None:
+                session = AISession(provider)
+                _sessions[provider] = session
+    return session
+
+
+def ai_post(provider: str, url: str, **kwargs) -> requests.Response:
+    """POST through the provider's shared session (see AISession)."""
+    return get_ai_session(provider).post(url, **kwargs)
+
+
+def get_ai_session_stats() -> List[Dict[str, Any]]:
+    """Statistics for every provider session opened so far."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+    return [session.get_stats() for session in sessions]
+
+
+def close_ai_sessions() -> None:
+    """Close all provider sessions and their pooled connections."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"Error closing {session.provider} session: {e}")
+
+
+atexit.register(close_ai_sessions)
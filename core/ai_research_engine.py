@@ -17,6 +17,8 @@ import time
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
 
+from core.ai_http import ai_post
+
 logger = logging.getLogger(__name__)
 
 
@@ -312,7 +314,7 @@ class AIResearchEngine:
                 self.logger.debug(f"[STAGE 1] Payload: {json.dumps(stage1_payload, indent=2)}")
                 self.logger.debug(f"[OpenAI Research STAGE 1] Payload:\n{json.dumps(stage1_payload, indent=2)}")
                 
-                response = requests.post(url, json=stage1_payload, headers=headers, timeout=None)
+                response = ai_post("OpenAI", url, json=stage1_payload, headers=headers)
                 if not response.ok:
                     error_body = response.text
                     self.logger.error(f"[STAGE 1] HTTP Error: {response.status_code}")
@@ -370,7 +372,7 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
                 self.logger.debug(f"[STAGE 2] Payload: {json.dumps(stage2_payload, indent=2)[:2000]}...")
                 self.logger.debug(f"[OpenAI Research STAGE 2] Payload:\n{json.dumps(stage2_payload, indent=2)[:2000]}...")
                 
-                response = requests.post(url, json=stage2_payload, headers=headers, timeout=None)
+                response = ai_post("OpenAI", url, json=stage2_payload, headers=headers)
                 if not response.ok:
                     error_body = response.text
                     self.logger.error(f"[STAGE 2] HTTP Error: {response.status_code}")
@@ -427,8 +429,8 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
             if progress_callback:
                 progress_callback(50, 100)
             
-            # No timeout - AI models may take arbitrarily long
-            response = requests.post(url, json=payload, headers=headers, timeout=None)
+            # Long read timeout - AI models may take many minutes
+            response = ai_post("OpenAI", url, json=payload, headers=headers)
             response.raise_for_status()
             
             data = response.json()
@@ -589,7 +591,7 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
                 self.logger.info(f"[STAGE 1] Payload: {json.dumps(stage1_payload, indent=2)[:2000]}...")
                 self.logger.debug(f"[Anthropic Research STAGE 1] Payload:\n{json.dumps(stage1_payload, indent=2)[:2000]}...")
                 
-                response = requests.post(url, json=stage1_payload, headers=headers, timeout=None)
+                response = ai_post("Anthropic AI", url, json=stage1_payload, headers=headers)
                 if not response.ok:
                     error_body = response.text
                     self.logger.error(f"[STAGE 1] HTTP Error: {response.status_code}")
@@ -656,7 +658,7 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
                 self.logger.info(f"[STAGE 2] Payload: {json.dumps(stage2_payload, indent=2)[:2000]}...")
                 self.logger.debug(f"[Anthropic Research STAGE 2] Payload:\n{json.dumps(stage2_payload, indent=2)[:2000]}...")
                 
-                response = requests.post(url, json=stage2_payload, headers=headers, timeout=None)
+                response = ai_post("Anthropic AI", url, json=stage2_payload, headers=headers)
                 if not response.ok:
                     error_body = response.text
                     self.logger.error(f"[STAGE 2] HTTP Error: {response.status_code}")
@@ -734,8 +736,8 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
             if progress_callback:
                 progress_callback(50, 100)
             
-            # No timeout - AI models may take arbitrarily long
-            response = requests.post(url, json=payload, headers=headers, timeout=None)
+            # Long read timeout - AI models may take many minutes
+            response = ai_post("Anthropic AI", url, json=payload, headers=headers)
             response.raise_for_status()
             
             data = response.json()
@@ -893,7 +895,7 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
                 self.logger.debug(f"[OpenRouter Research STAGE 1] Payload:\n{json.dumps(stage1_payload, indent=2)[:2000]}...")
                 print(f"\n[OpenRouter Research STAGE 1] Payload:\n{json.dumps(stage1_payload, indent=2)}", file=sys.stderr, flush=True)
                 
-                response = requests.post(url, json=stage1_payload, headers=headers, timeout=None)
+                response = ai_post("OpenRouterAI", url, json=stage1_payload, headers=headers)
                 if not response.ok:
                     error_body = response.text
                     self.logger.error(f"[STAGE 1] HTTP Error: {response.status_code}")
@@ -954,7 +956,7 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
                 self.logger.debug(f"[OpenRouter Research STAGE 2] Payload:\n{json.dumps(stage2_payload, indent=2)[:2000]}...")
                 print(f"\n[OpenRouter Research STAGE 2] Payload:\n{json.dumps(stage2_payload, indent=2)}", file=sys.stderr, flush=True)
                 
-                response = requests.post(url, json=stage2_payload, headers=headers, timeout=None)
+                response = ai_post("OpenRouterAI", url, json=stage2_payload, headers=headers)
                 if not response.ok:
                     error_body = response.text
                     self.logger.error(f"[STAGE 2] HTTP Error: {response.status_code}")
@@ -1008,8 +1010,8 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
             self.logger.debug(f"[OpenRouter Research Single] Payload:\n{json.dumps(payload, indent=2)[:2000]}...")
             print(f"\n[OpenRouter Research Single Mode] Payload:\n{json.dumps(payload, indent=2)}", file=sys.stderr, flush=True)
             
-            # No timeout - AI models may take arbitrarily long
-            response = requests.post(url, json=payload, headers=headers, timeout=None)
+            # Long read timeout - AI models may take many minutes
+            response = ai_post("OpenRouterAI", url, json=payload, headers=headers)
             response.raise_for_status()
             
             data = response.json()
@@ -1167,8 +1169,8 @@ Cite the sources from the search results. Apply deep reasoning to synthesize fin
             
             self.logger.debug(f"[DR-DEBUG-6] Making API request to Anthropic...")
             
-            # Make request without timeout for extended thinking
-            response = requests.post(url, json=payload, headers=headers, timeout=None)
+            # Long read timeout for extended thinking
+            response = ai_post("Anthropic AI", url, json=payload, headers=headers)
             
             self.logger.debug(f"[DR-DEBUG-7] Response received, status={response.status_code}")
             
@@ -13,11 +13,11 @@ Supports 11 AI providers:
 import logging
 import json
 import requests
-import time
-import random
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
 
+from core.ai_http import ai_post
+
 logger = logging.getLogger(__name__)
 
 # Import bedrock helper for AWS Bedrock support
@@ -318,76 +318,61 @@ class AIToolsEngine:
             if progress_callback:
                 progress_callback(25, 100)
             
-            # Make request with retry logic
-            max_retries = 3
-            base_delay = 1
-            
-            for i in range(max_retries):
-                try:
-                    response = requests.post(url, json=payload, headers=headers, timeout=None)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    self.logger.debug(f"{provider} Response: {json.dumps(data, indent=2)[:500]}...")
-                    
-                    # Notify progress
-                    if progress_callback:
-                        progress_callback(75, 100)
-                    
-                    # Extract response text
-                    result_text = self._extract_response_text(provider, data)
-                    
-                    # Extract usage if available
-                    usage = None
-                    if 'usage' in data:
-                        usage = data['usage']
-                    elif 'usageMetadata' in data:
-                        usage = data['usageMetadata']
-                    
-                    # Notify completion
-                    if progress_callback:
-                        progress_callback(100, 100)
-                    
-                    return AIToolsResult(
-                        success=True,
-                        response=result_text,
-                        provider=provider,
-                        model=actual_model,
-                        usage=usage
-                    )
-                    
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code == 429 and i < max_retries - 1:
-                        delay = base_delay * (2 ** i) + random.uniform(0, 1)
-                        self.logger.warning(f"Rate limit exceeded. Retrying in {delay:.2f} seconds...")
-                        time.sleep(delay)
-                    else:
-                        # Sanitize error message to remove API keys from URLs
-                        error_text = e.response.text if hasattr(e, 'response') and e.response else str(e)
-                        error_text = self._sanitize_url(error_text)
-                        return AIToolsResult(
-                            success=False,
-                            error=f"API Error ({e.response.status_code}): {error_text[:500]}",
-                            provider=provider,
-                            model=actual_model
-                        )
-                        
-                except requests.exceptions.RequestException as e:
-                    # Sanitize error message to remove API keys
-                    error_msg = self._sanitize_url(str(e))
-                    return AIToolsResult(
-                        success=False,
-                        error=f"Network Error: {error_msg}",
-                        provider=provider,
-                        model=actual_model
-                    )
-            
-            return AIToolsResult(
-                success=False,
-                error="Max retries exceeded",
-                provider=provider,
-                model=actual_model
-            )
+            # Make request over the provider's pooled session; the session
+            # retries 429/5xx with backoff and applies connect/read timeouts
+            try:
+                response = ai_post(provider, url, json=payload, headers=headers)
+                response.raise_for_status()
+                
+                data = response.json()
+                self.logger.debug(f"{provider} Response: {json.dumps(data, indent=2)[:500]}...")
+                
+                # Notify progress
+                if progress_callback:
+                    progress_callback(75, 100)
+                
+                # Extract response text
+                result_text = self._extract_response_text(provider, data)
+                
+                # Extract usage if available
+                usage = None
+                if 'usage' in data:
+                    usage = data['usage']
+                elif 'usageMetadata' in data:
+                    usage = data['usageMetadata']
+                
+                # Notify completion
+                if progress_callback:
+                    progress_callback(100, 100)
+                
+                return AIToolsResult(
+                    success=True,
+                    response=result_text,
+                    provider=provider,
+                    model=actual_model,
+                    usage=usage
+                )
+                
+            except requests.exceptions.HTTPError as e:
+                # Sanitize error message to remove API keys from URLs
+                error_text = e.response.text if hasattr(e, 'response') and e.response else str(e)
+                error_text = self._sanitize_url(error_text)
+                return AIToolsResult(
+                    success=False,
+                    error=f"API Error ({e.response.status_code}): {error_text[:500]}",
+                    provider=provider,
+                    model=actual_model
+                )
+                
+            except requests.exceptions.RequestException as e:
+                # Sanitize error message to remove API keys
+                error_msg = self._sanitize_url(str(e))
+                return AIToolsResult(
+                    success=False,
+                    error=f"Network Error: {error_msg}",
+                    provider=provider,
+                    model=actual_model
+                )
             
         except Exception as e:
             self.logger.error(f"AI Tools error: {e}", exc_info=True)
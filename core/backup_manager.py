@@ -4,6 +4,10 @@ Automatic Backup and Persistence Manager for Database Settings
 This module provides comprehensive backup and persistence management for the
 database settings system, including configurable backup intervals, disk
 persistence triggers, backup rotation, and recovery procedures.
+
+Compressed backups are incremental generations in a shared page store
+(see core.incremental_backup): each backup writes only the database pages
+that changed since earlier generations.
 """
 
 import os
@@ -14,11 +18,16 @@ import time
 import logging
 import json
 import gzip
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .incremental_backup import (
+    PageStore, GENERATION_SUFFIX, BACKUP_STEP_PAGES, BACKUP_STEP_SLEEP
+)
 
 
 class BackupTrigger(Enum):
@@ -179,8 +188,13 @@ class BackupManager:
         self.last_backup_time = None
         self.backup_history = []
         
+        # Incremental page store for compressed backups
+        self.page_store = PageStore(self.backup_dir)
+        
         # Threading
         self._lock = threading.RLock()
+        self._backup_lock = threading.Lock()  # serializes backups and restores
+        self._executor = None
         self._backup_thread = None
         self._stop_event = threading.Event()
         self._backup_callbacks = []
@@ -254,60 +268,80 @@ class BackupManager:
         Returns:
             BackupInfo if successful, None otherwise
         """
+        return self._run_backup(self._backup_source(connection_manager), trigger, metadata)
+    
+    def backup_database_async(self, connection_manager, trigger: BackupTrigger = BackupTrigger.MANUAL,
+                              metadata: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        Create a backup of the database on the background backup thread.
+        
+        Args:
+            connection_manager: Database connection manager
+            trigger: Backup trigger type
+            metadata: Additional metadata to store with backup
+            
+        Returns:
+            Future resolving to BackupInfo if successful, None otherwise
+        """
+        source = self._backup_source(connection_manager)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1,
+                                                    thread_name_prefix="BackupManagerWorker")
+            return self._executor.submit(self._run_backup, source, trigger, metadata)
+    
+    def _backup_source(self, connection_manager) -> Union[str, sqlite3.Connection]:
+        """
+        Database to back up: the file path, so the backup opens its own
+        connection, or for in-memory databases the caller's connection.
+        """
+        if connection_manager.db_path != ":memory:":
+            return connection_manager.db_path
+        return connection_manager.get_connection()
+    
+    def _run_backup(self, source, trigger: BackupTrigger,
+                    metadata: Optional[Dict[str, Any]]) -> Optional[BackupInfo]:
         try:
-            with self._lock:
-                return self._perform_backup(connection_manager, trigger, metadata)
+            with self._backup_lock:
+                return self._perform_backup(source, trigger, metadata)
         except Exception as e:
             self.logger.error(f"Backup failed: {e}")
-            self.backup_stats['failed_backups'] += 1
             return None
     
-    def _perform_backup(self, connection_manager, trigger: BackupTrigger = BackupTrigger.TIME_BASED,
+    def _perform_backup(self, source, trigger: BackupTrigger = BackupTrigger.TIME_BASED,
                        metadata: Optional[Dict[str, Any]] = None) -> Optional[BackupInfo]:
         """Internal backup implementation."""
         timestamp = datetime.now()
-        backup_filename = f"settings_backup_{timestamp.strftime('%Y%m%d_%H%M%S')}.db"
+        backup_filename = f"settings_backup_{timestamp.strftime('%Y%m%d_%H%M%S')}"
         
         if self.enable_compression:
-            backup_filename += ".gz"
+            backup_filename += GENERATION_SUFFIX
+        else:
+            backup_filename += ".db"
         
         backup_path = self.backup_dir / backup_filename
+        metadata = dict(metadata or {})
         
         try:
-            # Get database connection
-            source_conn = connection_manager.get_connection()
-            
             if self.enable_compression:
-                # Backup to temporary file then compress
-                temp_path = backup_path.with_suffix('')
-                backup_conn = sqlite3.connect(str(temp_path))
-                
-                try:
-                    # Perform backup
-                    source_conn.backup(backup_conn)
-                    backup_conn.close()
-                    
-                    # Compress the backup
-                    with open(temp_path, 'rb') as f_in:
-                        with gzip.open(backup_path, 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
-                    
-                    # Remove temporary file
-                    temp_path.unlink()
-                    
-                finally:
-                    if backup_conn:
-                        backup_conn.close()
+                # Incremental generation: only changed pages are compressed and stored
+                generation = self.page_store.create_generation(source, backup_path)
+                backup_size = generation['bytes_written']
+                metadata['generation'] = {
+                    key: generation[key]
+                    for key in ('page_count', 'new_pages', 'database_bytes', 'bytes_written', 'seconds')
+                }
             else:
-                # Direct backup without compression
+                # Direct page-stepped backup without compression
+                source_conn = source if isinstance(source, sqlite3.Connection) else sqlite3.connect(source)
                 backup_conn = sqlite3.connect(str(backup_path))
                 try:
-                    source_conn.backup(backup_conn)
+                    source_conn.backup(backup_conn, pages=BACKUP_STEP_PAGES, sleep=BACKUP_STEP_SLEEP)
                 finally:
                     backup_conn.close()
-            
-            # Get backup size
-            backup_size = backup_path.stat().st_size
+                    if source_conn is not source:
+                        source_conn.close()
+                backup_size = backup_path.stat().st_size
             
             # Create backup info
             backup_info = BackupInfo(
@@ -316,24 +350,25 @@ class BackupManager:
                 size_bytes=backup_size,
                 trigger=trigger,
                 compressed=self.enable_compression,
-                metadata=metadata or {}
+                metadata=metadata
             )
             
-            # Update state
-            self.backup_history.append(backup_info)
-            self.last_backup_time = timestamp
-            self.changes_since_backup = 0
-            
-            # Update statistics
-            self.backup_stats['total_backups'] += 1
-            self.backup_stats['successful_backups'] += 1
-            self.backup_stats['total_size_bytes'] += backup_size
-            
-            # Save backup history
-            self._save_backup_history()
-            
-            # Perform rotation cleanup
-            self._cleanup_old_backups()
+            with self._lock:
+                # Update state
+                self.backup_history.append(backup_info)
+                self.last_backup_time = timestamp
+                self.changes_since_backup = 0
+                
+                # Update statistics
+                self.backup_stats['total_backups'] += 1
+                self.backup_stats['successful_backups'] += 1
+                self.backup_stats['total_size_bytes'] += backup_size
+                
+                # Save backup history
+                self._save_backup_history()
+                
+                # Perform rotation cleanup
+                self._cleanup_old_backups()
             
             # Notify callbacks
             for callback in self._backup_callbacks:
@@ -347,7 +382,8 @@ class BackupManager:
             
         except Exception as e:
             self.logger.error(f"Backup creation failed: {e}")
-            self.backup_stats['failed_backups'] += 1
+            with self._lock:
+                self.backup_stats['failed_backups'] += 1
             
             # Clean up failed backup file
             if backup_path.exists():
@@ -370,7 +406,7 @@ class BackupManager:
             True if restore successful
         """
         try:
-            with self._lock:
+            with self._backup_lock, self._lock:
                 if backup_path is None:
                     # Use latest backup
                     if not self.backup_history:
@@ -391,7 +427,15 @@ class BackupManager:
                 # Determine if backup is compressed
                 is_compressed = backup_path.endswith('.gz')
                 
-                if is_compressed:
+                if backup_path.endswith(GENERATION_SUFFIX):
+                    # Reassemble the generation from the page store
+                    if connection_manager.db_path != ":memory:":
+                        self.page_store.restore_generation(backup_path, connection_manager.db_path)
+                    else:
+                        memory_conn = sqlite3.connect(":memory:")
+                        self.page_store.restore_generation(backup_path, memory_conn)
+                        connection_manager._main_connection = memory_conn
+                elif is_compressed:
                     # Decompress and restore
                     temp_path = backup_file.with_suffix('')
                     
@@ -453,6 +497,10 @@ class BackupManager:
                 else:
                     backups_to_remove.append(backup)
             
+            removed_generations = any(
+                backup.filepath.endswith(GENERATION_SUFFIX) for backup in backups_to_remove
+            )
+            
             # Remove old backup files
             for backup in backups_to_remove:
                 try:
@@ -473,6 +521,7 @@ class BackupManager:
                 excess_backups = self.backup_history[self.rotation_policy.max_backups:]
                 
                 for backup in excess_backups:
+                    removed_generations = removed_generations or backup.filepath.endswith(GENERATION_SUFFIX)
                     try:
                         backup_path = Path(backup.filepath)
                         if backup_path.exists():
@@ -482,6 +531,11 @@ class BackupManager:
                 
                 self.backup_history = self.backup_history[:self.rotation_policy.max_backups]
             
+            # Drop pages that only removed generations referenced
+            if removed_generations:
+                collected = self.page_store.collect_garbage()
+                self.logger.debug(f"Removed {collected} unreferenced backup pages")
+            
             # Save updated history
             self._save_backup_history()
             
@@ -556,6 +610,7 @@ class BackupManager:
                 'total_backup_size': sum(b.size_bytes for b in self.backup_history),
                 'compression_enabled': self.enable_compression,
                 'statistics': self.backup_stats.copy(),
+                'page_store': self.page_store.get_stats() if self.page_store.path.exists() else None,
                 'recent_backups': [
                     {
                         'filepath': b.filepath,
@@ -653,4 +708,13 @@ class BackupManager:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.stop_auto_backup()
\ No newline at end of file
+        self.close()
+    
+    def close(self) -> None:
+        """Stop automatic backups, wait for queued backups and close the page store."""
+        self.stop_auto_backup()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.page_store.close()
\ No newline at end of file
@@ -31,6 +31,8 @@ from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
 
+from .incremental_backup import snapshot_database
+
 
 class BackupType(Enum):
     """Types of backups that can be created."""
@@ -261,32 +263,28 @@ class BackupRecoveryManager:
                 settings_db_path = str(self.backup_dir.parent / 'settings.db')
                 notes_db_path = str(self.backup_dir.parent / 'notes.db')
             
-            # First, create the settings.db backup using connection_manager
-            temp_settings_backup = self.backup_dir / f"temp_settings_{int(time.time())}.db"
-            success = connection_manager.backup_to_disk(str(temp_settings_backup))
-            if not success:
-                self.logger.error("Settings database backup failed")
-                return None
-            
-            try:
-                # Create ZIP archive containing both databases
-                compression = zipfile.ZIP_DEFLATED if self.enable_compression else zipfile.ZIP_STORED
-                with zipfile.ZipFile(archive_path, 'w', compression=compression) as zf:
-                    # Add settings.db from the temp backup
-                    zf.write(temp_settings_backup, 'settings.db')
-                    self.logger.debug(f"Added settings.db to backup archive")
-                    
-                    # Add notes.db if it exists
-                    if os.path.exists(notes_db_path):
-                        zf.write(notes_db_path, 'notes.db')
-                        self.logger.debug(f"Added notes.db to backup archive")
-                    else:
-                        self.logger.debug("notes.db not found - skipping")
+            # Consistent online snapshots (including WAL contents), streamed
+            # straight into the archive without temporary database files
+            source_conn = connection_manager._main_connection or connection_manager.get_connection()
+            settings_image = snapshot_database(source_conn)
+            
+            # Create ZIP archive containing both databases
+            compression = zipfile.ZIP_DEFLATED if self.enable_compression else zipfile.ZIP_STORED
+            with zipfile.ZipFile(archive_path, 'w', compression=compression) as zf:
+                zf.writestr('settings.db', settings_image)
+                self.logger.debug(f"Added settings.db to backup archive")
+                del settings_image
                 
-            finally:
-                # Clean up temp file
-                if temp_settings_backup.exists():
-                    os.remove(temp_settings_backup)
+                # Add notes.db if it exists
+                if os.path.exists(notes_db_path):
+                    notes_conn = sqlite3.connect(notes_db_path)
+                    try:
+                        zf.writestr('notes.db', snapshot_database(notes_conn))
+                    finally:
+                        notes_conn.close()
+                    self.logger.debug(f"Added notes.db to backup archive")
+                else:
+                    self.logger.debug("notes.db not found - skipping")
             
             format_type = BackupFormat.COMPRESSED if self.enable_compression else BackupFormat.SQLITE
             
@@ -1,18 +1,34 @@
 """
 Content hash-based caching system for processed results in Promera AI Commander.
 Provides intelligent caching of text processing results using content hashing.
+
+Two tiers: an in-memory segmented LRU (new entries in a probationary
+segment, entries hit again promoted to a protected segment; O(1) eviction)
+and, with persistence enabled, a sharded append-only disk store
+(core.result_disk_store) loaded on demand, so results survive restarts
+without a startup penalty.
 """
 
 import hashlib
+import logging
 import time
 import threading
-import pickle
 import zlib
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, List, Optional, Any, Tuple, Union, Iterator
 from dataclasses import dataclass, field
 from collections import OrderedDict
 import weakref
-import os
+
+from .result_disk_store import ResultDiskStore, DEFAULT_MAX_DISK_MB
+
+logger = logging.getLogger(__name__)
+
+# Largest result kept in memory; larger ones (up to the disk limit) go to disk only
+MAX_MEMORY_RESULT_CHARS = 1024 * 1024
+MAX_DISK_RESULT_CHARS = 16 * 1024 * 1024
+
+# Share of max_entries reserved for the protected (hit more than once) segment
+PROTECTED_SHARE = 0.8
 
 @dataclass
 class ProcessedResult:
@@ -26,6 +42,7 @@ class ProcessedResult:
     timestamp: float = field(default_factory=time.time)
     access_count: int = 0
     last_access: float = field(default_factory=time.time)
+    expires_at: float = float('inf')
     
     @property
     def age_seconds(self) -> float:
@@ -43,6 +60,7 @@ class CacheMetrics:
     hits: int = 0
     misses: int = 0
     evictions: int = 0
+    disk_hits: int = 0
     total_processing_time_saved_ms: float = 0.0
     cache_size_bytes: int = 0
     
@@ -66,14 +84,17 @@ class ContentHashCache:
                  max_cache_size_mb: int = 50,
                  max_entries: int = 1000,
                  enable_compression: bool = True,
-                 enable_persistence: bool = False):
+                 enable_persistence: bool = False,
+                 cache_dir: Optional[str] = None,
+                 max_disk_mb: int = DEFAULT_MAX_DISK_MB):
         self.max_cache_size_bytes = max_cache_size_mb * 1024 * 1024
         self.max_entries = max_entries
         self.enable_compression = enable_compression
         self.enable_persistence = enable_persistence
         
-        # Cache storage
+        # Cache storage: probationary and protected LRU segments
         self.cache: OrderedDict[str, ProcessedResult] = OrderedDict()
+        self.protected: OrderedDict[str, ProcessedResult] = OrderedDict()
         self.cache_lock = threading.RLock()
         
         # Metrics
@@ -92,10 +113,35 @@ class ContentHashCache:
             'Morse Code Translator': {'priority': 'low', 'ttl_hours': 6}
         }
         
-        # Persistence settings
+        # Persistence settings: shard indexes are read on first lookup
+        self.disk_store: Optional[ResultDiskStore] = None
         if self.enable_persistence:
-            self.cache_file = "content_cache.pkl"
-            self._load_cache_from_disk()
+            try:
+                self.disk_store = ResultDiskStore(cache_dir or self._default_cache_dir(), max_disk_mb)
+            except OSError as e:
+                logger.warning(f"Content cache persistence disabled: {e}")
+                self.enable_persistence = False
+    
+    @staticmethod
+    def _default_cache_dir() -> str:
+        try:
+            from core.data_directory import get_database_path
+            return get_database_path('content_cache')
+        except ImportError:
+            return 'content_cache'
+    
+    def _entries(self) -> Iterator[Tuple[str, ProcessedResult]]:
+        """All in-memory entries, probationary segment first."""
+        yield from self.cache.items()
+        yield from self.protected.items()
+    
+    def _pop_entry(self, cache_key: str) -> Optional[ProcessedResult]:
+        result = self.cache.pop(cache_key, None)
+        if result is None:
+            result = self.protected.pop(cache_key, None)
+        if result is not None:
+            self.metrics.cache_size_bytes -= result.size_estimate
+        return result
     
     def get_cached_result(self, 
                          content: str, 
@@ -115,31 +161,81 @@ class ContentHashCache:
         cache_key = self._generate_cache_key(content, tool_name, tool_settings)
         
         with self.cache_lock:
-            if cache_key in self.cache:
-                result = self.cache[cache_key]
-                
+            result = self.cache.get(cache_key) or self.protected.get(cache_key)
+            if result is not None:
                 # Check if result is still valid (TTL)
                 if self._is_result_valid(result, tool_name):
-                    # Update access statistics
-                    result.access_count += 1
-                    result.last_access = time.time()
-                    
-                    # Move to end (LRU)
-                    self.cache.move_to_end(cache_key)
-                    
-                    # Update metrics
-                    self.metrics.hits += 1
-                    self.metrics.total_processing_time_saved_ms += result.processing_time_ms
-                    
+                    self._record_hit(cache_key, result)
                     return result.content
                 else:
                     # Result expired, remove from cache
-                    self.cache.pop(cache_key)
+                    self._pop_entry(cache_key)
+        
+        # Memory miss - try the disk tier
+        if self.disk_store is not None:
+            result = self._load_from_disk(cache_key)
+            if result is not None:
+                with self.cache_lock:
+                    self.metrics.disk_hits += 1
+                    self._record_hit(cache_key, result)
+                return result.content
         
         # Cache miss
         self.metrics.misses += 1
         return None
     
+    def _record_hit(self, cache_key: str, result: ProcessedResult) -> None:
+        """Update access statistics and LRU segments for a hit."""
+        result.access_count += 1
+        result.last_access = time.time()
+        
+        if cache_key in self.protected:
+            self.protected.move_to_end(cache_key)
+        elif cache_key in self.cache:
+            # Second hit: promote, unless the tool is low priority
+            priority = self.tool_cache_settings.get(result.tool_name, {}).get('priority', 'medium')
+            if priority == 'low':
+                self.cache.move_to_end(cache_key)
+            else:
+                self.protected[cache_key] = self.cache.pop(cache_key)
+                self._demote_protected_overflow()
+        elif len(result.content) <= MAX_MEMORY_RESULT_CHARS:
+            # Loaded from disk
+            self._enforce_cache_limits(result.size_estimate)
+            self.cache[cache_key] = result
+            self.metrics.cache_size_bytes += result.size_estimate
+        
+        # Update metrics
+        self.metrics.hits += 1
+        self.metrics.total_processing_time_saved_ms += result.processing_time_ms
+    
+    def _demote_protected_overflow(self) -> None:
+        """Move least recently used protected entries back to probation."""
+        limit = max(1, int(self.max_entries * PROTECTED_SHARE))
+        while len(self.protected) > limit:
+            cache_key, result = self.protected.popitem(last=False)
+            self.cache[cache_key] = result
+    
+    def _load_from_disk(self, cache_key: str) -> Optional[ProcessedResult]:
+        try:
+            record = self.disk_store.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Content cache disk read failed: {e}")
+            return None
+        if record is None:
+            return None
+        meta, data, created, expires_at = record
+        return ProcessedResult(
+            content=data if self.enable_compression else self._decompress_content(data),
+            tool_name=meta.get('tool_name', ''),
+            tool_settings=meta.get('tool_settings', {}),
+            processing_time_ms=meta.get('processing_time_ms', 0.0),
+            content_hash=meta.get('content_hash', ''),
+            result_hash=meta.get('result_hash', ''),
+            timestamp=created,
+            expires_at=expires_at
+        )
+    
     def cache_result(self, 
                     original_content: str,
                     processed_content: str,
@@ -160,8 +256,9 @@ class ContentHashCache:
         if original_content == processed_content:
             return
         
-        # Don't cache very large results (memory efficiency)
-        if len(processed_content) > 1024 * 1024:  # 1MB limit
+        # Don't cache very large results (memory efficiency); the disk tier takes larger ones
+        max_chars = MAX_DISK_RESULT_CHARS if self.disk_store is not None else MAX_MEMORY_RESULT_CHARS
+        if len(processed_content) > max_chars:
             return
         
         # Check if tool should be cached
@@ -170,30 +267,48 @@ class ContentHashCache:
             return
         
         cache_key = self._generate_cache_key(original_content, tool_name, tool_settings)
+        compressed = None
+        if self.enable_compression or self.disk_store is not None:
+            compressed = self._compress_content(processed_content)
         
         # Create result object
+        timestamp = time.time()
         result = ProcessedResult(
-            content=self._compress_content(processed_content) if self.enable_compression else processed_content,
+            content=compressed if self.enable_compression else processed_content,
             tool_name=tool_name,
             tool_settings=tool_settings.copy(),
             processing_time_ms=processing_time_ms,
             content_hash=self._generate_content_hash(original_content),
-            result_hash=self._generate_content_hash(processed_content)
+            result_hash=self._generate_content_hash(processed_content),
+            timestamp=timestamp,
+            expires_at=timestamp + tool_config.get('ttl_hours', 24) * 3600
         )
         
-        with self.cache_lock:
-            # Check cache size limits
-            self._enforce_cache_limits()
-            
-            # Add to cache
-            self.cache[cache_key] = result
-            
-            # Update metrics
-            self.metrics.cache_size_bytes += result.size_estimate
+        if len(processed_content) <= MAX_MEMORY_RESULT_CHARS:
+            with self.cache_lock:
+                self._pop_entry(cache_key)
+                
+                # Check cache size limits
+                self._enforce_cache_limits(result.size_estimate)
+                
+                # Add to cache
+                self.cache[cache_key] = result
+                
+                # Update metrics
+                self.metrics.cache_size_bytes += result.size_estimate
         
-        # Persist to disk if enabled
-        if self.enable_persistence:
-            self._save_cache_to_disk()
+        # Persist to disk if enabled (one append, not a rewrite of the cache)
+        if self.disk_store is not None:
+            try:
+                self.disk_store.put(cache_key, {
+                    'tool_name': tool_name,
+                    'tool_settings': result.tool_settings,
+                    'processing_time_ms': processing_time_ms,
+                    'content_hash': result.content_hash,
+                    'result_hash': result.result_hash,
+                }, compressed, result.timestamp, result.expires_at)
+            except Exception as e:
+                logger.warning(f"Content cache disk write failed: {e}")
     
     def _generate_cache_key(self, 
                            content: str, 
@@ -219,96 +334,55 @@ class ContentHashCache:
         return zlib.decompress(compressed_content).decode('utf-8')
     
     def _is_result_valid(self, result: ProcessedResult, tool_name: str) -> bool:
-        """Check if a cached result is still valid based on TTL."""
-        tool_config = self.tool_cache_settings.get(tool_name, {'ttl_hours': 24})
-        ttl_seconds = tool_config.get('ttl_hours', 24) * 3600
-        
-        return result.age_seconds < ttl_seconds
+        """Check if a cached result is still valid based on its TTL."""
+        return time.time() < result.expires_at
     
-    def _enforce_cache_limits(self):
-        """Enforce cache size and entry limits."""
-        # Remove expired entries first
-        self._remove_expired_entries()
-        
+    def _enforce_cache_limits(self, incoming_bytes: int = 0):
+        """Enforce cache size and entry limits before adding an entry."""
         # Check entry count limit
-        while len(self.cache) >= self.max_entries:
+        while len(self.cache) + len(self.protected) >= self.max_entries:
             self._evict_least_valuable_entry()
         
         # Check memory size limit
-        while self.metrics.cache_size_bytes > self.max_cache_size_bytes:
+        while (self.cache or self.protected) and \
+                self.metrics.cache_size_bytes + incoming_bytes > self.max_cache_size_bytes:
             self._evict_least_valuable_entry()
     
     def _remove_expired_entries(self):
         """Remove expired cache entries."""
-        current_time = time.time()
-        expired_keys = []
-        
-        for cache_key, result in self.cache.items():
-            if not self._is_result_valid(result, result.tool_name):
-                expired_keys.append(cache_key)
+        expired_keys = [cache_key for cache_key, result in self._entries()
+                        if not self._is_result_valid(result, result.tool_name)]
         
         for key in expired_keys:
-            result = self.cache.pop(key)
-            self.metrics.cache_size_bytes -= result.size_estimate
+            self._pop_entry(key)
             self.metrics.evictions += 1
     
     def _evict_least_valuable_entry(self):
-        """Evict the least valuable cache entry using a scoring algorithm."""
-        if not self.cache:
-            return
-        
-        # Calculate value scores for all entries
-        entries_with_scores = []
-        current_time = time.time()
-        
-        for cache_key, result in self.cache.items():
-            # Score based on access frequency, recency, processing time saved, and tool priority
-            tool_config = self.tool_cache_settings.get(result.tool_name, {'priority': 'medium'})
-            
-            # Priority multiplier
-            priority_multiplier = {'high': 3.0, 'medium': 2.0, 'low': 1.0, 'none': 0.1}.get(
-                tool_config.get('priority', 'medium'), 2.0
-            )
-            
-            # Recency score (more recent = higher score)
-            recency_score = 1.0 / max(result.age_seconds / 3600, 0.1)  # Hours
-            
-            # Access frequency score
-            frequency_score = result.access_count / max(result.age_seconds / 3600, 0.1)
-            
-            # Processing time saved score
-            time_saved_score = result.processing_time_ms / 100.0  # Normalize to reasonable range
-            
-            # Size penalty (larger entries are less valuable)
-            size_penalty = result.size_estimate / (1024 * 1024)  # MB
-            
-            # Combined score
-            score = (
-                (recency_score * 0.3 + frequency_score * 0.4 + time_saved_score * 0.2) * 
-                priority_multiplier - size_penalty * 0.1
-            )
-            
-            entries_with_scores.append((score, cache_key))
+        """
+        Evict the least recently used probationary entry (or, if there are
+        none, the least recently used protected entry) in O(1).
         
-        # Sort by score (lowest first) and evict the least valuable
-        entries_with_scores.sort()
-        if entries_with_scores:
-            _, evict_key = entries_with_scores[0]
-            result = self.cache.pop(evict_key)
-            self.metrics.cache_size_bytes -= result.size_estimate
-            self.metrics.evictions += 1
+        Entries hit only once are evicted before entries hit repeatedly,
+        and low-priority tools never leave the probationary segment.
+        """
+        segment = self.cache if self.cache else self.protected
+        if not segment:
+            return
+        _, result = segment.popitem(last=False)
+        self.metrics.cache_size_bytes -= result.size_estimate
+        self.metrics.evictions += 1
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics."""
         with self.cache_lock:
             # Calculate additional statistics
-            total_entries = len(self.cache)
+            total_entries = len(self.cache) + len(self.protected)
             
             # Tool distribution
             tool_distribution = {}
             total_processing_time = 0.0
             
-            for result in self.cache.values():
+            for _, result in self._entries():
                 tool_name = result.tool_name
                 tool_distribution[tool_name] = tool_distribution.get(tool_name, 0) + 1
                 total_processing_time += result.processing_time_ms
@@ -319,6 +393,7 @@ class ContentHashCache:
                     'hits': self.metrics.hits,
                     'misses': self.metrics.misses,
                     'evictions': self.metrics.evictions,
+                    'disk_hits': self.metrics.disk_hits,
                     'total_time_saved_ms': self.metrics.total_processing_time_saved_ms,
                     'average_time_saved_ms': self.metrics.average_time_saved_ms
                 },
@@ -328,8 +403,10 @@ class ContentHashCache:
                     'max_cache_size_mb': self.max_cache_size_bytes / (1024 * 1024),
                     'max_entries': self.max_entries,
                     'compression_enabled': self.enable_compression,
-                    'persistence_enabled': self.enable_persistence
+                    'persistence_enabled': self.enable_persistence,
+                    'protected_entries': len(self.protected)
                 },
+                'disk': self.disk_store.get_stats() if self.disk_store is not None else None,
                 'tool_distribution': tool_distribution,
                 'total_cached_processing_time_ms': total_processing_time
             }
@@ -337,7 +414,7 @@ class ContentHashCache:
     def get_tool_stats(self, tool_name: str) -> Dict[str, Any]:
         """Get statistics for a specific tool."""
         with self.cache_lock:
-            tool_entries = [r for r in self.cache.values() if r.tool_name == tool_name]
+            tool_entries = [r for _, r in self._entries() if r.tool_name == tool_name]
             
             if not tool_entries:
                 return {'tool_name': tool_name, 'cached_entries': 0}
@@ -360,17 +437,20 @@ class ContentHashCache:
         with self.cache_lock:
             if tool_name:
                 # Clear entries for specific tool
-                keys_to_remove = [k for k, v in self.cache.items() if v.tool_name == tool_name]
+                keys_to_remove = [k for k, v in self._entries() if v.tool_name == tool_name]
                 for key in keys_to_remove:
-                    result = self.cache.pop(key)
-                    self.metrics.cache_size_bytes -= result.size_estimate
+                    self._pop_entry(key)
             else:
                 # Clear all entries
                 self.cache.clear()
+                self.protected.clear()
                 self.metrics.cache_size_bytes = 0
         
-        if self.enable_persistence:
-            self._save_cache_to_disk()
+        if self.disk_store is not None:
+            if tool_name:
+                self.disk_store.delete_tool(tool_name)
+            else:
+                self.disk_store.clear()
     
     def optimize_cache(self):
         """Optimize cache by removing expired entries and adjusting settings."""
@@ -388,42 +468,6 @@ class ContentHashCache:
             elif stats['metrics']['hit_rate_percent'] > 90 and self.metrics.cache_size_bytes > self.max_cache_size_bytes * 0.8:
                 # High hit rate but near capacity - consider increasing cache size
                 pass
-    
-    def _save_cache_to_disk(self):
-        """Save cache to disk for persistence."""
-        if not self.enable_persistence:
-            return
-        
-        try:
-            with open(self.cache_file, 'wb') as f:
-                # Save only essential data to reduce file size
-                cache_data = {
-                    'cache': dict(self.cache),
-                    'metrics': self.metrics,
-                    'timestamp': time.time()
-                }
-                pickle.dump(cache_data, f)
-        except Exception as e:
-            print(f"Error saving cache to disk: {e}")
-    
-    def _load_cache_from_disk(self):
-        """Load cache from disk if available."""
-        if not self.enable_persistence or not os.path.exists(self.cache_file):
-            return
-        
-        try:
-            with open(self.cache_file, 'rb') as f:
-                cache_data = pickle.load(f)
-                
-                # Check if cache is not too old (24 hours)
-                if time.time() - cache_data.get('timestamp', 0) < 24 * 3600:
-                    self.cache = OrderedDict(cache_data.get('cache', {}))
-                    self.metrics = cache_data.get('metrics', CacheMetrics())
-                    
-                    # Recalculate cache size
-                    self.metrics.cache_size_bytes = sum(r.size_estimate for r in self.cache.values())
-        except Exception as e:
-            print(f"Error loading cache from disk: {e}")
 
 class ProcessingResultCache:
     """
@@ -496,7 +540,7 @@ def get_content_hash_cache() -> ContentHashCache:
     """Get the global content hash cache instance."""
     global _global_content_cache
     if _global_content_cache is None:
-        _global_content_cache = ContentHashCache()
+        _global_content_cache = ContentHashCache(enable_persistence=True)
     return _global_content_cache
 
 def get_processing_result_cache() -> ProcessingResultCache:
@@ -504,6 +548,6 @@ def get_processing_result_cache() -> ProcessingResultCache:
     global _global_processing_cache, _global_content_cache
     if _global_processing_cache is None:
         if _global_content_cache is None:
-            _global_content_cache = ContentHashCache()
+            _global_content_cache = ContentHashCache(enable_persistence=True)
         _global_processing_cache = ProcessingResultCache(_global_content_cache)
     return _global_processing_cache
\ No newline at end of file
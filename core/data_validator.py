@@ -212,26 +212,7 @@ class DataValidator:
                         auto_fixable=True
                     ))
             
-            # Validate data types and formats
-            for key, value in settings_data.items():
-                validation_issues = self._validate_setting_value(key, value)
-                issues.extend(validation_issues)
-            
-            # Validate tool settings structure
-            if 'tool_settings' in settings_data:
-                tool_issues = self._validate_tool_settings_structure(
-                    settings_data['tool_settings']
-                )
-                issues.extend(tool_issues)
-            
-            # Validate tab arrays
-            for tab_type in ['input_tabs', 'output_tabs']:
-                if tab_type in settings_data:
-                    tab_issues = self._validate_tab_array(
-                        tab_type, settings_data[tab_type]
-                    )
-                    issues.extend(tab_issues)
-            
+            issues.extend(self._validate_settings_subtrees(settings_data))
             return issues
             
         except Exception as e:
@@ -242,6 +223,56 @@ class DataValidator:
                 message=f"Settings validation failed: {e}"
             )]
     
+    def validate_settings_changes(self, changes: Dict[str, Any]) -> List[ValidationIssue]:
+        """
+        Validate only the settings subtrees that changed.
+        
+        Unlike validate_settings_data, a partial dictionary is expected, so
+        missing top-level keys are not reported. tool_settings may contain
+        just the tools that changed.
+        
+        Args:
+            changes: Partial settings data holding the changed subtrees
+            
+        Returns:
+            List of validation issues
+        """
+        try:
+            return self._validate_settings_subtrees(changes)
+        except Exception as e:
+            self.logger.error(f"Settings change validation failed: {e}")
+            return [ValidationIssue(
+                category=ValidationCategory.CORRUPTION,
+                severity=ValidationSeverity.CRITICAL,
+                message=f"Settings validation failed: {e}"
+            )]
+    
+    def _validate_settings_subtrees(self, settings_data: Dict[str, Any]) -> List[ValidationIssue]:
+        """Validate values, tool settings and tab arrays present in settings_data."""
+        issues = []
+        
+        # Validate data types and formats
+        for key, value in settings_data.items():
+            validation_issues = self._validate_setting_value(key, value)
+            issues.extend(validation_issues)
+        
+        # Validate tool settings structure
+        if 'tool_settings' in settings_data:
+            tool_issues = self._validate_tool_settings_structure(
+                settings_data['tool_settings']
+            )
+            issues.extend(tool_issues)
+        
+        # Validate tab arrays
+        for tab_type in ['input_tabs', 'output_tabs']:
+            if tab_type in settings_data:
+                tab_issues = self._validate_tab_array(
+                    tab_type, settings_data[tab_type]
+                )
+                issues.extend(tab_issues)
+        
+        return issues
+    
     def detect_data_corruption(self) -> List[ValidationIssue]:
         """
         Detect various types of data corruption in the database.
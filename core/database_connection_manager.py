@@ -22,6 +22,8 @@ from datetime import datetime, timedelta
 from contextlib import contextmanager
 from pathlib import Path
 
+from .incremental_backup import BACKUP_STEP_PAGES, BACKUP_STEP_SLEEP
+
 
 class DatabaseConnectionManager:
     """
@@ -70,6 +72,8 @@ class DatabaseConnectionManager:
         self._backup_stop_event = threading.Event()
         self._changes_since_backup = 0
         self._max_changes_before_backup = 100
+        self._disk_backup_lock = threading.Lock()
+        self._disk_backup_pending = False
         
         # Error handling
         self.logger = logging.getLogger(__name__)
@@ -266,20 +270,49 @@ class DatabaseConnectionManager:
         
         return results
     
-    def backup_to_disk(self, filepath: Optional[str] = None) -> bool:
+    def backup_to_disk(self, filepath: Optional[str] = None, background: bool = False) -> bool:
         """
         Backup the current database to a disk file.
         
+        The copy is made a batch of pages at a time, so other connections
+        can keep writing while it runs.
+        
         Args:
             filepath: Target backup file path (uses default if None)
+            background: Run the backup on a worker thread and return
+                immediately; a request made while one is still pending is
+                merged into it
             
         Returns:
-            True if backup successful, False otherwise
+            True if backup successful (or scheduled), False otherwise
         """
         if self.db_path == ":memory:" and not self._main_connection:
             self.logger.warning("Cannot backup: no in-memory database connection")
             return False
         
+        if background:
+            with self._lock:
+                if self._disk_backup_pending:
+                    return True
+                self._disk_backup_pending = True
+            threading.Thread(
+                target=self._backup_to_disk_worker,
+                args=(filepath,),
+                daemon=True,
+                name="DatabaseDiskBackup"
+            ).start()
+            return True
+        
+        return self._copy_to_disk(filepath)
+    
+    def _backup_to_disk_worker(self, filepath: Optional[str]) -> None:
+        """Background backup_to_disk()."""
+        with self._lock:
+            self._disk_backup_pending = False
+        self._copy_to_disk(filepath)
+    
+    def _copy_to_disk(self, filepath: Optional[str]) -> bool:
+        """Page-stepped online copy of the database to filepath."""
         backup_path = filepath or self.backup_path
         
         try:
@@ -288,22 +321,23 @@ class DatabaseConnectionManager:
             if backup_dir:
                 os.makedirs(backup_dir, exist_ok=True)
             
-            # Create backup connection
-            backup_conn = sqlite3.connect(backup_path)
-            
-            try:
-                # Perform backup
-                source_conn = self._main_connection or self.get_connection()
-                source_conn.backup(backup_conn)
+            with self._disk_backup_lock:
+                # Create backup connection
+                backup_conn = sqlite3.connect(backup_path)
                 
-                self.last_backup = datetime.now()
-                self._changes_since_backup = 0
-                
-                self.logger.info(f"Database backed up to: {backup_path}")
-                return True
-                
-            finally:
-                backup_conn.close()
+                try:
+                    # Perform backup
+                    source_conn = self._main_connection or self.get_connection()
+                    source_conn.backup(backup_conn, pages=BACKUP_STEP_PAGES, sleep=BACKUP_STEP_SLEEP)
+                    
+                    self.last_backup = datetime.now()
+                    self._changes_since_backup = 0
+                    
+                    self.logger.info(f"Database backed up to: {backup_path}")
+                    return True
+                    
+                finally:
+                    backup_conn.close()
                 
         except Exception as e:
             self._log_connection_error(f"Backup failed: {e}")
@@ -666,7 +700,8 @@ class DatabaseConnectionManager:
             self._backup_stop_event.set()
             self._backup_thread.join(timeout=5)
         
-        with self._lock:
+        # Let a running backup_to_disk() finish before closing its source
+        with self._disk_backup_lock, self._lock:
             # Close all thread connections
             for thread_id in list(self._connections.keys()):
                 self.close_connection(thread_id)
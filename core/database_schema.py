@@ -39,6 +39,8 @@ class DatabaseSchema:
             'core_settings': DatabaseSchema._get_core_settings_schema(),
             'tool_settings': DatabaseSchema._get_tool_settings_schema(),
             'tab_content': DatabaseSchema._get_tab_content_schema(),
+            'tab_content_refs': DatabaseSchema._get_tab_content_refs_schema(),
+            'tab_blobs': DatabaseSchema._get_tab_blobs_schema(),
             'performance_settings': DatabaseSchema._get_performance_settings_schema(),
             'font_settings': DatabaseSchema._get_font_settings_schema(),
             'dialog_settings': DatabaseSchema._get_dialog_settings_schema(),
@@ -68,6 +70,9 @@ class DatabaseSchema:
                 "CREATE INDEX IF NOT EXISTS idx_tab_content_type ON tab_content(tab_type)",
                 "CREATE INDEX IF NOT EXISTS idx_tab_content_type_index ON tab_content(tab_type, tab_index)"
             ],
+            'tab_blobs': [
+                "CREATE INDEX IF NOT EXISTS idx_tab_blobs_base ON tab_blobs(base_hash)"
+            ],
             'performance_settings': [
                 "CREATE INDEX IF NOT EXISTS idx_performance_category ON performance_settings(category)",
                 "CREATE INDEX IF NOT EXISTS idx_performance_category_key ON performance_settings(category, setting_key)"
@@ -150,6 +155,44 @@ class DatabaseSchema:
         )
         """
     
+    @staticmethod
+    def _get_tab_content_refs_schema() -> str:
+        """
+        Maps large tabs to their content blob.
+        
+        A tab with a content_hash is stored in tab_blobs and has an empty
+        tab_content row; NULL means the tab is stored inline in tab_content.
+        """
+        return """
+        CREATE TABLE IF NOT EXISTS tab_content_refs (
+            tab_type TEXT NOT NULL CHECK (tab_type IN ('input', 'output')),
+            tab_index INTEGER NOT NULL CHECK (tab_index >= 0 AND tab_index < 7),
+            content_hash TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY(tab_type, tab_index)
+        )
+        """
+    
+    @staticmethod
+    def _get_tab_blobs_schema() -> str:
+        """
+        Content-addressed, compressed tab text.
+        
+        encoding is 'zlib' (whole text) or 'delta' (changed section against
+        base_hash, see core.tab_content_store). depth is the delta chain length.
+        """
+        return """
+        CREATE TABLE IF NOT EXISTS tab_blobs (
+            hash TEXT PRIMARY KEY,
+            encoding TEXT NOT NULL CHECK (encoding IN ('zlib', 'delta')),
+            base_hash TEXT,
+            depth INTEGER NOT NULL DEFAULT 0,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    
     @staticmethod
     def _get_performance_settings_schema() -> str:
         """
@@ -319,6 +362,8 @@ class DatabaseSchema:
             'core_settings', 
             'tool_settings',
             'tab_content',
+            'tab_content_refs',
+            'tab_blobs',
             'performance_settings',
             'font_settings',
             'dialog_settings',
@@ -9,9 +9,12 @@ The DatabaseSettingsManager maintains identical API signatures to the current sy
 ensuring zero code changes are required in existing tools.
 """
 
+import copy
 import json
+import atexit
 import sqlite3
 import logging
+import weakref
 import threading
 from typing import Dict, List, Tuple, Any, Optional, Union
 from datetime import datetime
@@ -19,9 +22,37 @@ from pathlib import Path
 
 from .database_connection_manager import DatabaseConnectionManager
 from .database_schema_manager import DatabaseSchemaManager
-from .migration_manager import MigrationManager
+from .migration_manager import MigrationManager, SETTINGS_TABLE_UPSERTS, CONTENT_ADDRESSED_TABLES
 from .error_handler import get_error_handler, ErrorCategory, ErrorSeverity
-from .data_validator import DataValidator
+from .data_validator import DataValidator, ValidationSeverity
+
+
+# Seconds to coalesce setting changes before they are written to the database
+DEFAULT_WRITE_DELAY = 0.5
+
+# Depth of the settings path that maps to one table row. Changes below this
+# depth rewrite the whole row value; None means nested values are flattened
+# into their own rows. Top-level keys not listed are core_settings rows.
+_ROW_PATH_DEPTH = {
+    'tool_settings': None,
+    'performance_settings': None,
+    'font_settings': 3,
+    'dialog_settings': 3,
+}
+
+def _set_path_value(data: Dict[str, Any], path: List[str], value: Any) -> None:
+    """Set value at a key path, replacing non-dict intermediate values."""
+    for key in path[:-1]:
+        child = data.get(key)
+        if not isinstance(child, dict):
+            child = {}
+            data[key] = child
+        data = child
+    data[path[-1]] = value
+
+
+# Managers with possibly unflushed writes, flushed at interpreter exit
+_live_managers: 'weakref.WeakSet[DatabaseSettingsManager]' = weakref.WeakSet()
 
 
 class NestedSettingsProxy:
@@ -72,14 +103,8 @@ class NestedSettingsProxy:
         """Handle nested assignment like settings["tool_settings"]["Tool Name"] = {...}."""
         self._data[key] = value
         
-        # Update the full parent structure in database
-        # Get the current full structure and update it
-        current_settings = self.settings_manager._load_all_settings()
-        self._update_nested_value(current_settings, self.parent_key, self._data)
-        self.settings_manager.save_settings(current_settings)
-        
-        # Invalidate cache
-        self.settings_manager._settings_proxy._invalidate_cache()
+        # Only the assigned subtree is marked dirty and written
+        self.settings_manager._stage_changes([(self._path() + [key], value)])
     
     def __contains__(self, key: str) -> bool:
         """Handle 'key' in nested_settings checks."""
@@ -119,13 +144,8 @@ class NestedSettingsProxy:
         """Handle nested_settings.update(dict) calls."""
         self._data.update(other)
         
-        # Update the full parent structure in database
-        current_settings = self.settings_manager._load_all_settings()
-        self._update_nested_value(current_settings, self.parent_key, self._data)
-        self.settings_manager.save_settings(current_settings)
-        
-        # Invalidate cache
-        self.settings_manager._settings_proxy._invalidate_cache()
+        path = self._path()
+        self.settings_manager._stage_changes([(path + [key], value) for key, value in other.items()])
     
     def keys(self):
         """Return all available keys."""
@@ -159,24 +179,13 @@ class NestedSettingsProxy:
             result = self._data.pop(key)
         
         # Save the change to database
-        full_path = f"{self._parent_key}"
-        self._settings_manager.set_setting(full_path, self._data)
+        self.settings_manager._stage_changes([(self._path(), self._data.copy())])
         
         return result
     
-    def _update_nested_value(self, data: Dict[str, Any], path: str, value: Any) -> None:
-        """Update value in nested dictionary using dot notation."""
-        keys = path.split('.')
-        current = data
-        
-        # Navigate to the parent of the target key
-        for key in keys[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
-        
-        # Set the final value
-        current[keys[-1]] = value
+    def _path(self) -> List[str]:
+        """Settings path of this level as a list of keys."""
+        return self.parent_key.split('.')
 
 
 class SettingsDictProxy:
@@ -208,6 +217,14 @@ class SettingsDictProxy:
         """Mark cache as dirty to force refresh on next access."""
         with self._lock:
             self._cache_dirty = True
+        # The database was written behind our back; row snapshots may be stale
+        self.settings_manager._forget_written_rows()
+    
+    def _apply_change(self, path: List[str], value: Any) -> None:
+        """Apply a staged change to the cache so it stays valid without a reload."""
+        with self._lock:
+            if not self._cache_dirty:
+                _set_path_value(self._cache, path, value)
     
     def __getitem__(self, key: str) -> Any:
         """Handle self.settings["key"] access."""
@@ -232,7 +249,6 @@ class SettingsDictProxy:
     def __setitem__(self, key: str, value: Any) -> None:
         """Handle self.settings["key"] = value assignment."""
         self.settings_manager.set_setting(key, value)
-        self._invalidate_cache()
     
     def __contains__(self, key: str) -> bool:
         """Handle 'key' in self.settings checks."""
@@ -324,7 +340,8 @@ class DatabaseSettingsManager:
                  json_settings_path: str = "settings.json",
                  enable_performance_monitoring: bool = True,
                  enable_auto_backup: bool = True,
-                 backup_interval: int = 300):
+                 backup_interval: int = 300,
+                 write_delay: float = DEFAULT_WRITE_DELAY):
         """
         Initialize the database settings manager.
         
@@ -335,6 +352,9 @@ class DatabaseSettingsManager:
             enable_performance_monitoring: Whether to enable performance monitoring
             enable_auto_backup: Whether to enable automatic backups
             backup_interval: Automatic backup interval in seconds
+            write_delay: Seconds to coalesce setting changes before writing
+                them (0 writes immediately). In-memory databases are always
+                written immediately because connections are per thread.
         """
         self.db_path = db_path
         self.backup_path = backup_path or "settings_backup.db"
@@ -410,6 +430,15 @@ class DatabaseSettingsManager:
         self._lock = threading.RLock()
         self._default_settings_provider = None
         
+        # Write-behind state: rows staged by key, rows known to be in the
+        # database, and the coalescing timer that flushes staged rows
+        self.write_delay = 0.0 if db_path == ":memory:" else write_delay
+        self._pending_rows: Dict[Tuple[str, tuple], tuple] = {}
+        self._written_rows: Dict[Tuple[str, tuple], tuple] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._write_stats = {'changes': 0, 'flushes': 0, 'rows_written': 0, 'rows_unchanged': 0}
+        _live_managers.add(self)
+        
         # Initialize database schema
         self._initialize_database()
         
@@ -612,50 +641,39 @@ class DatabaseSettingsManager:
         Parse settings dictionary and update database tables.
         
         This method maintains compatibility with the existing save_settings() API
-        while internally using the database backend with error handling.
+        while internally using the database backend with error handling. Only
+        top-level settings (and individual tools) that differ from the current
+        settings are validated and written.
         
         Args:
-            settings_dict: Settings dictionary to save (if None, saves current state)
+            settings_dict: Settings dictionary to save (if None, flushes pending writes)
             
         Returns:
             True if save successful, False otherwise
         """
         try:
             if settings_dict is None:
-                # If no dict provided, this is a no-op since database is always current
-                return True
-            
-            # Validate settings data before saving
-            validation_issues = self.data_validator.validate_settings_data(settings_dict)
-            critical_issues = [i for i in validation_issues if i.severity == ErrorSeverity.CRITICAL]
-            
-            if critical_issues:
-                self.error_handler.handle_error(
-                    ErrorCategory.DATA_VALIDATION,
-                    f"Critical validation issues in settings data: {len(critical_issues)}",
-                    context={'issues': [i.message for i in critical_issues]}
-                )
-                return False
+                # The database is current apart from coalesced writes
+                return self.flush_pending_writes()
             
             # Check if in fallback mode
             if self.error_handler.is_fallback_mode():
                 return self.error_handler.save_fallback_settings(settings_dict)
             
-            with self._lock:
-                # Use migration manager to update database from dictionary
-                success = self.migration_manager._migrate_json_to_database(settings_dict)
-                
-                if not success:
-                    self.error_handler.handle_error(
-                        ErrorCategory.DATABASE_CONNECTION,
-                        "Failed to save settings to database"
-                    )
-                    
-                    # Try fallback mode
-                    if self.error_handler.is_fallback_mode():
-                        return self.error_handler.save_fallback_settings(settings_dict)
-                
-                return success
+            current = self._current_settings()
+            changes = []
+            for key, value in settings_dict.items():
+                old_value = current.get(key)
+                if key == 'tool_settings' and isinstance(value, dict) and isinstance(old_value, dict):
+                    changes.extend((['tool_settings', tool_name], tool_config)
+                                   for tool_name, tool_config in value.items()
+                                   if old_value.get(tool_name) != tool_config)
+                elif key not in current or old_value != value:
+                    changes.append(([key], value))
+            
+            if not self._stage_changes(changes):
+                return False
+            return self.flush_pending_writes()
                 
         except Exception as e:
             self.error_handler.handle_error(
@@ -670,6 +688,72 @@ class DatabaseSettingsManager:
             
             return False
     
+    def flush_pending_writes(self) -> bool:
+        """
+        Write all staged setting changes to the database now.
+        
+        Rows whose value matches what was last written are skipped; the rest
+        are upserted with one executemany per table in a single transaction.
+        
+        Returns:
+            True if the database is up to date, False if the write failed
+            (staged rows are kept and retried on the next flush)
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_rows:
+                return True
+            
+            pending = self._pending_rows
+            self._pending_rows = {}
+            changed: Dict[str, List[tuple]] = {}
+            for row_key, row in pending.items():
+                if row_key[0] in CONTENT_ADDRESSED_TABLES:
+                    changed.setdefault(row_key[0], []).append(row)
+                elif self._written_rows.get(row_key) == row:
+                    self._write_stats['rows_unchanged'] += 1
+                else:
+                    changed.setdefault(row_key[0], []).append(row)
+            if not changed:
+                return True
+            
+            try:
+                with self.connection_manager.transaction() as conn:
+                    self.migration_manager.write_settings_rows(conn, changed)
+            except Exception as e:
+                pending.update(self._pending_rows)
+                self._pending_rows = pending
+                self.error_handler.handle_error(
+                    ErrorCategory.DATABASE_CONNECTION,
+                    f"Failed to write settings changes: {e}",
+                    exception=e
+                )
+                return False
+            
+            self._written_rows.update((row_key, row) for row_key, row in pending.items()
+                                      if row_key[0] not in CONTENT_ADDRESSED_TABLES)
+            self._write_stats['flushes'] += 1
+            self._write_stats['rows_written'] += sum(len(rows) for rows in changed.values())
+        
+        # Record change for backup triggering
+        self._record_change()
+        return True
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """
+        Get write-behind persistence statistics.
+        
+        Returns:
+            Dictionary with staged changes, flushes and rows written/skipped
+        """
+        with self._lock:
+            stats = dict(self._write_stats)
+            stats['pending_rows'] = len(self._pending_rows)
+            stats['write_delay'] = self.write_delay
+        return stats
+    
     def get_tool_settings(self, tool_name: str) -> Dict[str, Any]:
         """
         Get all settings for a specific tool.
@@ -681,6 +765,7 @@ class DatabaseSettingsManager:
             Dictionary of tool settings
         """
         try:
+            self.flush_pending_writes()
             query = "SELECT setting_path, setting_value, data_type FROM tool_settings WHERE tool_name = ?"
             params = (tool_name,)
             
@@ -723,21 +808,7 @@ class DatabaseSettingsManager:
             value: Setting value
         """
         try:
-            with self.connection_manager.transaction() as conn:
-                data_type = self.migration_manager.converter.python_to_db_type(value)
-                serialized_value = self.migration_manager.converter.serialize_value(value)
-                
-                conn.execute(
-                    "INSERT OR REPLACE INTO tool_settings (tool_name, setting_path, setting_value, data_type) VALUES (?, ?, ?, ?)",
-                    (tool_name, key, serialized_value, data_type)
-                )
-            
-            # Record change for backup triggering
-            self._record_change()
-            
-            # Invalidate proxy cache
-            self._settings_proxy._invalidate_cache()
-            
+            self._stage_changes([(['tool_settings', tool_name] + key.split('.'), value)])
         except Exception as e:
             self.logger.error(f"Failed to set tool setting {tool_name}.{key}: {e}")
     
@@ -753,6 +824,8 @@ class DatabaseSettingsManager:
             Setting value or default
         """
         try:
+            self.flush_pending_writes()
+            
             # Handle nested keys
             if '.' in key:
                 settings = self._load_all_settings()
@@ -785,42 +858,15 @@ class DatabaseSettingsManager:
         """
         Set a core application setting.
         
+        The change is written behind (see flush_pending_writes); reads
+        through this manager always see it.
+        
         Args:
             key: Setting key (supports nested paths with dots)
             value: Setting value
         """
         try:
-            # Handle special keys that need to go to specific tables
-            if key in ['input_tabs', 'output_tabs', 'tool_settings', 'performance_settings', 'font_settings', 'dialog_settings']:
-                # These keys need special handling - update the full structure
-                settings = self._load_all_settings()
-                settings[key] = value
-                self.save_settings(settings)
-                return
-            
-            # Handle nested keys by updating the full structure
-            if '.' in key:
-                settings = self._load_all_settings()
-                self._set_nested_value(settings, key, value)
-                self.save_settings(settings)
-                return
-            
-            # Simple key update for core settings
-            with self.connection_manager.transaction() as conn:
-                data_type = self.migration_manager.converter.python_to_db_type(value)
-                serialized_value = self.migration_manager.converter.serialize_value(value)
-                
-                conn.execute(
-                    "INSERT OR REPLACE INTO core_settings (key, value, data_type) VALUES (?, ?, ?)",
-                    (key, serialized_value, data_type)
-                )
-            
-            # Record change for backup triggering
-            self._record_change()
-            
-            # Invalidate proxy cache
-            self._settings_proxy._invalidate_cache()
-            
+            self._stage_changes([(key.split('.'), value)])
         except Exception as e:
             self.logger.error(f"Failed to set setting {key}: {e}")
     
@@ -857,6 +903,7 @@ class DatabaseSettingsManager:
             updates: Dictionary of setting updates
         """
         try:
+            self.flush_pending_writes()
             with self.connection_manager.transaction() as conn:
                 for key, value in updates.items():
                     if key == 'tool_settings' and isinstance(value, dict):
@@ -889,6 +936,7 @@ class DatabaseSettingsManager:
         Returns:
             True if export successful, False otherwise
         """
+        self.flush_pending_writes()
         return self.migration_manager.migrate_to_json(filepath)
     
     def import_from_json(self, filepath: str) -> bool:
@@ -901,7 +949,10 @@ class DatabaseSettingsManager:
         Returns:
             True if import successful, False otherwise
         """
-        return self.migration_manager.migrate_from_json(filepath)
+        self.flush_pending_writes()
+        success = self.migration_manager.migrate_from_json(filepath)
+        self._settings_proxy._invalidate_cache()
+        return success
     
     # Backup and Recovery Methods
     
@@ -924,6 +975,8 @@ class DatabaseSettingsManager:
             
             from .backup_recovery_manager import BackupType
             
+            self.flush_pending_writes()
+            
             # Map string to enum
             backup_type_enum = {
                 "manual": BackupType.MANUAL,
@@ -977,6 +1030,8 @@ class DatabaseSettingsManager:
                 self.logger.error(f"Backup info not found for: {backup_filepath}")
                 return False
             
+            self.flush_pending_writes()
+            
             # Restore from backup
             success = self.backup_recovery_manager.restore_from_database_backup(
                 backup_info, self.connection_manager
@@ -1192,6 +1247,9 @@ class DatabaseSettingsManager:
     def close(self) -> None:
         """Close the settings manager and cleanup resources."""
         try:
+            # Write coalesced changes before connections go away
+            self.flush_pending_writes()
+            
             # Stop automatic backup
             if self.backup_recovery_manager:
                 self.backup_recovery_manager.stop_auto_backup()
@@ -1224,6 +1282,7 @@ class DatabaseSettingsManager:
     def _load_all_settings(self) -> Dict[str, Any]:
         """Load complete settings structure from database."""
         try:
+            self.flush_pending_writes()
             return self.migration_manager._migrate_database_to_json() or {}
         except Exception as e:
             self.logger.error(f"Failed to load all settings: {e}")
@@ -1257,6 +1316,92 @@ class DatabaseSettingsManager:
                 (tool_name, 'value', serialized_value, data_type)
             )
     
+    def _current_settings(self) -> Dict[str, Any]:
+        """Current settings, from the proxy cache when it is valid."""
+        proxy = self._settings_proxy
+        with proxy._lock:
+            if not proxy._cache_dirty:
+                return proxy._cache
+        return self._load_all_settings()
+    
+    def _row_aligned_change(self, path: List[str], value: Any) -> Tuple[List[str], Any]:
+        """
+        Widen a change to the settings path that maps to whole table rows.
+        
+        For example, setting "font_settings.text_font.size" is already a row,
+        but "pattern_library.0" is part of the single core_settings row
+        "pattern_library", so the change becomes the updated full value.
+        """
+        depth = _ROW_PATH_DEPTH.get(path[0], 1)
+        if depth is None or len(path) <= depth:
+            return path, value
+        row_value = self._current_settings()
+        for key in path[:depth]:
+            row_value = row_value.get(key) if isinstance(row_value, dict) else None
+        row_value = copy.deepcopy(row_value) if isinstance(row_value, dict) else {}
+        _set_path_value(row_value, path[depth:], value)
+        return path[:depth], row_value
+    
+    def _stage_changes(self, changes: List[Tuple[List[str], Any]]) -> bool:
+        """
+        Validate changed settings subtrees and queue their rows for writing.
+        
+        Only the changed subtrees are validated and converted to rows. Rows
+        are keyed by their primary key, so repeated changes to the same
+        setting before a flush are coalesced into one write.
+        
+        Args:
+            changes: (path, value) pairs, path being a list of keys from the top level
+            
+        Returns:
+            True if the changes were staged, False if validation rejected them
+        """
+        if not changes:
+            return True
+        
+        subtrees: Dict[str, Any] = {}
+        for path, value in changes:
+            row_path, row_value = self._row_aligned_change(path, value)
+            _set_path_value(subtrees, row_path, row_value)
+        
+        validation_issues = self.data_validator.validate_settings_changes(subtrees)
+        critical_issues = [i for i in validation_issues if i.severity == ValidationSeverity.CRITICAL]
+        if critical_issues:
+            self.error_handler.handle_error(
+                ErrorCategory.DATA_VALIDATION,
+                f"Critical validation issues in settings data: {len(critical_issues)}",
+                context={'issues': [i.message for i in critical_issues]}
+            )
+            return False
+        
+        rows = self.migration_manager.settings_to_rows(subtrees)
+        with self._lock:
+            for table, table_rows in rows.items():
+                key_columns = SETTINGS_TABLE_UPSERTS[table][1]
+                for row in table_rows:
+                    self._pending_rows[(table, row[:key_columns])] = row
+            self._write_stats['changes'] += len(changes)
+            self._schedule_flush()
+        
+        for path, value in changes:
+            self._settings_proxy._apply_change(path, value)
+        return True
+    
+    def _schedule_flush(self) -> None:
+        """Flush now, or start the coalescing timer if it is not running."""
+        if self.write_delay <= 0:
+            self.flush_pending_writes()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.write_delay, self.flush_pending_writes)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _forget_written_rows(self) -> None:
+        """Drop row snapshots after the database was changed directly."""
+        with self._lock:
+            self._written_rows.clear()
+        self.migration_manager.tab_store.reset()
+    
     def _get_nested_value(self, data: Dict[str, Any], path: str, default: Any = None) -> Any:
         """Get value from nested dictionary using dot notation."""
         keys = path.split('.')
@@ -1287,6 +1432,7 @@ class DatabaseSettingsManager:
     def _delete_setting(self, key: str) -> None:
         """Delete a setting from the database."""
         try:
+            self.flush_pending_writes()
             with self.connection_manager.transaction() as conn:
                 conn.execute("DELETE FROM core_settings WHERE key = ?", (key,))
             
@@ -1352,8 +1498,10 @@ class DatabaseSettingsManager:
                 self.logger.warning(f"Failed to get monitor stats: {e}")
                 stats['monitor'] = {}
         
+        stats['write_behind'] = self.get_write_stats()
+        
         # Backup manager stats
-        if self.backup_manager:
+        if getattr(self, 'backup_manager', None):
             try:
                 stats['backup'] = self.backup_manager.get_backup_info()
             except Exception as e:
@@ -1524,6 +1672,18 @@ class DatabaseSettingsManager:
             self.logger.error(f"Failed to clear performance data: {e}")
 
 
+def _flush_live_managers() -> None:
+    """Flush coalesced setting writes of every manager at interpreter exit."""
+    for manager in list(_live_managers):
+        try:
+            manager.flush_pending_writes()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_live_managers)
+
+
 # Convenience function for creating settings manager instance
 def create_settings_manager(db_path: str = ":memory:", 
                           backup_path: Optional[str] = None,
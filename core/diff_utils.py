@@ -5,14 +5,16 @@ Reusable diff generation functions for Find & Replace preview,
 MCP tools, and other components that need text comparison.
 
 This module is UI-independent and can be used by both tkinter widgets
-and CLI/MCP tools.
+and CLI/MCP tools. Line diffs use core.diff_engine (patience diff), which
+stays near-linear on inputs where difflib.SequenceMatcher is quadratic.
 """
 
-import difflib
 import re
 from typing import List, Tuple, Optional, NamedTuple
 from dataclasses import dataclass
 
+from core.diff_engine import LineMatcher, similarity_ratio, unified_diff
+
 
 @dataclass
 class DiffResult:
@@ -65,7 +67,7 @@ def generate_unified_diff(
     if modified_lines and not modified_lines[-1].endswith('\n'):
         modified_lines[-1] += '\n'
     
-    diff = difflib.unified_diff(
+    diff = unified_diff(
         original_lines,
         modified_lines,
         fromfile=original_label,
@@ -173,8 +175,7 @@ def compute_similarity_score(original: str, modified: str) -> float:
     if not original or not modified:
         return 0.0
     
-    matcher = difflib.SequenceMatcher(None, original, modified, autojunk=False)
-    return matcher.ratio() * 100
+    return similarity_ratio(original, modified) * 100
 
 
 def generate_compact_diff(
@@ -197,7 +198,7 @@ def generate_compact_diff(
     original_lines = original.splitlines()
     modified_lines = modified.splitlines()
     
-    matcher = difflib.SequenceMatcher(None, original_lines, modified_lines, autojunk=False)
+    matcher = LineMatcher(original_lines, modified_lines)
     
     output_lines = []
     line_count = 0
@@ -9,6 +9,7 @@ Submodules:
 - schema: Data classes for MCP types (Tool, Resource, Message)
 - protocol: JSON-RPC 2.0 message handling
 - tool_registry: Maps Pomera tools to MCP tool definitions
+- tool_manifest: Precomputed tool metadata and the lazy registry
 - server_stdio: stdio transport for MCP server
 - resource_provider: Exposes tab contents as MCP resources
 """
@@ -23,7 +24,14 @@ from .schema import (
 
 from .protocol import MCPProtocol
 
-from .tool_registry import ToolRegistry, MCPToolAdapter
+
+def __getattr__(name):
+    # The tool registry is a large module; import it only when asked for so
+    # the stdio server can answer initialize/tools/list from the manifest.
+    if name in ("ToolRegistry", "MCPToolAdapter"):
+        from . import tool_registry
+        return getattr(tool_registry, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     # Schema
@@ -9,11 +9,14 @@ This module provides:
 - save_file_content(): Save file with UTF-8 encoding
 - process_file_args(): Process multiple file input fields
 - handle_file_output(): Optionally save result to file
+- stream_file_output(): Transform a file into output_to_file in bounded memory
 """
 
 import os
 import logging
-from typing import Tuple, Dict, Any, Optional
+import tempfile
+from itertools import chain
+from typing import Tuple, Dict, Any, Optional, Callable, Iterable, Iterator, List
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,14 @@ ENCODING_CHAIN = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
 MAX_FILE_SIZE_BYTES = 25 * 1024 * 1024  # 25 MB
 MAX_FILE_SIZE_MB = 25
 
+# Streaming mode: characters decoded per read and lines buffered per write
+STREAM_CHUNK_CHARS = 1024 * 1024
+STREAM_WRITE_BATCH_LINES = 4096
+
+# Characters str.splitlines() treats as line boundaries. \r is absent because
+# files are read with universal newlines, which already maps \r and \r\n to \n.
+_LINE_BREAKS = frozenset('\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
+
 # Binary/compressed file extensions that should be rejected
 BINARY_EXTENSIONS = {
     # Archives
@@ -89,6 +100,37 @@ def _is_binary_file(file_path: str) -> Tuple[bool, str]:
     return False, ""
 
 
+def _validate_input_file(file_path: str, max_size_mb: Optional[float] = MAX_FILE_SIZE_MB) -> Optional[str]:
+    """
+    Check that a file exists, is readable, is text and (optionally) small enough.
+    
+    Returns:
+        Error message, or None if the file can be loaded
+    """
+    normalized_path = os.path.normpath(file_path)
+    
+    if not os.path.isfile(normalized_path):
+        return f"File not found: {file_path}"
+    
+    if not os.access(normalized_path, os.R_OK):
+        return f"File is not readable: {file_path}"
+    
+    # Check file size
+    if max_size_mb is not None:
+        file_size = os.path.getsize(normalized_path)
+        max_bytes = max_size_mb * 1024 * 1024
+        if file_size > max_bytes:
+            size_mb = file_size / (1024 * 1024)
+            return f"File too large: {size_mb:.1f}MB (maximum: {max_size_mb}MB). Please use a smaller file."
+    
+    # Check for binary/compressed files
+    is_binary, reason = _is_binary_file(normalized_path)
+    if is_binary:
+        return f"Cannot process binary file: {reason}. This tool only accepts text files."
+    
+    return None
+
+
 def load_file_content(file_path: str, max_size_mb: float = MAX_FILE_SIZE_MB) -> Tuple[bool, str]:
     """
     Load content from a file path with encoding fallback.
@@ -119,23 +161,9 @@ def load_file_content(file_path: str, max_size_mb: float = MAX_FILE_SIZE_MB) ->
     try:
         normalized_path = os.path.normpath(file_path)
         
-        if not os.path.isfile(normalized_path):
-            return False, f"File not found: {file_path}"
-        
-        if not os.access(normalized_path, os.R_OK):
-            return False, f"File is not readable: {file_path}"
-        
-        # Check file size
-        file_size = os.path.getsize(normalized_path)
-        max_bytes = max_size_mb * 1024 * 1024
-        if file_size > max_bytes:
-            size_mb = file_size / (1024 * 1024)
-            return False, f"File too large: {size_mb:.1f}MB (maximum: {max_size_mb}MB). Please use a smaller file."
-        
-        # Check for binary/compressed files
-        is_binary, reason = _is_binary_file(normalized_path)
-        if is_binary:
-            return False, f"Cannot process binary file: {reason}. This tool only accepts text files."
+        error = _validate_input_file(file_path, max_size_mb)
+        if error:
+            return False, error
         
         # Try encoding chain
         last_error = None
@@ -284,13 +312,222 @@ def handle_file_output(
     
     if success:
         # Provide preview of saved content
-        preview_length = 500
-        if len(result) > preview_length:
-            preview = f"{result[:preview_length]}...\n\n(truncated, {len(result)} total characters)"
-        else:
-            preview = result
-        
-        return f"{message}\n\n--- Content Preview ---\n{preview}"
+        return _format_saved_output(message, result, len(result))
     else:
         # Return error but still include original result
         return f"⚠️ {message}\n\n--- Original Result ---\n{result}"
+
+
+def _format_saved_output(message: str, preview: str, total_chars: int, preview_length: int = 500) -> str:
+    """Confirmation message with content preview, as returned by handle_file_output."""
+    if total_chars > preview_length:
+        preview = f"{preview[:preview_length]}...\n\n(truncated, {total_chars} total characters)"
+    return f"{message}\n\n--- Content Preview ---\n{preview}"
+
+
+# =============================================================================
+# Streaming file mode
+# =============================================================================
+
+def should_stream(
+    args: Dict[str, Any],
+    input_field: str = "text",
+    is_file_flag: str = "text_is_file",
+    output_file_field: str = "output_to_file"
+) -> bool:
+    """
+    Decide whether a call should use streaming file mode.
+    
+    Streaming needs a file on both ends. It is used when the caller sets
+    stream=true, or automatically when the input file is larger than the
+    in-memory limit (which would otherwise be rejected).
+    """
+    if not (args.get(is_file_flag) and args.get(input_field) and args.get(output_file_field)):
+        return False
+    if args.get("stream", False):
+        return True
+    try:
+        return os.path.getsize(os.path.normpath(args[input_field])) > MAX_FILE_SIZE_BYTES
+    except (OSError, TypeError):
+        return False
+
+
+def iter_file_chunks(file_path: str, encoding: str, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Yield decoded text chunks from a file.
+    
+    Uses universal newlines like load_file_content, so concatenating the
+    chunks gives exactly the string load_file_content would return.
+    """
+    with open(os.path.normpath(file_path), 'r', encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_line_blocks(chunks: Iterable[str]) -> Iterator[List[str]]:
+    """
+    Split a stream of text chunks into blocks of lines.
+    
+    Lines are returned without terminators and follow str.splitlines()
+    semantics, so flattening the blocks equals text.splitlines() on the
+    whole text, regardless of where chunk boundaries fall.
+    """
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(True)
+        if lines and lines[-1][-1] not in _LINE_BREAKS:
+            pending = lines.pop()
+        else:
+            pending = ''
+        if lines:
+            yield [line[:-1] for line in lines]
+    if pending:
+        yield [pending]
+
+
+class _StreamingFileWriter:
+    """
+    Incremental writer that replaces the target file only on success.
+    
+    Output goes to a temporary file next to the target and is moved into
+    place by commit(), so a failed or retried stream never leaves a
+    half-written result (and input and output may be the same file).
+    """
+    
+    def __init__(self, file_path: str, preview_length: int = 500):
+        self.file_path = os.path.normpath(file_path)
+        self.preview_length = preview_length
+        parent_dir = os.path.dirname(self.file_path)
+        if parent_dir and not os.path.exists(parent_dir):
+            os.makedirs(parent_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.file_path)}.", suffix=".tmp", dir=parent_dir or None
+        )
+        self._file = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+        self.chars_written = 0
+        self.preview = ''
+    
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        if len(self.preview) <= self.preview_length:
+            self.preview += text[:self.preview_length + 1 - len(self.preview)]
+        self._file.write(text)
+        self.chars_written += len(text)
+    
+    def reset(self) -> None:
+        """Discard everything written so far."""
+        self._file.seek(0)
+        self._file.truncate()
+        self.chars_written = 0
+        self.preview = ''
+    
+    def commit(self) -> None:
+        self._file.close()
+        os.replace(self._tmp_path, self.file_path)
+    
+    def discard(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+def _write_lines(writer: _StreamingFileWriter, lines: Iterable[str], separator: str) -> int:
+    """Write lines joined by separator in batches. Returns the line count."""
+    count = 0
+    batch: List[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= STREAM_WRITE_BATCH_LINES:
+            writer.write((separator if count else '') + separator.join(batch))
+            count += len(batch)
+            batch = []
+    if batch:
+        writer.write((separator if count else '') + separator.join(batch))
+        count += len(batch)
+    return count
+
+
+def stream_file_output(
+    args: Dict[str, Any],
+    line_transform: Optional[Callable[[Iterator[str]], Iterable[str]]] = None,
+    chunk_transform: Optional[Callable[[str], str]] = None,
+    separator: str = '\n',
+    input_field: str = "text",
+    output_file_field: str = "output_to_file"
+) -> str:
+    """
+    Transform the input file into the output file without loading either.
+    
+    Exactly one transform must be given:
+    - line_transform receives an iterator over the input lines (as
+      text.splitlines() would produce them) and yields output lines,
+      which are joined with separator. This matches tools built on
+      '\\n'.join(...splitlines()).
+    - chunk_transform is applied to each decoded chunk independently,
+      for operations that are pure character substitutions.
+    
+    The input encoding follows ENCODING_CHAIN; if a later chunk fails to
+    decode, the output is discarded and the next encoding is tried, just
+    like load_file_content. The size limit does not apply.
+    
+    Returns:
+        Same confirmation-with-preview message as handle_file_output, or
+        an error message
+    """
+    if (line_transform is None) == (chunk_transform is None):
+        raise ValueError("Provide exactly one of line_transform or chunk_transform")
+    
+    input_path = args.get(input_field, "")
+    output_path = args.get(output_file_field, "")
+    error = _validate_input_file(input_path, max_size_mb=None)
+    if error:
+        return f"Error loading '{input_field}' from file: {error}"
+    
+    try:
+        writer = _StreamingFileWriter(output_path)
+    except PermissionError:
+        return f"⚠️ Permission denied writing to: {output_path}"
+    except OSError as e:
+        return f"⚠️ OS error saving to file {output_path}: {str(e)}"
+    
+    try:
+        last_error = None
+        for encoding in ENCODING_CHAIN:
+            try:
+                chunks = iter_file_chunks(input_path, encoding)
+                if line_transform is not None:
+                    lines = chain.from_iterable(iter_line_blocks(chunks))
+                    line_count = _write_lines(writer, line_transform(lines), separator)
+                else:
+                    for chunk in chunks:
+                        writer.write(chunk_transform(chunk))
+                    line_count = None
+                break
+            except UnicodeDecodeError as e:
+                last_error = e
+                writer.reset()
+        else:
+            writer.discard()
+            return (f"Error loading '{input_field}' from file: Failed to decode file with any encoding "
+                    f"({ENCODING_CHAIN}): {input_path}. Last error: {last_error}")
+        writer.commit()
+    except PermissionError:
+        writer.discard()
+        return f"⚠️ Permission denied writing to: {output_path}"
+    except OSError as e:
+        writer.discard()
+        return f"⚠️ OS error streaming {input_path} to {output_path}: {str(e)}"
+    except Exception:
+        writer.discard()
+        raise
+    
+    logger.debug(f"Streamed {input_path} -> {output_path} ({encoding}, {writer.chars_written} chars)")
+    message = f"Content saved to: {output_path}"
+    if line_count is not None:
+        message += f" (streamed {line_count} lines)"
+    return _format_saved_output(message, writer.preview, writer.chars_written)
@@ -9,24 +9,29 @@ Operations:
 - preview: Show unified diff of proposed changes
 - execute: Perform replacement with automatic backup to Notes
 - recall: Retrieve previous operation state for rollback
+
+With a RollbackStore (core.mcp.rollback_store), execute saves a compact
+FindReplaceRecord in Notes and keeps the texts as content-addressed blobs;
+recall rebuilds them on demand. Older notes with full texts are still read.
 """
 
 import re
 import json
 import logging
+from bisect import bisect_right
 from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
-# Import diff utilities
-try:
-    from core.diff_utils import generate_find_replace_preview, generate_compact_diff, FindReplacePreview
-    DIFF_UTILS_AVAILABLE = True
-except ImportError:
-    DIFF_UTILS_AVAILABLE = False
+from core.diff_engine import LineMatcher
 
 logger = logging.getLogger(__name__)
 
+# Line boundaries of str.splitlines(), with "\r\n" as one boundary
+_LINE_BREAK = re.compile('\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+_OTHER_LINE_BREAKS = re.compile('[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+_LINE_BREAK_CHARS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+
 
 @dataclass
 class FindReplaceOperation:
@@ -48,6 +53,230 @@ class FindReplaceOperation:
         return cls(**data)
 
 
+@dataclass
+class FindReplaceRecord:
+    """Compact rollback record for Notes; the texts are kept in a RollbackStore."""
+    find_pattern: str
+    replace_pattern: str
+    flags: List[str]
+    match_count: int
+    timestamp: str
+    original_hash: str
+    original_size: int
+    modified_hash: str
+    modified_size: int
+    format: str = "find_replace_rollback/2"
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, json_str: str) -> 'FindReplaceRecord':
+        data = json.loads(json_str)
+        return cls(**data)
+
+
+class LineIndex:
+    """
+    Offsets of the line starts in a text, built once so that any offset can
+    be mapped to its line with a binary search instead of rescanning the
+    prefix for every match. Lines break where str.splitlines() breaks them,
+    so CR-only and CRLF text are numbered like the baseline diff numbers them.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        starts = [0]
+        # Offsets of the line breaks; None when every break is a lone "\n"
+        self._ends: Optional[List[int]] = None
+        if _OTHER_LINE_BREAKS.search(text) is None:
+            find = text.find
+            pos = find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find('\n', pos + 1)
+        else:
+            ends = self._ends = []
+            for match in _LINE_BREAK.finditer(text):
+                ends.append(match.start())
+                starts.append(match.end())
+        self.starts = starts
+
+    def line_of(self, offset: int, lo: int = 0) -> int:
+        """0-based line containing offset; lo is a line known not to come after it."""
+        return bisect_right(self.starts, offset, lo + 1) - 1
+
+    def line_end(self, line: int) -> int:
+        """Offset just past the last character of a line, excluding its line break."""
+        if line + 1 < len(self.starts):
+            return self.starts[line + 1] - 1 if self._ends is None else self._ends[line]
+        return len(self.text)
+
+
+def count_line_breaks(text: str, start: int = 0, end: Optional[int] = None) -> int:
+    """Line breaks in text[start:end], counted like str.splitlines() splits."""
+    end = len(text) if end is None else end
+    if _OTHER_LINE_BREAKS.search(text, start, end) is None:
+        return text.count('\n', start, end)
+    return len(_LINE_BREAK.findall(text, start, end))
+
+
+def _split_lines(text: str, start: int, end: int) -> List[str]:
+    """
+    Lines of text[start:end], a run of whole lines without its final line
+    break, split like str.splitlines(). An empty last line counts unless it
+    is the non-line after a line break at the very end of the text.
+
+    In modified text a replacement can join a "\r" and a "\n" across the
+    run's edges into one "\r\n" break; the joined character belongs to
+    the break, not to the run.
+    """
+    if start > 0 and text.startswith('\n', start) and text[start - 1] == '\r':
+        start += 1
+    if end > start and text.startswith('\n', end) and text[end - 1] == '\r':
+        end -= 1
+    if start > end:
+        return []
+    segment = text[start:end]
+    lines = segment.splitlines()
+    if end < len(text) and (not segment or segment[-1] in _LINE_BREAK_CHARS):
+        lines.append('')
+    return lines
+
+
+@dataclass
+class ReplaceResult:
+    """Everything one find/replace pass produces."""
+    modified_text: str
+    match_count: int
+    lines_affected: int
+    diff: str
+    # (start, end, replacement) of every match, in order
+    edits: List[Tuple[int, int, str]] = field(default_factory=list)
+
+
+def replace_all(pattern: re.Pattern, replace_pattern: str, text: str, max_diff_lines: int = 50) -> ReplaceResult:
+    """
+    Replace every match of pattern in a single scan of the text.
+
+    The substitution callback records each match span, and the line index maps
+    those spans to lines, so the affected line count and the compact diff come
+    from the matches themselves rather than from re-diffing the whole text.
+    A match counts toward the line it starts on. Diff lines use the same
+    "-N: old" / "+N: new" format as core.diff_utils.generate_compact_diff.
+
+    Args:
+        pattern: Compiled find pattern
+        replace_pattern: Replacement template (group references allowed)
+        text: Input text
+        max_diff_lines: Maximum diff lines to render; 0 skips the diff
+
+    Returns:
+        ReplaceResult for the whole text
+    """
+    spans = []
+    literal = '\\' not in replace_pattern
+
+    def substitute(match):
+        replacement = replace_pattern if literal else match.expand(replace_pattern)
+        spans.append((match.start(), match.end(), replacement))
+        return replacement
+
+    modified_text = pattern.sub(substitute, text)
+    if not spans:
+        return ReplaceResult(text, 0, 0, "No matches found.")
+
+    index = LineIndex(text)
+    diff = _DiffBuilder(index, modified_text, max_diff_lines)
+    lines_affected = 0
+    last_line = -1
+    char_delta = 0
+    for start, end, replacement in spans:
+        line = index.line_of(start, max(last_line, 0))
+        if line != last_line:
+            lines_affected += 1
+            last_line = line
+        if diff.open:
+            last = index.line_of(end, line)
+            if end > index.line_end(last):
+                # Ends inside a "\r\n" line break, so the next line changes too
+                last += 1
+            diff.add(line, last, char_delta)
+        char_delta += len(replacement) - (end - start)
+    diff.flush(char_delta)
+
+    return ReplaceResult(modified_text, len(spans), lines_affected, diff.render(), spans)
+
+
+class _DiffBuilder:
+    """
+    Groups match spans into hunks of adjacent lines and line-diffs each hunk
+    on its own. Hunks are capped at HUNK_MAX_LINES lines, so a match on every
+    line never turns into one diff over the whole text.
+    """
+
+    HUNK_MAX_LINES = 500
+
+    def __init__(self, index: LineIndex, modified_text: str, max_lines: int):
+        self.index = index
+        self.modified_text = modified_text
+        self.max_lines = max_lines
+        self.lines = []
+        self.truncated = False
+        self.open = max_lines > 0
+        self.group = None
+        # Line number of an offset in the modified text, counted forward
+        # from the previous hunk
+        self._new_offset = 0
+        self._new_line = 0
+
+    def add(self, first: int, last: int, char_delta: int):
+        """Add a match covering original lines first..last (0-based)."""
+        group = self.group
+        if group is not None:
+            if first <= group[1] or (first == group[1] + 1 and last - group[0] < self.HUNK_MAX_LINES):
+                group[1] = max(group[1], last)
+                return
+            self._emit(group, char_delta)
+        self.group = [first, last, char_delta] if self.open else None
+
+    def flush(self, char_delta: int):
+        if self.group is not None:
+            self._emit(self.group, char_delta)
+        self.group = None
+
+    def render(self) -> str:
+        if not self.lines:
+            return "No differences found."
+        if self.truncated:
+            self.lines.append(f"... ({self.max_lines}+ changes, truncated)")
+        return '\n'.join(self.lines)
+
+    def _emit(self, group: list, end_delta: int):
+        first, last, start_delta = group
+        index = self.index
+        start, end = index.starts[first], index.line_end(last)
+        new_start = start + start_delta
+        old = _split_lines(index.text, start, end)
+        new = _split_lines(self.modified_text, new_start, end + end_delta)
+        self._new_line += count_line_breaks(self.modified_text, self._new_offset, new_start)
+        self._new_offset = new_start
+        new_first = self._new_line
+
+        for tag, i1, i2, j1, j2 in LineMatcher(old, new).get_opcodes():
+            if tag == 'equal':
+                continue
+            rows = [f"-{first + i + 1}: {old[i]}" for i in range(i1, i2)]
+            rows += [f"+{new_first + j + 1}: {new[j]}" for j in range(j1, j2)]
+            room = self.max_lines - len(self.lines)
+            if len(rows) > room:
+                self.lines.extend(rows[:room])
+                self.truncated = True
+                self.open = False
+                return
+            self.lines.extend(rows)
+
+
 def validate_regex(pattern: str, flags: List[str] = None) -> Dict[str, Any]:
     """
     Validate a regex pattern.
@@ -132,9 +361,10 @@ def preview_replace(
     
     try:
         pattern = re.compile(find_pattern, re_flags)
-        matches = list(pattern.finditer(text))
+        # Replace, count lines and build the compact diff (token-efficient) in one pass
+        replaced = replace_all(pattern, replace_pattern, text, max_diff_lines)
         
-        if not matches:
+        if not replaced.match_count:
             return {
                 "success": True,
                 "match_count": 0,
@@ -142,20 +372,11 @@ def preview_replace(
                 "lines_affected": 0
             }
         
-        # Perform replacement
-        modified_text = pattern.sub(replace_pattern, text)
-        
-        # Generate compact diff (token-efficient)
-        diff = generate_compact_diff(text, modified_text, max_lines=max_diff_lines) if DIFF_UTILS_AVAILABLE else _basic_diff(text, modified_text)
-        
-        # Count affected lines
-        lines_affected = len(set(text[:m.start()].count('\n') + 1 for m in matches))
-        
         return {
             "success": True,
-            "match_count": len(matches),
-            "lines_affected": lines_affected,
-            "diff": diff
+            "match_count": replaced.match_count,
+            "lines_affected": replaced.lines_affected,
+            "diff": replaced.diff
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -167,7 +388,8 @@ def execute_replace(
     replace_pattern: str,
     flags: List[str] = None,
     save_to_notes: bool = True,
-    notes_handler = None
+    notes_handler = None,
+    rollback_store = None
 ) -> Dict[str, Any]:
     """
     Execute find/replace with optional backup to Notes.
@@ -179,6 +401,8 @@ def execute_replace(
         flags: Optional regex flags
         save_to_notes: Whether to save operation to Notes for rollback
         notes_handler: Function to save to notes (called as notes_handler(title, input_content, output_content))
+        rollback_store: Optional RollbackStore; when given, the note holds a compact
+            FindReplaceRecord instead of both full texts
         
     Returns:
         Dict with execution result including note_id if saved
@@ -198,9 +422,9 @@ def execute_replace(
     
     try:
         pattern = re.compile(find_pattern, re_flags)
-        matches = list(pattern.finditer(text))
+        replaced = replace_all(pattern, replace_pattern, text, max_diff_lines=0)
         
-        if not matches:
+        if not replaced.match_count:
             return {
                 "success": True,
                 "replacements": 0,
@@ -208,16 +432,11 @@ def execute_replace(
                 "note_id": None
             }
         
-        # Perform replacement
-        modified_text = pattern.sub(replace_pattern, text)
-        
-        # Count affected lines
-        lines_affected = len(set(text[:m.start()].count('\n') + 1 for m in matches))
-        
+        modified_text = replaced.modified_text
         result = {
             "success": True,
-            "replacements": len(matches),
-            "lines_affected": lines_affected,
+            "replacements": replaced.match_count,
+            "lines_affected": replaced.lines_affected,
             "modified_text": modified_text,
             "note_id": None
         }
@@ -228,22 +447,41 @@ def execute_replace(
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 title = f"FindReplace/{timestamp}"
                 
-                # Create operation record
-                operation = FindReplaceOperation(
-                    find_pattern=find_pattern,
-                    replace_pattern=replace_pattern,
-                    flags=flags or [],
-                    original_text=text,
-                    modified_text=modified_text,
-                    match_count=len(matches),
-                    timestamp=timestamp
-                )
+                if rollback_store is not None:
+                    # Texts go to the store once; the note only references them
+                    original_hash, modified_hash = rollback_store.save(text, replaced.edits, modified_text)
+                    operation = FindReplaceRecord(
+                        find_pattern=find_pattern,
+                        replace_pattern=replace_pattern,
+                        flags=flags or [],
+                        match_count=replaced.match_count,
+                        timestamp=timestamp,
+                        original_hash=original_hash,
+                        original_size=len(text),
+                        modified_hash=modified_hash,
+                        modified_size=len(modified_text)
+                    )
+                    input_content = (f"Find: {find_pattern}\nReplace: {replace_pattern}\n"
+                                     f"Original: {len(text)} chars, sha256 {original_hash[:12]}")
+                else:
+                    operation = FindReplaceOperation(
+                        find_pattern=find_pattern,
+                        replace_pattern=replace_pattern,
+                        flags=flags or [],
+                        original_text=text,
+                        modified_text=modified_text,
+                        match_count=replaced.match_count,
+                        timestamp=timestamp
+                    )
+                    input_content = text
                 
                 note_id = notes_handler(
                     title=title,
-                    input_content=text,
+                    input_content=input_content,
                     output_content=operation.to_json()
                 )
+                if rollback_store is not None and note_id is not None and note_id > 0:
+                    rollback_store.attach(note_id, (original_hash, modified_hash))
                 result["note_id"] = note_id
                 result["note_title"] = title
             except Exception as e:
@@ -255,13 +493,16 @@ def execute_replace(
         return {"success": False, "error": str(e)}
 
 
-def recall_operation(note_id: int, notes_getter = None) -> Dict[str, Any]:
+def recall_operation(note_id: int, notes_getter = None, rollback_store = None,
+                     texts: str = "both") -> Dict[str, Any]:
     """
     Recall a previous find/replace operation from Notes.
     
     Args:
         note_id: ID of the note to recall
         notes_getter: Function to get note by ID (returns dict with 'output_content')
+        rollback_store: RollbackStore holding the texts of compact records
+        texts: Which texts to return: "both", "original", "modified" or "none"
         
     Returns:
         Dict with recalled operation details
@@ -275,20 +516,35 @@ def recall_operation(note_id: int, notes_getter = None) -> Dict[str, Any]:
             return {"success": False, "error": f"Note {note_id} not found"}
         
         # Parse the operation from output_content
-        operation = FindReplaceOperation.from_json(note.get('output_content', '{}'))
+        data = json.loads(note.get('output_content', '{}'))
+        if "original_hash" in data:
+            operation = FindReplaceRecord(**data)
+        else:
+            operation = FindReplaceOperation(**data)
         
-        return {
+        result = {
             "success": True,
             "note_id": note_id,
             "title": note.get('title', ''),
             "find_pattern": operation.find_pattern,
             "replace_pattern": operation.replace_pattern,
             "flags": operation.flags,
-            "original_text": operation.original_text,
-            "modified_text": operation.modified_text,
             "match_count": operation.match_count,
             "timestamp": operation.timestamp
         }
+        for name in ("original", "modified"):
+            if texts not in ("both", name):
+                continue
+            if isinstance(operation, FindReplaceOperation):
+                result[f"{name}_text"] = getattr(operation, f"{name}_text")
+                continue
+            if rollback_store is None:
+                return {"success": False, "error": "Rollback store not available"}
+            text = rollback_store.load(getattr(operation, f"{name}_hash"))
+            if text is None:
+                return {"success": False, "error": f"The {name} text of note {note_id} is no longer stored"}
+            result[f"{name}_text"] = text
+        return result
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -311,24 +567,3 @@ def _get_regex_suggestion(error_msg: str) -> str:
     
     return "Check regex syntax - see Python re module documentation"
 
-
-def _basic_diff(original: str, modified: str) -> str:
-    """Basic diff when diff_utils not available."""
-    orig_lines = original.splitlines()
-    mod_lines = modified.splitlines()
-    
-    output = []
-    for i, (o, m) in enumerate(zip(orig_lines, mod_lines)):
-        if o != m:
-            output.append(f"-{i+1}: {o}")
-            output.append(f"+{i+1}: {m}")
-    
-    # Handle length differences
-    if len(mod_lines) > len(orig_lines):
-        for i in range(len(orig_lines), len(mod_lines)):
-            output.append(f"+{i+1}: {mod_lines[i]}")
-    elif len(orig_lines) > len(mod_lines):
-        for i in range(len(mod_lines), len(orig_lines)):
-            output.append(f"-{i+1}: {orig_lines[i]}")
-    
-    return '\n'.join(output) if output else "No differences"
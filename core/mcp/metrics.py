@@ -2,8 +2,15 @@
 MCP Performance Metrics Collector
 
 Lightweight, thread-safe, in-memory metrics for MCP tool execution.
-Collects per-tool latency, call counts, error rates, and payload sizes.
-Exposed via pomera_diagnose for AI agent troubleshooting.
+Collects per-tool latency, call counts, error rates, and payload sizes,
+plus per-stage timings (JSON parse, argument validation, handler,
+serialization, stdout write) for tools/call requests.
+Exposed via pomera_diagnose for AI agent troubleshooting, and exportable
+as Prometheus text or JSON lines to a local file.
+
+Latencies are kept in fixed-bucket log-linear histograms (HDR-style):
+constant memory per series, O(1) recording, and percentiles over the
+whole session instead of a short window of recent samples.
 
 Usage:
     from core.mcp.metrics import mcp_metrics
@@ -11,20 +18,164 @@ Usage:
     # Record a tool call
     mcp_metrics.record(tool_name, elapsed_ms, payload_bytes, success=True)
     
+    # Record per-stage timings for a call
+    mcp_metrics.record_stages(tool_name, {"parse": 0.1, "handler": 12.5})
+    
     # Get stats for diagnose
     stats = mcp_metrics.get_stats()
+    
+    # Export
+    mcp_metrics.write_export("/tmp/pomera_mcp.prom")
 """
 
+import os
+import json
+import math
 import time
 import threading
 import logging
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+# Stages of a tools/call request, in processing order
+STAGES = ("parse", "queue", "validate", "handler", "serialize", "write")
+
+# Cumulative "le" boundaries (ms) used for Prometheus export
+PROMETHEUS_BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000, 300000,
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket log-linear latency histogram.
+    
+    Values are bucketed by power of two (in microseconds) with
+    SUB_BUCKETS linear sub-buckets per power, so every recorded value is
+    known to within ~6% regardless of magnitude. Memory is one fixed
+    array of counters; recording never allocates.
+    
+    Not thread-safe on its own; MCPMetricsCollector serializes access.
+    """
+    
+    SUB_BUCKETS = 16
+    MAX_EXPONENT = 32  # 2**32 us ~= 71 minutes; larger values land in an overflow bucket
+    
+    __slots__ = ("_counts", "count", "total_ms", "min_ms", "max_ms")
+    
+    def __init__(self):
+        self._counts = array('Q', bytes(8 * (2 + self.MAX_EXPONENT * self.SUB_BUCKETS)))
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+    
+    @classmethod
+    def _index(cls, value_ms: float) -> int:
+        micros = value_ms * 1000.0
+        if micros < 1.0:
+            return 0
+        mantissa, exponent = math.frexp(micros)  # micros = mantissa * 2**exponent, 0.5 <= mantissa < 1
+        if exponent > cls.MAX_EXPONENT:
+            return 1 + cls.MAX_EXPONENT * cls.SUB_BUCKETS
+        return 1 + (exponent - 1) * cls.SUB_BUCKETS + int((mantissa * 2.0 - 1.0) * cls.SUB_BUCKETS)
+    
+    @classmethod
+    def _upper_bound_ms(cls, index: int) -> float:
+        """Largest value (ms) that maps to a bucket."""
+        if index == 0:
+            return 0.001
+        if index > cls.MAX_EXPONENT * cls.SUB_BUCKETS:
+            return float('inf')
+        exponent, sub = divmod(index - 1, cls.SUB_BUCKETS)
+        return (2.0 ** exponent) * (1.0 + (sub + 1) / cls.SUB_BUCKETS) / 1000.0
+    
+    def record(self, value_ms: float) -> None:
+        """Record one latency sample."""
+        if value_ms < 0:
+            value_ms = 0.0
+        self._counts[self._index(value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+    
+    def percentile(self, q: float) -> float:
+        """
+        Value (ms) at quantile q (0-100).
+        
+        Returns the upper bound of the bucket holding the q-th sample,
+        clamped to the observed min/max.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= rank:
+                    return min(max(self._upper_bound_ms(index), self.min_ms), self.max_ms)
+        return self.max_ms
+    
+    def cumulative_counts(self, bounds_ms: Tuple[float, ...]) -> List[int]:
+        """Number of samples <= each bound (bucket-resolution approximation)."""
+        result = []
+        seen = 0
+        index = 0
+        last = len(self._counts)
+        for bound in bounds_ms:
+            while index < last and self._upper_bound_ms(index) <= bound:
+                seen += self._counts[index]
+                index += 1
+            result.append(seen)
+        return result
+    
+    def summary(self) -> Dict[str, Any]:
+        """Compact summary for diagnostics."""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3),
+            "min_ms": round(self.min_ms, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class StageTimer:
+    """
+    Splits one request's wall time into named stages.
+    
+    Each mark(stage) attributes the time since the previous mark to
+    that stage. Created when a line is read and handed along with the
+    request until its response has been written.
+    """
+    
+    __slots__ = ("tool", "stages", "_last")
+    
+    def __init__(self):
+        self.tool: Optional[str] = None
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter()
+    
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+
 @dataclass
 class ToolMetrics:
     """Accumulated metrics for a single tool."""
@@ -35,9 +186,10 @@ class ToolMetrics:
     max_ms: float = 0.0
     total_payload_bytes: int = 0
     last_error: Optional[str] = None
-    # Keep last N latencies for percentile calculation
-    _recent_latencies: list = field(default_factory=list)
-    _max_recent: int = field(default=100, repr=False)
+    # Whole-session latency distribution for percentile calculation
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+    # Per-stage distributions, keyed by STAGES names
+    stages: Dict[str, LatencyHistogram] = field(default_factory=dict, repr=False)
     
     def record(self, elapsed_ms: float, payload_bytes: int = 0, success: bool = True, error_msg: str = None):
         """Record a single tool execution."""
@@ -51,9 +203,15 @@ class ToolMetrics:
             self.error_count += 1
             self.last_error = error_msg
         
-        self._recent_latencies.append(elapsed_ms)
-        if len(self._recent_latencies) > self._max_recent:
-            self._recent_latencies.pop(0)
+        self.latency.record(elapsed_ms)
+    
+    def record_stages(self, stage_ms: Dict[str, float]) -> None:
+        """Record the per-stage timings of one request."""
+        for stage, elapsed_ms in stage_ms.items():
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.record(elapsed_ms)
     
     def to_dict(self) -> Dict[str, Any]:
         """Export metrics as a dictionary."""
@@ -70,13 +228,16 @@ class ToolMetrics:
             "avg_payload_bytes": round(avg_payload),
         }
         
-        # Percentiles from recent latencies
-        if self._recent_latencies:
-            sorted_lat = sorted(self._recent_latencies)
-            n = len(sorted_lat)
-            result["p50_ms"] = round(sorted_lat[int(n * 0.5)], 1)
-            result["p95_ms"] = round(sorted_lat[min(int(n * 0.95), n - 1)], 1)
-            result["p99_ms"] = round(sorted_lat[min(int(n * 0.99), n - 1)], 1)
+        # Percentiles from the latency histogram
+        if self.latency.count:
+            result["p50_ms"] = round(self.latency.percentile(50), 1)
+            result["p95_ms"] = round(self.latency.percentile(95), 1)
+            result["p99_ms"] = round(self.latency.percentile(99), 1)
+        
+        if self.stages:
+            result["stages"] = {
+                stage: self.stages[stage].summary() for stage in STAGES if stage in self.stages
+            }
         
         if self.last_error:
             result["last_error"] = self.last_error
@@ -98,6 +259,11 @@ class MCPMetricsCollector:
         self._server_start_time: float = time.time()
         self._total_calls: int = 0
         self._total_errors: int = 0
+        # Periodic file export (see start_file_export)
+        self._export_path: Optional[str] = None
+        self._export_format: str = "prometheus"
+        self._export_stop: Optional[threading.Event] = None
+        self._export_thread: Optional[threading.Thread] = None
     
     def record(self, tool_name: str, elapsed_ms: float, 
                payload_bytes: int = 0, success: bool = True, 
@@ -113,6 +279,11 @@ class MCPMetricsCollector:
         status = "OK" if success else "FAIL"
         logger.info(f"[PERF] {tool_name}: {elapsed_ms:.1f}ms [{status}] ({payload_bytes} bytes)")
     
+    def record_stages(self, tool_name: str, stage_ms: Dict[str, float]) -> None:
+        """Record per-stage timings (ms) for one tools/call. Thread-safe."""
+        with self._lock:
+            self._tools[tool_name].record_stages(stage_ms)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get all metrics as a dictionary for pomera_diagnose."""
         with self._lock:
@@ -138,6 +309,23 @@ class MCPMetricsCollector:
                 if by_errors[1].error_count > 0:
                     most_errors_tool = by_errors[0]
             
+            # Where time goes across all tools, per stage
+            stage_totals: Dict[str, Dict[str, float]] = {}
+            for metrics in self._tools.values():
+                for stage, histogram in metrics.stages.items():
+                    totals = stage_totals.setdefault(stage, {"count": 0, "total_ms": 0.0})
+                    totals["count"] += histogram.count
+                    totals["total_ms"] += histogram.total_ms
+            all_stages_ms = sum(t["total_ms"] for t in stage_totals.values())
+            stage_breakdown = {
+                stage: {
+                    "total_ms": round(stage_totals[stage]["total_ms"], 1),
+                    "avg_ms": round(stage_totals[stage]["total_ms"] / max(stage_totals[stage]["count"], 1), 3),
+                    "share": f"{(stage_totals[stage]['total_ms'] / all_stages_ms * 100):.1f}%" if all_stages_ms else "0%",
+                }
+                for stage in STAGES if stage in stage_totals
+            }
+            
             return {
                 "session_uptime_minutes": round(uptime_minutes, 1),
                 "total_tool_calls": self._total_calls,
@@ -147,7 +335,9 @@ class MCPMetricsCollector:
                 "unique_tools_used": len(self._tools),
                 "slowest_tool": slowest_tool,
                 "most_errors_tool": most_errors_tool,
+                "stage_breakdown": stage_breakdown,
                 "per_tool": per_tool,
+                "export_file": self._export_path,
             }
     
     def reset(self):
@@ -158,6 +348,131 @@ class MCPMetricsCollector:
             self._total_calls = 0
             self._total_errors = 0
 
+    
+    # =========================================================================
+    # Export
+    # =========================================================================
+    
+    def export_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        lines = [
+            "# HELP pomera_mcp_tool_calls_total Tool calls handled.",
+            "# TYPE pomera_mcp_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for name, metrics in tools:
+                lines.append(f'pomera_mcp_tool_calls_total{{tool="{name}"}} {metrics.call_count}')
+            lines += [
+                "# HELP pomera_mcp_tool_errors_total Tool calls that failed.",
+                "# TYPE pomera_mcp_tool_errors_total counter",
+            ]
+            for name, metrics in tools:
+                lines.append(f'pomera_mcp_tool_errors_total{{tool="{name}"}} {metrics.error_count}')
+            lines += [
+                "# HELP pomera_mcp_tool_latency_ms Tool handler latency in milliseconds.",
+                "# TYPE pomera_mcp_tool_latency_ms histogram",
+            ]
+            for name, metrics in tools:
+                lines += self._prometheus_histogram(
+                    "pomera_mcp_tool_latency_ms", f'tool="{name}"', metrics.latency)
+            lines += [
+                "# HELP pomera_mcp_stage_latency_ms Per-stage tools/call latency in milliseconds.",
+                "# TYPE pomera_mcp_stage_latency_ms histogram",
+            ]
+            for name, metrics in tools:
+                for stage in STAGES:
+                    if stage in metrics.stages:
+                        lines += self._prometheus_histogram(
+                            "pomera_mcp_stage_latency_ms", f'tool="{name}",stage="{stage}"',
+                            metrics.stages[stage])
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _prometheus_histogram(metric: str, labels: str, histogram: LatencyHistogram) -> List[str]:
+        lines = []
+        for bound, cumulative in zip(PROMETHEUS_BUCKETS_MS,
+                                     histogram.cumulative_counts(PROMETHEUS_BUCKETS_MS)):
+            lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{metric}_sum{{{labels}}} {histogram.total_ms:.3f}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return lines
+    
+    def export_json_lines(self) -> str:
+        """One JSON object per tool and stage, stamped with the export time."""
+        timestamp = round(time.time(), 3)
+        lines = []
+        with self._lock:
+            for name, metrics in sorted(self._tools.items()):
+                lines.append(json.dumps({
+                    "ts": timestamp, "tool": name, "stage": "total",
+                    "calls": metrics.call_count, "errors": metrics.error_count,
+                    **metrics.latency.summary(),
+                }))
+                for stage in STAGES:
+                    if stage in metrics.stages:
+                        lines.append(json.dumps({
+                            "ts": timestamp, "tool": name, "stage": stage,
+                            **metrics.stages[stage].summary(),
+                        }))
+        return "".join(line + "\n" for line in lines)
+    
+    def write_export(self, path: str, fmt: str = "auto") -> None:
+        """
+        Write metrics to a local file.
+        
+        Args:
+            path: Target file
+            fmt: "prometheus" (file replaced atomically, suitable for a node
+                 exporter textfile collector), "jsonl" (snapshot appended),
+                 or "auto" to pick by extension (.jsonl/.json -> jsonl)
+        """
+        if fmt == "auto":
+            fmt = "jsonl" if path.lower().endswith((".jsonl", ".json")) else "prometheus"
+        if fmt == "jsonl":
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(self.export_json_lines())
+        elif fmt == "prometheus":
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+                f.write(self.export_prometheus())
+            os.replace(tmp_path, path)
+        else:
+            raise ValueError(f"Unknown metrics export format: {fmt}")
+    
+    def start_file_export(self, path: str, fmt: str = "auto", interval_s: float = 30.0) -> None:
+        """Export to a file every interval_s seconds until stop_file_export()."""
+        self.stop_file_export()
+        self._export_path = path
+        self._export_format = fmt
+        self._export_stop = stop = threading.Event()
+        
+        def loop():
+            while not stop.wait(interval_s):
+                try:
+                    self.write_export(path, fmt)
+                except Exception as e:
+                    logger.warning(f"Metrics export to {path} failed: {e}")
+        
+        self._export_thread = threading.Thread(target=loop, name="mcp-metrics-export", daemon=True)
+        self._export_thread.start()
+        logger.info(f"Exporting MCP metrics to {path} every {interval_s:g}s")
+    
+    def stop_file_export(self) -> None:
+        """Stop periodic export, writing one final snapshot."""
+        if self._export_stop is None:
+            return
+        self._export_stop.set()
+        self._export_thread.join(timeout=5)
+        try:
+            self.write_export(self._export_path, self._export_format)
+        except Exception as e:
+            logger.warning(f"Final metrics export to {self._export_path} failed: {e}")
+        self._export_stop = None
+        self._export_thread = None
+        self._export_path = None
+
 
 # Module-level singleton
 mcp_metrics = MCPMetricsCollector()
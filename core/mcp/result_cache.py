@@ -0,0 +1,210 @@
+"""
+MCP Result Cache - Opt-in memoization of pure MCP tool calls
+
+Agents often send the same large payload to a deterministic tool several
+times in a session (text stats, diffs, JSON/XML conversion, extraction,
+word frequency). With the result cache enabled, ToolRegistry.execute looks
+up calls to pure tools by (tool, canonical arguments) before running them.
+Results are kept in a core.content_hash_cache.ContentHashCache with a byte
+budget and LRU eviction.
+
+A call is cached only when:
+- the adapter has a purity predicate (MCPToolAdapter.pure) that accepts
+  the arguments, e.g. a pure action of a compound tool
+- the tool is not in UNCACHEABLE_TOOLS
+- no argument reads or writes a file (*_is_file, output_to_file), since the
+  result would then depend on file contents or have side effects
+- the result is a single, non-error text item
+
+Usage:
+    configure_result_cache(max_mb=64)    # or --result-cache-mb / env var
+    cache = get_result_cache()
+    stats = get_result_cache_stats()
+
+Author: Pomera AI Commander
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Any, Callable, Optional, Set
+
+from .schema import MCPToolResult
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_ENV = "POMERA_MCP_RESULT_CACHE_MB"
+DEFAULT_MAX_ENTRIES = 2000
+
+# Never memoized, whatever their annotations say: results depend on state,
+# time, randomness or the network, or the call has side effects
+UNCACHEABLE_TOOLS = frozenset({
+    "pomera_notes",              # reads/writes notes.db
+    "pomera_find_replace_diff",  # can save notes and backups
+    "pomera_safe_update",        # writes files
+    "pomera_web_search",         # network (has its own TTL cache)
+    "pomera_read_url",           # network
+    "pomera_ai_tools",           # remote models
+    "pomera_system",             # diagnostics, GUI launch
+    "pomera_pipeline",           # steps may include non-deterministic tools
+})
+
+# Arguments that make a call read or write files
+FILE_ARGUMENT_SUFFIX = "_is_file"
+FILE_OUTPUT_ARGUMENTS = ("output_to_file",)
+
+
+def pure_actions(*actions: str,
+                 impure_values: Optional[Dict[str, Set[Any]]] = None) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Purity predicate for a compound tool.
+
+    Args:
+        actions: Values of the "action" argument whose results depend only
+            on the arguments
+        impure_values: Argument values that make an otherwise pure action
+            non-deterministic, e.g. {"operation": {"shuffle"}}
+
+    Returns:
+        Predicate for MCPToolAdapter.pure
+    """
+    allowed = frozenset(actions)
+    impure = impure_values or {}
+
+    def is_pure(arguments: Dict[str, Any]) -> bool:
+        if arguments.get("action") not in allowed:
+            return False
+        return not any(arguments.get(name) in values for name, values in impure.items())
+
+    return is_pure
+
+
+class MCPResultCache:
+    """
+    Memoizes pure tool calls in a ContentHashCache keyed by the canonical
+    JSON of the arguments.
+    """
+
+    def __init__(self, max_mb: int, max_entries: int = DEFAULT_MAX_ENTRIES):
+        from core.content_hash_cache import ContentHashCache
+
+        self.max_mb = max_mb
+        self._cache = ContentHashCache(max_cache_size_mb=max_mb, max_entries=max_entries,
+                                       enable_compression=False, enable_persistence=False)
+        self._lock = threading.Lock()
+        self._tool_stats: Dict[str, Dict[str, int]] = {}
+        self._uncacheable_results = 0
+
+    def is_cacheable(self, adapter, arguments: Dict[str, Any]) -> bool:
+        """Whether a call's result may be served from and stored in the cache."""
+        if adapter.pure is None or adapter.name in UNCACHEABLE_TOOLS:
+            return False
+        for name, value in arguments.items():
+            if value and (name.endswith(FILE_ARGUMENT_SUFFIX) or name in FILE_OUTPUT_ARGUMENTS):
+                return False
+        try:
+            return bool(adapter.pure(arguments))
+        except Exception:
+            return False
+
+    def execute(self, adapter, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Return the cached result of a pure call, running the tool on a miss."""
+        try:
+            key = json.dumps(arguments, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError):
+            return adapter.execute(arguments)
+
+        cached = self._cache.get_cached_result(key, adapter.name, {})
+        self._count(adapter.name, "hits" if cached is not None else "misses")
+        if cached is not None:
+            return MCPToolResult.text(cached)
+
+        start = time.perf_counter()
+        result = adapter.execute(arguments)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        content = result.content
+        if not result.isError and len(content) == 1 and content[0].get("type") == "text" \
+                and isinstance(content[0].get("text"), str):
+            self._cache.cache_result(key, content[0]["text"], adapter.name, {}, elapsed_ms)
+        else:
+            with self._lock:
+                self._uncacheable_results += 1
+        return result
+
+    def _count(self, tool_name: str, outcome: str) -> None:
+        with self._lock:
+            stats = self._tool_stats.setdefault(tool_name, {"hits": 0, "misses": 0})
+            stats[outcome] += 1
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._cache.clear_cache()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts per tool and cache occupancy."""
+        cache_stats = self._cache.get_cache_stats()
+        with self._lock:
+            tools = {name: dict(stats) for name, stats in self._tool_stats.items()}
+            uncacheable = self._uncacheable_results
+        hits = sum(stats["hits"] for stats in tools.values())
+        misses = sum(stats["misses"] for stats in tools.values())
+        return {
+            "enabled": True,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate_percent": round(hits / (hits + misses) * 100, 1) if hits + misses else 0.0,
+            "entries": cache_stats["cache_info"]["total_entries"],
+            "size_mb": round(cache_stats["cache_info"]["cache_size_mb"], 3),
+            "max_size_mb": self.max_mb,
+            "evictions": cache_stats["metrics"]["evictions"],
+            "time_saved_ms": round(cache_stats["metrics"]["total_time_saved_ms"], 1),
+            "uncacheable_results": uncacheable,
+            "tools": tools,
+        }
+
+
+_result_cache: Optional[MCPResultCache] = None
+_result_cache_lock = threading.Lock()
+_configured = False
+
+
+def configure_result_cache(max_mb: int) -> Optional[MCPResultCache]:
+    """
+    Enable the result cache with a budget of max_mb megabytes (0 disables it).
+
+    Returns:
+        The active cache, or None when disabled
+    """
+    global _result_cache, _configured
+    with _result_cache_lock:
+        _result_cache = MCPResultCache(max_mb) if max_mb > 0 else None
+        _configured = True
+    if _result_cache is not None:
+        logger.info(f"MCP result cache enabled ({max_mb} MB)")
+    return _result_cache
+
+
+def get_result_cache() -> Optional[MCPResultCache]:
+    """The active result cache, configured from the environment on first use."""
+    if not _configured:
+        try:
+            max_mb = int(os.environ.get(RESULT_CACHE_ENV, "0") or 0)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {RESULT_CACHE_ENV}={os.environ.get(RESULT_CACHE_ENV)!r}")
+            max_mb = 0
+        with _result_cache_lock:
+            already = _configured
+        if not already:
+            configure_result_cache(max_mb)
+    return _result_cache
+
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    """Statistics for pomera_diagnose."""
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False,
+                "note": f"Enable with --result-cache-mb N or {RESULT_CACHE_ENV}=N"}
+    return cache.get_stats()
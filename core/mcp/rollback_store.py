@@ -0,0 +1,317 @@
+"""
+Rollback Store - Compact, content-addressed find/replace rollback records
+
+pomera_find_replace_diff used to back up every execute as a note holding the
+original text twice (note Input and the operation JSON) and the modified text
+once, so replacing in a 10 MB document wrote 30 MB to notes.db. This store
+keeps texts in notes.db keyed by SHA-256 and the note keeps only a small
+record with both hashes.
+
+Features:
+- A text seen for the first time is stored zlib-compressed
+- The result of a replacement is stored as its edits against the original:
+  match spans and replacement strings, compressed
+- Texts already stored cost nothing, so repeating operations on the same base
+  text, or running the next operation on the previous result, shares storage
+- Edit chains are bounded; past MAX_EDIT_CHAIN a full blob is stored again
+- Decoded texts are memoized by hash
+- Blobs that no remaining note refers to are pruned
+
+Tables:
+    find_replace_blobs  hash, kind ('zlib' | 'edits'), base, depth, size, created, data
+    find_replace_refs   note_id, hash
+
+Usage:
+    store = RollbackStore(connect)
+    original_hash, modified_hash = store.save(original, edits, modified)
+    store.attach(note_id, (original_hash, modified_hash))
+    text = store.load(modified_hash)
+
+Author: Pomera AI Commander
+"""
+
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ZLIB_LEVEL = 6
+
+# Longest chain of edit blobs before a full blob is stored again
+MAX_EDIT_CHAIN = 16
+
+# Upper bound on decoded text kept in memory by the memo
+MEMO_MAX_CHARS = 32 * 1024 * 1024
+
+# Unreferenced blobs younger than this are kept: their note may still be saving
+PRUNE_GRACE_SECONDS = 3600
+
+Edit = Tuple[int, int, str]
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS find_replace_blobs (
+        hash TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        base TEXT,
+        depth INTEGER NOT NULL DEFAULT 0,
+        size INTEGER NOT NULL,
+        created REAL NOT NULL,
+        data BLOB NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS find_replace_refs (
+        note_id INTEGER NOT NULL,
+        hash TEXT NOT NULL,
+        PRIMARY KEY (note_id, hash)
+    )''',
+)
+
+
+def text_hash(text: str) -> str:
+    """Content address of a text."""
+    return hashlib.sha256(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+
+def encode_edits(edits: Sequence[Edit]) -> bytes:
+    """
+    Serialize edits as compressed JSON.
+
+    Spans are stored as (gap since the previous span end, span length) pairs,
+    and a replacement shared by every edit is stored once.
+    """
+    spans = []
+    previous_end = 0
+    for start, end, _ in edits:
+        spans.append(start - previous_end)
+        spans.append(end - start)
+        previous_end = end
+    replacements = [replacement for _, _, replacement in edits]
+    if replacements and replacements.count(replacements[0]) == len(replacements):
+        replacements = replacements[:1]
+    payload = json.dumps({"spans": spans, "replacements": replacements},
+                         ensure_ascii=False, separators=(',', ':'))
+    return zlib.compress(payload.encode('utf-8', errors='surrogatepass'), ZLIB_LEVEL)
+
+
+def decode_edits(data: bytes) -> List[Edit]:
+    """Inverse of encode_edits."""
+    payload = json.loads(zlib.decompress(data).decode('utf-8', errors='surrogatepass'))
+    spans, replacements = payload["spans"], payload["replacements"]
+    shared = replacements[0] if len(replacements) == 1 else None
+    edits = []
+    end = 0
+    for i in range(0, len(spans), 2):
+        start = end + spans[i]
+        end = start + spans[i + 1]
+        edits.append((start, end, shared if shared is not None else replacements[i // 2]))
+    return edits
+
+
+def apply_edits(base: str, edits: Iterable[Edit]) -> str:
+    """Rebuild a text from its base and its ordered, non-overlapping edits."""
+    pieces = []
+    position = 0
+    for start, end, replacement in edits:
+        pieces.append(base[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(base[position:])
+    return ''.join(pieces)
+
+
+class RollbackStore:
+    """
+    Stores original and modified texts of find/replace operations in notes.db.
+
+    ``connect`` returns a database connection whose close() releases it, such
+    as ToolRegistry._get_notes_connection.
+    """
+
+    def __init__(self, connect: Callable[[], Any]):
+        self._connect = connect
+        self._lock = threading.RLock()
+        self._memo: 'OrderedDict[str, str]' = OrderedDict()
+        self._memo_chars = 0
+        self._stats = {'full_blobs': 0, 'edit_blobs': 0, 'reused': 0,
+                       'bytes_in': 0, 'bytes_stored': 0, 'loaded': 0, 'pruned': 0}
+
+    def save(self, original: str, edits: Sequence[Edit], modified: str) -> Tuple[str, str]:
+        """
+        Store the original text and the modified text as edits against it.
+
+        Args:
+            original: Text before the replacement
+            edits: (start, end, replacement) for every match, in order
+            modified: Text after the replacement
+
+        Returns:
+            (original hash, modified hash)
+        """
+        original_hash, modified_hash = text_hash(original), text_hash(modified)
+        conn = self._connect()
+        try:
+            self._ensure_schema(conn)
+            stored = self._stored(conn, (original_hash, modified_hash))
+            if original_hash not in stored:
+                data = zlib.compress(original.encode('utf-8', errors='surrogatepass'), ZLIB_LEVEL)
+                self._insert(conn, original_hash, 'zlib', None, 0, len(original), data)
+                stored[original_hash] = 0
+            else:
+                self._stats['reused'] += 1
+            if modified_hash not in stored:
+                self._insert_modified(conn, modified_hash, original_hash, stored[original_hash],
+                                      edits, modified)
+            elif modified_hash != original_hash:
+                self._stats['reused'] += 1
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._remember(original_hash, original)
+        self._remember(modified_hash, modified)
+        return original_hash, modified_hash
+
+    def attach(self, note_id: int, hashes: Iterable[str]) -> None:
+        """Record that a note refers to the given texts, then prune blobs of deleted notes."""
+        conn = self._connect()
+        try:
+            self._ensure_schema(conn)
+            conn.executemany('INSERT OR IGNORE INTO find_replace_refs (note_id, hash) VALUES (?, ?)',
+                             [(note_id, digest) for digest in set(hashes)])
+            self._prune(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load(self, digest: str) -> Optional[str]:
+        """
+        Load a stored text, applying edit chains.
+
+        Returns:
+            The text, or None if no blob has this hash
+        """
+        with self._lock:
+            text = self._memo.get(digest)
+            if text is not None:
+                self._memo.move_to_end(digest)
+                return text
+
+        conn = self._connect()
+        try:
+            self._ensure_schema(conn)
+            text = self._load(conn, digest)
+        finally:
+            conn.close()
+        if text is not None:
+            self._remember(digest, text)
+        return text
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memo_texts'] = len(self._memo)
+            stats['memo_chars'] = self._memo_chars
+        return stats
+
+    def _load(self, conn, digest: str) -> Optional[str]:
+        # Walk down to a full blob or a memoized text, then apply edits upward
+        chain = []
+        current = digest
+        text = None
+        while text is None:
+            with self._lock:
+                text = self._memo.get(current)
+            if text is not None:
+                break
+            row = conn.execute('SELECT kind, base, data FROM find_replace_blobs WHERE hash = ?',
+                               (current,)).fetchone()
+            if row is None:
+                if current != digest:
+                    logger.error(f"Rollback blob {current[:12]} is missing (needed by {digest[:12]})")
+                return None
+            kind, base, data = row[0], row[1], row[2]
+            if kind == 'zlib':
+                text = zlib.decompress(data).decode('utf-8', errors='surrogatepass')
+                self._stats['loaded'] += 1
+                break
+            chain.append(data)
+            current = base
+        for data in reversed(chain):
+            text = apply_edits(text, decode_edits(data))
+            self._stats['loaded'] += 1
+        return text
+
+    def _insert_modified(self, conn, digest: str, base: str, base_depth: int,
+                         edits: Sequence[Edit], modified: str) -> None:
+        if base_depth < MAX_EDIT_CHAIN:
+            data = encode_edits(edits)
+            # Rewriting most of the text is cheaper to store in full
+            if len(data) < len(modified) // 2:
+                self._insert(conn, digest, 'edits', base, base_depth + 1, len(modified), data)
+                return
+        data = zlib.compress(modified.encode('utf-8', errors='surrogatepass'), ZLIB_LEVEL)
+        self._insert(conn, digest, 'zlib', None, 0, len(modified), data)
+
+    def _insert(self, conn, digest: str, kind: str, base: Optional[str], depth: int,
+                size: int, data: bytes) -> None:
+        conn.execute('''
+            INSERT OR IGNORE INTO find_replace_blobs (hash, kind, base, depth, size, created, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (digest, kind, base, depth, size, time.time(), data))
+        self._stats['full_blobs' if kind == 'zlib' else 'edit_blobs'] += 1
+        self._stats['bytes_in'] += size
+        self._stats['bytes_stored'] += len(data)
+
+    @staticmethod
+    def _stored(conn, digests: Sequence[str]) -> Dict[str, int]:
+        """Depths of the given blobs that are already stored."""
+        rows = conn.execute(
+            f'SELECT hash, depth FROM find_replace_blobs WHERE hash IN ({",".join("?" * len(digests))})',
+            tuple(digests)).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def _prune(self, conn) -> None:
+        conn.execute('DELETE FROM find_replace_refs WHERE note_id NOT IN (SELECT id FROM notes)')
+        referenced = {row[0] for row in conn.execute('SELECT DISTINCT hash FROM find_replace_refs')}
+        bases = {row[0]: (row[1], row[2])
+                 for row in conn.execute('SELECT hash, base, created FROM find_replace_blobs')}
+        keep_after = time.time() - PRUNE_GRACE_SECONDS
+        live = set()
+        for digest, (base, created) in bases.items():
+            if digest not in referenced and created < keep_after:
+                continue
+            # A kept blob keeps its whole base chain
+            while digest is not None and digest not in live:
+                live.add(digest)
+                digest = bases.get(digest, (None, 0))[0]
+        dead = [(digest,) for digest in bases if digest not in live]
+        if dead:
+            conn.executemany('DELETE FROM find_replace_blobs WHERE hash = ?', dead)
+            self._stats['pruned'] += len(dead)
+            with self._lock:
+                for (digest,) in dead:
+                    text = self._memo.pop(digest, None)
+                    if text is not None:
+                        self._memo_chars -= len(text)
+
+    def _ensure_schema(self, conn) -> None:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _remember(self, digest: str, text: str) -> None:
+        if len(text) > MEMO_MAX_CHARS // 4:
+            return
+        with self._lock:
+            if digest in self._memo:
+                self._memo.move_to_end(digest)
+                return
+            self._memo[digest] = text
+            self._memo_chars += len(text)
+            while self._memo_chars > MEMO_MAX_CHARS:
+                _, evicted = self._memo.popitem(last=False)
+                self._memo_chars -= len(evicted)
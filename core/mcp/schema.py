@@ -29,6 +29,7 @@ class MCPErrorCode(IntEnum):
     RESOURCE_NOT_FOUND = -32001
     TOOL_NOT_FOUND = -32002
     TOOL_EXECUTION_ERROR = -32003
+    REQUEST_CANCELLED = -32800  # Same code as LSP's RequestCancelled
 
 
 @dataclass
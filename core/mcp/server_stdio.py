@@ -7,13 +7,24 @@ via standard input/output streams.
 
 The server reads JSON-RPC messages from stdin and writes responses to stdout.
 Each message is a single line of JSON.
+
+Dispatch modes:
+- Sequential (default): each message is handled to completion before the
+  next line is read.
+- Concurrent (max_workers > 0): each tools/call runs on a bounded worker
+  pool. Responses are written out of order, keyed by request id, through a
+  single locked writer. notifications/cancelled answers the named call with
+  a cancellation error at once and signals its handler, which stops at its
+  next cancellation check (see is_request_cancelled).
 """
 
 import sys
 import json
+import time
 import logging
-import asyncio
-from typing import Optional, Callable, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Callable, Dict, Any, TYPE_CHECKING
 
 from .schema import (
     MCPMessage,
@@ -21,9 +32,14 @@ from .schema import (
     MCPServerInfo,
     MCPToolResult,
     MCPResource,
+    MCPErrorCode,
 )
 from .protocol import MCPProtocol, MCPProtocolError
-from .tool_registry import ToolRegistry, get_registry
+from .metrics import StageTimer
+from .startup_metrics import StartupMetrics, get_startup_metrics
+
+if TYPE_CHECKING:
+    from .tool_registry import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +53,47 @@ def get_session_diagnostics() -> Optional[Dict[str, Any]]:
     return _active_server._get_session_diagnostics()
 
 
+# Replies whose first occurrence is a startup milestone
+_STARTUP_REPLY_STAGES = {
+    "initialize": StartupMetrics.FIRST_INITIALIZE,
+    "tools/list": StartupMetrics.FIRST_TOOLS_LIST,
+}
+
+
+# Cancel event of the tools/call running on the current thread
+_request_context = threading.local()
+
+
+def is_request_cancelled() -> bool:
+    """
+    True when the client cancelled the tools/call running on this thread.
+    
+    Cancellation is cooperative: long-running handlers check this between
+    steps or poll cycles and return early. Outside a cancellable call
+    (sequential mode, the GUI) it is always False.
+    """
+    event = getattr(_request_context, "cancel_event", None)
+    return event is not None and event.is_set()
+
+
+class _InFlightCall:
+    """Book-keeping for a tools/call dispatched to the worker pool."""
+    
+    __slots__ = ("request_id", "tool", "future", "start", "cancelled", "responded",
+                 "cancel_event", "lock", "timer")
+    
+    def __init__(self, request_id: Any, tool: Optional[str], timer: Optional[StageTimer] = None):
+        self.request_id = request_id
+        self.tool = tool
+        self.timer = timer
+        self.future: Optional[Future] = None
+        self.start: Optional[float] = None
+        self.cancelled = False
+        self.responded = False
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+
+
 class StdioMCPServer:
     """
     MCP Server using stdio transport.
@@ -48,10 +105,11 @@ class StdioMCPServer:
     
     def __init__(
         self,
-        tool_registry: Optional[ToolRegistry] = None,
+        tool_registry: Optional["ToolRegistry"] = None,
         server_name: str = "pomera-mcp-server",
         server_version: str = "0.1.0",
-        resource_provider: Optional[Callable[[str], str]] = None
+        resource_provider: Optional[Callable[[str], str]] = None,
+        max_workers: int = 0
     ):
         """
         Initialize the stdio MCP server.
@@ -61,8 +119,13 @@ class StdioMCPServer:
             server_name: Name to advertise in server info
             server_version: Version to advertise in server info
             resource_provider: Optional callback to read resources by URI
+            max_workers: Size of the tools/call worker pool. 0 keeps the
+                         sequential dispatch mode.
         """
-        self.registry = tool_registry or get_registry()
+        if tool_registry is None:
+            from .tool_registry import get_registry
+            tool_registry = get_registry()
+        self.registry = tool_registry
         self.server_info = MCPServerInfo(name=server_name, version=server_version)
         self.capabilities = MCPServerCapabilities(
             tools=True,
@@ -80,7 +143,17 @@ class StdioMCPServer:
         self._total_requests = 0
         self._last_request_time = None
         self._longest_request = {"tool": None, "duration_ms": 0}
-        self._active_request = None  # {"tool": str, "start": float} or None
+        # request id -> {"tool": str, "start": float} for executing tools/calls
+        self._active_requests: Dict[Any, Dict[str, Any]] = {}
+        
+        # Concurrent dispatch state (see _dispatch_line)
+        self.max_workers = max(0, int(max_workers or 0))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[Any, _InFlightCall] = {}
+        self._in_flight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._cancelled_count = 0
         
         # Resources list (can be populated externally)
         self._resources: list[MCPResource] = []
@@ -91,25 +164,47 @@ class StdioMCPServer:
         from datetime import datetime
         
         now = time.time()
-        active = None
-        if self._active_request:
-            elapsed = now - self._active_request["start"]
-            active = {
-                "tool": self._active_request["tool"],
-                "running_seconds": round(elapsed, 1),
-            }
+        with self._stats_lock:
+            active = [
+                {
+                    "id": request_id,
+                    "tool": request["tool"],
+                    "running_seconds": round(now - request["start"], 1),
+                }
+                for request_id, request in self._active_requests.items()
+            ]
+            longest = dict(self._longest_request)
+            total_requests = self._total_requests
+            last_request_time = self._last_request_time
+            cancelled_count = self._cancelled_count
         
         last_age = None
-        if self._last_request_time:
-            last_age = round(now - self._last_request_time, 1)
+        if last_request_time:
+            last_age = round(now - last_request_time, 1)
+        
+        with self._in_flight_lock:
+            in_flight = [
+                {
+                    "id": call.request_id,
+                    "tool": call.tool,
+                    "running_seconds": round(now - call.start, 1) if call.start else None,
+                    "queued": call.start is None,
+                    "cancelled": call.cancelled,
+                }
+                for call in self._in_flight.values()
+            ]
         
         return {
             "session_start": datetime.fromtimestamp(self._session_start_time).isoformat(),
             "uptime_seconds": round(now - self._session_start_time, 1),
-            "total_requests": self._total_requests,
+            "total_requests": total_requests,
             "last_request_age_seconds": last_age,
-            "longest_request": self._longest_request,
+            "longest_request": longest,
             "currently_executing": active,
+            "dispatch_mode": "concurrent" if self.max_workers > 0 else "sequential",
+            "max_workers": self.max_workers,
+            "in_flight_requests": in_flight,
+            "cancelled_requests": cancelled_count,
             "progress_keepalive_interval_s": 10,
             "stdin_open": not sys.stdin.closed,
             "stdout_open": not sys.stdout.closed,
@@ -133,9 +228,14 @@ class StdioMCPServer:
         stop() is called.
         """
         self.running = True
+        global _active_server
+        _active_server = self
+        self._start_executor()
         logger.info("MCP stdio server starting...")
         
-        # Use asyncio for non-blocking stdin reading
+        # Use asyncio for non-blocking stdin reading. Imported here: the
+        # sync transport never needs it and it is costly to import.
+        import asyncio
         loop = asyncio.get_event_loop()
         reader = asyncio.StreamReader()
         protocol = asyncio.StreamReaderProtocol(reader)
@@ -156,11 +256,8 @@ class StdioMCPServer:
                 
                 logger.debug(f"Received: {line_str[:100]}...")
                 
-                # Process the message
-                response = self._handle_message(line_str)
-                
-                if response:
-                    self._send_response(response)
+                # Process the message (tools/call may be handed to the pool)
+                self._dispatch_line(line_str)
                     
             except asyncio.CancelledError:
                 logger.info("Server cancelled")
@@ -171,6 +268,7 @@ class StdioMCPServer:
                 error_response = MCPProtocol.internal_error(None, str(e))
                 self._send_response(error_response)
         
+        self._shutdown_executor()
         self.running = False
         logger.info("MCP stdio server stopped")
     
@@ -195,7 +293,9 @@ class StdioMCPServer:
         self.running = True
         global _active_server
         _active_server = self
-        logger.info("MCP stdio server starting (sync mode)...")
+        self._start_executor()
+        logger.info("MCP stdio server starting (sync mode, "
+                    f"{'concurrent' if self._executor else 'sequential'} dispatch)...")
         
         while self.running:
             try:
@@ -210,10 +310,7 @@ class StdioMCPServer:
                 
                 logger.debug(f"Received: {line[:100]}...")
                 
-                response = self._handle_message(line)
-                
-                if response:
-                    self._send_response(response)
+                self._dispatch_line(line)
                     
             except KeyboardInterrupt:
                 logger.info("Keyboard interrupt, shutting down")
@@ -223,6 +320,7 @@ class StdioMCPServer:
                 error_response = MCPProtocol.internal_error(None, str(e))
                 self._send_response(error_response)
         
+        self._shutdown_executor()
         self.running = False
         logger.info("MCP stdio server stopped")
     
@@ -230,11 +328,173 @@ class StdioMCPServer:
         """Signal the server to stop."""
         self.running = False
     
-    def _send_response(self, msg: MCPMessage) -> None:
-        """Send a response message to stdout."""
+    def _send_response(self, msg: MCPMessage, timer: Optional[StageTimer] = None) -> None:
+        """
+        Send a response message to stdout.
+        
+        Serialized through a single lock so responses and progress
+        notifications written from worker threads never interleave.
+        
+        Args:
+            msg: Message to send
+            timer: Stage timer of the tools/call being answered; the
+                   serialize and write stages are added and the timings
+                   recorded in mcp_metrics
+        """
         json_str = MCPProtocol.serialize(msg)
+        if timer is not None:
+            timer.mark("serialize")
         logger.debug(f"Sending: {json_str[:100]}...")
-        print(json_str, flush=True)
+        with self._write_lock:
+            print(json_str, flush=True)
+        if timer is not None and timer.tool:
+            from .metrics import mcp_metrics
+            timer.mark("write")
+            mcp_metrics.record_stages(timer.tool, timer.stages)
+    
+    # =========================================================================
+    # Dispatch
+    # =========================================================================
+    
+    def _start_executor(self) -> None:
+        """Create the tools/call worker pool when concurrent dispatch is enabled."""
+        if self.max_workers > 0 and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="mcp-tool"
+            )
+            logger.info(f"Concurrent tool dispatch enabled ({self.max_workers} workers)")
+    
+    def _shutdown_executor(self) -> None:
+        """Wait for in-flight calls so their responses are flushed, then stop the pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def _dispatch_line(self, data: str) -> None:
+        """
+        Handle one incoming line and write any response.
+        
+        In concurrent mode, tools/call requests are submitted to the worker
+        pool and answered from the worker thread; every other message
+        (initialize, tools/list, ping, notifications) is answered inline so
+        the read loop never waits on a tool.
+        """
+        timer = StageTimer()
+        try:
+            msg = MCPProtocol.parse(data)
+        except MCPProtocolError as e:
+            self._send_response(MCPProtocol.create_error(None, e.code, e.message))
+            return
+        timer.mark("parse")
+        
+        if msg.is_request() and msg.method == "tools/call":
+            if self._executor is not None:
+                self._submit_tools_call(msg, timer)
+            else:
+                response = self._handle_tools_call(msg.id, msg.params or {}, timer)
+                self._send_response(response, timer)
+            return
+        
+        response = self._route_message(msg)
+        if response:
+            self._send_response(response)
+            stage = _STARTUP_REPLY_STAGES.get(msg.method)
+            if stage is not None:
+                get_startup_metrics().mark(stage)
+    
+    def _submit_tools_call(self, msg: MCPMessage, timer: Optional[StageTimer] = None) -> None:
+        """Queue a tools/call on the worker pool, keyed by request id."""
+        params = msg.params or {}
+        call = _InFlightCall(msg.id, params.get("name"), timer)
+        with self._in_flight_lock:
+            if msg.id in self._in_flight:
+                self._send_response(MCPProtocol.create_error(
+                    msg.id, MCPErrorCode.INVALID_REQUEST,
+                    f"Request id {msg.id!r} is already in flight"
+                ))
+                return
+            self._in_flight[msg.id] = call
+        call.future = self._executor.submit(self._run_pooled_call, call, params)
+    
+    def _run_pooled_call(self, call: _InFlightCall, params: Dict[str, Any]) -> None:
+        """Worker-thread body for a pooled tools/call."""
+        try:
+            with call.lock:
+                if call.cancelled:
+                    return
+                call.start = time.time()
+            if call.timer is not None:
+                call.timer.mark("queue")
+            
+            _request_context.cancel_event = call.cancel_event
+            try:
+                response = self._handle_tools_call(call.request_id, params, call.timer)
+            except Exception as e:
+                logger.exception(f"Error executing tool call {call.request_id!r}: {e}")
+                response = MCPProtocol.internal_error(call.request_id, str(e))
+            finally:
+                _request_context.cancel_event = None
+            
+            # A cancelled call was already answered by _cancel_request
+            with call.lock:
+                if call.cancelled:
+                    logger.info(f"Tool call {call.request_id!r} ({call.tool}) finished after cancellation")
+                    return
+                call.responded = True
+            self._send_response(response, call.timer)
+        finally:
+            self._forget_call(call)
+    
+    def _forget_call(self, call: _InFlightCall) -> None:
+        """Drop a call from the in-flight table (unless its id was reused)."""
+        with self._in_flight_lock:
+            if self._in_flight.get(call.request_id) is call:
+                del self._in_flight[call.request_id]
+    
+    def _cancel_request(self, request_id: Any, reason: Optional[str] = None) -> bool:
+        """
+        Cancel the in-flight tools/call with the given request id.
+        
+        The call is answered with a cancellation error right away. A queued
+        call is removed from the pool before it starts; a running call has
+        its cancel event set and stops at its handler's next
+        is_request_cancelled() check. Nothing is injected into the worker
+        thread, so handlers always run their own cleanup.
+        
+        Returns:
+            True if a matching call was found and cancelled
+        """
+        with self._in_flight_lock:
+            call = self._in_flight.get(request_id)
+        if call is None:
+            logger.info(f"Cancel for unknown or finished request {request_id!r} ignored")
+            return False
+        
+        with call.lock:
+            if call.cancelled:
+                return True
+            if call.responded:
+                logger.info(f"Cancel for answered request {request_id!r} ignored")
+                return False
+            call.cancelled = True
+            call.cancel_event.set()
+            queued = call.future is not None and call.future.cancel()
+        
+        if queued:
+            self._forget_call(call)
+            logger.info(f"Cancelled queued tool call {request_id!r} ({call.tool})")
+        else:
+            logger.info(f"Cancelling running tool call {request_id!r} ({call.tool})"
+                        + (f": {reason}" if reason else ""))
+        self._send_response(MCPProtocol.create_error(
+            request_id, MCPErrorCode.REQUEST_CANCELLED,
+            "Request cancelled" + (f": {reason}" if reason else "")
+        ))
+        
+        with self._stats_lock:
+            self._cancelled_count += 1
+        return True
     
     def _handle_message(self, data: str) -> Optional[MCPMessage]:
         """
@@ -251,6 +511,10 @@ class StdioMCPServer:
         except MCPProtocolError as e:
             return MCPProtocol.create_error(None, e.code, e.message)
         
+        return self._route_message(msg)
+    
+    def _route_message(self, msg: MCPMessage) -> Optional[MCPMessage]:
+        """Route a parsed message to its handler and return the response."""
         # Notifications don't get responses
         if msg.is_notification():
             self._handle_notification(msg)
@@ -286,6 +550,9 @@ class StdioMCPServer:
             logger.info("Client initialized")
         elif msg.method == "notifications/cancelled":
             logger.info(f"Request cancelled: {msg.params}")
+            params = msg.params or {}
+            if "requestId" in params:
+                self._cancel_request(params["requestId"], params.get("reason"))
     
     def _handle_initialize(self, id: int, params: Dict[str, Any]) -> MCPMessage:
         """Handle 'initialize' request."""
@@ -305,8 +572,18 @@ class StdioMCPServer:
         logger.debug(f"Listing {len(tools)} tools")
         return MCPProtocol.create_tools_list_response(id, tools)
     
-    def _handle_tools_call(self, id: int, params: Dict[str, Any]) -> MCPMessage:
-        """Handle 'tools/call' request."""
+    def _handle_tools_call(
+        self, id: int, params: Dict[str, Any], timer: Optional[StageTimer] = None
+    ) -> MCPMessage:
+        """
+        Handle 'tools/call' request.
+        
+        Args:
+            id: Request ID
+            params: Request params (name, arguments, _meta)
+            timer: Stage timer for this request; validate and handler
+                   stages are marked on it
+        """
         import time
         from .metrics import mcp_metrics
         
@@ -319,12 +596,18 @@ class StdioMCPServer:
         if tool_name not in self.registry:
             return MCPProtocol.tool_not_found(id, tool_name)
         
+        if timer is not None:
+            timer.tool = tool_name
+            timer.mark("validate")
+        
         logger.info(f"Executing tool: {tool_name}")
         
         # Track request for timeout diagnostics
-        self._total_requests += 1
-        self._last_request_time = time.time()
-        self._active_request = {"tool": tool_name, "start": time.time()}
+        started = time.time()
+        with self._stats_lock:
+            self._total_requests += 1
+            self._last_request_time = started
+            self._active_requests[id] = {"tool": tool_name, "start": started}
         
         # Check for long-running tool calls that need progress notifications
         if self._is_long_running_tool(tool_name, arguments):
@@ -332,12 +615,12 @@ class StdioMCPServer:
             meta = params.get("_meta", {})
             progress_token = meta.get("progressToken", f"progress-{id}")
             try:
-                return self._execute_with_progress(id, tool_name, arguments, progress_token)
+                response = self._execute_with_progress(id, tool_name, arguments, progress_token)
+                if timer is not None:
+                    timer.mark("handler")
+                return response
             finally:
-                elapsed_ms = (time.time() - self._active_request["start"]) * 1000
-                if elapsed_ms > self._longest_request["duration_ms"]:
-                    self._longest_request = {"tool": tool_name, "duration_ms": round(elapsed_ms, 1)}
-                self._active_request = None
+                self._finish_request(id, tool_name, (time.time() - started) * 1000)
         
         # Standard synchronous execution for fast tools
         start = time.perf_counter()
@@ -351,10 +634,7 @@ class StdioMCPServer:
             raise
         finally:
             elapsed_ms = (time.perf_counter() - start) * 1000
-            # Track longest request
-            if elapsed_ms > self._longest_request["duration_ms"]:
-                self._longest_request = {"tool": tool_name, "duration_ms": round(elapsed_ms, 1)}
-            self._active_request = None
+            self._finish_request(id, tool_name, elapsed_ms)
             # Estimate payload size from result
             payload_bytes = 0
             if success and result:
@@ -367,8 +647,17 @@ class StdioMCPServer:
                     pass
             mcp_metrics.record(tool_name, elapsed_ms, payload_bytes, success, error_msg)
         
+        if timer is not None:
+            timer.mark("handler")
         return MCPProtocol.create_tools_call_response(id, result)
     
+    def _finish_request(self, id: Any, tool_name: str, elapsed_ms: float) -> None:
+        """Drop a finished tools/call from the active set and track the longest one."""
+        with self._stats_lock:
+            self._active_requests.pop(id, None)
+            if elapsed_ms > self._longest_request["duration_ms"]:
+                self._longest_request = {"tool": tool_name, "duration_ms": round(elapsed_ms, 1)}
+    
     def _is_long_running_tool(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
         """
         Detect tool calls that may take a long time and need progress keepalive.
@@ -403,12 +692,16 @@ class StdioMCPServer:
         from .metrics import mcp_metrics
         
         PROGRESS_INTERVAL = 10  # seconds between keepalive notifications
+        CANCEL_POLL_INTERVAL = 0.5  # seconds between cancellation checks
         
         # Shared state between main thread and worker thread
         result_holder = {"result": None, "error": None, "done": False}
+        cancel_event = getattr(_request_context, "cancel_event", None)
         
         def worker():
             """Execute the tool in a background thread."""
+            # The tool's own cancellation checks see this request's event
+            _request_context.cancel_event = cancel_event
             try:
                 result_holder["result"] = self.registry.execute(tool_name, arguments)
             except Exception as e:
@@ -431,12 +724,21 @@ class StdioMCPServer:
         
         # Poll for completion, sending progress keepalives
         tick = 0
+        next_progress = start + PROGRESS_INTERVAL
         while not result_holder["done"]:
-            thread.join(timeout=PROGRESS_INTERVAL)
+            thread.join(timeout=CANCEL_POLL_INTERVAL)
             if result_holder["done"]:
                 break
+            if cancel_event is not None and cancel_event.is_set():
+                # Stop waiting; the worker ends at its next cancellation check
+                logger.info(f"Long-running tool '{tool_name}' cancelled, no longer waiting for it")
+                mcp_metrics.record(tool_name, (time.perf_counter() - start) * 1000, 0, False, "cancelled")
+                return MCPProtocol.create_error(id, MCPErrorCode.REQUEST_CANCELLED, "Request cancelled")
+            if time.perf_counter() < next_progress:
+                continue
             
             tick += 1
+            next_progress += PROGRESS_INTERVAL
             elapsed = time.perf_counter() - start
             
             # Send progress notification to keep connection alive
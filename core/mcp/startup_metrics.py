@@ -0,0 +1,205 @@
+"""
+MCP Startup Metrics - Timings and memory of MCP server startup
+
+Records how long pomera_mcp_server takes to get from its first line to the
+first initialize and tools/list replies, how much memory it holds once it is
+ready to serve, and how long deferred work (building the real tool registry,
+probing optional dependencies) takes when it finally runs. pomera_diagnose
+reports the same numbers under "startup", and
+tests/test_mcp_startup_benchmark.py measures them per toolset from outside.
+
+Features:
+- Stage marks in milliseconds since server start; the first mark of a stage wins
+- RSS after init and current RSS (/proc, psutil, or peak RSS as a fallback)
+- Tasks deferred until the first initialize reply has been sent, run on a
+  daemon thread so they never delay the handshake
+
+Usage:
+    from core.mcp.startup_metrics import get_startup_metrics
+
+    metrics = get_startup_metrics()
+    metrics.mark(metrics.SERVER_READY)
+    metrics.after_initialize(probe_dependencies)
+    stats = metrics.get_stats()
+
+Author: Pomera AI Commander
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss() -> Tuple[Optional[int], str]:
+    """
+    Resident set size of this process in bytes.
+
+    Returns:
+        (bytes or None, source) where source is "proc", "psutil",
+        "peak" (ru_maxrss, the high-water mark) or "unavailable"
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"), "proc"
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss, "psutil"
+    except Exception:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return (peak if sys.platform == "darwin" else peak * 1024), "peak"
+    except Exception:
+        return None, "unavailable"
+
+
+class StartupMetrics:
+    """
+    Startup stage timings for one MCP server process.
+
+    Stages are marked once, in milliseconds since ``start``. Durations of
+    work that runs on its own schedule (registry build, dependency probe)
+    are recorded with record_duration().
+    """
+
+    IMPORTS = "imports"
+    REGISTRY_READY = "registry_ready"
+    SERVER_READY = "server_ready"
+    FIRST_INITIALIZE = "first_initialize"
+    FIRST_TOOLS_LIST = "first_tools_list"
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start: time.perf_counter() value stages are measured from;
+                   defaults to now
+        """
+        self._lock = threading.Lock()
+        self._clear(start)
+
+    def _clear(self, start: Optional[float]) -> None:
+        self.start = time.perf_counter() if start is None else start
+        self._stages: Dict[str, float] = {}
+        self._durations: Dict[str, float] = {}
+        self._info: Dict[str, Any] = {}
+        self._rss_after_init: Optional[int] = None
+        self._modules_after_init: Optional[int] = None
+        self._deferred: List[Tuple[str, Callable[[], Any]]] = []
+
+    def reset(self, start: Optional[float] = None) -> None:
+        """Start measuring again from ``start`` (or now)."""
+        with self._lock:
+            self._clear(start)
+
+    def mark(self, stage: str) -> Optional[float]:
+        """
+        Record that ``stage`` was reached, unless it already was.
+
+        Marking SERVER_READY also samples RSS and the loaded module count;
+        marking FIRST_INITIALIZE starts the tasks queued with after_initialize().
+
+        Returns:
+            Milliseconds since start for a new mark, None for a repeated one
+        """
+        elapsed = (time.perf_counter() - self.start) * 1000
+        with self._lock:
+            if stage in self._stages:
+                return None
+            self._stages[stage] = elapsed
+            if stage == self.SERVER_READY:
+                self._rss_after_init = current_rss()[0]
+                self._modules_after_init = len(sys.modules)
+            deferred = []
+            if stage == self.FIRST_INITIALIZE:
+                deferred, self._deferred = self._deferred, []
+        if deferred:
+            self._run_deferred(deferred)
+        return elapsed
+
+    def record_duration(self, name: str, duration_ms: float) -> None:
+        """Record how long a piece of deferred startup work took."""
+        with self._lock:
+            self._durations[name] = duration_ms
+
+    def set_info(self, **info: Any) -> None:
+        """Attach descriptive fields (toolsets, tool count) to the report."""
+        with self._lock:
+            self._info.update(info)
+
+    def stage(self, stage: str) -> Optional[float]:
+        """Milliseconds since start at which ``stage`` was marked, or None."""
+        with self._lock:
+            return self._stages.get(stage)
+
+    def after_initialize(self, task: Callable[[], Any], name: str = "") -> None:
+        """
+        Run ``task`` once the first initialize reply has been sent.
+
+        Tasks run in order on a daemon thread. If initialize was already
+        answered the task starts right away.
+        """
+        name = name or getattr(task, "__name__", "task")
+        with self._lock:
+            if self.FIRST_INITIALIZE not in self._stages:
+                self._deferred.append((name, task))
+                return
+        self._run_deferred([(name, task)])
+
+    def _run_deferred(self, tasks: List[Tuple[str, Callable[[], Any]]]) -> None:
+        def run():
+            for name, task in tasks:
+                started = time.perf_counter()
+                try:
+                    task()
+                except Exception as e:
+                    logger.warning(f"Deferred startup task {name} failed: {e}")
+                self.record_duration(name, (time.perf_counter() - started) * 1000)
+
+        threading.Thread(target=run, name="mcp-startup-deferred", daemon=True).start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Startup report for pomera_diagnose."""
+        rss_now, rss_source = current_rss()
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._info)
+            stats["stages_ms"] = {name: round(ms, 1) for name, ms in
+                                  sorted(self._stages.items(), key=lambda item: item[1])}
+            stats["deferred_ms"] = {name: round(ms, 1) for name, ms in self._durations.items()}
+            stats["pending_deferred_tasks"] = [name for name, _ in self._deferred]
+            stats["modules_after_init"] = self._modules_after_init
+            rss_after_init = self._rss_after_init
+        stats["modules_now"] = len(sys.modules)
+        stats["rss_after_init_mb"] = None if rss_after_init is None else round(rss_after_init / 1048576, 1)
+        stats["rss_now_mb"] = None if rss_now is None else round(rss_now / 1048576, 1)
+        stats["rss_source"] = rss_source
+        return stats
+
+
+_startup_metrics: Optional[StartupMetrics] = None
+_startup_metrics_lock = threading.Lock()
+
+
+def get_startup_metrics() -> StartupMetrics:
+    """Get the process-wide startup metrics (created on first use)."""
+    global _startup_metrics
+    if _startup_metrics is None:
+        with _startup_metrics_lock:
+            if _startup_metrics is None:
+                _startup_metrics = StartupMetrics()
+    return _startup_metrics
+
+
+def set_startup_start(start: float) -> StartupMetrics:
+    """Measure startup from ``start`` (a time.perf_counter() value)."""
+    metrics = get_startup_metrics()
+    metrics.reset(start)
+    return metrics
@@ -0,0 +1,228 @@
+"""
+MCP Tool Manifest - Precomputed tool metadata for fast server startup
+
+Importing core.mcp.tool_registry (a very large module) and building the
+full ToolRegistry dominates MCP server cold start, yet the first thing a
+client does is call initialize and tools/list, which only need tool names,
+descriptions and schemas. This module stores that metadata in
+tool_manifest.json next to this file and provides LazyToolRegistry, which
+answers discovery from the manifest and only builds the real registry on
+the first tools/call.
+
+The manifest carries a fingerprint of the modules that define the tools.
+If the fingerprint does not match (tool_registry.py was edited without
+regenerating the manifest), LazyToolRegistry falls back to eager loading,
+so a stale manifest can never advertise the wrong schemas.
+
+Regenerate after changing tool definitions:
+    python -m core.mcp.tool_manifest
+
+Author: Pomera AI Commander
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+
+from .schema import MCPTool, MCPToolAnnotations, MCPToolResult
+from .startup_metrics import get_startup_metrics
+
+if TYPE_CHECKING:
+    from .tool_registry import ToolRegistry, MCPToolAdapter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_manifest.json")
+
+# Modules whose contents determine the advertised tool metadata
+_FINGERPRINT_SOURCES = ("tool_registry.py", "schema.py")
+
+
+def compute_fingerprint() -> str:
+    """Hash the tool-defining sources (line endings normalized)."""
+    digest = hashlib.sha256()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _FINGERPRINT_SOURCES:
+        with open(os.path.join(base_dir, name), "rb") as f:
+            digest.update(f.read().replace(b"\r\n", b"\n"))
+    return digest.hexdigest()
+
+
+def build_manifest(registry: "ToolRegistry") -> Dict[str, Any]:
+    """
+    Build manifest data from a fully populated registry.
+
+    Args:
+        registry: ToolRegistry with built-in tools registered
+
+    Returns:
+        Manifest dictionary (JSON-serializable)
+    """
+    from .tool_registry import LEGACY_TOOL_ALIASES
+
+    return {
+        "version": MANIFEST_VERSION,
+        "fingerprint": compute_fingerprint(),
+        "tools": [tool.to_dict() for tool in registry.list_tools()],
+        "aliases": {name: target for name, (target, _) in LEGACY_TOOL_ALIASES.items()},
+    }
+
+
+def write_manifest(path: str = MANIFEST_PATH) -> Dict[str, Any]:
+    """Regenerate the manifest file from the built-in tools."""
+    from .tool_registry import ToolRegistry
+
+    manifest = build_manifest(ToolRegistry())
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return manifest
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Load the manifest if it exists and matches the current sources.
+
+    Returns:
+        Manifest dictionary, or None if missing, unreadable or stale
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Tool manifest unavailable: {e}")
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.info("Tool manifest version mismatch, loading tools eagerly")
+        return None
+    try:
+        fingerprint = compute_fingerprint()
+    except OSError as e:
+        # Frozen builds may ship without sources; trust the bundled manifest
+        logger.debug(f"Cannot fingerprint tool sources: {e}")
+        fingerprint = manifest.get("fingerprint")
+    if manifest.get("fingerprint") != fingerprint:
+        logger.info("Tool manifest is stale, loading tools eagerly")
+        return None
+    return manifest
+
+
+def _tool_from_dict(data: Dict[str, Any]) -> MCPTool:
+    """Rebuild an MCPTool from its to_dict() form."""
+    annotations = data.get("annotations")
+    return MCPTool(
+        name=data["name"],
+        description=data.get("description", ""),
+        inputSchema=data.get("inputSchema", {}),
+        annotations=MCPToolAnnotations(**annotations) if annotations else None,
+    )
+
+
+class LazyToolRegistry:
+    """
+    ToolRegistry stand-in that defers building the real registry.
+
+    Discovery (list_tools, get_tool_names, __contains__, __len__) is served
+    from the manifest; anything that needs a handler (execute, get_tool,
+    register, unregister) builds the real ToolRegistry once and delegates
+    to it from then on.
+    """
+
+    def __init__(self, enabled_tools: Optional[set] = None,
+                 manifest_path: str = MANIFEST_PATH):
+        """
+        Initialize the lazy registry.
+
+        Args:
+            enabled_tools: Same meaning as for ToolRegistry
+            manifest_path: Manifest file to read
+        """
+        self._enabled_input = enabled_tools
+        self._registry: Optional["ToolRegistry"] = None
+        self._lock = threading.Lock()
+        self._tools: Optional[List[MCPTool]] = None
+        self._aliases: Dict[str, str] = {}
+
+        manifest = load_manifest(manifest_path)
+        if manifest is None:
+            self._load()
+            return
+
+        self._aliases = manifest.get("aliases", {})
+        enabled = None
+        if enabled_tools is not None:
+            # Legacy names in the filter select their consolidated tool
+            enabled = {self._aliases.get(name, name) for name in enabled_tools}
+        self._tools = [
+            _tool_from_dict(entry) for entry in manifest.get("tools", [])
+            if enabled is None or entry.get("name") in enabled
+        ]
+
+    def _load(self) -> "ToolRegistry":
+        """Build the real registry (once) and return it."""
+        if self._registry is None:
+            with self._lock:
+                if self._registry is None:
+                    started = time.perf_counter()
+                    from .tool_registry import ToolRegistry
+
+                    self._registry = ToolRegistry(enabled_tools=self._enabled_input)
+                    build_ms = (time.perf_counter() - started) * 1000
+                    get_startup_metrics().record_duration("registry_build", build_ms)
+                    logger.info(f"Loaded {len(self._registry)} MCP tool handlers in {build_ms:.0f}ms")
+        return self._registry
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real registry has been built."""
+        return self._registry is not None
+
+    def list_tools(self) -> List[MCPTool]:
+        """Get list of all tools as MCPTool definitions."""
+        if self._registry is not None:
+            return self._registry.list_tools()
+        return list(self._tools)
+
+    def get_tool_names(self) -> List[str]:
+        """Get list of all tool names."""
+        if self._registry is not None:
+            return self._registry.get_tool_names()
+        return [tool.name for tool in self._tools]
+
+    def execute(self, name: str, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Execute a tool, building the real registry on first use."""
+        return self._load().execute(name, arguments)
+
+    def get_tool(self, name: str) -> Optional["MCPToolAdapter"]:
+        """Get a tool adapter by name."""
+        return self._load().get_tool(name)
+
+    def register(self, adapter: "MCPToolAdapter") -> None:
+        """Register a tool adapter on the real registry."""
+        self._load().register(adapter)
+
+    def unregister(self, name: str) -> bool:
+        """Unregister a tool from the real registry."""
+        return self._load().unregister(name)
+
+    def __len__(self) -> int:
+        if self._registry is not None:
+            return len(self._registry)
+        return len(self._tools)
+
+    def __contains__(self, name: str) -> bool:
+        if self._registry is not None:
+            return name in self._registry
+        names = {tool.name for tool in self._tools}
+        return name in names or self._aliases.get(name) in names
+
+
+if __name__ == "__main__":
+    data = write_manifest()
+    print(f"Wrote {len(data['tools'])} tools to {MANIFEST_PATH}")
@@ -10,10 +10,11 @@ allowing external MCP clients to discover and execute them.
 """
 
 import logging
-from typing import Dict, Any, List, Callable, Optional, Tuple
+from typing import Dict, Any, List, Callable, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from .schema import MCPTool, MCPToolResult, MCPToolAnnotations
+from .result_cache import get_result_cache, pure_actions
 
 logger = logging.getLogger(__name__)
 
@@ -68,12 +69,15 @@ class MCPToolAdapter:
         description: Human-readable description
         input_schema: JSON Schema for input validation
         handler: Function that executes the tool
+        pure: Predicate telling whether a call's result depends only on its
+              arguments, so it may be memoized (see result_cache)
     """
     name: str
     description: str
     input_schema: Dict[str, Any]
     handler: Callable[[Dict[str, Any]], str]
     annotations: Optional[MCPToolAnnotations] = None
+    pure: Optional[Callable[[Dict[str, Any]], bool]] = None
     
     def to_mcp_tool(self) -> MCPTool:
         """Convert to MCPTool definition."""
@@ -96,6 +100,8 @@ class MCPToolAdapter:
         """
         try:
             result = self.handler(arguments)
+            if isinstance(result, MCPToolResult):
+                return result
             return MCPToolResult.text(result)
         except Exception as e:
             logger.exception(f"Tool execution failed: {self.name}")
@@ -123,6 +129,10 @@ class ToolRegistry:
         self._tools: Dict[str, MCPToolAdapter] = {}
         self._logger = logging.getLogger(__name__)
         self._enabled_tools = self._normalize_enabled_tools(enabled_tools)
+        # tools/list result, rebuilt only when the tool set changes
+        self._tool_list_cache: Optional[List[MCPTool]] = None
+        # Find/replace rollback texts in notes.db, created on first use
+        self._rollback_store = None
         
         if register_builtins:
             self._register_builtin_tools()
@@ -139,6 +149,7 @@ class ToolRegistry:
             return
         
         self._tools[adapter.name] = adapter
+        self._tool_list_cache = None
         self._logger.info(f"Registered MCP tool: {adapter.name}")
     
     def unregister(self, name: str) -> bool:
@@ -153,6 +164,7 @@ class ToolRegistry:
         """
         if name in self._tools:
             del self._tools[name]
+            self._tool_list_cache = None
             self._logger.info(f"Unregistered MCP tool: {name}")
             return True
         return False
@@ -183,7 +195,9 @@ class ToolRegistry:
         Returns:
             List of MCPTool objects
         """
-        return [adapter.to_mcp_tool() for adapter in self._tools.values()]
+        if self._tool_list_cache is None:
+            self._tool_list_cache = [adapter.to_mcp_tool() for adapter in self._tools.values()]
+        return list(self._tool_list_cache)
     
     def execute(self, name: str, arguments: Dict[str, Any]) -> MCPToolResult:
         """
@@ -211,6 +225,9 @@ class ToolRegistry:
         if adapter is None:
             return MCPToolResult.error(f"Tool not found: {name}")
         
+        result_cache = get_result_cache()
+        if result_cache is not None and result_cache.is_cacheable(adapter, arguments):
+            return result_cache.execute(adapter, arguments)
         return adapter.execute(arguments)
     
     def get_tool_names(self) -> List[str]:
@@ -325,6 +342,9 @@ class ToolRegistry:
         # System - merge diagnose, launch_gui
         self._register_compound_system()
         
+        # Pipeline - chain text tools in memory (single round-trip)
+        self._register_pipeline_tool()
+        
         self._logger.info(f"Registered {len(self._tools)} built-in MCP tools (consolidated)")
     
     # =========================================================================
@@ -447,12 +467,19 @@ class ToolRegistry:
                         "enum": ["report", "keep_yours", "keep_theirs"],
                         "description": "For compare_3way: conflict resolution strategy",
                         "default": "report"
+                    },
+                    "partitioned": {
+                        "type": "boolean",
+                        "description": "For compare_3way: diff top-level keys in parallel worker "
+                                     "processes (same result; faster for large configs)",
+                        "default": False
                     }
                 },
                 "required": ["action"]
             },
             handler=self._handle_compound_smart_diff,
-            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False),
+            pure=pure_actions("compare_2way", "compare_3way"),
         ))
     
     def _handle_compound_smart_diff(self, args: Dict[str, Any]) -> str:
@@ -577,12 +604,22 @@ class ToolRegistry:
                         "type": "integer",
                         "description": "For action=wrap: maximum line width",
                         "default": 80
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "For action=lines/whitespace with text_is_file and output_to_file: "
+                                     "process the file incrementally in bounded memory, without the file size limit. "
+                                     "Used automatically for oversized files. Not available for reverse, shuffle "
+                                     "or keep_last (those fall back to in-memory processing).",
+                        "default": False
                     }
                 },
                 "required": ["action", "text"]
             },
             handler=self._handle_compound_text_tools,
-            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False),
+            pure=pure_actions("case", "lines", "whitespace", "sort", "wrap",
+                              impure_values={"operation": {"shuffle"}}),
         ))
     
     def _handle_compound_text_tools(self, args: Dict[str, Any]) -> str:
@@ -795,7 +832,9 @@ class ToolRegistry:
                 "required": ["action"]
             },
             handler=self._handle_compound_data_tools,
-            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False),
+            # generate and timestamp depend on randomness and the clock
+            pure=pure_actions("json_xml", "columns", "encode"),
         ))
     
     def _handle_compound_data_tools(self, args: Dict[str, Any]) -> str:
@@ -967,7 +1006,8 @@ class ToolRegistry:
                 "required": ["action"]
             },
             handler=self._handle_compound_analysis,
-            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False),
+            pure=pure_actions("stats", "frequency", "compare_lists", "html"),
         ))
     
     def _handle_compound_analysis(self, args: Dict[str, Any]) -> str:
@@ -1100,7 +1140,9 @@ class ToolRegistry:
                 "required": ["action"]
             },
             handler=self._handle_compound_specialist,
-            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False),
+            # cron computes next runs from the current time
+            pure=pure_actions("extract", "escape", "markdown", "url_parse", "translate", "email_header"),
         ))
     
     def _handle_compound_specialist(self, args: Dict[str, Any]) -> str:
@@ -1202,6 +1244,173 @@ class ToolRegistry:
             return f"Error: Unknown action '{action}'. Valid actions: diagnose, launch_gui"
 
     
+    # =========================================================================
+    # Pipeline Tool - chain text tools in a single call
+    # =========================================================================
+    
+    # Hard cap on steps per pipeline call
+    PIPELINE_MAX_STEPS = 50
+    
+    # Handlers report bad arguments by returning text with one of these
+    # prefixes instead of raising, so the pipeline checks for them per step
+    PIPELINE_STEP_ERROR_PREFIXES = (
+        "Error:", "Error ", "Unknown operation:", "Unknown action",
+        "Unknown encoding type:", "Unknown target base:",
+    )
+    
+    def _register_pipeline_tool(self) -> None:
+        """Register the Pipeline tool (runs several text tools in one call)."""
+        self.register(MCPToolAdapter(
+            name="pomera_pipeline",
+            description=(
+                "Run an ordered chain of text tools in ONE call. The output text of each step "
+                "is passed in memory as the 'text' argument of the next step, and only the "
+                "final output is returned. Use instead of several separate calls, e.g. "
+                "whitespace trim -> lines remove_duplicates -> sort -> stats. "
+                "Each step is {tool, arguments}; tool may be a consolidated name "
+                "(pomera_text_tools, pomera_data_tools, pomera_analysis, pomera_specialist) "
+                "or a legacy alias (pomera_whitespace, pomera_line_tools, pomera_sort, "
+                "pomera_text_stats, ...). Only tools that take a 'text' argument can be chained. "
+                "Supports file input/output via text_is_file and output_to_file."
+            ),
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "text": {
+                        "type": "string",
+                        "description": "Input text for the first step (or file path if text_is_file=true)"
+                    },
+                    "text_is_file": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "If true, treat 'text' as file path"
+                    },
+                    "steps": {
+                        "type": "array",
+                        "description": "Ordered steps. 'text', 'text_is_file' and 'output_to_file' "
+                                     "are managed by the pipeline and must not be set per step.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {
+                                    "type": "string",
+                                    "description": "Tool name, e.g. pomera_text_tools or pomera_whitespace"
+                                },
+                                "arguments": {
+                                    "type": "object",
+                                    "description": "Tool arguments (without 'text')"
+                                }
+                            },
+                            "required": ["tool"]
+                        }
+                    },
+                    "include_timings": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "If true, return JSON with the final result plus per-step timings"
+                    },
+                    "output_to_file": {
+                        "type": "string",
+                        "description": "If provided, save the final result to this file path"
+                    }
+                },
+                "required": ["text", "steps"]
+            },
+            handler=self._handle_pipeline,
+            annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+        ))
+    
+    def _handle_pipeline(self, args: Dict[str, Any]) -> Union[str, MCPToolResult]:
+        """
+        Run pipeline steps through execute(), passing text between steps in memory.
+        
+        Errors name the failing step (1-based) so agents can fix that step only;
+        a step that fails ends the pipeline with an isError result.
+        """
+        import json
+        import time
+        from .file_io_helpers import process_file_args, handle_file_output
+        from .server_stdio import is_request_cancelled
+        
+        success, args, error = process_file_args(args, {"text": "text_is_file"})
+        if not success:
+            return error
+        
+        steps = args.get("steps") or []
+        if not isinstance(steps, list) or not steps:
+            return "Error: 'steps' must be a non-empty list of {tool, arguments} objects"
+        if len(steps) > self.PIPELINE_MAX_STEPS:
+            return f"Error: Pipeline has {len(steps)} steps (maximum {self.PIPELINE_MAX_STEPS})"
+        
+        reserved = ("text", "text_is_file", "output_to_file")
+        text = args.get("text", "")
+        timings = []
+        pipeline_start = time.perf_counter()
+        
+        for index, step in enumerate(steps, start=1):
+            if not isinstance(step, dict) or not step.get("tool"):
+                return f"Error: Step {index} must be an object with a 'tool' name"
+            tool_name = step["tool"]
+            step_args = step.get("arguments") or {}
+            if not isinstance(step_args, dict):
+                return f"Error: Step {index} ({tool_name}): 'arguments' must be an object"
+            
+            adapter = self.get_tool(tool_name)
+            if adapter is None:
+                return f"Error: Step {index}: Tool not found: {tool_name}"
+            if adapter.name == "pomera_pipeline":
+                return f"Error: Step {index}: pomera_pipeline cannot be nested"
+            if "text" not in adapter.input_schema.get("properties", {}):
+                return f"Error: Step {index}: {tool_name} does not take a 'text' argument and cannot be chained"
+            bad_keys = [key for key in reserved if key in step_args]
+            if bad_keys:
+                return (f"Error: Step {index} ({tool_name}): {', '.join(bad_keys)} "
+                        f"is managed by the pipeline and must not be set per step")
+            
+            if is_request_cancelled():
+                return f"Error: Pipeline cancelled before step {index} ({tool_name})"
+            
+            call_args = dict(step_args)
+            call_args["text"] = text
+            step_start = time.perf_counter()
+            result = self.execute(tool_name, call_args)
+            elapsed_ms = (time.perf_counter() - step_start) * 1000
+            
+            output = "".join(
+                str(c.get("text", "")) for c in (result.content or []) if c.get("type") == "text"
+            )
+            if result.isError or self._is_step_error(output, text):
+                return MCPToolResult.error(f"Step {index} ({tool_name}) failed: {output}")
+            
+            timings.append({
+                "step": index,
+                "tool": tool_name,
+                "ms": round(elapsed_ms, 2),
+                "output_chars": len(output),
+            })
+            text = output
+        
+        if args.get("include_timings", False):
+            final = json.dumps({
+                "result": text,
+                "steps": timings,
+                "total_ms": round((time.perf_counter() - pipeline_start) * 1000, 2),
+            }, ensure_ascii=False)
+            return handle_file_output(args, final)
+        
+        return handle_file_output(args, text)
+    
+    def _is_step_error(self, output: str, step_input: str) -> bool:
+        """
+        Tell whether a step's output is a handler error message.
+        
+        A first line that was already in the step input is data passed
+        through (e.g. a log line starting with "Error:"), not an error.
+        """
+        first_line = output.split("\n", 1)[0]
+        return (first_line.startswith(self.PIPELINE_STEP_ERROR_PREFIXES)
+                and first_line not in step_input)
+    
     def _register_case_tool(self) -> None:
         """Register the Case Tool."""
         self.register(MCPToolAdapter(
@@ -1451,6 +1660,12 @@ class ToolRegistry:
                     "output_to_file": {
                         "type": "string",
                         "description": "If provided, save result to this file path"
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "With text_is_file and output_to_file: process the file incrementally "
+                                     "in bounded memory, without the file size limit (not for reverse, shuffle or keep_last)",
+                        "default": False
                     }
                 },
                 "required": ["text", "operation"]
@@ -1461,9 +1676,14 @@ class ToolRegistry:
     
     def _handle_line_tools(self, args: Dict[str, Any]) -> str:
         """Handle line tools execution."""
-        from .file_io_helpers import process_file_args, handle_file_output
+        from .file_io_helpers import process_file_args, handle_file_output, should_stream, stream_file_output
         from tools.line_tools import LineToolsProcessor
         
+        if should_stream(args):
+            transform = self._line_tools_stream_transform(args)
+            if transform is not None:
+                return stream_file_output(args, line_transform=transform)
+        
         # Process file input
         success, args, error = process_file_args(args, {"text": "text_is_file"})
         if not success:
@@ -1492,6 +1712,25 @@ class ToolRegistry:
         
         return handle_file_output(args, result)
     
+    def _line_tools_stream_transform(self, args: Dict[str, Any]) -> Optional[Callable]:
+        """Line generator for streaming mode, or None if the operation needs the whole text."""
+        from tools.line_tools import LineToolsProcessor
+        
+        operation = args.get("operation", "remove_duplicates")
+        if operation == "remove_duplicates":
+            if args.get("keep_mode", "keep_first") != "keep_first":
+                return None
+            case_sensitive = args.get("case_sensitive", True)
+            return lambda lines: LineToolsProcessor.iter_remove_duplicates(lines, case_sensitive, hash_keys=True)
+        elif operation == "remove_empty":
+            return LineToolsProcessor.iter_remove_empty_lines
+        elif operation == "add_numbers":
+            format_style = args.get("number_format", "1. ")
+            return lambda lines: LineToolsProcessor.iter_add_line_numbers(lines, format_style)
+        elif operation == "remove_numbers":
+            return LineToolsProcessor.iter_remove_line_numbers
+        return None
+    
     def _register_whitespace_tools(self) -> None:
         """Register the Whitespace Tools."""
         self.register(MCPToolAdapter(
@@ -1536,6 +1775,12 @@ class ToolRegistry:
                     "output_to_file": {
                         "type": "string",
                         "description": "If provided, save result to this file path"
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "With text_is_file and output_to_file: process the file incrementally "
+                                     "in bounded memory, without the file size limit",
+                        "default": False
                     }
                 },
                 "required": ["text", "operation"]
@@ -1546,9 +1791,14 @@ class ToolRegistry:
     
     def _handle_whitespace_tools(self, args: Dict[str, Any]) -> str:
         """Handle whitespace tools execution."""
-        from .file_io_helpers import process_file_args, handle_file_output
+        from .file_io_helpers import process_file_args, handle_file_output, should_stream, stream_file_output
         from tools.whitespace_tools import WhitespaceToolsProcessor
         
+        if should_stream(args):
+            transform = self._whitespace_stream_transform(args)
+            if transform is not None:
+                return stream_file_output(args, **transform)
+        
         # Process file input
         success, args, error = process_file_args(args, {"text": "text_is_file"})
         if not success:
@@ -1576,6 +1826,27 @@ class ToolRegistry:
         
         return handle_file_output(args, result)
     
+    def _whitespace_stream_transform(self, args: Dict[str, Any]) -> Optional[Dict[str, Callable]]:
+        """stream_file_output transform arguments for an operation, or None if unsupported."""
+        from tools.whitespace_tools import WhitespaceToolsProcessor
+        
+        operation = args.get("operation", "trim")
+        tab_size = args.get("tab_size", 4)
+        if operation == "trim":
+            mode = args.get("trim_mode", "both")
+            return {"line_transform": lambda lines: WhitespaceToolsProcessor.iter_trim_lines(lines, mode)}
+        elif operation == "remove_extra_spaces":
+            return {"line_transform": WhitespaceToolsProcessor.iter_remove_extra_spaces}
+        elif operation == "spaces_to_tabs":
+            return {"line_transform": lambda lines: WhitespaceToolsProcessor.iter_spaces_to_tabs(lines, tab_size)}
+        # Pure character substitutions keep the original line structure
+        elif operation == "tabs_to_spaces":
+            return {"chunk_transform": lambda chunk: WhitespaceToolsProcessor.tabs_to_spaces(chunk, tab_size)}
+        elif operation == "normalize_endings":
+            ending = args.get("line_ending", "lf")
+            return {"chunk_transform": lambda chunk: WhitespaceToolsProcessor.normalize_line_endings(chunk, ending)}
+        return None
+    
     def _register_string_escape_tool(self) -> None:
         """Register the String Escape Tool."""
         self.register(MCPToolAdapter(
@@ -3334,12 +3605,14 @@ class ToolRegistry:
             return os.path.join(project_root, 'notes.db')
     
     def _get_notes_connection(self):
-        """Get a connection to the notes database."""
-        import sqlite3
-        db_path = self._get_notes_db_path()
-        conn = sqlite3.connect(db_path, timeout=10.0)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """
+        Get a pooled connection to the notes database.
+        
+        Connections are long-lived and shared with NotesWidget via
+        core.notes_storage; close() returns the connection to the pool.
+        """
+        from core.notes_storage import get_notes_pool
+        return get_notes_pool(self._get_notes_db_path()).acquire()
     
     def _sanitize_text(self, text: str) -> str:
         """
@@ -3549,7 +3822,7 @@ class ToolRegistry:
     def _handle_notes_get(self, args: Dict[str, Any]) -> str:
         """Handle getting a note by ID with automatic decryption."""
         from core.note_encryption import (
-            decrypt_note_content, get_encryption_status, 
+            decrypt_note_fields, get_encryption_status, 
             format_encryption_metadata
         )
         
@@ -3571,9 +3844,10 @@ class ToolRegistry:
             output_content = row['Output'] or ""
             encryption_status = get_encryption_status(input_content, output_content)
             
-            # Decrypt content if encrypted
-            decrypted_input = decrypt_note_content(input_content) if input_content else "(empty)"
-            decrypted_output = decrypt_note_content(output_content) if output_content else "(empty)"
+            # Decrypt content if encrypted (one key lookup for both fields)
+            decrypted_input, decrypted_output = decrypt_note_fields([input_content, output_content])
+            decrypted_input = decrypted_input or "(empty)"
+            decrypted_output = decrypted_output or "(empty)"
             
             lines = [
                 f"=== Note #{row['id']} ===",
@@ -4506,6 +4780,12 @@ class ToolRegistry:
                         "type": "integer",
                         "description": "Note ID to recall (for recall operation)"
                     },
+                    "recall_text": {
+                        "type": "string",
+                        "enum": ["both", "original", "modified", "none"],
+                        "default": "both",
+                        "description": "Which texts recall rebuilds and returns (for recall)"
+                    },
                     "output_to_file": {
                         "type": "string",
                         "description": "If provided, save replaced text result to this file path"
@@ -4579,10 +4859,13 @@ class ToolRegistry:
             
             # Create notes handler if saving is requested
             notes_handler = None
+            rollback_store = None
             if save_to_notes:
                 notes_handler = self._create_notes_handler()
+                rollback_store = self._get_rollback_store()
             
-            result = execute_replace(text, find_pattern, replace_pattern, flags, save_to_notes, notes_handler)
+            result = execute_replace(text, find_pattern, replace_pattern, flags, save_to_notes, notes_handler,
+                                     rollback_store)
             
             # Save replaced text to file if requested
             if output_to_file and result.get("success") and result.get("modified_text"):
@@ -4602,7 +4885,8 @@ class ToolRegistry:
                 return json.dumps({"success": False, "error": "note_id is required for recall"})
             
             notes_getter = self._create_notes_getter()
-            result = recall_operation(note_id, notes_getter)
+            result = recall_operation(note_id, notes_getter, self._get_rollback_store(),
+                                      args.get("recall_text", "both"))
             return json.dumps(result, ensure_ascii=False)
         
         else:
@@ -4636,6 +4920,13 @@ class ToolRegistry:
                 return -1
         return save_to_notes
     
+    def _get_rollback_store(self):
+        """Get the store for find/replace rollback texts, kept in notes.db."""
+        if self._rollback_store is None:
+            from core.mcp.rollback_store import RollbackStore
+            self._rollback_store = RollbackStore(self._get_notes_connection)
+        return self._rollback_store
+    
     def _create_notes_getter(self):
         """Create a getter function for retrieving notes."""
         registry = self  # Capture reference
@@ -4719,7 +5010,12 @@ class ToolRegistry:
                 "- For AI agent workflows requiring high semantic relevance\n"
                 "- Academic research (use category='research paper')\n"
                 "- News monitoring (use category='news' with max_age_hours=24)\n"
-                "- When you need specific phrase matching (use exa_include_text filter)"
+                "- When you need specific phrase matching (use exa_include_text filter)\n\n"
+                
+                "**MULTI-ENGINE MODE**:\n"
+                "Pass `engines` (e.g. ['tavily', 'brave', 'duckduckgo']) to query them concurrently. "
+                "Results are merged by rank and de-duplicated by URL; the call returns once `quorum` "
+                "engines have answered. Results are cached on disk for an hour per engine, query and count."
             ),
             input_schema={
                 "type": "object",
@@ -4734,6 +5030,30 @@ class ToolRegistry:
                         "description": "Search engine to use",
                         "default": "tavily"
                     },
+                    "engines": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": ["tavily", "exa", "google", "brave", "duckduckgo", "serpapi", "serper"]
+                        },
+                        "description": "Multi-engine mode: query these engines concurrently and return merged results, de-duplicated by URL. Overrides 'engine'."
+                    },
+                    "quorum": {
+                        "type": "integer",
+                        "description": "Multi-engine mode: return once this many engines have answered (default: a majority)",
+                        "minimum": 1
+                    },
+                    "timeout": {
+                        "type": "integer",
+                        "description": "Per-engine request timeout in seconds (default 30, or 10 in multi-engine mode)",
+                        "minimum": 1,
+                        "maximum": 120
+                    },
+                    "use_cache": {
+                        "type": "boolean",
+                        "description": "Reuse results cached on disk for the same engine, query and count (1 hour TTL)",
+                        "default": True
+                    },
                     "count": {
                         "type": "integer",
                         "description": "Number of results (1-20)",
@@ -4793,11 +5113,12 @@ class ToolRegistry:
             annotations=MCPToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False, openWorldHint=True)
         ))
     
+    WEB_SEARCH_ENGINES = ["duckduckgo", "tavily", "exa", "google", "brave", "serpapi", "serper"]
+    
     def _handle_web_search(self, args: Dict[str, Any]) -> str:
         """Handle web search tool execution using encrypted API keys from database settings."""
         import json
-        import urllib.request
-        import urllib.parse
+        from .web_search import get_search_cache, is_error_result
         
         query = args.get("query", "").strip()
         engine = args.get("engine", "tavily").lower()
@@ -4808,7 +5129,18 @@ class ToolRegistry:
         if not query:
             return json.dumps({"success": False, "error": "Query is required"})
         
-        valid_engines = ["duckduckgo", "tavily", "exa", "google", "brave", "serpapi", "serper"]
+        valid_engines = self.WEB_SEARCH_ENGINES
+        engines = args.get("engines")
+        if engines:
+            engines = list(dict.fromkeys(e.lower() for e in engines))
+            invalid = [e for e in engines if e not in valid_engines]
+            if invalid:
+                return json.dumps({
+                    "success": False,
+                    "error": f"Invalid engine(s): {', '.join(invalid)}. Valid engines: {', '.join(valid_engines)}"
+                })
+            return self._handle_web_search_fan_out(query, engines, count, args)
+        
         if engine not in valid_engines:
             return json.dumps({
                 "success": False, 
@@ -4816,48 +5148,15 @@ class ToolRegistry:
             })
         
         try:
-            # Get API key from encrypted database settings
-            api_key = self._get_encrypted_web_search_api_key(engine)
-            cse_id = self._get_web_search_setting(engine, "cse_id", "")
-            
-            # Execute search based on engine
-            if engine == "duckduckgo":
-                results = self._mcp_search_duckduckgo(query, count)
-            elif engine == "tavily":
-                if not api_key:
-                    return json.dumps({"success": False, "error": "Tavily API key required. Configure in Web Search settings."})
-                results = self._mcp_search_tavily(query, count, api_key, search_depth)
-            elif engine == "exa":
-                if not api_key:
-                    return json.dumps({"success": False, "error": "Exa API key required. Configure in Web Search settings."})
-                # Get Exa-specific options from args
-                exa_options = {
-                    "search_type": args.get("exa_search_type", "auto"),
-                    "category": args.get("exa_category", "general"),
-                    "content_type": args.get("exa_content_type", "highlights"),
-                    "max_characters": args.get("exa_max_characters", 2000),
-                    "max_age_hours": args.get("exa_max_age_hours", -1),
-                    "include_text": args.get("exa_include_text", "")
-                }
-                results = self._mcp_search_exa(query, count, api_key, exa_options)
-            elif engine == "google":
-                if not api_key or not cse_id:
-                    return json.dumps({"success": False, "error": "Google API key and CSE ID required. Configure in Web Search settings."})
-                results = self._mcp_search_google(query, count, api_key, cse_id)
-            elif engine == "brave":
-                if not api_key:
-                    return json.dumps({"success": False, "error": "Brave API key required. Configure in Web Search settings."})
-                results = self._mcp_search_brave(query, count, api_key)
-            elif engine == "serpapi":
-                if not api_key:
-                    return json.dumps({"success": False, "error": "SerpApi key required. Configure in Web Search settings."})
-                results = self._mcp_search_serpapi(query, count, api_key)
-            elif engine == "serper":
-                if not api_key:
-                    return json.dumps({"success": False, "error": "Serper API key required. Configure in Web Search settings."})
-                results = self._mcp_search_serper(query, count, api_key)
-            else:
-                return json.dumps({"success": False, "error": f"Unknown engine: {engine}"})
+            cache = get_search_cache() if args.get("use_cache", True) else None
+            cache_engine = self._web_search_cache_engine(engine, args)
+            results = cache.get(cache_engine, query, count) if cache else None
+            cached = results is not None
+            if not cached:
+                search = self._web_search_call(engine, query, count, args, args.get("timeout", 30))
+                results = search()
+                if cache and not is_error_result(results):
+                    cache.put(cache_engine, query, count, results)
             
             output = {
                 "success": True,
@@ -4866,33 +5165,171 @@ class ToolRegistry:
                 "count": len(results),
                 "results": results
             }
+            if cached:
+                output["cached"] = True
             
             # Add search_depth info for Tavily
             if engine == "tavily":
                 output["search_depth"] = search_depth
-                output["credits_used"] = 2 if search_depth == "advanced" else 1
-            
-            # Save to file if requested
-            output_to_file = args.get("output_to_file")
-            if output_to_file:
-                from .file_io_helpers import save_file_content
-                json_output = json.dumps(output, indent=2, ensure_ascii=False)
-                save_file_content(output_to_file, json_output)
-                output["saved_to"] = output_to_file
+                output["credits_used"] = 0 if cached else (2 if search_depth == "advanced" else 1)
             
-            return json.dumps(output, indent=2, ensure_ascii=False)
+            return self._web_search_output(output, args)
         except Exception as e:
-            # Sanitize error message to prevent API key exposure
-            # Use the same sanitization as AI Tools
-            error_msg = str(e)
-            import re
-            # Remove API key from URL parameters
-            error_msg = re.sub(r'([?&](?:key|api_key|apikey)=)[^&\s]+', r'\1[REDACTED]', error_msg, flags=re.IGNORECASE)
-            # Remove Bearer tokens
-            error_msg = re.sub(r'(Bearer\s+)[A-Za-z0-9._-]+', r'\1[REDACTED]', error_msg)
-            # Remove X-API-KEY and similar headers
-            error_msg = re.sub(r'(X-API-KEY["\']?:\s*["\']?)[A-Za-z0-9._-]+', r'\1[REDACTED]', error_msg, flags=re.IGNORECASE)
-            return json.dumps({"success": False, "error": error_msg})
+            return json.dumps({"success": False, "error": self._sanitize_web_search_error(str(e))})
+    
+    def _handle_web_search_fan_out(self, query: str, engines: List[str], count: int,
+                                   args: Dict[str, Any]) -> str:
+        """Query several engines concurrently, merge and de-duplicate the results.
+        
+        Cached engines count towards the quorum without touching the network;
+        the remaining engines run on a thread pool and the call returns as soon
+        as enough of them have answered or the per-engine timeout expires.
+        """
+        import json
+        from .web_search import (
+            DEFAULT_ENGINE_TIMEOUT_SECONDS, fan_out, get_search_cache, merge_results,
+        )
+        
+        timeout = args.get("timeout", DEFAULT_ENGINE_TIMEOUT_SECONDS)
+        quorum = args.get("quorum") or len(engines) // 2 + 1
+        quorum = max(1, min(quorum, len(engines)))
+        cache = get_search_cache() if args.get("use_cache", True) else None
+        
+        status: Dict[str, Dict[str, Any]] = {}
+        results_by_engine: Dict[str, list] = {}
+        searches = {}
+        cache_engines = {}
+        for engine in engines:
+            cache_engines[engine] = self._web_search_cache_engine(engine, args)
+            hit = cache.get(cache_engines[engine], query, count) if cache else None
+            if hit is not None:
+                results_by_engine[engine] = hit
+                status[engine] = {"status": "cached", "count": len(hit)}
+                continue
+            try:
+                searches[engine] = self._web_search_call(engine, query, count, args, timeout)
+            except ValueError as e:
+                status[engine] = {"status": "skipped", "error": str(e)}
+        
+        def store(engine: str, results: list) -> None:
+            if cache:
+                cache.put(cache_engines[engine], query, count, results)
+        
+        needed = quorum - len(results_by_engine)
+        if needed > 0 and searches:
+            outcome = fan_out(searches, needed, timeout, on_result=store)
+            for engine, results in outcome.results.items():
+                results_by_engine[engine] = results
+                status[engine] = {"status": "ok", "count": len(results)}
+            for engine, error in outcome.errors.items():
+                status[engine] = {"status": "error", "error": self._sanitize_web_search_error(error)}
+            for engine in outcome.timed_out:
+                # Still running in the background; a late answer warms the cache
+                status[engine] = {"status": "incomplete"}
+        else:
+            for engine in searches:
+                status[engine] = {"status": "not_needed"}
+        
+        ordered = {e: results_by_engine[e] for e in engines if e in results_by_engine}
+        merged = merge_results(ordered, count)
+        output = {
+            "success": bool(ordered),
+            "query": query,
+            "engines": engines,
+            "quorum": quorum,
+            "count": len(merged),
+            "results": merged,
+            "engine_status": {e: status[e] for e in engines},
+        }
+        if not ordered:
+            output["error"] = "No search engine returned results"
+        return self._web_search_output(output, args)
+    
+    def _web_search_call(self, engine: str, query: str, count: int, args: Dict[str, Any],
+                         timeout: float) -> Callable[[], list]:
+        """Build the search call for one engine.
+        
+        Raises:
+            ValueError: If the engine's API key (or Google CSE ID) is not configured
+        """
+        if engine == "duckduckgo":
+            return lambda: self._mcp_search_duckduckgo(query, count, timeout)
+        
+        # Get API key from encrypted database settings
+        api_key = self._get_encrypted_web_search_api_key(engine)
+        if engine == "tavily":
+            if not api_key:
+                raise ValueError("Tavily API key required. Configure in Web Search settings.")
+            search_depth = args.get("search_depth", "basic").lower()
+            return lambda: self._mcp_search_tavily(query, count, api_key, search_depth, timeout)
+        if engine == "exa":
+            if not api_key:
+                raise ValueError("Exa API key required. Configure in Web Search settings.")
+            exa_options = self._web_search_exa_options(args)
+            return lambda: self._mcp_search_exa(query, count, api_key, exa_options, timeout)
+        if engine == "google":
+            cse_id = self._get_web_search_setting(engine, "cse_id", "")
+            if not api_key or not cse_id:
+                raise ValueError("Google API key and CSE ID required. Configure in Web Search settings.")
+            return lambda: self._mcp_search_google(query, count, api_key, cse_id, timeout)
+        if engine == "brave":
+            if not api_key:
+                raise ValueError("Brave API key required. Configure in Web Search settings.")
+            return lambda: self._mcp_search_brave(query, count, api_key, timeout)
+        if engine == "serpapi":
+            if not api_key:
+                raise ValueError("SerpApi key required. Configure in Web Search settings.")
+            return lambda: self._mcp_search_serpapi(query, count, api_key, timeout)
+        if engine == "serper":
+            if not api_key:
+                raise ValueError("Serper API key required. Configure in Web Search settings.")
+            return lambda: self._mcp_search_serper(query, count, api_key, timeout)
+        raise ValueError(f"Unknown engine: {engine}")
+    
+    @staticmethod
+    def _web_search_exa_options(args: Dict[str, Any]) -> Dict[str, Any]:
+        """Get Exa-specific options from args."""
+        return {
+            "search_type": args.get("exa_search_type", "auto"),
+            "category": args.get("exa_category", "general"),
+            "content_type": args.get("exa_content_type", "highlights"),
+            "max_characters": args.get("exa_max_characters", 2000),
+            "max_age_hours": args.get("exa_max_age_hours", -1),
+            "include_text": args.get("exa_include_text", "")
+        }
+    
+    def _web_search_cache_engine(self, engine: str, args: Dict[str, Any]) -> str:
+        """Cache key engine part, including options that change the results."""
+        import json
+        if engine == "tavily":
+            return f"tavily:{args.get('search_depth', 'basic').lower()}"
+        if engine == "exa":
+            return "exa:" + json.dumps(self._web_search_exa_options(args), sort_keys=True)
+        return engine
+    
+    def _web_search_output(self, output: Dict[str, Any], args: Dict[str, Any]) -> str:
+        """Serialize search output, saving it to a file if requested."""
+        import json
+        output_to_file = args.get("output_to_file")
+        if output_to_file:
+            from .file_io_helpers import save_file_content
+            json_output = json.dumps(output, indent=2, ensure_ascii=False)
+            save_file_content(output_to_file, json_output)
+            output["saved_to"] = output_to_file
+        
+        return json.dumps(output, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def _sanitize_web_search_error(error_msg: str) -> str:
+        """Remove API keys from an error message (same sanitization as AI Tools)."""
+        import re
+        # Remove API key from URL parameters
+        error_msg = re.sub(r'([?&](?:key|api_key|apikey)=)[^&\s]+', r'\1[REDACTED]', error_msg, flags=re.IGNORECASE)
+        # Remove Bearer tokens
+        error_msg = re.sub(r'(Bearer\s+)[A-Za-z0-9._-]+', r'\1[REDACTED]', error_msg)
+        # Remove X-API-KEY and similar headers
+        error_msg = re.sub(r'(X-API-KEY["\']?:\s*["\']?)[A-Za-z0-9._-]+', r'\1[REDACTED]', error_msg, flags=re.IGNORECASE)
+        return error_msg
     
     def _get_encrypted_web_search_api_key(self, engine_key: str) -> str:
         """Load encrypted API key for a search engine from database settings.
@@ -4922,7 +5359,7 @@ class ToolRegistry:
         except Exception:
             return default
     
-    def _mcp_search_duckduckgo(self, query: str, count: int) -> list:
+    def _mcp_search_duckduckgo(self, query: str, count: int, timeout: float = 30) -> list:
         """Search DuckDuckGo (free, no API key)."""
         try:
             from ddgs import DDGS
@@ -4930,7 +5367,7 @@ class ToolRegistry:
             return [{"title": "Error", "snippet": "DuckDuckGo requires: pip install ddgs", "url": ""}]
         
         try:
-            with DDGS() as ddgs:
+            with DDGS(timeout=int(timeout)) as ddgs:
                 results = []
                 for r in ddgs.text(query, max_results=count):
                     results.append({
@@ -4943,7 +5380,8 @@ class ToolRegistry:
         except Exception as e:
             return [{"title": "Error", "snippet": str(e), "url": ""}]
     
-    def _mcp_search_tavily(self, query: str, count: int, api_key: str, search_depth: str = "basic") -> list:
+    def _mcp_search_tavily(self, query: str, count: int, api_key: str, search_depth: str = "basic",
+                           timeout: float = 30) -> list:
         """Search using Tavily API.
         
         Args:
@@ -4951,15 +5389,17 @@ class ToolRegistry:
             count: Number of results
             api_key: Tavily API key
             search_depth: 'basic' (1 credit) or 'advanced' (2 credits, semantic snippets)
+            timeout: Request timeout in seconds
         """
         import urllib.request
         import json
+        from .web_search import SEARCH_ENDPOINTS
         
         # Validate search_depth
         if search_depth not in ("basic", "advanced"):
             search_depth = "basic"
         
-        url = "https://api.tavily.com/search"
+        url = SEARCH_ENDPOINTS["tavily"]
         data = json.dumps({
             "api_key": api_key,
             "query": query,
@@ -4968,7 +5408,7 @@ class ToolRegistry:
         }).encode()
         
         req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
-        with urllib.request.urlopen(req, timeout=30) as response:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
             result = json.loads(response.read().decode())
         
         return [
@@ -4977,16 +5417,17 @@ class ToolRegistry:
             for item in result.get("results", [])
         ]
     
-    def _mcp_search_google(self, query: str, count: int, api_key: str, cse_id: str) -> list:
+    def _mcp_search_google(self, query: str, count: int, api_key: str, cse_id: str, timeout: float = 30) -> list:
         """Search using Google Custom Search API."""
         import urllib.request
         import urllib.parse
         import json
+        from .web_search import SEARCH_ENDPOINTS
         
-        url = f"https://www.googleapis.com/customsearch/v1?key={api_key}&cx={cse_id}&q={urllib.parse.quote(query)}&num={min(count, 10)}"
+        url = f"{SEARCH_ENDPOINTS['google']}?key={api_key}&cx={cse_id}&q={urllib.parse.quote(query)}&num={min(count, 10)}"
         
         req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=30) as response:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
             data = json.loads(response.read().decode())
         
         return [
@@ -4995,19 +5436,20 @@ class ToolRegistry:
             for item in data.get("items", [])
         ]
     
-    def _mcp_search_brave(self, query: str, count: int, api_key: str) -> list:
+    def _mcp_search_brave(self, query: str, count: int, api_key: str, timeout: float = 30) -> list:
         """Search using Brave Search API."""
         import urllib.request
         import urllib.parse
         import json
+        from .web_search import SEARCH_ENDPOINTS
         
-        url = f"https://api.search.brave.com/res/v1/web/search?q={urllib.parse.quote(query)}&count={min(count, 20)}"
+        url = f"{SEARCH_ENDPOINTS['brave']}?q={urllib.parse.quote(query)}&count={min(count, 20)}"
         
         req = urllib.request.Request(url, headers={
             "Accept": "application/json",
             "X-Subscription-Token": api_key
         })
-        with urllib.request.urlopen(req, timeout=30) as response:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
             data = json.loads(response.read().decode())
         
         return [
@@ -5016,16 +5458,17 @@ class ToolRegistry:
             for item in data.get("web", {}).get("results", [])
         ]
     
-    def _mcp_search_serpapi(self, query: str, count: int, api_key: str) -> list:
+    def _mcp_search_serpapi(self, query: str, count: int, api_key: str, timeout: float = 30) -> list:
         """Search using SerpApi."""
         import urllib.request
         import urllib.parse
         import json
+        from .web_search import SEARCH_ENDPOINTS
         
-        url = f"https://serpapi.com/search?q={urllib.parse.quote(query)}&api_key={api_key}&num={min(count, 10)}"
+        url = f"{SEARCH_ENDPOINTS['serpapi']}?q={urllib.parse.quote(query)}&api_key={api_key}&num={min(count, 10)}"
         
         req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=30) as response:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
             data = json.loads(response.read().decode())
         
         return [
@@ -5034,19 +5477,20 @@ class ToolRegistry:
             for item in data.get("organic_results", [])[:count]
         ]
     
-    def _mcp_search_serper(self, query: str, count: int, api_key: str) -> list:
+    def _mcp_search_serper(self, query: str, count: int, api_key: str, timeout: float = 30) -> list:
         """Search using Serper.dev."""
         import urllib.request
         import json
+        from .web_search import SEARCH_ENDPOINTS
         
-        url = "https://google.serper.dev/search"
+        url = SEARCH_ENDPOINTS["serper"]
         data = json.dumps({"q": query, "num": min(count, 10)}).encode()
         
         req = urllib.request.Request(url, data=data, headers={
             "X-API-KEY": api_key,
             "Content-Type": "application/json"
         })
-        with urllib.request.urlopen(req, timeout=30) as response:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
             result = json.loads(response.read().decode())
         
         return [
@@ -5055,7 +5499,8 @@ class ToolRegistry:
             for item in result.get("organic", [])
         ]
     
-    def _mcp_search_exa(self, query: str, count: int, api_key: str, options: dict) -> list:
+    def _mcp_search_exa(self, query: str, count: int, api_key: str, options: dict,
+                        timeout: float = 30) -> list:
         """Search using Exa AI neural search API with advanced options.
         
         Args:
@@ -5069,8 +5514,10 @@ class ToolRegistry:
                 - max_characters: int (100-20000)
                 - max_age_hours: int (-1 for cache, 0 for livecrawl, positive for age limit)
                 - include_text: str (phrase filter)
+            timeout: Request timeout in seconds
         """
         import requests
+        from .web_search import SEARCH_ENDPOINTS
         
         # Build request payload
         payload = {
@@ -5120,10 +5567,10 @@ class ToolRegistry:
         
         # Use requests library (urllib has issues with Exa API headers)
         response = requests.post(
-            "https://api.exa.ai/search",
+            SEARCH_ENDPOINTS["exa"],
             json=payload,
             headers={"x-api-key": api_key},
-            timeout=30
+            timeout=timeout
         )
         response.raise_for_status()
         result = response.json()
@@ -5681,6 +6128,7 @@ class ToolRegistry:
         ignore_order = args.get("ignore_order", False)
         mode = args.get("mode", "semantic")
         case_insensitive = args.get("case_insensitive", False)
+        partitioned = args.get("partitioned", False)
         save_to_notes = args.get("save_to_notes", False)
         note_title = args.get("note_title", "Smart Diff 3-Way Merge Result")
         
@@ -5702,7 +6150,8 @@ class ToolRegistry:
                 "conflict_strategy": conflict_strategy,
                 "ignore_order": ignore_order,
                 "mode": mode,
-                "case_insensitive": case_insensitive
+                "case_insensitive": case_insensitive,
+                "partitioned": partitioned
             }
         )
         
@@ -6204,6 +6653,8 @@ class ToolRegistry:
             if provider == "Google AI":
                 research_kwargs["timeout"] = get_setting("timeout", "research_timeout", 600)
                 research_kwargs["poll_interval"] = get_setting("poll_interval", "research_poll_interval", 10)
+                from .server_stdio import is_request_cancelled
+                research_kwargs["cancel_check"] = is_request_cancelled
             
             # Execute research
             result = engine.generate_research(**research_kwargs)
@@ -6427,6 +6878,7 @@ class ToolRegistry:
             registry_info = self._diagnose_tool_registry()
             runtime_info = self._diagnose_runtime()
             performance_info = self._diagnose_performance()
+            startup_info = self._diagnose_startup()
             
             # MCP session diagnostics (timeout investigation)
             session_info = None
@@ -6448,6 +6900,7 @@ class ToolRegistry:
                 "tool_registry": registry_info,
                 "runtime": runtime_info,
                 "performance": performance_info,
+                "startup": startup_info,
                 "mcp_session": session_info,
                 "environment": {
                     POMERA_DATA_DIR_ENV: env_data_dir,
@@ -6537,6 +6990,11 @@ class ToolRegistry:
                     if p95 > 1000 and tname not in ("pomera_web_search", "pomera_ai_tools", "pomera_read_url"):
                         warnings.append(f"Tool '{tname}' p95 latency is {p95:.0f}ms (target: <1000ms for non-network tools)")
             
+            # Startup warnings
+            first_initialize_ms = startup_info.get("stages_ms", {}).get("first_initialize")
+            if first_initialize_ms is not None and first_initialize_ms > 1000:
+                warnings.append(f"MCP server took {first_initialize_ms:.0f}ms to answer initialize (target: <1000ms)")
+            
             if warnings:
                 result["warnings"] = warnings
             if recommendations:
@@ -6773,11 +7231,11 @@ class ToolRegistry:
         try:
             from core.note_encryption import (
                 ENCRYPTION_AVAILABLE, is_encryption_available,
-                get_system_encryption_key
+                get_system_encryption_key, get_key_manager
             )
             result["cryptography_available"] = ENCRYPTION_AVAILABLE
             
-            # Test key derivation
+            # Test key derivation (cached per process after the first call)
             if ENCRYPTION_AVAILABLE:
                 try:
                     fernet = get_system_encryption_key()
@@ -6785,6 +7243,9 @@ class ToolRegistry:
                 except Exception as e:
                     result["key_derivation_ok"] = False
                     result["key_derivation_error"] = str(e)
+            
+            # Key cache timings: derivations should stay at 1 per process
+            result["key_cache"] = get_key_manager().get_stats()
         except ImportError as e:
             result["import_error"] = str(e)
         
@@ -7054,7 +7515,28 @@ class ToolRegistry:
         """Report MCP tool execution performance metrics."""
         try:
             from core.mcp.metrics import mcp_metrics
-            return mcp_metrics.get_stats()
+            stats = mcp_metrics.get_stats()
+            try:
+                from core.notes_storage import get_notes_pool_stats
+                stats["notes_connection_pools"] = get_notes_pool_stats()
+            except Exception:
+                pass
+            try:
+                from core.ai_http import get_ai_session_stats
+                stats["ai_http_sessions"] = get_ai_session_stats()
+            except Exception:
+                pass
+            try:
+                from core.mcp.result_cache import get_result_cache_stats
+                stats["result_cache"] = get_result_cache_stats()
+            except Exception:
+                pass
+            # Only once a smart diff has run; importing it pulls in DeepDiff
+            import sys
+            semantic_diff = sys.modules.get("core.semantic_diff")
+            if semantic_diff is not None:
+                stats["smart_diff_parse_cache"] = semantic_diff.get_parsed_document_cache().get_stats()
+            return stats
         except Exception as e:
             return {
                 "available": False,
@@ -7063,6 +7545,14 @@ class ToolRegistry:
                         "If running outside the server, metrics are not available."
             }
     
+    def _diagnose_startup(self) -> Dict[str, Any]:
+        """Report MCP server startup timings and memory (see core.mcp.startup_metrics)."""
+        try:
+            from core.mcp.startup_metrics import get_startup_metrics
+            return get_startup_metrics().get_stats()
+        except Exception as e:
+            return {"available": False, "error": str(e)}
+    
     # =========================================================================
     # GUI Launcher Tool (Phase 10) - Launch Pomera GUI from Agentic IDE
     # =========================================================================
@@ -1,4 +1,4 @@
-"""Text processing tools: case, lines, whitespace, sort, wrap (compound)."""
+"""Text processing tools: case, lines, whitespace, sort, wrap (compound) and pipeline."""
 
 from .base import register_from_v1
 
@@ -9,3 +9,6 @@ TOOLS = {
 def register_tools(registry) -> None:
     """Register text processing tools into the given registry."""
     register_from_v1(registry, TOOLS)
+    # The pipeline dispatches steps through the registry that owns it,
+    # so bind it to the target registry instead of a V1 extraction.
+    registry._register_pipeline_tool()
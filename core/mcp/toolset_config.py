@@ -41,6 +41,7 @@ TOOLSET_DEFINITIONS = {
         "pomera_data_tools",
         "pomera_analysis",
         "pomera_specialist",
+        "pomera_pipeline",
     ],
 }
 
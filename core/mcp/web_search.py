@@ -0,0 +1,333 @@
+"""
+Web Search Helpers - Multi-engine fan-out and on-disk result cache
+
+pomera_web_search used to query one engine per call and go to the network
+every time, even when an agent repeated the same query minutes later.
+This module provides the pieces the tool handler uses to do better:
+
+- SEARCH_ENDPOINTS: base URLs of the HTTP search APIs (overridable, e.g.
+  to point the engines at a local stub server in tests)
+- SearchResultCache: SQLite-backed TTL cache keyed by (engine, query, count)
+- fan_out: run several engine searches concurrently with a per-engine
+  timeout and return once a quorum of engines has answered
+- merge_results: interleave results by rank and de-duplicate them by
+  normalized URL
+
+Usage:
+    from core.mcp.web_search import fan_out, merge_results, get_search_cache
+
+    outcome = fan_out({"tavily": search_tavily, "brave": search_brave},
+                      quorum=1, timeout=10)
+    results = merge_results(outcome.results, count=5)
+
+Author: Pomera AI Commander
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+SEARCH_ENDPOINTS = {
+    "tavily": "https://api.tavily.com/search",
+    "exa": "https://api.exa.ai/search",
+    "google": "https://www.googleapis.com/customsearch/v1",
+    "brave": "https://api.search.brave.com/res/v1/web/search",
+    "serpapi": "https://serpapi.com/search",
+    "serper": "https://google.serper.dev/search",
+}
+
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_ENGINE_TIMEOUT_SECONDS = 10
+CACHE_DB_NAME = "web_search_cache.db"
+
+# Query parameters that only track the click, not the page
+_TRACKING_PARAMS = frozenset({"gclid", "fbclid", "msclkid", "yclid", "ref", "ref_src"})
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection.
+
+    Lowercases scheme and host, drops "www.", default ports, fragments,
+    tracking parameters and trailing slashes, and sorts the query string.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower() or "http"
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def is_error_result(results: list) -> bool:
+    """Whether a search function reported failure as a single error entry."""
+    return (len(results) == 1 and results[0].get("title") == "Error"
+            and not results[0].get("url"))
+
+
+def merge_results(results_by_engine: Dict[str, list], count: int) -> list:
+    """
+    Merge per-engine result lists into one ranked, de-duplicated list.
+
+    Results are interleaved by rank (every engine's first hit, then every
+    engine's second hit, ...) in the order engines appear in the mapping.
+    Duplicates are detected by normalized URL; the first occurrence is
+    kept and lists every engine that returned it under "sources".
+
+    Args:
+        results_by_engine: Engine name -> results in that engine's order
+        count: Maximum number of merged results
+
+    Returns:
+        List of result dicts
+    """
+    merged: List[dict] = []
+    by_url: Dict[str, dict] = {}
+    lists = [(engine, results) for engine, results in results_by_engine.items() if results]
+    depth = max((len(results) for _, results in lists), default=0)
+    for rank in range(depth):
+        for engine, results in lists:
+            if rank >= len(results):
+                continue
+            item = results[rank]
+            url = item.get("url", "")
+            if not url:
+                continue
+            key = normalize_url(url)
+            existing = by_url.get(key)
+            if existing is not None:
+                if engine not in existing["sources"]:
+                    existing["sources"].append(engine)
+                continue
+            entry = dict(item)
+            entry["sources"] = [engine]
+            by_url[key] = entry
+            merged.append(entry)
+    return merged[:count]
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of a fan-out search."""
+    results: Dict[str, list] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+def fan_out(searches: Dict[str, Callable[[], list]], quorum: int,
+            timeout: float = DEFAULT_ENGINE_TIMEOUT_SECONDS,
+            on_result: Optional[Callable[[str, list], None]] = None) -> FanOutResult:
+    """
+    Run engine searches concurrently and return once a quorum succeeded.
+
+    Engines still running when the quorum is reached (or when the timeout
+    expires) are abandoned, not awaited; their results are still passed to
+    on_result when they arrive, so late answers can warm the cache.
+
+    Args:
+        searches: Engine name -> zero-argument callable returning results
+        quorum: Number of successful engines to wait for
+        timeout: Seconds to wait for any single engine
+        on_result: Called with (engine, results) for every successful engine
+
+    Returns:
+        FanOutResult with the results in the order of `searches`
+    """
+    start = time.perf_counter()
+    outcome = FanOutResult()
+    if not searches:
+        return outcome
+
+    executor = ThreadPoolExecutor(max_workers=len(searches),
+                                  thread_name_prefix="web-search")
+    futures = {}
+    for name, search in searches.items():
+        future = executor.submit(search)
+        futures[future] = name
+        if on_result is not None:
+            future.add_done_callback(lambda f, name=name: _notify(f, name, on_result))
+
+    finished: Dict[str, list] = {}
+    pending = set(futures)
+    deadline = time.monotonic() + timeout
+    try:
+        while pending and len(finished) < quorum:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    outcome.errors[name] = str(e)
+                    continue
+                if is_error_result(results):
+                    outcome.errors[name] = results[0].get("snippet", "search failed")
+                else:
+                    finished[name] = results
+    finally:
+        # shutdown(cancel_futures=True) needs Python 3.9
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    outcome.results = {name: finished[name] for name in searches if name in finished}
+    outcome.timed_out = [futures[f] for f in futures if f in pending]
+    outcome.elapsed_ms = (time.perf_counter() - start) * 1000
+    return outcome
+
+
+def _notify(future, name: str, on_result: Callable[[str, list], None]) -> None:
+    """Done-callback: pass successful results to on_result."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    results = future.result()
+    if is_error_result(results):
+        return
+    try:
+        on_result(name, results)
+    except Exception as e:
+        logger.debug(f"Web search result callback failed for {name}: {e}")
+
+
+class SearchResultCache:
+    """
+    On-disk TTL cache for search results.
+
+    Entries are keyed by (engine, query, count). The engine part may carry
+    engine-specific options (e.g. "tavily:advanced") so that searches whose
+    results differ are cached separately. Expired entries are ignored on
+    read and removed by purge_expired().
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    engine TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    results TEXT NOT NULL,
+                    PRIMARY KEY (engine, query, count)
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return " ".join(query.split()).lower()
+
+    def get(self, engine: str, query: str, count: int) -> Optional[list]:
+        """Return cached results, or None if missing or expired."""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT created, results FROM search_cache "
+                    "WHERE engine = ? AND query = ? AND count = ?",
+                    (engine, self._normalize_query(query), count),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Search cache read failed: {e}")
+            return None
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, engine: str, query: str, count: int, results: list) -> None:
+        """Store results for (engine, query, count)."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?)",
+                    (engine, self._normalize_query(query), count, time.time(),
+                     json.dumps(results, ensure_ascii=False)),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Search cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("DELETE FROM search_cache WHERE created < ?",
+                                  (time.time() - self.ttl_seconds,))
+            conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM search_cache")
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchResultCache]:
+    """Get the process-wide search cache in the user data directory."""
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                try:
+                    from core.data_directory import get_database_path
+                    cache = SearchResultCache(get_database_path(CACHE_DB_NAME))
+                    cache.purge_expired()
+                    _search_cache = cache
+                except Exception as e:
+                    logger.warning(f"Web search cache unavailable: {e}")
+                    return None
+    return _search_cache
@@ -21,6 +21,38 @@ from pathlib import Path
 
 from .database_connection_manager import DatabaseConnectionManager
 from .database_schema import DatabaseSchema, DataTypeConverter
+from .tab_content_store import TabContentStore
+
+
+# Top-level settings keys stored in their own tables rather than core_settings
+NON_CORE_SETTINGS_KEYS = frozenset({
+    'tool_settings', 'input_tabs', 'output_tabs',
+    'performance_settings', 'font_settings', 'dialog_settings'
+})
+
+# Upsert statement and number of key columns for each settings table
+SETTINGS_TABLE_UPSERTS = {
+    'core_settings': (
+        "INSERT OR REPLACE INTO core_settings (key, value, data_type) VALUES (?, ?, ?)", 1),
+    'tool_settings': (
+        "INSERT OR REPLACE INTO tool_settings (tool_name, setting_path, setting_value, data_type) VALUES (?, ?, ?, ?)", 2),
+    'tab_content': (
+        "INSERT OR REPLACE INTO tab_content (tab_type, tab_index, content) VALUES (?, ?, ?)", 2),
+    'tab_content_refs': (
+        "INSERT OR REPLACE INTO tab_content_refs (tab_type, tab_index, content_hash) VALUES (?, ?, ?)", 2),
+    'tab_blobs': (
+        "INSERT OR REPLACE INTO tab_blobs (hash, encoding, base_hash, depth, size, data) VALUES (?, ?, ?, ?, ?, ?)", 1),
+    'performance_settings': (
+        "INSERT OR REPLACE INTO performance_settings (category, setting_key, setting_value, data_type) VALUES (?, ?, ?, ?)", 2),
+    'font_settings': (
+        "INSERT OR REPLACE INTO font_settings (font_type, property, value, data_type) VALUES (?, ?, ?, ?)", 2),
+    'dialog_settings': (
+        "INSERT OR REPLACE INTO dialog_settings (category, property, value, data_type) VALUES (?, ?, ?, ?)", 2),
+}
+
+# Tables keyed by content hash; their rows are written whenever produced
+# because pruning may have removed an identical earlier row
+CONTENT_ADDRESSED_TABLES = frozenset({'tab_blobs'})
 
 
 class MigrationManager:
@@ -47,6 +79,7 @@ class MigrationManager:
         self.logger = logging.getLogger(__name__)
         self.schema = DatabaseSchema()
         self.converter = DataTypeConverter()
+        self.tab_store = TabContentStore()
         
         # Migration tracking
         self._migration_history = []
@@ -327,28 +360,7 @@ class MigrationManager:
                 # NOTE: Do NOT clear tables - use INSERT OR REPLACE for upsert semantics
                 # The _clear_all_tables() call was removed because it caused data loss
                 # when save_settings() was called with incomplete/empty data
-                
-                # Migrate core settings
-                self._migrate_core_settings(conn, json_data)
-                
-                # Migrate tool settings
-                if 'tool_settings' in json_data:
-                    self._migrate_tool_settings(conn, json_data['tool_settings'])
-                
-                # Migrate tab content
-                self._migrate_tab_content(conn, json_data)
-                
-                # Migrate performance settings
-                if 'performance_settings' in json_data:
-                    self._migrate_performance_settings(conn, json_data['performance_settings'])
-                
-                # Migrate font settings
-                if 'font_settings' in json_data:
-                    self._migrate_font_settings(conn, json_data['font_settings'])
-                
-                # Migrate dialog settings
-                if 'dialog_settings' in json_data:
-                    self._migrate_dialog_settings(conn, json_data['dialog_settings'])
+                self.write_settings_rows(conn, self.settings_to_rows(json_data))
                 
                 # Update metadata
                 self._update_migration_metadata(conn)
@@ -360,6 +372,49 @@ class MigrationManager:
             self.logger.error(f"JSON to database migration failed: {e}")
             return False
     
+    def settings_to_rows(self, json_data: Dict[str, Any]) -> Dict[str, List[tuple]]:
+        """
+        Convert a (possibly partial) settings dictionary to table rows.
+        
+        Args:
+            json_data: Settings data in JSON structure
+            
+        Returns:
+            Dictionary mapping table name to the rows to upsert; each row
+            matches the column order of SETTINGS_TABLE_UPSERTS
+        """
+        content_rows, ref_rows, blob_rows = self._tab_content_rows(json_data)
+        rows = {
+            'core_settings': self._core_settings_rows(json_data),
+            'tab_content': content_rows,
+            'tab_content_refs': ref_rows,
+            'tab_blobs': blob_rows,
+        }
+        if 'tool_settings' in json_data:
+            rows['tool_settings'] = self._tool_settings_rows(json_data['tool_settings'])
+        if 'performance_settings' in json_data:
+            rows['performance_settings'] = self._performance_settings_rows(json_data['performance_settings'])
+        if 'font_settings' in json_data:
+            rows['font_settings'] = self._font_settings_rows(json_data['font_settings'])
+        if 'dialog_settings' in json_data:
+            rows['dialog_settings'] = self._dialog_settings_rows(json_data['dialog_settings'])
+        return rows
+    
+    def write_settings_rows(self, conn: sqlite3.Connection, rows: Dict[str, List[tuple]]) -> None:
+        """
+        Upsert rows produced by settings_to_rows, one executemany per table.
+        
+        Args:
+            conn: Database connection (inside a transaction)
+            rows: Dictionary mapping table name to rows
+        """
+        for table, table_rows in rows.items():
+            if table_rows:
+                conn.executemany(SETTINGS_TABLE_UPSERTS[table][0], table_rows)
+        
+        if rows.get('tab_blobs') or rows.get('tab_content_refs'):
+            self.tab_store.prune(conn)
+    
     def _migrate_database_to_json(self) -> Optional[Dict[str, Any]]:
         """
         Extract data from database and reconstruct JSON structure.
@@ -413,157 +468,118 @@ class MigrationManager:
         for table in tables:
             conn.execute(f"DELETE FROM {table}")
     
-    def _migrate_core_settings(self, conn: sqlite3.Connection, json_data: Dict[str, Any]) -> None:
+    def _core_settings_rows(self, json_data: Dict[str, Any]) -> List[tuple]:
         """
-        Migrate core application settings to database.
+        Build core application setting rows.
         
         Args:
-            conn: Database connection
             json_data: Full JSON data structure
         """
         # Core settings are top-level keys excluding special categories
-        excluded_keys = {
-            'tool_settings', 'input_tabs', 'output_tabs', 
-            'performance_settings', 'font_settings', 'dialog_settings'
-        }
-        
+        rows = []
         for key, value in json_data.items():
-            if key not in excluded_keys:
-                data_type = self.converter.python_to_db_type(value)
-                serialized_value = self.converter.serialize_value(value)
-                
-                conn.execute(
-                    "INSERT OR REPLACE INTO core_settings (key, value, data_type) VALUES (?, ?, ?)",
-                    (key, serialized_value, data_type)
-                )
+            if key not in NON_CORE_SETTINGS_KEYS:
+                rows.append((key, self.converter.serialize_value(value),
+                             self.converter.python_to_db_type(value)))
+        return rows
     
-    def _migrate_tool_settings(self, conn: sqlite3.Connection, tool_settings: Dict[str, Any]) -> None:
+    def _tool_settings_rows(self, tool_settings: Dict[str, Any]) -> List[tuple]:
         """
-        Migrate tool-specific settings to database with nested path support.
+        Build tool-specific setting rows with nested path support.
         
         Args:
-            conn: Database connection
             tool_settings: Tool settings dictionary
         """
+        rows = []
         for tool_name, tool_config in tool_settings.items():
             if isinstance(tool_config, dict):
                 # Flatten nested tool configuration
                 flattened = self._flatten_nested_dict(tool_config)
                 
                 for setting_path, value in flattened.items():
-                    data_type = self.converter.python_to_db_type(value)
-                    serialized_value = self.converter.serialize_value(value)
-                    
-                    conn.execute(
-                        "INSERT OR REPLACE INTO tool_settings (tool_name, setting_path, setting_value, data_type) VALUES (?, ?, ?, ?)",
-                        (tool_name, setting_path, serialized_value, data_type)
-                    )
+                    rows.append((tool_name, setting_path, self.converter.serialize_value(value),
+                                 self.converter.python_to_db_type(value)))
             else:
                 # Simple tool setting
-                data_type = self.converter.python_to_db_type(tool_config)
-                serialized_value = self.converter.serialize_value(tool_config)
-                
-                conn.execute(
-                    "INSERT OR REPLACE INTO tool_settings (tool_name, setting_path, setting_value, data_type) VALUES (?, ?, ?, ?)",
-                    (tool_name, 'value', serialized_value, data_type)
-                )
+                rows.append((tool_name, 'value', self.converter.serialize_value(tool_config),
+                             self.converter.python_to_db_type(tool_config)))
+        return rows
     
-    def _migrate_tab_content(self, conn: sqlite3.Connection, json_data: Dict[str, Any]) -> None:
+    def _tab_content_rows(self, json_data: Dict[str, Any]) -> Tuple[List[tuple], List[tuple], List[tuple]]:
         """
-        Migrate input_tabs and output_tabs arrays to database.
+        Build tab rows from the input_tabs and output_tabs arrays.
+        
+        Large tabs are stored as content-addressed blobs (see TabContentStore)
+        and keep an empty inline content row.
         
         Args:
-            conn: Database connection
             json_data: Full JSON data structure
+            
+        Returns:
+            (tab_content rows, tab_content_refs rows, tab_blobs rows)
         """
-        # Migrate input tabs
-        if 'input_tabs' in json_data:
-            input_tabs = json_data['input_tabs']
-            for i, content in enumerate(input_tabs):
-                conn.execute(
-                    "INSERT OR REPLACE INTO tab_content (tab_type, tab_index, content) VALUES (?, ?, ?)",
-                    ('input', i, content or '')
-                )
-        
-        # Migrate output tabs
-        if 'output_tabs' in json_data:
-            output_tabs = json_data['output_tabs']
-            for i, content in enumerate(output_tabs):
-                conn.execute(
-                    "INSERT OR REPLACE INTO tab_content (tab_type, tab_index, content) VALUES (?, ?, ?)",
-                    ('output', i, content or '')
-                )
+        content_rows, ref_rows, blob_rows = [], [], []
+        for key, tab_type in (('input_tabs', 'input'), ('output_tabs', 'output')):
+            if key in json_data:
+                for i, content in enumerate(json_data[key]):
+                    content_row, ref_row, blob_row = self.tab_store.tab_rows(tab_type, i, content)
+                    content_rows.append(content_row)
+                    ref_rows.append(ref_row)
+                    if blob_row is not None:
+                        blob_rows.append(blob_row)
+        return content_rows, ref_rows, blob_rows
     
-    def _migrate_performance_settings(self, conn: sqlite3.Connection, performance_settings: Dict[str, Any]) -> None:
+    def _performance_settings_rows(self, performance_settings: Dict[str, Any]) -> List[tuple]:
         """
-        Migrate performance settings with nested structure support.
+        Build performance setting rows with nested structure support.
         
         Args:
-            conn: Database connection
             performance_settings: Performance settings dictionary
         """
+        rows = []
         for category, settings in performance_settings.items():
             if isinstance(settings, dict):
                 # Nested performance category
                 flattened = self._flatten_nested_dict(settings)
                 
                 for setting_key, value in flattened.items():
-                    data_type = self.converter.python_to_db_type(value)
-                    serialized_value = self.converter.serialize_value(value)
-                    
-                    conn.execute(
-                        "INSERT OR REPLACE INTO performance_settings (category, setting_key, setting_value, data_type) VALUES (?, ?, ?, ?)",
-                        (category, setting_key, serialized_value, data_type)
-                    )
+                    rows.append((category, setting_key, self.converter.serialize_value(value),
+                                 self.converter.python_to_db_type(value)))
             else:
                 # Simple performance setting
-                data_type = self.converter.python_to_db_type(settings)
-                serialized_value = self.converter.serialize_value(settings)
-                
-                conn.execute(
-                    "INSERT OR REPLACE INTO performance_settings (category, setting_key, setting_value, data_type) VALUES (?, ?, ?, ?)",
-                    (category, 'value', serialized_value, data_type)
-                )
+                rows.append((category, 'value', self.converter.serialize_value(settings),
+                             self.converter.python_to_db_type(settings)))
+        return rows
     
-    def _migrate_font_settings(self, conn: sqlite3.Connection, font_settings: Dict[str, Any]) -> None:
+    def _font_settings_rows(self, font_settings: Dict[str, Any]) -> List[tuple]:
         """
-        Migrate font settings with platform-specific fallbacks.
+        Build font setting rows.
         
         Args:
-            conn: Database connection
             font_settings: Font settings dictionary
         """
+        rows = []
         for font_type, font_config in font_settings.items():
             if isinstance(font_config, dict):
                 for property_name, value in font_config.items():
-                    data_type = self.converter.python_to_db_type(value)
-                    serialized_value = self.converter.serialize_value(value)
-                    
-                    conn.execute(
-                        "INSERT OR REPLACE INTO font_settings (font_type, property, value, data_type) VALUES (?, ?, ?, ?)",
-                        (font_type, property_name, serialized_value, data_type)
-                    )
+                    rows.append((font_type, property_name, self.converter.serialize_value(value),
+                                 self.converter.python_to_db_type(value)))
+        return rows
     
-    def _migrate_dialog_settings(self, conn: sqlite3.Connection, dialog_settings: Dict[str, Any]) -> None:
+    def _dialog_settings_rows(self, dialog_settings: Dict[str, Any]) -> List[tuple]:
         """
-        Migrate dialog settings with category-based organization.
+        Build dialog setting rows with category-based organization.
         
         Args:
-            conn: Database connection
             dialog_settings: Dialog settings dictionary
         """
+        rows = []
         for category, dialog_config in dialog_settings.items():
             if isinstance(dialog_config, dict):
                 for property_name, value in dialog_config.items():
-                    data_type = self.converter.python_to_db_type(value)
-                    serialized_value = self.converter.serialize_value(value)
-                    
-                    self.logger.debug(f"Inserting dialog setting: {category}.{property_name} = {value} (type: {data_type})")
-                    
-                    conn.execute(
-                        "INSERT OR REPLACE INTO dialog_settings (category, property, value, data_type) VALUES (?, ?, ?, ?)",
-                        (category, property_name, serialized_value, data_type)
-                    )
+                    rows.append((category, property_name, self.converter.serialize_value(value),
+                                 self.converter.python_to_db_type(value)))
+        return rows
     
     def _update_migration_metadata(self, conn: sqlite3.Connection) -> None:
         """Update migration metadata in database."""
@@ -656,6 +672,21 @@ class MigrationManager:
             elif tab_type == 'output' and 0 <= tab_index < 7:
                 tab_content['output_tabs'][tab_index] = content or ''
         
+        # Large tabs live in tab_blobs
+        try:
+            refs = conn.execute(
+                "SELECT r.tab_type, r.tab_index, r.content_hash, b.depth FROM tab_content_refs r "
+                "JOIN tab_blobs b ON b.hash = r.content_hash"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            refs = []
+        for tab_type, tab_index, digest, depth in refs:
+            key = f"{tab_type}_tabs"
+            if key in tab_content and 0 <= tab_index < 7:
+                text = self.tab_store.load_text(conn, digest)
+                self.tab_store.remember(tab_type, tab_index, digest, text, depth)
+                tab_content[key][tab_index] = text
+        
         return tab_content
     
     def _extract_performance_settings(self, conn: sqlite3.Connection) -> Dict[str, Any]:
@@ -9,6 +9,8 @@ maintain consistency across the application.
 
 Features:
 - Machine-specific encryption using PBKDF2 + Fernet
+- Key derived once per process and cached (NoteKeyManager)
+- Batch encrypt/decrypt APIs for many fields at once
 - Automatic detection of sensitive data patterns
 - ENC: prefix convention for encrypted content
 - Backward compatibility with unencrypted notes
@@ -17,8 +19,10 @@ Author: Pomera AI Commander
 """
 
 import re
+import time
 import base64
-from typing import Dict, Any, Optional, Tuple
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 # Encryption support (same as curl_tool.py)
 try:
@@ -32,11 +36,16 @@ except ImportError:
 import os
 
 
-def get_system_encryption_key():
+ENCRYPTED_PREFIX = "ENC:"
+
+
+def _derive_system_encryption_key():
     """
-    Generate encryption key based on system characteristics (same as AI Tools).
+    Derive the Fernet key from system characteristics (same as AI Tools).
     
     Uses platform-native methods that work in all contexts including MCP subprocess.
+    This runs PBKDF2 with 100,000 iterations; callers should go through
+    get_system_encryption_key(), which caches the result per process.
     
     Returns:
         Fernet instance or None if encryption unavailable
@@ -67,6 +76,160 @@ def get_system_encryption_key():
         return None
 
 
+class NoteKeyManager:
+    """
+    Process-wide cache for the derived note encryption key.
+    
+    PBKDF2 runs once per process; every later encrypt/decrypt reuses the
+    cached Fernet instance (Fernet is stateless and safe to share across
+    threads). Timings are kept so pomera_diagnose can show that key
+    derivation is no longer on the notes hot path.
+    """
+    
+    def __init__(self, key_factory=None):
+        self._key_factory = key_factory or _derive_system_encryption_key
+        self._lock = threading.Lock()
+        self._fernet = None
+        self._derivations = 0
+        self._derivation_ms = 0.0
+        self._cache_hits = 0
+        self._encrypt_calls = 0
+        self._encrypt_ms = 0.0
+        self._decrypt_calls = 0
+        self._decrypt_ms = 0.0
+    
+    def get_fernet(self):
+        """Return the cached Fernet instance, deriving it on first use."""
+        with self._lock:
+            # Counters are shared with other threads, so even hits take the lock
+            if self._fernet is not None:
+                self._cache_hits += 1
+                return self._fernet
+            
+            start = time.perf_counter()
+            fernet = self._key_factory()
+            self._derivation_ms += (time.perf_counter() - start) * 1000
+            self._derivations += 1
+            # Failures are not cached so a later call can retry
+            self._fernet = fernet
+            return fernet
+    
+    def reset(self) -> None:
+        """Drop the cached key and counters (next call re-derives)."""
+        with self._lock:
+            self._fernet = None
+            self._derivations = 0
+            self._derivation_ms = 0.0
+            self._cache_hits = 0
+            self._encrypt_calls = 0
+            self._encrypt_ms = 0.0
+            self._decrypt_calls = 0
+            self._decrypt_ms = 0.0
+    
+    def encrypt_many(self, contents: Iterable[str]) -> List[str]:
+        """
+        Encrypt several fields with one key lookup.
+        
+        Empty and already-encrypted values are passed through unchanged,
+        as are all values if encryption is unavailable.
+        """
+        contents = list(contents)
+        if not ENCRYPTION_AVAILABLE:
+            return contents
+        
+        start = time.perf_counter()
+        fernet = None
+        results = []
+        for content in contents:
+            if not content or content.startswith(ENCRYPTED_PREFIX):
+                results.append(content)
+                continue
+            if fernet is None:
+                fernet = self.get_fernet()
+                if fernet is None:
+                    return contents
+            try:
+                encrypted = fernet.encrypt(content.encode())
+                results.append(ENCRYPTED_PREFIX + base64.urlsafe_b64encode(encrypted).decode())
+            except Exception:
+                results.append(content)  # Fallback to unencrypted if encryption fails
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._encrypt_calls += len(contents)
+            self._encrypt_ms += elapsed_ms
+        return results
+    
+    def decrypt_many(self, contents: Iterable[str]) -> List[str]:
+        """
+        Decrypt several fields with one key lookup.
+        
+        Values without the ENC: prefix are passed through unchanged; values
+        that fail to decrypt are returned in their encrypted form.
+        """
+        contents = list(contents)
+        if not ENCRYPTION_AVAILABLE:
+            return contents
+        
+        start = time.perf_counter()
+        fernet = None
+        results = []
+        for content in contents:
+            if not content or not content.startswith(ENCRYPTED_PREFIX):
+                results.append(content)
+                continue
+            if fernet is None:
+                fernet = self.get_fernet()
+                if fernet is None:
+                    return contents
+            try:
+                encrypted_bytes = base64.urlsafe_b64decode(content[len(ENCRYPTED_PREFIX):].encode())
+                results.append(fernet.decrypt(encrypted_bytes).decode())
+            except Exception:
+                results.append(content)
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._decrypt_calls += len(contents)
+            self._decrypt_ms += elapsed_ms
+        return results
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Key cache statistics for pomera_diagnose."""
+        with self._lock:
+            return {
+                "key_cached": self._fernet is not None,
+                "key_derivations": self._derivations,
+                "key_derivation_ms": round(self._derivation_ms, 1),
+                "key_cache_hits": self._cache_hits,
+                "fields_encrypted": self._encrypt_calls,
+                "encrypt_ms_total": round(self._encrypt_ms, 2),
+                "fields_decrypted": self._decrypt_calls,
+                "decrypt_ms_total": round(self._decrypt_ms, 2),
+                "avg_decrypt_ms": round(self._decrypt_ms / self._decrypt_calls, 3) if self._decrypt_calls else 0,
+            }
+
+
+_key_manager = NoteKeyManager()
+
+
+def get_key_manager() -> NoteKeyManager:
+    """Return the process-wide NoteKeyManager."""
+    return _key_manager
+
+
+def get_system_encryption_key():
+    """
+    Get the machine-specific Fernet instance (derived once per process).
+    
+    Returns:
+        Fernet instance or None if encryption unavailable
+    """
+    if not ENCRYPTION_AVAILABLE:
+        return None
+    return _key_manager.get_fernet()
+
+
 def encrypt_note_content(content: str) -> str:
     """
     Encrypt note content for storage.
@@ -77,22 +240,7 @@ def encrypt_note_content(content: str) -> str:
     Returns:
         Encrypted content with "ENC:" prefix, or original content if encryption fails
     """
-    if not content or not ENCRYPTION_AVAILABLE:
-        return content
-    
-    # Check if already encrypted (starts with our prefix)
-    if content.startswith("ENC:"):
-        return content
-    
-    try:
-        fernet = get_system_encryption_key()
-        if not fernet:
-            return content
-        
-        encrypted = fernet.encrypt(content.encode())
-        return "ENC:" + base64.urlsafe_b64encode(encrypted).decode()
-    except Exception:
-        return content  # Fallback to unencrypted if encryption fails
+    return _key_manager.encrypt_many([content])[0]
 
 
 def decrypt_note_content(encrypted_content: str) -> str:
@@ -105,25 +253,33 @@ def decrypt_note_content(encrypted_content: str) -> str:
     Returns:
         Decrypted content, or original content if not encrypted/decryption fails
     """
-    if not encrypted_content or not ENCRYPTION_AVAILABLE:
-        return encrypted_content
+    return _key_manager.decrypt_many([encrypted_content])[0]
+
+
+def encrypt_note_fields(contents: Iterable[str]) -> List[str]:
+    """
+    Encrypt many note fields at once (e.g. Input and Output of a note).
     
-    # Check if encrypted (starts with our prefix)
-    if not encrypted_content.startswith("ENC:"):
-        return encrypted_content  # Not encrypted, return as-is
+    Args:
+        contents: Plain text values; empty or already-encrypted values pass through
+        
+    Returns:
+        List of values in the same order
+    """
+    return _key_manager.encrypt_many(contents)
+
+
+def decrypt_note_fields(contents: Iterable[str]) -> List[str]:
+    """
+    Decrypt many note fields at once (e.g. every row of a listing).
     
-    try:
-        fernet = get_system_encryption_key()
-        if not fernet:
-            return encrypted_content
+    Args:
+        contents: Values that may carry the "ENC:" prefix
         
-        # Remove prefix and decrypt
-        encrypted_data = encrypted_content[4:]  # Remove "ENC:" prefix
-        encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode())
-        decrypted = fernet.decrypt(encrypted_bytes)
-        return decrypted.decode()
-    except Exception:
-        return encrypted_content  # Fallback to encrypted value if decryption fails
+    Returns:
+        List of values in the same order
+    """
+    return _key_manager.decrypt_many(contents)
 
 
 def is_encrypted(content: str) -> bool:
@@ -136,7 +292,7 @@ def is_encrypted(content: str) -> bool:
     Returns:
         True if content starts with "ENC:" prefix
     """
-    return bool(content and content.startswith("ENC:"))
+    return bool(content and content.startswith(ENCRYPTED_PREFIX))
 
 
 # Try to import detect-secrets library (optional enhancement)
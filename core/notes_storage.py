@@ -0,0 +1,263 @@
+"""
+Notes Storage - Pooled SQLite connections for notes.db
+
+Both the MCP notes handlers (core/mcp/tool_registry.py) and the GUI
+NotesWidget open notes.db many times per session. Opening a fresh
+sqlite3 connection per operation pays connection setup and pragma
+configuration every time and throws away SQLite's prepared-statement
+cache. This module keeps a small pool of long-lived, pre-configured
+connections per database file, similar to how DatabaseConnectionManager
+treats settings.db.
+
+Features:
+- One process-wide pool per notes.db path (get_notes_pool)
+- WAL journal mode, synchronous=NORMAL and busy timeout on every connection
+- Prepared-statement reuse via sqlite3's per-connection statement cache
+- Thread-safe checkout: a connection is used by one thread at a time
+- Backward compatible: close() on a pooled connection returns it to the pool
+
+Usage:
+    from core.notes_storage import get_notes_pool
+
+    pool = get_notes_pool(db_path)
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO notes ...", params)
+    # committed and returned to the pool here
+
+Author: Pomera AI Commander
+"""
+
+import os
+import atexit
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Generator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Idle connections kept per database; extra connections are closed on release
+DEFAULT_POOL_SIZE = 4
+# Per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_SECONDS = 10.0
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that returns itself to its pool on close().
+
+    Existing code that follows the connect/commit/close pattern keeps
+    working unchanged; the underlying database handle stays open so the
+    statement cache and pragmas survive between operations.
+    """
+
+    _pool: Optional["NotesConnectionPool"] = None
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def _close_for_real(self) -> None:
+        self._pool = None
+        super().close()
+
+
+class NotesConnectionPool:
+    """
+    Thread-safe pool of long-lived SQLite connections for one notes database.
+
+    Connections are created on demand; at most ``pool_size`` idle
+    connections are kept. A connection that is never released (e.g. a
+    caller raised before close()) is simply closed by garbage collection,
+    so the pool can never deadlock waiting for it.
+    """
+
+    def __init__(self, db_path: str, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            db_path: Path to notes.db
+            pool_size: Maximum number of idle connections to keep
+        """
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._idle: List[PooledConnection] = []
+        self._closed = False
+
+        # Statistics
+        self._created = 0
+        self._reused = 0
+        self._checked_out = 0
+        self._wal_enabled: Optional[bool] = None
+
+    def _create_connection(self) -> PooledConnection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=PooledConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()
+            self._wal_enabled = bool(mode and str(mode[0]).lower() == "wal")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        except sqlite3.Error as e:
+            # Read-only or exotic filesystems: keep the connection usable
+            logger.warning(f"Failed to configure notes connection pragmas: {e}")
+        with self._lock:
+            self._created += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """
+        Check out a connection.
+
+        The caller must call close() (or release()) when done; prefer the
+        connection() context manager.
+        """
+        stale: List[PooledConnection] = []
+        # If notes.db was deleted, idle handles still point at the unlinked file
+        if self._idle and not os.path.exists(self.db_path):
+            with self._lock:
+                stale, self._idle = self._idle, []
+        for old in stale:
+            old._close_for_real()
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Notes connection pool is closed")
+            conn = self._idle.pop() if self._idle else None
+            self._checked_out += 1
+            if conn is not None:
+                self._reused += 1
+
+        if conn is None:
+            try:
+                conn = self._create_connection()
+            except Exception:
+                with self._lock:
+                    self._checked_out -= 1
+                raise
+
+        conn._pool = self
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """Return a connection to the pool, rolling back any open transaction."""
+        if conn._pool is not self:
+            return  # Already released
+        conn._pool = None
+
+        keep = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            keep = True
+        except sqlite3.Error as e:
+            logger.debug(f"Discarding broken notes connection: {e}")
+
+        with self._lock:
+            self._checked_out = max(0, self._checked_out - 1)
+            if keep and not self._closed and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn._close_for_real()
+
+    @contextmanager
+    def connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Provide a pooled connection.
+
+        Commits on success, rolls back on error, and returns the
+        connection to the pool either way.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self) -> None:
+        """Close idle connections and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                conn._close_for_real()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool statistics for diagnostics."""
+        with self._lock:
+            total = self._created + self._reused
+            return {
+                "db_path": self.db_path,
+                "connections_created": self._created,
+                "connections_reused": self._reused,
+                "reuse_rate": f"{(self._reused / total * 100):.1f}%" if total else "0%",
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "pool_size": self.pool_size,
+                "wal_enabled": self._wal_enabled,
+            }
+
+
+_pools: Dict[str, NotesConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_notes_pool(db_path: str) -> NotesConnectionPool:
+    """
+    Get the process-wide pool for a notes database, creating it on first use.
+
+    Args:
+        db_path: Path to notes.db (normalized so equivalent paths share a pool)
+    """
+    key = os.path.normcase(os.path.abspath(db_path))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = NotesConnectionPool(db_path)
+            _pools[key] = pool
+        return pool
+
+
+def close_notes_pools() -> None:
+    """Close every notes pool (used at shutdown and by tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+def get_notes_pool_stats() -> List[Dict[str, Any]]:
+    """Statistics for every open notes pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
+
+
+atexit.register(close_notes_pools)
@@ -9,6 +9,8 @@ from typing import Dict, Optional, Tuple, List
 from dataclasses import dataclass
 from functools import lru_cache
 
+from core.text_stats_engine import scan_text
+
 
 @dataclass
 class TextStructure:
@@ -261,30 +263,15 @@ class OptimizedPatternEngine:
         else:
             structure.processing_method = "regex"
         
-        # Character counts
-        char_count, byte_count = self.count_characters_unicode_aware(text)
-        structure.char_count = byte_count  # Use byte count for consistency
-        
-        # Line count (always fast)
-        structure.line_count = self.count_lines_fast(text)
-        
-        # Word count (optimized based on size)
-        structure.word_count = self.count_words_fast(text)
-        
-        # Sentence count (optimized based on size)
-        structure.sentence_count = self.count_sentences_fast(text)
-        
-        # Paragraph count (optimized based on size)
-        structure.paragraph_count = self.count_paragraphs_fast(text)
-        
-        # Whitespace count (fast string method)
-        structure.whitespace_count = sum(1 for c in text if c.isspace())
-        
-        # Punctuation count (fast character check)
-        structure.punctuation_count = sum(
-            1 for c in text 
-            if unicodedata.category(c).startswith('P')
-        )
+        # All counts come from one pass of the shared scanner
+        stats = scan_text(text)
+        structure.char_count = stats.byte_count  # Use byte count for consistency
+        structure.line_count = stats.line_count
+        structure.word_count = stats.word_count
+        structure.sentence_count = stats.sentence_count
+        structure.paragraph_count = stats.paragraph_count
+        structure.whitespace_count = stats.whitespace_count
+        structure.punctuation_count = stats.punctuation_count
         
         # Record processing time
         structure.processing_time_ms = (time.time() - start_time) * 1000
@@ -18,7 +18,8 @@ import hashlib
 from typing import Optional, Callable, Dict, Any, List
 from dataclasses import dataclass, field
 from enum import Enum
-import re
+
+from core.text_stats_engine import TextScanner, scan_text
 
 
 class CalculationStatus(Enum):
@@ -129,10 +130,6 @@ class ProgressiveStatsCalculator:
         self.active_calculations: Dict[str, CalculationTask] = {}
         self.calculation_lock = threading.RLock()
         
-        # Regex patterns (compiled once for performance)
-        self.word_pattern = re.compile(r'\b\w+\b')
-        self.sentence_pattern = re.compile(r'[.!?]+')
-        
         # Statistics
         self.stats = {
             'total_calculations': 0,
@@ -219,11 +216,8 @@ class ProgressiveStatsCalculator:
         # Calculate number of chunks
         total_chunks = (text_length + task.chunk_size - 1) // task.chunk_size
         
-        # Initialize accumulators
-        total_char_count = 0
-        total_word_count = 0
-        total_sentence_count = 0
-        total_line_count = 0
+        # Chunks are fed to one scanner so counts match a whole-text scan
+        scanner = TextScanner()
         
         try:
             # Process text in chunks
@@ -239,13 +233,7 @@ class ProgressiveStatsCalculator:
                 chunk = text[start_pos:end_pos]
                 
                 # Process chunk
-                chunk_stats = self._process_chunk(chunk, start_pos, end_pos, text_length)
-                
-                # Accumulate results
-                total_char_count += chunk_stats['char_count']
-                total_word_count += chunk_stats['word_count']
-                total_sentence_count += chunk_stats['sentence_count']
-                total_line_count += chunk_stats['line_count']
+                scanner.feed(chunk)
                 
                 # Calculate progress
                 chunks_processed = chunk_idx + 1
@@ -278,14 +266,15 @@ class ProgressiveStatsCalculator:
                     time.sleep(0.001)  # Small sleep to yield control
             
             # Calculation complete
+            scan = scanner.finish()
             calculation_time_ms = (time.time() - start_time) * 1000.0
             
             # Create final stats
             stats = TextStats(
-                char_count=total_char_count,
-                word_count=total_word_count,
-                sentence_count=total_sentence_count,
-                line_count=total_line_count,
+                char_count=scan.byte_count,
+                word_count=scan.word_count,
+                sentence_count=scan.sentence_count,
+                line_count=scan.line_count,
                 token_count=max(1, round(text_length / 4)),
                 content_hash=self._generate_content_hash(text),
                 calculation_time_ms=calculation_time_ms,
@@ -335,45 +324,6 @@ class ProgressiveStatsCalculator:
             with self.calculation_lock:
                 self.active_calculations.pop(task.calculation_id, None)
     
-    def _process_chunk(self, chunk: str, start_pos: int, end_pos: int, total_length: int) -> Dict[str, int]:
-        """
-        Process a single chunk of text.
-        
-        Args:
-            chunk: Text chunk to process
-            start_pos: Start position in original text
-            end_pos: End position in original text
-            total_length: Total length of original text
-            
-        Returns:
-            Dictionary with chunk statistics
-        """
-        # Character count (bytes)
-        char_count = len(chunk.encode('utf-8'))
-        
-        # Word count
-        words = self.word_pattern.findall(chunk)
-        word_count = len(words)
-        
-        # Sentence count
-        sentences = self.sentence_pattern.findall(chunk)
-        sentence_count = len(sentences)
-        
-        # Line count
-        line_count = chunk.count('\n')
-        
-        # Adjust counts for chunk boundaries
-        # Only count full lines for first and last chunks
-        if start_pos == 0 and chunk.strip():
-            line_count += 1  # Add first line
-        
-        return {
-            'char_count': char_count,
-            'word_count': word_count,
-            'sentence_count': sentence_count,
-            'line_count': line_count
-        }
-    
     def _calculate_stats_fast(self, text: str) -> TextStats:
         """
         Fast calculation for small text content.
@@ -386,17 +336,7 @@ class ProgressiveStatsCalculator:
         """
         start_time = time.time()
         
-        # Basic statistics
-        char_count = len(text.encode('utf-8'))
-        line_count = text.count('\n') + (1 if text.strip() else 0)
-        
-        # Word statistics
-        words = self.word_pattern.findall(text)
-        word_count = len(words)
-        
-        # Sentence statistics
-        sentences = self.sentence_pattern.findall(text)
-        sentence_count = len(sentences)
+        scan = scan_text(text)
         
         # Token count (rough estimate: 1 token ≈ 4 characters)
         token_count = max(1, round(len(text) / 4))
@@ -404,10 +344,10 @@ class ProgressiveStatsCalculator:
         calculation_time_ms = (time.time() - start_time) * 1000.0
         
         return TextStats(
-            char_count=char_count,
-            word_count=word_count,
-            sentence_count=sentence_count,
-            line_count=line_count,
+            char_count=scan.byte_count,
+            word_count=scan.word_count,
+            sentence_count=scan.sentence_count,
+            line_count=scan.line_count,
             token_count=token_count,
             content_hash=self._generate_content_hash(text),
             calculation_time_ms=calculation_time_ms,
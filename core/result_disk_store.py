@@ -0,0 +1,384 @@
+"""
+Result Disk Store - Sharded, append-only on-disk tier for ContentHashCache
+
+ContentHashCache used to pickle its whole OrderedDict on every change and
+unpickle it at startup, discarding the file once it was a day old. This
+store keeps each cached result as one record appended to one of 16 shard
+logs, chosen by the first hex digit of the cache key. Nothing is read at
+startup; a shard's index is built from its record headers the first time
+a key in that shard is looked up.
+
+Features:
+- One append per cached result (no rewrite of the whole cache)
+- Per-record expiry time; expired records are skipped and compacted away
+- Lazy per-shard indexes built by scanning headers only
+- Tombstones for deleted entries, last record for a key wins
+- Shards are compacted when they exceed their share of the size limit or
+  are mostly dead records
+- Safe to share between processes (the GUI and the MCP server use the same
+  directory): every shard operation holds a lock file, and an index catches
+  up with records other processes appended, or reloads after they compacted
+
+Record layout:
+    header  struct '>16sddII'  key, created, expires_at, meta_len, data_len
+    meta    JSON (tool_name, tool_settings, processing_time_ms, hashes)
+    data    zlib-compressed UTF-8 result (empty for a tombstone)
+
+Usage:
+    store = ResultDiskStore("content_cache")
+    store.put(key_hex, meta, compressed, created, expires_at)
+    record = store.get(key_hex)
+
+Author: Pomera AI Commander
+"""
+
+import os
+import json
+import struct
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+SHARD_COUNT = 16
+DEFAULT_MAX_DISK_MB = 200
+
+# Compact a shard when more than this share of its bytes is dead
+COMPACT_DEAD_RATIO = 0.5
+COMPACT_MIN_BYTES = 1024 * 1024
+
+_HEADER = struct.Struct('>16sddII')
+_SHARD_PATTERN = "results-{:x}.log"
+_LOCK_PATTERN = "results-{:x}.lock"
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` (created if missing) across processes."""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after ten seconds; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _IndexEntry:
+    __slots__ = ('offset', 'length', 'expires_at', 'tool_name')
+
+    def __init__(self, offset: int, length: int, expires_at: float, tool_name: str):
+        self.offset = offset
+        self.length = length
+        self.expires_at = expires_at
+        self.tool_name = tool_name
+
+
+class _Shard:
+    """Index and byte accounting for one shard log."""
+
+    def __init__(self, path: Path, lock_path: Path):
+        self.path = path
+        self.lock_path = lock_path
+        self.index: Optional[Dict[bytes, _IndexEntry]] = None
+        self.size = 0
+        self.live_bytes = 0
+        # (st_dev, st_ino) of the file the index describes; a compaction
+        # in another process replaces the file and changes it
+        self.identity: Optional[Tuple[int, int]] = None
+
+
+class ResultDiskStore:
+    """
+    Sharded append-only store of compressed results keyed by cache key.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike],
+                 max_disk_mb: int = DEFAULT_MAX_DISK_MB):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_shard_bytes = max_disk_mb * 1024 * 1024 // SHARD_COUNT
+        self._lock = threading.Lock()
+        self._shards = [_Shard(self.directory / _SHARD_PATTERN.format(i),
+                               self.directory / _LOCK_PATTERN.format(i))
+                        for i in range(SHARD_COUNT)]
+        self._stats = {'reads': 0, 'hits': 0, 'writes': 0, 'bytes_written': 0,
+                       'compactions': 0, 'index_loads': 0, 'index_refreshes': 0,
+                       'key_mismatches': 0}
+
+    def _shard(self, key: bytes) -> _Shard:
+        return self._shards[key[0] >> 4]
+
+    def _sync(self, shard: _Shard) -> None:
+        """
+        Bring a shard's index up to date with its file.
+
+        Records appended by other processes are indexed incrementally; a
+        replaced (compacted), shrunk or deleted file is indexed from scratch.
+        Caller holds self._lock and the shard's file lock.
+        """
+        try:
+            st = os.stat(shard.path)
+        except FileNotFoundError:
+            shard.index = {}
+            shard.size = 0
+            shard.live_bytes = 0
+            shard.identity = None
+            return
+        except OSError as e:
+            logger.warning(f"Content cache shard {shard.path.name} cannot be read: {e}")
+            return
+        identity = (st.st_dev, st.st_ino)
+        if shard.index is None or identity != shard.identity or st.st_size < shard.size:
+            self._load_index(shard)
+        elif st.st_size > shard.size:
+            self._load_index(shard, incremental=True)
+            self._stats['index_refreshes'] += 1
+
+    def _load_index(self, shard: _Shard, incremental: bool = False) -> None:
+        """
+        Build a shard's index by reading record headers and metadata only.
+
+        With ``incremental`` only the records past the indexed size are read.
+        Caller holds the shard's file lock.
+        """
+        if incremental:
+            index, live_bytes, offset = shard.index, shard.live_bytes, shard.size
+        else:
+            index, live_bytes, offset = {}, 0, 0
+        try:
+            with open(shard.path, 'rb') as f:
+                f.seek(offset)
+                while True:
+                    header = f.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        break
+                    key, _, expires_at, meta_len, data_len = _HEADER.unpack(header)
+                    meta_bytes = f.read(meta_len)
+                    if len(meta_bytes) < meta_len:
+                        break
+                    length = _HEADER.size + meta_len + data_len
+                    if f.seek(data_len, os.SEEK_CUR) > os.fstat(f.fileno()).st_size:
+                        break  # truncated final record
+                    previous = index.pop(key, None)
+                    if previous is not None:
+                        live_bytes -= previous.length
+                    if data_len:
+                        tool_name = json.loads(meta_bytes).get('tool_name', '')
+                        index[key] = _IndexEntry(offset, length, expires_at, tool_name)
+                        live_bytes += length
+                    offset += length
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Content cache shard {shard.path.name} is unreadable, resetting it: {e}")
+            index, live_bytes, offset = {}, 0, 0
+            self._remove(shard.path)
+        identity = None
+        if shard.path.exists():
+            if shard.path.stat().st_size > offset:
+                # Drop a partially written record so later appends stay aligned;
+                # writers hold the file lock, so this is never one in progress
+                with open(shard.path, 'r+b') as f:
+                    f.truncate(offset)
+            st = shard.path.stat()
+            identity = (st.st_dev, st.st_ino)
+        shard.index = index
+        shard.size = offset
+        shard.live_bytes = live_bytes
+        shard.identity = identity
+        if not incremental:
+            self._stats['index_loads'] += 1
+
+    def get(self, key_hex: str) -> Optional[Tuple[Dict[str, Any], bytes, float, float]]:
+        """
+        Look up a result.
+
+        Returns:
+            (meta, compressed data, created, expires_at), or None if the key
+            is missing or expired
+        """
+        key = bytes.fromhex(key_hex)
+        with self._lock:
+            self._stats['reads'] += 1
+            shard = self._shard(key)
+            with _file_lock(shard.lock_path):
+                self._sync(shard)
+                entry = shard.index.get(key)
+                if entry is None:
+                    return None
+                if entry.expires_at <= time.time():
+                    del shard.index[key]
+                    shard.live_bytes -= entry.length
+                    return None
+                try:
+                    with open(shard.path, 'rb') as f:
+                        f.seek(entry.offset)
+                        record = f.read(entry.length)
+                except OSError as e:
+                    logger.warning(f"Content cache read failed: {e}")
+                    return None
+            if len(record) < _HEADER.size or record[:16] != key:
+                # The index no longer describes the file; never hand back
+                # another key's result
+                logger.warning(f"Content cache shard {shard.path.name} index is stale, reloading it")
+                self._stats['key_mismatches'] += 1
+                shard.index = None
+                return None
+            self._stats['hits'] += 1
+
+        _, created, expires_at, meta_len, _ = _HEADER.unpack_from(record)
+        meta = json.loads(record[_HEADER.size:_HEADER.size + meta_len])
+        return meta, record[_HEADER.size + meta_len:], created, expires_at
+
+    def put(self, key_hex: str, meta: Dict[str, Any], data: bytes,
+            created: float, expires_at: float) -> None:
+        """Append a result record (replacing any earlier one for the key)."""
+        key = bytes.fromhex(key_hex)
+        meta_bytes = json.dumps(meta, default=str).encode('utf-8')
+        record = _HEADER.pack(key, created, expires_at, len(meta_bytes), len(data)) + meta_bytes + data
+        with self._lock:
+            shard = self._shard(key)
+            with _file_lock(shard.lock_path):
+                self._sync(shard)
+                self._append(shard, key, record, expires_at, meta.get('tool_name', ''))
+                self._maybe_compact(shard)
+
+    def delete(self, key_hex: str) -> None:
+        """Remove a result by appending a tombstone."""
+        key = bytes.fromhex(key_hex)
+        with self._lock:
+            shard = self._shard(key)
+            with _file_lock(shard.lock_path):
+                self._sync(shard)
+                if key in shard.index:
+                    self._append(shard, key, _HEADER.pack(key, time.time(), 0.0, 0, 0), 0.0, '')
+
+    def delete_tool(self, tool_name: str) -> int:
+        """Remove all results of one tool. Returns the number removed."""
+        removed = 0
+        with self._lock:
+            for shard in self._shards:
+                with _file_lock(shard.lock_path):
+                    self._sync(shard)
+                    tombstones = [key for key, entry in shard.index.items() if entry.tool_name == tool_name]
+                    for key in tombstones:
+                        self._append(shard, key, _HEADER.pack(key, time.time(), 0.0, 0, 0), 0.0, '')
+                removed += len(tombstones)
+        return removed
+
+    def clear(self) -> None:
+        """Delete all shard files."""
+        with self._lock:
+            for shard in self._shards:
+                with _file_lock(shard.lock_path):
+                    self._remove(shard.path)
+                    shard.index = {}
+                    shard.size = 0
+                    shard.live_bytes = 0
+                    shard.identity = None
+
+    def _append(self, shard: _Shard, key: bytes, record: bytes,
+                expires_at: float, tool_name: str) -> None:
+        # Caller holds self._lock and the shard's file lock, and has synced the index
+        with open(shard.path, 'ab') as f:
+            offset = f.tell()
+            f.write(record)
+            if shard.identity is None:
+                st = os.fstat(f.fileno())
+                shard.identity = (st.st_dev, st.st_ino)
+        previous = shard.index.pop(key, None)
+        if previous is not None:
+            shard.live_bytes -= previous.length
+        if expires_at > 0:
+            shard.index[key] = _IndexEntry(offset, len(record), expires_at, tool_name)
+            shard.live_bytes += len(record)
+        shard.size = offset + len(record)
+        self._stats['writes'] += 1
+        self._stats['bytes_written'] += len(record)
+
+    def _maybe_compact(self, shard: _Shard) -> None:
+        # Caller holds self._lock and the shard's file lock
+        dead = shard.size - shard.live_bytes
+        if shard.size > self.max_shard_bytes or (
+                dead > COMPACT_MIN_BYTES and dead > shard.size * COMPACT_DEAD_RATIO):
+            self._compact(shard)
+
+    def _compact(self, shard: _Shard) -> None:
+        """Rewrite a shard with its live records, newest kept within the size limit."""
+        now = time.time()
+        entries = sorted(((key, entry) for key, entry in shard.index.items() if entry.expires_at > now),
+                         key=lambda item: item[1].offset, reverse=True)
+        budget = self.max_shard_bytes * 3 // 4
+        kept = []
+        total = 0
+        for key, entry in entries:
+            if total + entry.length > budget:
+                break
+            kept.append((key, entry))
+            total += entry.length
+        kept.reverse()
+
+        temp_path = shard.path.with_name(shard.path.name + '.tmp')
+        index: Dict[bytes, _IndexEntry] = {}
+        offset = 0
+        try:
+            with open(shard.path, 'rb') as src, open(temp_path, 'wb') as dst:
+                for key, entry in kept:
+                    src.seek(entry.offset)
+                    dst.write(src.read(entry.length))
+                    index[key] = _IndexEntry(offset, entry.length, entry.expires_at, entry.tool_name)
+                    offset += entry.length
+            os.replace(temp_path, shard.path)
+            st = shard.path.stat()
+        except OSError as e:
+            logger.warning(f"Content cache compaction of {shard.path.name} failed: {e}")
+            self._remove(temp_path)
+            return
+        shard.index = index
+        shard.size = offset
+        shard.live_bytes = offset
+        shard.identity = (st.st_dev, st.st_ino)
+        self._stats['compactions'] += 1
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Disk tier statistics; entry counts cover shards indexed so far."""
+        with self._lock:
+            stats = dict(self._stats)
+            loaded = [shard for shard in self._shards if shard.index is not None]
+            stats['shards_indexed'] = len(loaded)
+            stats['indexed_entries'] = sum(len(shard.index) for shard in loaded)
+            stats['disk_bytes'] = sum(shard.path.stat().st_size
+                                      for shard in self._shards if shard.path.exists())
+        return stats
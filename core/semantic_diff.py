@@ -8,14 +8,17 @@ format-aware comparison that ignores whitespace and formatting differences.
 This module is the core engine for the Smart Diff widget and MCP tools.
 """
 
+import hashlib
 import json
+import threading
 import yaml
 import re
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple, Callable
 from dataclasses import dataclass, field
-from deepdiff import DeepDiff
-from copy import deepcopy
+from copy import copy, deepcopy
 from core.semantic_diff_operators import CaseInsensitiveStringOperator
+from core.structural_diff import StructuralDiff, diff_against_base
 
 
 @dataclass
@@ -177,8 +180,8 @@ class FormatParser:
         Raises:
             ValueError: If format is ambiguous (mixed format indicators)
         """
-        # Use the confidence-based detection
-        detected_format, confidence, candidates = FormatParser.detect_format_with_confidence(text)
+        # Use the confidence-based detection (memoized per content hash)
+        detected_format, confidence, candidates = get_parsed_document_cache().detect_format_with_confidence(text)
         
         # NEW: Raise error on ambiguous format
         if detected_format == 'ambiguous':
@@ -419,6 +422,20 @@ class FormatParser:
         # All retries exhausted
         raise ValueError(f"Parse failed after {max_retries} attempts. Last error: {last_error}")
     
+    @staticmethod
+    def load(text: str, format: str) -> 'ParsedDocument':
+        """
+        Validate and parse text once, reusing earlier results for the same content.
+        
+        Args:
+            text: Input text to parse
+            format: Format type (as for parse(), including 'auto')
+            
+        Returns:
+            Cached ParsedDocument; its data is shared and must not be mutated
+        """
+        return get_parsed_document_cache().load(text, format)
+    
     @staticmethod
     def parse(text: str, format: str) -> Dict[str, Any]:
         """
@@ -763,9 +780,7 @@ class FormatParser:
         """
         import json
         
-        total_keys = FormatParser._count_keys(data)
-        total_values = FormatParser._count_values(data)
-        nesting_depth = FormatParser._calculate_depth(data)
+        total_keys, total_values, nesting_depth = FormatParser._collect_stats(data)
         
         # Calculate approximate size
         try:
@@ -781,40 +796,31 @@ class FormatParser:
         }
     
     @staticmethod
-    def _count_keys(data: Any, count: int = 0) -> int:
-        """Recursively count all keys in nested structure."""
-        if isinstance(data, dict):
-            count += len(data)
-            for value in data.values():
-                count = FormatParser._count_keys(value, count)
-        elif isinstance(data, list):
-            for item in data:
-                count = FormatParser._count_keys(item, count)
-        return count
-    
-    @staticmethod
-    def _count_values(data: Any) -> int:
-        """Count leaf values (non-dict, non-list items)."""
-        if isinstance(data, dict):
-            return sum(FormatParser._count_values(v) for v in data.values())
-        elif isinstance(data, list):
-            return sum(FormatParser._count_values(item) for item in data)
-        else:
-            return 1  # Leaf value
-    
-    @staticmethod
-    def _calculate_depth(data: Any, current_depth: int = 0) -> int:
-        """Calculate maximum nesting depth."""
-        if isinstance(data, dict):
-            if not data:
-                return current_depth
-            return max(FormatParser._calculate_depth(v, current_depth + 1) for v in data.values())
-        elif isinstance(data, list):
-            if not data:
-                return current_depth
-            return max(FormatParser._calculate_depth(item, current_depth + 1) for item in data)
-        else:
-            return current_depth
+    def _collect_stats(data: Any) -> Tuple[int, int, int]:
+        """
+        Count keys (nested), leaf values and maximum nesting depth in one pass.
+        
+        Iterative, so deeply nested documents don't hit the recursion limit.
+        """
+        total_keys = 0
+        total_values = 0
+        max_depth = 0
+        stack = [(data, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if isinstance(node, dict):
+                total_keys += len(node)
+                children = node.values()
+            elif isinstance(node, list):
+                children = node
+            else:
+                total_values += 1
+                children = None
+            if children:
+                stack.extend((child, depth + 1) for child in children)
+            elif depth > max_depth:
+                max_depth = depth
+        return total_keys, total_values, max_depth
     
     @staticmethod
     def validate_with_schema(data: Dict[str, Any], schema: Dict[str, Any], format: str = 'json') -> Dict[str, Any]:
@@ -875,6 +881,174 @@ class FormatParser:
         return result
 
 
+# Source text the parsed-document cache may hold (parsed data is several times larger)
+PARSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+PARSE_CACHE_MAX_ENTRIES = 64
+
+
+def _load_toml(text: str) -> Any:
+    import tomli
+    return tomli.loads(text)
+
+
+# Formats whose validation is just "does it parse": a successful parse is
+# also a successful validation, so the text is only parsed once
+_SINGLE_PASS_LOADERS = {
+    'json': json.loads,
+    'yaml': lambda text: yaml.safe_load(text) or {},
+    'toml': _load_toml,
+}
+
+
+@dataclass
+class ParsedDocument:
+    """One input parsed by FormatParser.load(), with its validation result."""
+    format: str
+    validation: Dict[str, Any]
+    data: Any = None
+    parse_error: Optional[str] = None
+    size: int = 0  # Length of the source text
+    _stats: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    
+    @classmethod
+    def from_text(cls, text: str, format: str) -> 'ParsedDocument':
+        """Validate and parse text, parsing it only once when it is valid."""
+        loader = _SINGLE_PASS_LOADERS.get(format)
+        if loader is not None:
+            try:
+                data = loader(text)
+            except (ValueError, yaml.YAMLError, ImportError):
+                pass  # Fall through for error details and JSON repair
+            else:
+                validation = {
+                    "valid": True,
+                    "error": None,
+                    "error_line": None,
+                    "error_column": None,
+                    "error_suggestion": None,
+                    "warnings": []
+                }
+                return cls(format=format, validation=validation, data=data, size=len(text))
+        
+        validation = FormatParser.validate_format(text, format)
+        try:
+            data = FormatParser.parse(text, format)
+        except ValueError as e:
+            return cls(format=format, validation=validation, parse_error=str(e), size=len(text))
+        return cls(format=format, validation=validation, data=data, size=len(text))
+    
+    @property
+    def warnings(self) -> List[str]:
+        return self.validation['warnings']
+    
+    def get_data(self) -> Any:
+        """
+        Parsed data (shared between callers, treat as read-only).
+        
+        Raises:
+            ValueError: If the text could not be parsed
+        """
+        if self.parse_error is not None:
+            raise ValueError(self.parse_error)
+        return self.data
+    
+    def stats(self) -> Dict[str, Any]:
+        """FormatParser.calculate_stats() of the data, computed once."""
+        if self._stats is None:
+            self._stats = FormatParser.calculate_stats(self.get_data())
+        return dict(self._stats)
+
+
+class ParsedDocumentCache:
+    """
+    LRU cache of ParsedDocuments and format detections keyed by content hash.
+    
+    Documents larger than the byte budget are parsed but not kept.
+    """
+    
+    def __init__(self, max_bytes: int = PARSE_CACHE_MAX_BYTES, max_entries: int = PARSE_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._documents: 'OrderedDict[Tuple[str, bytes], ParsedDocument]' = OrderedDict()
+        self._detections: 'OrderedDict[bytes, Tuple[str, float, List[Tuple[str, float]]]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    
+    def detect_format_with_confidence(self, text: str) -> Tuple[str, float, List[Tuple[str, float]]]:
+        """Memoized FormatParser.detect_format_with_confidence()."""
+        digest = self._digest(text)
+        with self._lock:
+            detection = self._detections.get(digest)
+            if detection is not None:
+                self._detections.move_to_end(digest)
+                return detection
+        detection = FormatParser.detect_format_with_confidence(text)
+        with self._lock:
+            self._detections[digest] = detection
+            while len(self._detections) > self.max_entries:
+                self._detections.popitem(last=False)
+        return detection
+    
+    def load(self, text: str, format: str) -> ParsedDocument:
+        """Return the ParsedDocument for text, parsing it on a miss."""
+        if format == 'auto':
+            format = FormatParser.detect_format(text)
+        key = (format, self._digest(text))
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+        
+        document = ParsedDocument.from_text(text, format)
+        if document.size <= self.max_bytes:
+            with self._lock:
+                if key not in self._documents:
+                    self._documents[key] = document
+                    self._bytes += document.size
+                    while self._bytes > self.max_bytes or len(self._documents) > self.max_entries:
+                        _, evicted = self._documents.popitem(last=False)
+                        self._bytes -= evicted.size
+        return document
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._detections.clear()
+            self._bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'documents': len(self._documents),
+                'detections': len(self._detections),
+                'source_bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0,
+            }
+
+
+_parsed_document_cache: Optional[ParsedDocumentCache] = None
+
+
+def get_parsed_document_cache() -> ParsedDocumentCache:
+    """Get the process-wide parsed document cache."""
+    global _parsed_document_cache
+    if _parsed_document_cache is None:
+        _parsed_document_cache = ParsedDocumentCache()
+    return _parsed_document_cache
+
+
 class SemanticDiffEngine:
     """Core engine for semantic diff and merge operations."""
     
@@ -1029,16 +1203,16 @@ class SemanticDiffEngine:
             if format == 'auto':
                 format = FormatParser.detect_format(before)
             
-            # Pre-validate both inputs and collect warnings
-            warnings = []
-            before_validation = FormatParser.validate_format(before, format)
-            after_validation = FormatParser.validate_format(after, format)
+            # Validate and parse both inputs once (cached per content hash)
+            before_doc = FormatParser.load(before, format)
+            after_doc = FormatParser.load(after, format)
             
             # Collect validation warnings
-            if before_validation['warnings']:
-                warnings.extend([f"Before: {w}" for w in before_validation['warnings']])
-            if after_validation['warnings']:
-                warnings.extend([f"After: {w}" for w in after_validation['warnings']])
+            warnings = []
+            if before_doc.warnings:
+                warnings.extend([f"Before: {w}" for w in before_doc.warnings])
+            if after_doc.warnings:
+                warnings.extend([f"After: {w}" for w in after_doc.warnings])
             
             # Apply whitespace normalization if requested
             normalize_ws = options.get('normalize_whitespace')
@@ -1047,14 +1221,16 @@ class SemanticDiffEngine:
                 ws_options = normalize_ws if isinstance(normalize_ws, dict) else None
                 before = FormatParser.normalize_whitespace(before, ws_options)
                 after = FormatParser.normalize_whitespace(after, ws_options)
+                before_doc = FormatParser.load(before, format)
+                after_doc = FormatParser.load(after, format)
             
-            # Parse both versions (parsing will also handle JSON repair if needed)
-            before_data = FormatParser.parse(before, format)
+            # Parsed data (parsing also handles JSON repair if needed)
+            before_data = before_doc.get_data()
             
             # Progress update: Before parsed (35%)
             update_progress(35)
             
-            after_data = FormatParser.parse(after, format)
+            after_data = after_doc.get_data()
             
             # Progress update: After parsed (60%)
             update_progress(60)
@@ -1104,7 +1280,10 @@ class SemanticDiffEngine:
                 if case_insensitive:
                     diff_config['custom_operators'] = [CaseInsensitiveStringOperator()]
             
-            diff = DeepDiff(before_data, after_data, **diff_config)
+            # Same report as DeepDiff(before_data, after_data, **diff_config),
+            # but identical subtrees are skipped by hash (see core.structural_diff)
+            diff = StructuralDiff(before_data, after_data, diff_config,
+                                  case_insensitive=case_insensitive).to_deepdiff_view()
             
             # Progress update: Diff computation complete (90%)
             update_progress(90)
@@ -1191,8 +1370,8 @@ class SemanticDiffEngine:
             change_percentage = None
             
             if options.get('include_stats', False):
-                before_stats = FormatParser.calculate_stats(before_data)
-                after_stats = FormatParser.calculate_stats(after_data)
+                before_stats = before_doc.stats()
+                after_stats = after_doc.stats()
                 
                 # Calculate change percentage
                 total_before_values = before_stats['total_values']
@@ -1256,7 +1435,10 @@ class SemanticDiffEngine:
             yours: Your changes
             theirs: Their changes
             format: Data format ('json', 'yaml', 'env', 'toml', 'auto')
-            options: Optional settings {auto_merge: bool, conflict_strategy: str}
+            options: Optional settings {auto_merge: bool, conflict_strategy: str,
+                partitioned: bool, max_workers: int}. With partitioned=True the
+                two diffs are split by top-level key and run on max_workers
+                processes (default: CPU count); the result is the same.
             
         Returns:
             SmartMergeResult with merge information and conflicts
@@ -1266,10 +1448,11 @@ class SemanticDiffEngine:
         conflict_strategy = options.get('conflict_strategy', 'report')
         
         try:
-            # Parse all three versions
-            base_data = FormatParser.parse(base, format)
-            yours_data = FormatParser.parse(yours, format)
-            theirs_data = FormatParser.parse(theirs, format)
+            # Parse all three versions (cached per content hash; merging
+            # works on a copy of base_data)
+            base_data = FormatParser.load(base, format).get_data()
+            yours_data = FormatParser.load(yours, format).get_data()
+            theirs_data = FormatParser.load(theirs, format).get_data()
             
             # Detect actual format if auto
             if format == 'auto':
@@ -1292,15 +1475,33 @@ class SemanticDiffEngine:
                 from core.semantic_diff_operators import CaseInsensitiveStringOperator
                 diff_config['custom_operators'] = [CaseInsensitiveStringOperator()]
             
-            # Compare base vs yours (with options)
-            diff_yours = DeepDiff(base_data, yours_data, **diff_config)
-            
-            # Compare base vs theirs (with options)
-            diff_theirs = DeepDiff(base_data, theirs_data, **diff_config)
+            if options.get('partitioned', False):
+                # Both diffs, split by top-level key across worker processes
+                diff_yours, diff_theirs = diff_against_base(
+                    base_data, [yours_data, theirs_data], diff_config,
+                    case_insensitive=case_insensitive, max_workers=options.get('max_workers'))
+            else:
+                # base is hashed once for both diffs
+                base_hashes = {}
+                
+                # Compare base vs yours (with options)
+                diff_yours = StructuralDiff(base_data, yours_data, diff_config, case_insensitive=case_insensitive,
+                                            hashes=base_hashes).to_deepdiff_view()
+                
+                # Compare base vs theirs (with options)
+                diff_theirs = StructuralDiff(base_data, theirs_data, diff_config, case_insensitive=case_insensitive,
+                                             hashes=base_hashes).to_deepdiff_view()
 
             
             # Perform merge
-            merged_data = deepcopy(base_data)
+            if format == 'yaml':
+                # YAML aliases share nodes; a deep copy keeps them shared
+                merged_data = deepcopy(base_data)
+                copied = None
+            else:
+                # Copy-on-write: only containers along merged paths are copied
+                merged_data = copy(base_data)
+                copied = {id(merged_data)}
             conflicts = []
             auto_merged = 0
             
@@ -1321,7 +1522,7 @@ class SemanticDiffEngine:
                     # Check if they made the same change
                     if yours_val == theirs_val:
                         # Same change, auto-merge
-                        self._set_value_at_path(merged_data, path, yours_val)
+                        self._set_value_at_path(merged_data, path, yours_val, copied)
                         auto_merged += 1
                     else:
                         # Conflict!
@@ -1335,19 +1536,19 @@ class SemanticDiffEngine:
                         
                         # Apply conflict strategy
                         if conflict_strategy == 'keep_yours':
-                            self._set_value_at_path(merged_data, path, yours_val)
+                            self._set_value_at_path(merged_data, path, yours_val, copied)
                         elif conflict_strategy == 'keep_theirs':
-                            self._set_value_at_path(merged_data, path, theirs_val)
+                            self._set_value_at_path(merged_data, path, theirs_val, copied)
                         # else: 'report' - leave base value
                 
                 # Only yours modified
                 elif yours_val is not None:
-                    self._set_value_at_path(merged_data, path, yours_val)
+                    self._set_value_at_path(merged_data, path, yours_val, copied)
                     auto_merged += 1
                 
                 # Only theirs modified
                 elif theirs_val is not None:
-                    self._set_value_at_path(merged_data, path, theirs_val)
+                    self._set_value_at_path(merged_data, path, theirs_val, copied)
                     auto_merged += 1
             
             # Serialize merged result
@@ -1407,18 +1608,31 @@ class SemanticDiffEngine:
                 return None
         return current
     
-    def _set_value_at_path(self, data: Dict, path: str, value: Any) -> None:
-        """Set value at nested path in dictionary."""
+    def _set_value_at_path(self, data: Dict, path: str, value: Any, copied: Optional[set] = None) -> None:
+        """
+        Set value at nested path in dictionary.
+        
+        With copied (ids of containers already copied), data shares subtrees
+        with the document it was copied from, and each container along the
+        path is copied before it is modified.
+        """
         keys = path.split('.')
         current = data
         for key in keys[:-1]:
             if key not in current:
                 current[key] = {}
-            current = current[key]
-        current[keys[-1]] = value
+            child = current[key]
+            if copied is not None and isinstance(child, (dict, list)) and id(child) not in copied:
+                child = copy(child)
+                copied.add(id(child))
+                current[key] = child
+            current = child
+        # Without copy-on-write, copy the value, so a later set of a nested
+        # path never writes into the (cached, shared) document it came from
+        current[keys[-1]] = deepcopy(value) if copied is None else value
     
-    def _extract_all_paths(self, diff: DeepDiff, new_data: Any = None) -> Dict[str, Any]:
-        """Extract all changed paths and their new values from DeepDiff."""
+    def _extract_all_paths(self, diff: Dict[str, Any], new_data: Any = None) -> Dict[str, Any]:
+        """Extract all changed paths and their new values from a DeepDiff-style result."""
         paths = {}
         
         if 'values_changed' in diff:
@@ -1497,7 +1711,14 @@ class SemanticDiffEngine:
         
         return '\n'.join(lines) if lines else "No changes detected."
     
-    def _format_3way_output_detailed(self, diff_yours: DeepDiff, diff_theirs: DeepDiff, 
+    def _values_changed_by_path(self, diff: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Map cleaned paths to their values_changed entries."""
+        by_path = {}
+        for diff_path, change in diff.get('values_changed', {}).items():
+            by_path.setdefault(self._clean_path(diff_path), change)
+        return by_path
+    
+    def _format_3way_output_detailed(self, diff_yours: Dict[str, Any], diff_theirs: Dict[str, Any], 
                                      yours_changes: Dict, theirs_changes: Dict, 
                                      conflicts: List[Dict], auto_merged: int) -> str:
         """Format detailed 3-way merge results showing individual changes."""
@@ -1508,6 +1729,10 @@ class SemanticDiffEngine:
         theirs_paths = set(theirs_changes.keys())
         conflict_paths = set(c['path'] for c in conflicts)
         
+        # values_changed entries by cleaned path (first one wins, as a scan would)
+        yours_values_changed = self._values_changed_by_path(diff_yours)
+        theirs_values_changed = self._values_changed_by_path(diff_theirs)
+        
         # Show changes from 'yours' (non-conflicting)
         yours_only = yours_paths - theirs_paths
         if yours_only:
@@ -1517,12 +1742,10 @@ class SemanticDiffEngine:
                 old_val = "N/A"
                 new_val = yours_changes[path]
                 
-                if 'values_changed' in diff_yours:
-                    for diff_path, change in diff_yours['values_changed'].items():
-                        if self._clean_path(diff_path) == path:
-                            old_val = change.get('old_value', 'N/A')
-                            new_val = change.get('new_value', new_val)
-                            break
+                change = yours_values_changed.get(path)
+                if change is not None:
+                    old_val = change.get('old_value', 'N/A')
+                    new_val = change.get('new_value', new_val)
                 
                 lines.append(f"  ✏️  {path}")
                 lines.append(f"      Base:  {old_val}")
@@ -1538,12 +1761,10 @@ class SemanticDiffEngine:
                 old_val = "N/A"
                 new_val = theirs_changes[path]
                 
-                if 'values_changed' in diff_theirs:
-                    for diff_path, change in diff_theirs['values_changed'].items():
-                        if self._clean_path(diff_path) == path:
-                            old_val = change.get('old_value', 'N/A')
-                            new_val = change.get('new_value', new_val)
-                            break
+                change = theirs_values_changed.get(path)
+                if change is not None:
+                    old_val = change.get('old_value', 'N/A')
+                    new_val = change.get('new_value', new_val)
                 
                 lines.append(f"  ✏️  {path}")
                 lines.append(f"      Base:   {old_val}")
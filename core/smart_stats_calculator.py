@@ -15,6 +15,7 @@ import weakref
 
 # Import optimized pattern engine
 from core.optimized_pattern_engine import get_pattern_engine, OptimizedPatternEngine
+from core.text_stats_engine import scan_text
 
 @dataclass
 class ChangeInfo:
@@ -336,36 +337,32 @@ class SmartStatsCalculator:
         return stats
     
     def _calculate_stats_impl(self, text: str, content_hash: str) -> TextStats:
-        """Internal implementation of statistics calculation using optimized pattern engine."""
+        """Internal implementation of statistics calculation using the single-pass scanner."""
         stats = TextStats(content_hash=content_hash)
         
-        # Use optimized pattern engine for fast counting
-        text_structure = self.pattern_engine.analyze_text_structure(text)
+        # One scan yields the basic counts and the word tally
+        scan = scan_text(text)
         
-        # Basic statistics from optimized engine
-        stats.char_count = text_structure.char_count
-        stats.line_count = text_structure.line_count
-        stats.word_count = text_structure.word_count
-        stats.sentence_count = text_structure.sentence_count
-        stats.paragraph_count = text_structure.paragraph_count
+        # Basic statistics
+        stats.char_count = scan.byte_count
+        stats.line_count = scan.line_count
+        stats.word_count = scan.word_count
+        stats.sentence_count = scan.sentence_count
+        stats.paragraph_count = scan.paragraph_count
         
         # Token count (rough estimate: 1 token ≈ 4 characters)
         stats.token_count = max(1, round(len(text) / 4))
         
         # Advanced statistics (if enabled)
         if self.enable_advanced_stats and stats.word_count > 0:
-            # Use regex for word extraction (needed for advanced stats)
-            words = self.word_pattern.findall(text)
+            stats.unique_words = scan.unique_words
+            stats.average_word_length = scan.avg_word_length
             
-            if words:
-                stats.unique_words = len(set(word.lower() for word in words))
-                stats.average_word_length = sum(len(word) for word in words) / len(words)
-                
-                if stats.sentence_count > 0:
-                    stats.average_sentence_length = stats.word_count / stats.sentence_count
-                
-                # Reading time estimate (average 200 words per minute)
-                stats.reading_time_minutes = stats.word_count / 200.0
+            if stats.sentence_count > 0:
+                stats.average_sentence_length = stats.word_count / stats.sentence_count
+            
+            # Reading time estimate (average 200 words per minute)
+            stats.reading_time_minutes = stats.word_count / 200.0
         
         return stats
     
@@ -616,10 +613,7 @@ class SmartStatsCalculator:
         if content_hash in self.word_frequency_cache:
             word_freq = self.word_frequency_cache[content_hash]
         else:
-            words = self.word_pattern.findall(text.lower())
-            word_freq = defaultdict(int)
-            for word in words:
-                word_freq[word] += 1
+            word_freq = scan_text(text).word_frequencies
             
             # Cache the result (limit cache size)
             if len(self.word_frequency_cache) >= 100:
@@ -0,0 +1,393 @@
+"""
+Structural Diff - Merkle-hashed tree diff for large JSON/YAML documents
+
+DeepDiff compares two parsed documents node by node with a lot of per-node
+bookkeeping, which makes multi-megabyte configs take minutes. StructuralDiff
+produces the same report for the subset SemanticDiffEngine consumes, with
+work proportional to the size of the documents plus the size of the changes:
+
+1. Every dict and list is hashed bottom-up (Merkle style): a container's
+   hash combines its children's hashes, dicts independently of key order.
+   Subtrees with equal hashes are skipped in O(1).
+2. Dicts are matched by key and only differing values are descended into.
+3. Lists of containers are paired by index, as DeepDiff does without
+   ignore_order. With ignore_order, lists whose items have the same
+   multiset of hashes are skipped.
+4. Anything else that differs (flat lists of scalars, unordered lists with
+   different items, unusual types) is handed to DeepDiff for just that
+   subtree, so those reports are DeepDiff's own.
+
+Changes are streamed by iter_changes() as (report_type, path, detail)
+tuples, where path and detail are exactly what DeepDiff(verbose_level=2)
+stores under that report type. to_deepdiff_view() collects them into the
+same dict DeepDiff returns.
+
+diff_against_base() diffs one base document against several others (the
+two sides of a 3-way merge) with the work split by top-level key across a
+process pool. Its views are identical to sequential StructuralDiff views.
+
+Usage:
+    diff = StructuralDiff(before, after, {'ignore_order': False, 'verbose_level': 2})
+    for report_type, path, detail in diff.iter_changes():
+        ...
+    view = diff.to_deepdiff_view()   # {'values_changed': {...}, ...}
+
+    yours_view, theirs_view = diff_against_base(base, [yours, theirs], options, max_workers=4)
+
+Author: Pomera AI Commander
+"""
+
+import datetime
+import inspect
+import itertools
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from deepdiff import DeepDiff
+from deepdiff.helper import basic_types
+from deepdiff.model import DictRelationship
+
+logger = logging.getLogger(__name__)
+
+# DeepDiff reports a whole dict as changed when the two sides share fewer
+# than this fraction of their keys
+DEFAULT_THRESHOLD_TO_DIFF_DEEPER = (
+    inspect.signature(DeepDiff.__init__).parameters['threshold_to_diff_deeper'].default)
+
+# Scalars whose type and repr identify their value
+_SCALAR_TYPES = (str, int, float, bool, type(None),
+                 datetime.datetime, datetime.date, datetime.time, datetime.timedelta)
+
+_MISSING = object()
+
+# Source of never-equal hashes (NaN, unknown types); module-wide so diffs
+# sharing a hash memo can't hand out the same one twice
+_unique_ids = itertools.count()
+
+# Partitions per worker, so one slow top-level key doesn't idle the others
+PARTITIONS_PER_WORKER = 4
+
+
+def _threshold(deepdiff_options: Dict[str, Any]) -> float:
+    return deepdiff_options.get('threshold_to_diff_deeper', DEFAULT_THRESHOLD_TO_DIFF_DEEPER)
+
+
+def _key_repr(key: Any) -> str:
+    """DeepDiff's path segment for a dict key, e.g. ['name'] or [1]."""
+    return DictRelationship(None, None, key).get_param_repr() or f"[{key!r}]"
+
+
+def _common_keys(t1: dict, t2: dict, threshold: float) -> Optional[list]:
+    """
+    Keys of t2 that are also in t1, in t2's order; None when too few are
+    shared and DeepDiff reports the whole dict as changed instead.
+    """
+    common = [key for key in t2 if key in t1]
+    union = len(t1) + len(t2) - len(common)
+    if threshold and union > 1 and len(common) / union < threshold:
+        return None
+    return common
+
+
+class Change(NamedTuple):
+    """One reported difference, in DeepDiff's verbose_level=2 terms."""
+    report_type: str  # values_changed, type_changes, dictionary_item_added, ...
+    path: str         # DeepDiff path, e.g. root['servers'][0]['port']
+    detail: Any       # {'old_value', 'new_value'} or the added/removed value
+
+
+class StructuralDiff:
+    """
+    Merkle-hashed diff of two parsed documents with DeepDiff-compatible output.
+    """
+
+    def __init__(self, t1: Any, t2: Any, deepdiff_options: Optional[Dict[str, Any]] = None,
+                 case_insensitive: bool = False, root: str = 'root',
+                 hashes: Optional[Dict[int, int]] = None):
+        """
+        Args:
+            t1: Parsed "before" document
+            t2: Parsed "after" document
+            deepdiff_options: DeepDiff keyword arguments; also used for the
+                subtrees delegated to DeepDiff
+            case_insensitive: Strings compare case-insensitively (the
+                CaseInsensitiveStringOperator passed in deepdiff_options)
+            root: Path of t1/t2 within their documents, when diffing subtrees
+            hashes: Subtree hash memo to share with other diffs of the same
+                documents and options (e.g. base in a 3-way merge)
+        """
+        self.t1 = t1
+        self.t2 = t2
+        self.root = root
+        self.deepdiff_options = dict(deepdiff_options or {})
+        self.deepdiff_options.setdefault('verbose_level', 2)
+        self.ignore_order = bool(self.deepdiff_options.get('ignore_order', False))
+        self.case_insensitive = case_insensitive
+        # DeepDiff matches unordered list items by a case-sensitive hash, so
+        # case is only folded into subtree hashes when order matters
+        self._fold_case = case_insensitive and not self.ignore_order
+        self.threshold_to_diff_deeper = _threshold(self.deepdiff_options)
+        self._hashes: Dict[int, int] = hashes if hashes is not None else {}
+        self._key_reprs: Dict[tuple, str] = {}
+        self.stats = {'nodes_hashed': 0, 'subtrees_skipped': 0, 'delegated': 0}
+
+    # ------------------------------------------------------------------
+    # Hashing
+
+    def _hash(self, node: Any) -> int:
+        """
+        Hash of a subtree. Equal hashes mean DeepDiff would report nothing
+        between the two subtrees; unequal hashes only mean "look closer".
+        """
+        node_type = type(node)
+        if node_type is str:
+            return hash(node.lower() if self._fold_case else node)
+        if isinstance(node, dict):
+            key = id(node)
+            cached = self._hashes.get(key)
+            if cached is None:
+                self.stats['nodes_hashed'] += 1
+                cached = hash((node_type, frozenset([(k, self._hash(v)) for k, v in node.items()])))
+                self._hashes[key] = cached
+            return cached
+        if isinstance(node, list):
+            key = id(node)
+            cached = self._hashes.get(key)
+            if cached is None:
+                self.stats['nodes_hashed'] += 1
+                cached = hash((node_type, tuple([self._hash(v) for v in node])))
+                self._hashes[key] = cached
+            return cached
+        if node_type in _SCALAR_TYPES:
+            if node != node:
+                return hash(('unique', next(_unique_ids)))  # NaN never equals anything
+            # repr, not the value: hash(-1) == hash(-2) and 1 == 1.0 == True
+            return hash((node_type, repr(node)))
+        # Unknown types never match by hash and are compared by DeepDiff
+        return hash(('unique', next(_unique_ids)))
+
+    # ------------------------------------------------------------------
+    # Paths
+
+    def _key_path(self, path: str, key: Any) -> str:
+        # Keyed by type too: 1, 1.0 and True are the same dict key
+        memo_key = (type(key), key)
+        key_repr = self._key_reprs.get(memo_key)
+        if key_repr is None:
+            key_repr = _key_repr(key)
+            self._key_reprs[memo_key] = key_repr
+        return path + key_repr
+
+    # ------------------------------------------------------------------
+    # Walking
+
+    def iter_changes(self) -> Iterator[Change]:
+        """Stream changes in the order DeepDiff reports them within each report type."""
+        return self._walk(self.t1, self.t2, self.root)
+
+    def _walk(self, t1: Any, t2: Any, path: str) -> Iterator[Change]:
+        if t1 is t2:
+            return
+        type1 = type(t1)
+        if type1 is str and type(t2) is str:
+            if t1 != t2 and not (self.case_insensitive and t1.lower() == t2.lower()):
+                yield Change('values_changed', path, {'new_value': t2, 'old_value': t1})
+            return
+        if type1 is not type(t2):
+            yield Change('type_changes', path, {'old_type': type1, 'new_type': type(t2),
+                                                'old_value': t1, 'new_value': t2})
+            return
+
+        if isinstance(t1, dict):
+            if self._hash(t1) == self._hash(t2):
+                self.stats['subtrees_skipped'] += 1
+                return
+            yield from self._walk_dict(t1, t2, path)
+        elif isinstance(t1, list):
+            if self._hash(t1) == self._hash(t2):
+                self.stats['subtrees_skipped'] += 1
+                return
+            yield from self._walk_list(t1, t2, path)
+        elif type1 in _SCALAR_TYPES:
+            if t1 != t2:
+                yield Change('values_changed', path, {'new_value': t2, 'old_value': t1})
+        else:
+            yield from self._delegate(t1, t2, path)
+
+    def _walk_dict(self, t1: dict, t2: dict, path: str) -> Iterator[Change]:
+        common = _common_keys(t1, t2, self.threshold_to_diff_deeper)
+        if common is None:
+            yield Change('values_changed', path, {'new_value': t2, 'old_value': t1})
+            return
+
+        for key in t2:
+            if key not in t1:
+                yield Change('dictionary_item_added', self._key_path(path, key), t2[key])
+        for key in t1:
+            if key not in t2:
+                yield Change('dictionary_item_removed', self._key_path(path, key), t1[key])
+        for key in common:
+            value1 = t1[key]
+            value2 = t2[key]
+            if value1 is value2:
+                continue
+            yield from self._walk(value1, value2, self._key_path(path, key))
+
+    def _walk_list(self, t1: list, t2: list, path: str) -> Iterator[Change]:
+        if self.ignore_order:
+            # Same items in a different order: nothing to report
+            if Counter(map(self._hash, t1)) == Counter(map(self._hash, t2)):
+                self.stats['subtrees_skipped'] += 1
+                return
+            yield from self._delegate(t1, t2, path)
+            return
+
+        if all(isinstance(item, basic_types) for item in t1) and \
+                all(isinstance(item, basic_types) for item in t2):
+            # DeepDiff aligns flat lists with difflib; keep its exact report
+            yield from self._delegate(t1, t2, path)
+            return
+
+        # Lists with containers are compared index by index
+        for index, (item1, item2) in enumerate(itertools.zip_longest(t1, t2, fillvalue=_MISSING)):
+            item_path = f"{path}[{index}]"
+            if item2 is _MISSING:
+                yield Change('iterable_item_removed', item_path, item1)
+            elif item1 is _MISSING:
+                yield Change('iterable_item_added', item_path, item2)
+            else:
+                yield from self._walk(item1, item2, item_path)
+
+    def _delegate(self, t1: Any, t2: Any, path: str) -> Iterator[Change]:
+        """Diff one subtree with DeepDiff and re-root its paths."""
+        self.stats['delegated'] += 1
+        diff = DeepDiff(t1, t2, **self.deepdiff_options)
+        for report_type, entries in diff.items():
+            if isinstance(entries, dict):
+                for sub_path, detail in entries.items():
+                    if isinstance(detail, dict) and ('new_path' in detail or 'old_path' in detail):
+                        detail = dict(detail)
+                        for key in ('new_path', 'old_path'):
+                            if key in detail:
+                                detail[key] = path + detail[key][4:]
+                    yield Change(report_type, path + sub_path[4:], detail)
+            else:
+                for sub_path in entries:
+                    yield Change(report_type, path + sub_path[4:], None)
+
+    # ------------------------------------------------------------------
+
+    def to_deepdiff_view(self) -> Dict[str, Dict[str, Any]]:
+        """Collect all changes into DeepDiff's {report_type: {path: detail}} layout."""
+        view: Dict[str, Dict[str, Any]] = {}
+        for change in self.iter_changes():
+            view.setdefault(change.report_type, {})[change.path] = change.detail
+        return view
+
+
+def _diff_partition(partition: List[tuple], deepdiff_options: Dict[str, Any],
+                    case_insensitive: bool) -> List[List[List[Change]]]:
+    """
+    Process pool worker: diff the subtrees of a group of top-level keys.
+    
+    Each entry is (path, base_value, [other_value, ...]); returns the
+    changes for every other value, in the same layout.
+    """
+    results = []
+    for path, base_value, other_values in partition:
+        hashes: Dict[int, int] = {}
+        results.append([list(StructuralDiff(base_value, other_value, deepdiff_options,
+                                            case_insensitive=case_insensitive, root=path,
+                                            hashes=hashes).iter_changes())
+                        for other_value in other_values])
+    return results
+
+
+def diff_against_base(base: Any, others: Sequence[Any], deepdiff_options: Optional[Dict[str, Any]] = None,
+                      case_insensitive: bool = False,
+                      max_workers: Optional[int] = None) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Diff base against each of others, splitting the work by top-level key.
+    
+    The top-level keys of dict documents are diffed independently on a
+    process pool and the results are reassembled in StructuralDiff's order,
+    so each view is identical to StructuralDiff(base, other).to_deepdiff_view().
+    Non-dict documents, a single worker or a failing pool fall back to
+    diffing sequentially.
+    
+    Args:
+        base: Parsed common ancestor
+        others: Parsed documents to compare with base
+        deepdiff_options: DeepDiff keyword arguments (must be picklable)
+        case_insensitive: Strings compare case-insensitively
+        max_workers: Worker processes (default: CPU count)
+        
+    Returns:
+        One DeepDiff-style view per document in others
+    """
+    options = dict(deepdiff_options or {})
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    def sequential() -> List[Dict[str, Dict[str, Any]]]:
+        hashes: Dict[int, int] = {}
+        return [StructuralDiff(base, other, options, case_insensitive=case_insensitive,
+                               hashes=hashes).to_deepdiff_view()
+                for other in others]
+
+    if max_workers < 2 or type(base) is not dict or any(type(other) is not dict for other in others):
+        return sequential()
+
+    # Root-level plan per document: which keys are shared, and which differ
+    threshold = _threshold(options)
+    common_per_other = [_common_keys(base, other, threshold) for other in others]
+    differing = {}  # top-level key -> indexes of the documents whose value differs
+    for index, (other, common) in enumerate(zip(others, common_per_other)):
+        for key in common or ():
+            if other[key] is not base[key]:
+                differing.setdefault(key, []).append(index)
+
+    partition_keys = [key for key in base if key in differing]
+    if len(partition_keys) < 2:
+        return sequential()
+
+    chunk_count = min(len(partition_keys), max_workers * PARTITIONS_PER_WORKER)
+    chunk_size = -(-len(partition_keys) // chunk_count)
+    chunks = [partition_keys[start:start + chunk_size] for start in range(0, len(partition_keys), chunk_size)]
+    partitions = [[('root' + _key_repr(key), base[key], [others[index][key] for index in differing[key]])
+                   for key in chunk] for chunk in chunks]
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(partitions))) as pool:
+            results = list(pool.map(_diff_partition, partitions,
+                                    itertools.repeat(options), itertools.repeat(case_insensitive)))
+    except Exception as e:
+        logger.warning(f"Partitioned diff failed, diffing sequentially: {e}")
+        return sequential()
+
+    changes = {}  # (top-level key, document index) -> changes
+    for chunk, chunk_results in zip(chunks, results):
+        for key, per_other in zip(chunk, chunk_results):
+            for index, key_changes in zip(differing[key], per_other):
+                changes[(key, index)] = key_changes
+
+    views = []
+    for index, (other, common) in enumerate(zip(others, common_per_other)):
+        view: Dict[str, Dict[str, Any]] = {}
+        if common is None:
+            view['values_changed'] = {'root': {'new_value': other, 'old_value': base}}
+            views.append(view)
+            continue
+        root_changes = itertools.chain(
+            (Change('dictionary_item_added', 'root' + _key_repr(key), other[key])
+             for key in other if key not in base),
+            (Change('dictionary_item_removed', 'root' + _key_repr(key), base[key])
+             for key in base if key not in other),
+            itertools.chain.from_iterable(changes.get((key, index), ()) for key in common))
+        for change in root_changes:
+            view.setdefault(change.report_type, {})[change.path] = change.detail
+        views.append(view)
+    return views
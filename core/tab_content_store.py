@@ -0,0 +1,297 @@
+"""
+Tab Content Store - Content-addressed, compressed storage for large tabs
+
+Large input/output tabs are not stored inline in tab_content. Their text is
+kept as zlib-compressed blobs in tab_blobs, keyed by SHA-256 of the text,
+and tab_content_refs maps each tab to the hash of its current text. Small
+tabs stay inline in tab_content as before.
+
+Features:
+- Unchanged tabs produce the same reference row, so saving them costs an
+  equality/hash check and no compression or database write
+- Edits to a large tab are stored as a delta (changed middle section)
+  against the previous blob, with a bounded delta chain
+- Decompressed texts are memoized by hash
+- Blobs no longer reachable from any tab are pruned
+
+Usage:
+    store = TabContentStore()
+    content_row, ref_row, blob_row = store.tab_rows("input", 0, text)
+    text = store.load_text(conn, content_hash)
+
+Author: Pomera AI Commander
+"""
+
+import zlib
+import struct
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tabs with at least this many characters are stored as blobs
+BLOB_THRESHOLD_CHARS = 64 * 1024
+
+ZLIB_LEVEL = 6
+
+# Store a delta only if the changed section is at most this share of the text
+DELTA_MAX_RATIO = 0.25
+
+# Longest chain of deltas before a full blob is stored again
+MAX_DELTA_CHAIN = 16
+
+# Upper bound on decompressed text kept in memory by the memo
+MEMO_MAX_CHARS = 64 * 1024 * 1024
+
+_DELTA_HEADER = struct.Struct('>QQ')
+_PREFIX_SCAN_BLOCK = 64 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    """Content address of UTF-8 encoded tab text."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def common_affixes(old: bytes, new: bytes) -> Tuple[int, int]:
+    """
+    Lengths of the common prefix and (non-overlapping) common suffix.
+
+    Compares 64 KB blocks first, so the scan runs at memcmp speed.
+    """
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit:
+        end = min(prefix + _PREFIX_SCAN_BLOCK, limit)
+        if old[prefix:end] == new[prefix:end]:
+            prefix = end
+            continue
+        while old[prefix] == new[prefix]:
+            prefix += 1
+        break
+
+    limit -= prefix
+    suffix = 0
+    old_end, new_end = len(old), len(new)
+    while suffix < limit:
+        step = min(_PREFIX_SCAN_BLOCK, limit - suffix)
+        if old[old_end - suffix - step:old_end - suffix] == new[new_end - suffix - step:new_end - suffix]:
+            suffix += step
+            continue
+        while old[old_end - suffix - 1] == new[new_end - suffix - 1]:
+            suffix += 1
+        break
+    return prefix, suffix
+
+
+class TabContentStore:
+    """
+    Converts tab text to rows for tab_content, tab_content_refs and tab_blobs.
+
+    Keeps the last stored hash and text of every tab, so that unchanged tabs
+    are detected without hashing and edits can be stored as deltas. The
+    settings manager calls reset() when the database is changed behind its
+    back (restore, import), after which the next save stores full blobs.
+    """
+
+    def __init__(self, threshold_chars: int = BLOB_THRESHOLD_CHARS):
+        self.threshold_chars = threshold_chars
+        self._lock = threading.RLock()
+        # (tab_type, tab_index) -> (hash, text, depth)
+        self._tabs: Dict[Tuple[str, int], Tuple[str, str, int]] = {}
+        # Delta bases of blobs created here that may not be in the database yet
+        self._created_bases: Dict[str, str] = {}
+        self._memo: 'OrderedDict[str, str]' = OrderedDict()
+        self._memo_chars = 0
+        self._stats = {'unchanged': 0, 'full_blobs': 0, 'delta_blobs': 0,
+                       'bytes_in': 0, 'bytes_stored': 0, 'blobs_loaded': 0}
+
+    def tab_rows(self, tab_type: str, tab_index: int,
+                 content: str) -> Tuple[tuple, tuple, Optional[tuple]]:
+        """
+        Build the rows that store one tab.
+
+        Args:
+            tab_type: 'input' or 'output'
+            tab_index: Tab position
+            content: Tab text
+
+        Returns:
+            (tab_content row, tab_content_refs row, tab_blobs row or None).
+            The blob row is None when the text is inline or already stored.
+        """
+        key = (tab_type, tab_index)
+        content = content or ''
+        if len(content) < self.threshold_chars:
+            with self._lock:
+                self._tabs.pop(key, None)
+            return (tab_type, tab_index, content), (tab_type, tab_index, None), None
+
+        with self._lock:
+            previous = self._tabs.get(key)
+            if previous is not None and previous[1] == content:
+                self._stats['unchanged'] += 1
+                return (tab_type, tab_index, ''), (tab_type, tab_index, previous[0]), None
+
+            data = content.encode('utf-8')
+            digest = content_hash(data)
+            blob_row, depth = self._blob_row(digest, data, previous)
+            self._tabs[key] = (digest, content, depth)
+            self._remember_text(digest, content)
+        return (tab_type, tab_index, ''), (tab_type, tab_index, digest), blob_row
+
+    def _blob_row(self, digest: str, data: bytes,
+                  previous: Optional[Tuple[str, str, int]]) -> Tuple[tuple, int]:
+        """Encode data as a delta against the previous version, or in full."""
+        self._stats['bytes_in'] += len(data)
+        if previous is not None and previous[2] < MAX_DELTA_CHAIN:
+            old = previous[1].encode('utf-8')
+            prefix, suffix = common_affixes(old, data)
+            middle = data[prefix:len(data) - suffix]
+            if len(middle) <= len(data) * DELTA_MAX_RATIO:
+                payload = _DELTA_HEADER.pack(prefix, suffix) + zlib.compress(middle, ZLIB_LEVEL)
+                depth = previous[2] + 1
+                self._created_bases[digest] = previous[0]
+                self._stats['delta_blobs'] += 1
+                self._stats['bytes_stored'] += len(payload)
+                return (digest, 'delta', previous[0], depth, len(data), payload), depth
+
+        payload = zlib.compress(data, ZLIB_LEVEL)
+        self._stats['full_blobs'] += 1
+        self._stats['bytes_stored'] += len(payload)
+        return (digest, 'zlib', None, 0, len(data), payload), 0
+
+    def load_text(self, conn, digest: str) -> str:
+        """
+        Load and decode a blob, following delta chains.
+
+        Args:
+            conn: Database connection
+            digest: Content hash
+
+        Returns:
+            Tab text ('' if the blob is missing)
+        """
+        with self._lock:
+            text = self._memo.get(digest)
+            if text is not None:
+                self._memo.move_to_end(digest)
+                return text
+
+        data = self._load_bytes(conn, digest)
+        if data is None:
+            logger.error(f"Tab content blob {digest[:12]} is missing")
+            return ''
+        text = data.decode('utf-8')
+        with self._lock:
+            self._remember_text(digest, text)
+            self._stats['blobs_loaded'] += 1
+        return text
+
+    def _load_bytes(self, conn, digest: str) -> Optional[bytes]:
+        chain = []
+        current = digest
+        base = None
+        while current is not None:
+            with self._lock:
+                memo_text = self._memo.get(current)
+            if memo_text is not None and current != digest:
+                base = memo_text.encode('utf-8')
+                break
+            row = conn.execute(
+                "SELECT encoding, base_hash, data FROM tab_blobs WHERE hash = ?", (current,)
+            ).fetchone()
+            if row is None:
+                return None
+            encoding, base_hash, payload = row
+            if encoding == 'zlib':
+                base = zlib.decompress(payload)
+                break
+            chain.append(payload)
+            current = base_hash
+        if base is None:
+            return None
+
+        for payload in reversed(chain):
+            prefix, suffix = _DELTA_HEADER.unpack_from(payload)
+            middle = zlib.decompress(payload[_DELTA_HEADER.size:])
+            base = base[:prefix] + middle + base[len(base) - suffix:]
+        return base
+
+    def remember(self, tab_type: str, tab_index: int, digest: str, text: str,
+                 depth: int) -> None:
+        """
+        Record the stored version of a tab after loading it from the database.
+
+        Args:
+            tab_type: 'input' or 'output'
+            tab_index: Tab position
+            digest: Content hash of text
+            text: Tab text
+            depth: Delta chain length of the blob
+        """
+        with self._lock:
+            self._tabs[(tab_type, tab_index)] = (digest, text, depth)
+
+    def reset(self) -> None:
+        """Forget tab versions; used after the database changed externally."""
+        with self._lock:
+            self._tabs.clear()
+
+    def prune(self, conn) -> int:
+        """
+        Delete blobs that no tab references, directly or as a delta base.
+
+        Args:
+            conn: Database connection (inside a transaction)
+
+        Returns:
+            Number of blobs deleted
+        """
+        stored = dict(conn.execute("SELECT hash, base_hash FROM tab_blobs").fetchall())
+        with self._lock:
+            bases = dict(self._created_bases)
+            bases.update(stored)
+        live = set()
+        for (digest,) in conn.execute(
+                "SELECT content_hash FROM tab_content_refs WHERE content_hash IS NOT NULL"):
+            while digest is not None and digest not in live:
+                live.add(digest)
+                digest = bases.get(digest)
+        # Blobs staged by a save that has not been flushed yet are kept too
+        with self._lock:
+            for digest, _, _ in self._tabs.values():
+                while digest is not None and digest not in live:
+                    live.add(digest)
+                    digest = bases.get(digest)
+        dead = [(digest,) for digest in stored if digest not in live]
+        if dead:
+            conn.executemany("DELETE FROM tab_blobs WHERE hash = ?", dead)
+        with self._lock:
+            for digest in list(self._created_bases):
+                if digest in stored or digest not in live:
+                    del self._created_bases[digest]
+        return len(dead)
+
+    def _remember_text(self, digest: str, text: str) -> None:
+        # Caller holds self._lock
+        if digest in self._memo:
+            self._memo.move_to_end(digest)
+            return
+        self._memo[digest] = text
+        self._memo_chars += len(text)
+        while self._memo_chars > MEMO_MAX_CHARS and len(self._memo) > 1:
+            _, evicted = self._memo.popitem(last=False)
+            self._memo_chars -= len(evicted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Blob store statistics for this process."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memo_entries'] = len(self._memo)
+            stats['compression_ratio'] = (
+                round(stats['bytes_in'] / stats['bytes_stored'], 2) if stats['bytes_stored'] else None
+            )
+        return stats
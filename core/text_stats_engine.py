@@ -0,0 +1,315 @@
+"""
+Single-pass text statistics engine shared by the GUI, MCP server and tools.
+
+All statistics consumers (the Text Statistics tool, pomera_text_stats, the
+status bar calculators and the pattern engine) used to run their own set of
+regex passes over the text, each with slightly different definitions of a
+word, sentence or line. This module replaces them with one scanner that
+tokenizes the text once and derives every count, plus the word-frequency
+tally, from that single traversal.
+
+The scan is a single findall() of one master pattern over the lowercased
+text. Each token is one of:
+
+- a whitespace run between two line breaks (blank lines, and paragraph
+  breaks when it holds two newlines),
+- a run of sentence terminators (. ! ?), merged across whitespace,
+- a word (\\w+),
+- any other non-space character.
+
+The tokens are tallied in a Counter, so the per-token work happens in C;
+the Python-level bookkeeping only visits each distinct token once. The
+remaining counts (characters, bytes, newlines, whitespace) are str methods
+on the same chunk. Large inputs are scanned in chunks that are split at
+a word boundary no token can straddle, so chunked and whole-text scans
+give identical results.
+
+Definitions:
+    words       runs of \\w characters, case-folded for the frequency tally
+    lines       the lines of str.splitlines(): split at \\n, \\r, \\r\\n and
+                the other Unicode line boundaries; a trailing line break
+                does not start a new line
+    sentences   non-blank segments between runs of . ! ?
+    paragraphs  non-blank segments between blank lines
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple
+
+# Characters scanned per findall() call
+SCAN_CHUNK_CHARS = 1024 * 1024
+
+SENTENCE_TERMINATORS = frozenset('.!?')
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'it', 'its',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'we', 'they',
+})
+
+# Line boundaries of str.splitlines() besides \n and \r
+_OTHER_LINE_BREAKS = '\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+_LINE_BREAK = '[\n\r' + _OTHER_LINE_BREAKS + ']'
+_LINE_BREAK_CHARS = frozenset('\n\r' + _OTHER_LINE_BREAKS)
+
+_TOKEN_PATTERN = re.compile(
+    _LINE_BREAK + r'\s*' + _LINE_BREAK + r'|[.!?]+(?:\s*[.!?]+)*|\w+|[^\w\s]')
+_WHITESPACE_RUN = re.compile(r'\s+')
+# Safe split points: where a word starts or ends next to anything but a
+# sentence terminator, so no token can straddle the split
+_SPLIT = r'(?:[^\w.!?](?=\w)|\w(?=[^\w\s.!?]))'
+_CHUNK_SPLIT = re.compile(_SPLIT)
+_LAST_SPLIT = re.compile(r'.*' + _SPLIT, re.DOTALL)
+_FIRST_CONTENT = re.compile(r'\S')
+_OTHER_LINE_BREAK = re.compile('[' + _OTHER_LINE_BREAKS + ']')
+
+# ASCII whitespace other than space, tab, CR and LF
+_OTHER_ASCII_WHITESPACE = re.compile(r'[\x0b\x0c\x1c-\x1f]')
+
+
+def _count_line_breaks(text: str, start: int = 0, end: int = None) -> int:
+    """Line breaks in text[start:end] as str.splitlines() sees them (CRLF is one)."""
+    text = text[start:end]
+    return (text.count('\n') + text.count('\r') - text.count('\r\n')
+            + len(_OTHER_LINE_BREAK.findall(text)))
+
+
+@dataclass
+class TextScanResult:
+    """Counts produced by a single scan of a text."""
+    char_count: int = 0
+    byte_count: int = 0
+    whitespace_count: int = 0
+    # Spaces, tabs, CR and LF (what "characters without spaces" excludes)
+    space_count: int = 0
+    line_count: int = 0
+    non_empty_lines: int = 0
+    word_count: int = 0
+    total_word_length: int = 0
+    sentence_count: int = 0
+    paragraph_count: int = 0
+    punctuation_count: int = 0
+    word_frequencies: Counter = field(default_factory=Counter)
+
+    @property
+    def char_count_no_spaces(self) -> int:
+        return self.char_count - self.space_count
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.word_frequencies)
+
+    @property
+    def avg_word_length(self) -> float:
+        if not self.word_count:
+            return 0.0
+        return self.total_word_length / self.word_count
+
+    def top_words(self, count: int = 10, exclude: Iterable[str] = STOP_WORDS,
+                  min_length: int = 2) -> List[Tuple[str, int]]:
+        """
+        Most frequent words, ties in order of first appearance.
+
+        Args:
+            count: Number of words to return
+            exclude: Words to leave out (stop words by default)
+            min_length: Minimum word length to include
+        """
+        exclude = exclude if isinstance(exclude, (set, frozenset)) else set(exclude)
+        filtered = Counter({
+            word: n for word, n in self.word_frequencies.items()
+            if len(word) >= min_length and word not in exclude
+        })
+        return filtered.most_common(count)
+
+
+class TextScanner:
+    """
+    Incremental single-pass scanner.
+
+    Text can be fed in arbitrary pieces; the scanner holds back the tail of
+    each piece after its last safe split point, so the result is the same
+    as scanning the concatenated text in one go.
+
+    Usage:
+        scanner = TextScanner()
+        for chunk in chunks:
+            scanner.feed(chunk)
+        result = scanner.finish()
+    """
+
+    def __init__(self, chunk_chars: int = SCAN_CHUNK_CHARS):
+        self.chunk_chars = chunk_chars
+        self._tokens: Counter = Counter()
+        self._pending = ''
+        self._char_count = 0
+        self._byte_count = 0
+        self._whitespace_count = 0
+        self._space_count = 0
+        self._line_breaks = 0
+        # Whitespace before the first and after the last non-space character;
+        # newlines (\n) mark paragraphs, line breaks of any kind mark lines
+        self._first_content = ''
+        self._leading_newlines = 0
+        self._leading_breaks = 0
+        self._last_content = ''
+        self._trailing_newlines = 0
+        self._trailing_breaks = 0
+        self._last_char = ''
+
+    def feed(self, text: str) -> None:
+        """Add the next piece of text."""
+        if not text:
+            return
+        if self._pending:
+            text = self._pending + text
+        match = _LAST_SPLIT.match(text)
+        if match is None:
+            self._pending = text
+            return
+        split = match.end()
+        self._pending = text[split:]
+        self._scan_span(text, split)
+
+    def finish(self) -> TextScanResult:
+        """Scan any held-back text and return the totals."""
+        if self._pending:
+            pending, self._pending = self._pending, ''
+            self._scan_chunk(pending)
+        return self._build_result()
+
+    def _scan_span(self, text: str, end: int) -> None:
+        """Scan text[:end] in chunks split at safe positions."""
+        start = 0
+        while end - start > self.chunk_chars:
+            match = _CHUNK_SPLIT.search(text, start + self.chunk_chars, end)
+            if match is None:
+                break
+            self._scan_chunk(text[start:match.end()])
+            start = match.end()
+        self._scan_chunk(text[start:end] if start or end < len(text) else text)
+
+    def _scan_chunk(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._tokens.update(_TOKEN_PATTERN.findall(chunk.lower()))
+
+        length = len(chunk)
+        newlines = chunk.count('\n')
+        returns = chunk.count('\r')
+        self._char_count += length
+        spaces = chunk.count(' ') + chunk.count('\t') + newlines + returns
+        self._space_count += spaces
+        line_breaks = newlines + returns - (returns and chunk.count('\r\n'))
+        if chunk.isascii():
+            self._byte_count += length
+            other_whitespace = _OTHER_ASCII_WHITESPACE.findall(chunk)
+            self._whitespace_count += spaces + len(other_whitespace)
+            line_breaks += len(other_whitespace) - other_whitespace.count('\x1f')
+        else:
+            self._byte_count += len(chunk.encode('utf-8', 'surrogatepass'))
+            self._whitespace_count += length - sum(map(len, chunk.split()))
+            line_breaks += len(_OTHER_LINE_BREAK.findall(chunk))
+        # Chunks end next to a word character, so CRLF is never split
+        self._line_breaks += line_breaks
+
+        stripped = chunk.rstrip()
+        if not stripped:
+            # Whitespace only: extends the leading or trailing run
+            if not self._first_content:
+                self._leading_newlines += newlines
+                self._leading_breaks += line_breaks
+            self._trailing_newlines += newlines
+            self._trailing_breaks += line_breaks
+        else:
+            if not self._first_content:
+                first = _FIRST_CONTENT.search(chunk).start()
+                self._first_content = chunk[first]
+                self._leading_newlines += chunk.count('\n', 0, first)
+                self._leading_breaks += _count_line_breaks(chunk, 0, first)
+            self._last_content = stripped[-1]
+            self._trailing_newlines = chunk.count('\n', len(stripped))
+            self._trailing_breaks = _count_line_breaks(chunk, len(stripped))
+        self._last_char = chunk[-1]
+
+    def _build_result(self) -> TextScanResult:
+        result = TextScanResult(
+            char_count=self._char_count,
+            byte_count=self._byte_count,
+            whitespace_count=self._whitespace_count,
+            space_count=self._space_count,
+        )
+        if not self._char_count:
+            return result
+
+        ends_with_break = self._last_char in _LINE_BREAK_CHARS
+        result.line_count = self._line_breaks + (not ends_with_break)
+        if not self._first_content:
+            return result
+
+        breaks = 0
+        terminator_runs = 0
+        blank_lines = 0
+        words = result.word_frequencies
+        for token, n in self._tokens.items():
+            head = token[0]
+            if head.isspace():
+                # Whitespace between two line breaks
+                breaks += (token.count('\n') > 1) * n
+                blank_lines += (_count_line_breaks(token) - 1) * n
+            elif head in SENTENCE_TERMINATORS:
+                terminator_runs += n
+                gap_length = 0
+                for gap in _WHITESPACE_RUN.findall(token):
+                    gap_length += len(gap)
+                    gap_breaks = _count_line_breaks(gap)
+                    if gap_breaks:
+                        blank_lines += (gap_breaks - 1) * n
+                        breaks += (gap.count('\n') > 1) * n
+                result.punctuation_count += (len(token) - gap_length) * n
+            elif len(token) == 1 and not (head.isalnum() or head == '_'):
+                if unicodedata.category(head).startswith('P'):
+                    result.punctuation_count += n
+            else:
+                words[token] = n
+                result.word_count += n
+                result.total_word_length += len(token) * n
+                if not token.isalnum():
+                    # Connector punctuation such as '_' is also a word character
+                    result.punctuation_count += n * sum(
+                        1 for c in token if unicodedata.category(c).startswith('P'))
+
+        # First and last line are blank when whitespace containing a line
+        # break precedes the first / follows the last non-space character
+        blank_lines += self._leading_breaks > 0
+        blank_lines += self._trailing_breaks > 0 and not ends_with_break
+        result.non_empty_lines = result.line_count - blank_lines
+
+        result.sentence_count = (terminator_runs + 1
+                                 - (self._first_content in SENTENCE_TERMINATORS)
+                                 - (self._last_content in SENTENCE_TERMINATORS))
+        result.paragraph_count = (breaks + 1
+                                  - (self._leading_newlines > 1)
+                                  - (self._trailing_newlines > 1))
+        return result
+
+
+def scan_text(text: str, chunk_chars: int = SCAN_CHUNK_CHARS) -> TextScanResult:
+    """
+    Compute all text statistics in one pass.
+
+    Args:
+        text: Text to analyze
+        chunk_chars: Characters tokenized per chunk (bounds token memory)
+
+    Returns:
+        TextScanResult with counts and the word-frequency tally
+    """
+    scanner = TextScanner(chunk_chars)
+    scanner.feed(text)
+    return scanner.finish()
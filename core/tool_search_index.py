@@ -0,0 +1,282 @@
+"""
+Tool Search Index - Precomputed fuzzy search over tool names, descriptions and aliases
+
+ToolSearchPalette and ToolLoader.search_tools used to rebuild their search
+texts and run rapidfuzz WRatio over every tool on each keystroke. This index
+is built once per tool set and answers queries from precomputed tables.
+
+Features:
+- Normalized (lower-cased, whitespace-collapsed) search texts, built once
+- Trigram postings over the search texts and over names and aliases
+- Prefix tables for short queries
+- Fuzzy scoring (rapidfuzz WRatio) only for the tools sharing the most
+  trigrams with the query; a full scan only when no tool shares any
+- Aliases scored on their own, so they never dilute the name and
+  description score
+- Extending a query narrows the cached matches of its longest cached
+  prefix instead of starting over
+- Results memoized per query, so backspacing is free
+- Substring scoring when rapidfuzz is not installed
+
+Usage:
+    index = ToolSearchIndex([("Case Tool", "Transform text case", ["upper"])])
+    index.search("case", limit=10, score_cutoff=30)   # [("Case Tool", 90.0)]
+    index.prefix_matches("ca")                        # ["Case Tool"]
+    index.name_matches("tool")                        # ["Case Tool"]
+
+Author: Pomera AI Commander
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    fuzz = None
+    process = None
+    RAPIDFUZZ_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Longest name prefix kept in the prefix table
+PREFIX_DEPTH = 3
+
+# Most tools scored with WRatio per query, ranked by shared trigrams
+MAX_FUZZY_CANDIDATES = 48
+
+# Queries whose results and partial matches are memoized
+CACHE_SIZE = 256
+
+
+def normalize(text: str) -> str:
+    """Lower-case and collapse whitespace."""
+    return " ".join(text.lower().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """All three-character substrings of ``text``."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ToolSearchIndex:
+    """
+    Immutable search index over a fixed set of tools.
+
+    Build a new index when the tool set changes; queries only touch the
+    memo caches.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Sequence[str]]]):
+        """
+        Args:
+            entries: (name, description, aliases) per tool, in display order
+        """
+        self.names: List[str] = []
+        self._keys: List[List[str]] = []   # normalized name and aliases
+        self._key_texts: List[str] = []    # the same, each preceded by a newline
+        self._texts: List[str] = []        # normalized name, aliases and description
+        self._fuzzy_texts: List[str] = []  # normalized name and description
+        self._alias_texts: List[str] = []  # normalized aliases
+        self._text_postings: Dict[str, List[int]] = {}
+        self._key_postings: Dict[str, List[int]] = {}
+        self._prefixes: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._results: 'OrderedDict[tuple, list]' = OrderedDict()
+        self._partial: 'OrderedDict[tuple, object]' = OrderedDict()
+
+        for name, description, aliases in entries:
+            i = len(self.names)
+            keys = [normalize(name)] + [normalize(alias) for alias in aliases or () if alias]
+            text = " ".join(keys + [normalize(description or "")]).strip()
+            self.names.append(name)
+            self._keys.append(keys)
+            self._key_texts.append("".join("\n" + key for key in keys))
+            self._texts.append(text)
+            self._fuzzy_texts.append(normalize(f"{name} {description or ''}"))
+            self._alias_texts.append(" ".join(keys[1:]))
+            for gram in trigrams(text):
+                self._text_postings.setdefault(gram, []).append(i)
+            key_grams = set()
+            prefixes = set()
+            for key in keys:
+                key_grams |= trigrams(key)
+                prefixes.update(key[:depth] for depth in range(1, min(PREFIX_DEPTH, len(key)) + 1))
+            for gram in key_grams:
+                self._key_postings.setdefault(gram, []).append(i)
+            for prefix in prefixes:
+                self._prefixes.setdefault(prefix, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def prefix_matches(self, query: str) -> List[str]:
+        """Tools whose name or an alias starts with ``query``, in index order."""
+        query = normalize(query)
+        if not query:
+            return list(self.names)
+        return [self.names[i] for i in self._narrowed("prefix", query, self._prefix_ids)]
+
+    def name_matches(self, query: str) -> List[str]:
+        """Tools whose name or an alias contains ``query``, in index order."""
+        query = normalize(query)
+        if not query:
+            return list(self.names)
+        return [self.names[i] for i in self._narrowed("name", query, self._name_ids)]
+
+    def search(self, query: str, limit: int = 10, score_cutoff: float = 0) -> List[Tuple[str, float]]:
+        """
+        Rank tools against ``query``, best first.
+
+        With rapidfuzz, scores are WRatio (0-100) of the query against the
+        normalized name and description, or against the aliases when those
+        score higher. Without it, tools containing the query score
+        100 (exact name), 90 (name prefix), 80 (in name) or 60 (elsewhere).
+
+        Returns:
+            Up to ``limit`` (name, score) pairs scoring at least ``score_cutoff``
+        """
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+        key = ("search", query, limit, score_cutoff)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return list(cached)
+
+        if RAPIDFUZZ_AVAILABLE:
+            ranked = self._fuzzy(query, limit, score_cutoff)
+        else:
+            ranked = self._substring_scored(query, limit, score_cutoff)
+        results = [(self.names[i], score) for i, score in ranked]
+
+        with self._lock:
+            self._results[key] = results
+            self._trim(self._results)
+        return list(results)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fuzzy(self, query: str, limit: int, score_cutoff: float) -> List[Tuple[int, float]]:
+        counts = self._narrowed("grams", query, self._gram_counts)
+        if counts:
+            candidates = sorted(counts, key=lambda i: (-counts[i], i))[:max(MAX_FUZZY_CANDIDATES, limit)]
+            return self._extract(query, candidates, limit, score_cutoff)
+        # Nothing shares a trigram with the query (a typo, or under three
+        # characters): score every name, then every search text
+        everything = range(len(self._texts))
+        names = [keys[0] for keys in self._keys]
+        return (self._extract(query, everything, limit, score_cutoff, names)
+                or self._extract(query, everything, limit, score_cutoff))
+
+    def _extract(self, query: str, candidates: Sequence[int], limit: int,
+                 score_cutoff: float, texts: Sequence[str] = ()) -> List[Tuple[int, float]]:
+        """Best of the WRatio against ``texts`` (name and description) and against the aliases."""
+        texts = texts or self._fuzzy_texts
+        main = {position: texts[i] for position, i in enumerate(candidates)}
+        aliases = {position: self._alias_texts[i] for position, i in enumerate(candidates)
+                   if self._alias_texts[i]}
+        scores: Dict[int, float] = {}
+        for choices in (main, aliases):
+            matches = process.extract(query, choices, scorer=fuzz.WRatio, limit=None,
+                                      score_cutoff=score_cutoff)
+            for _, score, position in matches:
+                scores[position] = max(score, scores.get(position, score))
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(candidates[position], score) for position, score in ranked]
+
+    def _substring_scored(self, query: str, limit: int, score_cutoff: float) -> List[Tuple[int, float]]:
+        scored = []
+        for i in self._narrowed("text", query, self._text_ids):
+            name = self._keys[i][0]
+            if name == query:
+                score = 100
+            elif name.startswith(query):
+                score = 90
+            elif query in name:
+                score = 80
+            else:
+                score = 60
+            if score >= score_cutoff:
+                scored.append((i, score))
+        scored.sort(key=lambda item: (-item[1], self.names[item[0]]))
+        return scored[:limit]
+
+    def _narrowed(self, kind: str, query: str, compute):
+        """
+        Memoized ``compute(query, base)``, where ``base`` is the memoized
+        result of the longest cached prefix of ``query`` (or None).
+        """
+        with self._lock:
+            result = self._partial.get((kind, query))
+            if result is not None:
+                self._partial.move_to_end((kind, query))
+                return result
+            base, base_query = None, ""
+            for end in range(len(query) - 1, 0, -1):
+                base = self._partial.get((kind, query[:end]))
+                if base is not None:
+                    base_query = query[:end]
+                    break
+        result = compute(query, base, base_query)
+        with self._lock:
+            self._partial[(kind, query)] = result
+            self._trim(self._partial)
+        return result
+
+    def _prefix_ids(self, query: str, base, base_query: str) -> List[int]:
+        if base is None:
+            base = self._prefixes.get(query[:PREFIX_DEPTH], [])
+        if len(query) <= PREFIX_DEPTH and base_query == "":
+            return base
+        needle = "\n" + query
+        return [i for i in base if needle in self._key_texts[i]]
+
+    def _name_ids(self, query: str, base, base_query: str) -> List[int]:
+        if base is None:
+            base = self._posting_intersection(query, self._key_postings)
+        return [i for i in base if query in self._key_texts[i]]
+
+    def _text_ids(self, query: str, base, base_query: str) -> List[int]:
+        if base is None:
+            base = self._posting_intersection(query, self._text_postings)
+        return [i for i in base if query in self._texts[i]]
+
+    def _gram_counts(self, query: str, base, base_query: str) -> Dict[int, int]:
+        """Tool id -> number of distinct query trigrams in its search text."""
+        counts = dict(base) if base is not None else {}
+        for gram in trigrams(query) - trigrams(base_query):
+            for i in self._text_postings.get(gram, ()):
+                counts[i] = counts.get(i, 0) + 1
+        return counts
+
+    def _posting_intersection(self, query: str, postings: Dict[str, List[int]]) -> Iterable[int]:
+        """Tools that may contain ``query``: every trigram of it, or all tools if it is short."""
+        grams = trigrams(query)
+        if not grams:
+            return range(len(self.names))
+        lists = sorted((postings.get(gram, []) for gram in grams), key=len)
+        if not lists[0]:
+            return []
+        common = set(lists[0])
+        for ids in lists[1:]:
+            common.intersection_update(ids)
+            if not common:
+                return []
+        return sorted(common)
+
+    @staticmethod
+    def _trim(cache: OrderedDict) -> None:
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
@@ -16,12 +16,8 @@ import sys
 # Platform detection for macOS-specific workarounds
 IS_MACOS = sys.platform == "darwin"
 
-# Try to import rapidfuzz for fuzzy matching
-try:
-    from rapidfuzz import fuzz, process
-    RAPIDFUZZ_AVAILABLE = True
-except ImportError:
-    RAPIDFUZZ_AVAILABLE = False
+# Fuzzy matching over a prebuilt index (rapidfuzz optional)
+from core.tool_search_index import RAPIDFUZZ_AVAILABLE, ToolSearchIndex
 
 
 logger = logging.getLogger(__name__)
@@ -82,6 +78,10 @@ class ToolSearchPalette(ttk.Frame):
         self._closing: bool = False  # Flag to prevent re-opening during close
         self._focus_sentinel_id = None  # macOS focus sentinel timer ID
         
+        # Search index over the listed tools, rebuilt when the list changes
+        self._search_index: Optional[ToolSearchIndex] = None
+        self._search_index_key: Optional[tuple] = None
+        
         self._create_widgets()
     
     def _create_widgets(self) -> None:
@@ -354,53 +354,60 @@ class ToolSearchPalette(ttk.Frame):
             self._selected_index = 0
             self._popup_listbox.selection_set(0)
     
+    def _get_search_index(self, tools: List[str]) -> ToolSearchIndex:
+        """Search index over ``tools``, rebuilt only when the tool list or loader specs change."""
+        key = (tuple(tools), getattr(self._tool_loader, "specs_version", None))
+        if self._search_index is None or key != self._search_index_key:
+            entries = []
+            for tool in tools:
+                spec = self._tool_loader.get_tool_spec(tool) if self._tool_loader else None
+                description = getattr(spec, "description", "")
+                aliases = getattr(spec, "aliases", [])
+                entries.append((
+                    tool,
+                    description if isinstance(description, str) else "",
+                    aliases if isinstance(aliases, list) else [],
+                ))
+            self._search_index = ToolSearchIndex(entries)
+            self._search_index_key = key
+        return self._search_index
+    
     def _fuzzy_search(self, tools: List[str], query: str) -> List[str]:
         """Perform fuzzy search on tool names."""
         if not query:
             return tools
         
-        query_lower = query.lower()
+        index = self._get_search_index(tools)
         
         # For very short queries (1-2 chars), use prefix matching only to avoid noise
         if len(query) <= 2:
-            matches = [t for t in tools if t.lower().startswith(query_lower)]
+            matches = index.prefix_matches(query)
             if matches:
                 return matches
             # Fallback to contains if no prefix matches
-            return [t for t in tools if query_lower in t.lower()]
+            return index.name_matches(query)
         
         if RAPIDFUZZ_AVAILABLE:
-            search_data = {}
-            for tool in tools:
-                search_text = tool
-                if self._tool_loader:
-                    spec = self._tool_loader.get_tool_spec(tool)
-                    if spec and spec.description:
-                        search_text = f"{tool} {spec.description}"
-                # Use lowercase for case-insensitive matching
-                search_data[tool] = search_text.lower()
-            
-            # Convert query to lowercase for case-insensitive search
             # Threshold set to 50 to allow substring matches
-            results = process.extract(query_lower, search_data, scorer=fuzz.WRatio, limit=15)
-            fuzzy_matches = [match[2] for match in results if match[1] >= 50]
+            fuzzy_matches = [name for name, _ in index.search(query, limit=15, score_cutoff=50)]
             
             # Also include any tools that contain the query as substring (ensures "URL" finds "URL Parser")
-            substring_matches = [t for t in tools if query_lower in t.lower()]
-            for tool in substring_matches:
+            for tool in index.name_matches(query):
                 if tool not in fuzzy_matches:
                     fuzzy_matches.append(tool)
             
             # Prioritize exact prefix matches at the top
-            prefix_matches = [t for t in fuzzy_matches if t.lower().startswith(query_lower)]
-            other_matches = [t for t in fuzzy_matches if not t.lower().startswith(query_lower)]
+            prefixed = set(index.prefix_matches(query))
+            prefix_matches = [t for t in fuzzy_matches if t in prefixed]
+            other_matches = [t for t in fuzzy_matches if t not in prefixed]
             
             return prefix_matches + other_matches
         else:
-            # Fallback substring matching
-            matches = [(t, t.lower().find(query_lower)) for t in tools if query_lower in t.lower()]
-            matches.sort(key=lambda x: x[1])
-            return [m[0] for m in matches]
+            # Fallback substring matching, earliest match first
+            query_lower = query.lower()
+            positions = {t: t.lower().find(query_lower) for t in index.name_matches(query)}
+            # Tools matched only through an alias go last
+            return sorted(positions, key=lambda t: (positions[t] < 0, positions[t]))
     
     def _on_search_key(self, event=None) -> None:
         """Handle key press in search entry."""
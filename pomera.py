@@ -1,3 +1,6 @@
+import time
+_MODULE_IMPORT_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox, font
 import re
@@ -11,45 +14,72 @@ import csv
 import io
 import platform
 from typing import Optional, Dict, Any, List
-import requests
 import threading
-import time
 import string
 import random
 import webbrowser
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from docx import Document
-try:
-    import pyaudio
-    import numpy as np
-    PYAUDIO_AVAILABLE = True
-except ImportError:
-    PYAUDIO_AVAILABLE = False
 
-# AI Tools import
-try:
-    from tools.ai_tools import AIToolsWidget
-    AI_TOOLS_AVAILABLE = True
-except ImportError:
-    AI_TOOLS_AVAILABLE = False
-    print("AI Tools module not available")
-
-# Find & Replace module import
-try:
-    from tools.find_replace import FindReplaceWidget, SettingsManager
-    FIND_REPLACE_MODULE_AVAILABLE = True
-except ImportError:
-    FIND_REPLACE_MODULE_AVAILABLE = False
-    print("Find & Replace module not available")
-
-# Diff Viewer module import
-try:
-    from tools.diff_viewer import DiffViewerWidget, DiffViewerSettingsWidget
-    DIFF_VIEWER_MODULE_AVAILABLE = True
-except ImportError:
-    DIFF_VIEWER_MODULE_AVAILABLE = False
-    print("Diff Viewer module not available")
+from tools.tool_loader import DeferredClass, module_available
+
+# Optional dependencies are imported where they are used: reportlab and docx
+# by the PDF/DOCX exporters, pyaudio and numpy by Morse code playback, AI
+# SDKs by their providers. Only check here that they are installed.
+PYAUDIO_AVAILABLE = module_available("pyaudio") and module_available("numpy")
+
+# Tool modules are imported on first use. Each flag records that the module
+# is present; the classes the app uses are DeferredClass stand-ins.
+AI_TOOLS_AVAILABLE = module_available("tools.ai_tools")
+FIND_REPLACE_MODULE_AVAILABLE = module_available("tools.find_replace")
+DIFF_VIEWER_MODULE_AVAILABLE = module_available("tools.diff_viewer")
+CASE_TOOL_MODULE_AVAILABLE = module_available("tools.case_tool")
+EMAIL_EXTRACTION_MODULE_AVAILABLE = module_available("tools.email_extraction_tool")
+EMAIL_HEADER_ANALYZER_MODULE_AVAILABLE = module_available("tools.email_header_analyzer")
+URL_LINK_EXTRACTOR_MODULE_AVAILABLE = module_available("tools.url_link_extractor")
+REGEX_EXTRACTOR_MODULE_AVAILABLE = module_available("tools.regex_extractor")
+URL_PARSER_MODULE_AVAILABLE = module_available("tools.url_parser")
+WORD_FREQUENCY_COUNTER_MODULE_AVAILABLE = module_available("tools.word_frequency_counter")
+SORTER_TOOLS_MODULE_AVAILABLE = module_available("tools.sorter_tools")
+TRANSLATOR_TOOLS_MODULE_AVAILABLE = module_available("tools.translator_tools")
+GENERATOR_TOOLS_MODULE_AVAILABLE = module_available("tools.generator_tools")
+EXTRACTION_TOOLS_MODULE_AVAILABLE = module_available("tools.extraction_tools")
+BASE64_TOOLS_MODULE_AVAILABLE = module_available("tools.base64_tools")
+JSONXML_TOOL_MODULE_AVAILABLE = module_available("tools.jsonxml_tool")
+CRON_TOOL_MODULE_AVAILABLE = module_available("tools.cron_tool")
+HTML_EXTRACTION_TOOL_MODULE_AVAILABLE = module_available("tools.html_tool")
+CURL_TOOL_MODULE_AVAILABLE = module_available("tools.curl_tool")
+LIST_COMPARATOR_MODULE_AVAILABLE = module_available("tools.list_comparator")
+NOTES_WIDGET_MODULE_AVAILABLE = module_available("tools.notes_widget")
+SMART_DIFF_WIDGET_AVAILABLE = module_available("tools.smart_diff_widget")
+FOLDER_FILE_REPORTER_MODULE_AVAILABLE = module_available("tools.folder_file_reporter_adapter")
+LINE_TOOLS_MODULE_AVAILABLE = module_available("tools.line_tools")
+WHITESPACE_TOOLS_MODULE_AVAILABLE = module_available("tools.whitespace_tools")
+TEXT_STATISTICS_MODULE_AVAILABLE = module_available("tools.text_statistics_tool")
+HASH_GENERATOR_MODULE_AVAILABLE = module_available("tools.hash_generator")
+MARKDOWN_TOOLS_MODULE_AVAILABLE = module_available("tools.markdown_tools")
+STRING_ESCAPE_TOOL_MODULE_AVAILABLE = module_available("tools.string_escape_tool")
+NUMBER_BASE_CONVERTER_MODULE_AVAILABLE = module_available("tools.number_base_converter")
+TEXT_WRAPPER_MODULE_AVAILABLE = module_available("tools.text_wrapper")
+SLUG_GENERATOR_MODULE_AVAILABLE = module_available("tools.slug_generator")
+COLUMN_TOOLS_MODULE_AVAILABLE = module_available("tools.column_tools")
+TIMESTAMP_CONVERTER_MODULE_AVAILABLE = module_available("tools.timestamp_converter")
+ASCII_ART_GENERATOR_MODULE_AVAILABLE = module_available("tools.ascii_art_generator")
+MCP_MANAGER_MODULE_AVAILABLE = module_available("tools.mcp_widget")
+
+AIToolsWidget = DeferredClass("tools.ai_tools", "AIToolsWidget")
+FindReplaceWidget = DeferredClass("tools.find_replace", "FindReplaceWidget")
+DiffViewerWidget = DeferredClass("tools.diff_viewer", "DiffViewerWidget")
+DiffViewerSettingsWidget = DeferredClass("tools.diff_viewer", "DiffViewerSettingsWidget")
+GeneratorToolsWidget = DeferredClass("tools.generator_tools", "GeneratorToolsWidget")
+Base64ToolsWidget = DeferredClass("tools.base64_tools", "Base64ToolsWidget")
+JSONXMLTool = DeferredClass("tools.jsonxml_tool", "JSONXMLTool")
+CronTool = DeferredClass("tools.cron_tool", "CronTool")
+HTMLExtractionTool = DeferredClass("tools.html_tool", "HTMLExtractionTool")
+CurlToolWidget = DeferredClass("tools.curl_tool", "CurlToolWidget")
+DiffApp = DeferredClass("tools.list_comparator", "DiffApp")
+NotesWidget = DeferredClass("tools.notes_widget", "NotesWidget")
+SmartDiffWidget = DeferredClass("tools.smart_diff_widget", "SmartDiffWidget")
+FolderFileReporterAdapter = DeferredClass("tools.folder_file_reporter_adapter", "FolderFileReporterAdapter")
+MCPManager = DeferredClass("tools.mcp_widget", "MCPManager")
 
 # Database Settings Manager import
 try:
@@ -71,275 +101,6 @@ except ImportError:
     DATA_DIRECTORY_AVAILABLE = False
     print("Data Directory module not available, using legacy paths")
 
-# Case Tool module import
-try:
-    from tools.case_tool import CaseTool
-    CASE_TOOL_MODULE_AVAILABLE = True
-except ImportError:
-    CASE_TOOL_MODULE_AVAILABLE = False
-    print("Case Tool module not available")
-
-# Email Extraction Tool module import
-try:
-    from tools.email_extraction_tool import EmailExtractionTool
-    EMAIL_EXTRACTION_MODULE_AVAILABLE = True
-except ImportError:
-    EMAIL_EXTRACTION_MODULE_AVAILABLE = False
-    print("Email Extraction Tool module not available")
-
-# Email Header Analyzer module import
-try:
-    from tools.email_header_analyzer import EmailHeaderAnalyzer
-    EMAIL_HEADER_ANALYZER_MODULE_AVAILABLE = True
-except ImportError:
-    EMAIL_HEADER_ANALYZER_MODULE_AVAILABLE = False
-    print("Email Header Analyzer module not available")
-
-# URL and Link Extractor module import
-try:
-    from tools.url_link_extractor import URLLinkExtractor
-    URL_LINK_EXTRACTOR_MODULE_AVAILABLE = True
-except ImportError:
-    URL_LINK_EXTRACTOR_MODULE_AVAILABLE = False
-    print("URL and Link Extractor module not available")
-
-# Regex Extractor module import
-try:
-    from tools.regex_extractor import RegexExtractor
-    REGEX_EXTRACTOR_MODULE_AVAILABLE = True
-except ImportError:
-    REGEX_EXTRACTOR_MODULE_AVAILABLE = False
-    print("Regex Extractor module not available")
-
-# URL Parser module import
-try:
-    from tools.url_parser import URLParser
-    URL_PARSER_MODULE_AVAILABLE = True
-except ImportError:
-    URL_PARSER_MODULE_AVAILABLE = False
-    print("URL Parser module not available")
-
-# Word Frequency Counter module import
-try:
-    from tools.word_frequency_counter import WordFrequencyCounter
-    WORD_FREQUENCY_COUNTER_MODULE_AVAILABLE = True
-except ImportError:
-    WORD_FREQUENCY_COUNTER_MODULE_AVAILABLE = False
-    print("Word Frequency Counter module not available")
-
-# Sorter Tools module import
-try:
-    from tools.sorter_tools import SorterTools
-    SORTER_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    SORTER_TOOLS_MODULE_AVAILABLE = False
-    print("Sorter Tools module not available")
-
-# Translator Tools module import
-try:
-    from tools.translator_tools import TranslatorTools
-    TRANSLATOR_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    TRANSLATOR_TOOLS_MODULE_AVAILABLE = False
-    print("Translator Tools module not available")
-
-# Generator Tools module import
-try:
-    from tools.generator_tools import GeneratorTools, GeneratorToolsWidget
-    GENERATOR_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    GENERATOR_TOOLS_MODULE_AVAILABLE = False
-    print("Generator Tools module not available")
-
-# Extraction Tools module import
-try:
-    from tools.extraction_tools import ExtractionTools
-    EXTRACTION_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    EXTRACTION_TOOLS_MODULE_AVAILABLE = False
-    print("Extraction Tools module not available")
-
-# Base64 Tools module import
-try:
-    from tools.base64_tools import Base64Tools, Base64ToolsWidget
-    BASE64_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    BASE64_TOOLS_MODULE_AVAILABLE = False
-
-# JSON/XML Tool module import
-try:
-    from tools.jsonxml_tool import JSONXMLTool
-    JSONXML_TOOL_MODULE_AVAILABLE = True
-except ImportError:
-    JSONXML_TOOL_MODULE_AVAILABLE = False
-
-# Cron Tool module import
-try:
-    from tools.cron_tool import CronTool
-    CRON_TOOL_MODULE_AVAILABLE = True
-except ImportError:
-    CRON_TOOL_MODULE_AVAILABLE = False
-    print("Cron Tool module not available")
-
-# HTML Extraction Tool module import
-try:
-    from tools.html_tool import HTMLExtractionTool
-    HTML_EXTRACTION_TOOL_MODULE_AVAILABLE = True
-except ImportError:
-    HTML_EXTRACTION_TOOL_MODULE_AVAILABLE = False
-    print("HTML Extraction Tool module not available")
-
-# cURL Tool module import
-try:
-    from tools.curl_tool import CurlToolWidget
-    CURL_TOOL_MODULE_AVAILABLE = True
-except ImportError:
-    CURL_TOOL_MODULE_AVAILABLE = False
-    print("cURL Tool module not available")
-
-# List Comparator module import
-try:
-    from tools.list_comparator import DiffApp
-    LIST_COMPARATOR_MODULE_AVAILABLE = True
-except ImportError:
-    LIST_COMPARATOR_MODULE_AVAILABLE = False
-    print("List Comparator module not available")
-
-# Notes Widget module import
-try:
-    from tools.notes_widget import NotesWidget
-    NOTES_WIDGET_MODULE_AVAILABLE = True
-except ImportError:
-    NOTES_WIDGET_MODULE_AVAILABLE = False
-    print("Notes Widget module not available")
-
-# Smart Diff widget module import
-try:
-    from tools.smart_diff_widget import SmartDiffWidget
-    SMART_DIFF_WIDGET_AVAILABLE = True
-except ImportError:
-    SMART_DIFF_WIDGET_AVAILABLE = False
-
-# Folder File Reporter module import
-try:
-    from tools.folder_file_reporter_adapter import FolderFileReporterAdapter
-    FOLDER_FILE_REPORTER_MODULE_AVAILABLE = True
-except ImportError:
-    FOLDER_FILE_REPORTER_MODULE_AVAILABLE = False
-    print("Folder File Reporter module not available")
-
-# Line Tools module import
-try:
-    from tools.line_tools import LineTools
-    LINE_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    LINE_TOOLS_MODULE_AVAILABLE = False
-    print("Line Tools module not available")
-
-# Whitespace Tools module import
-try:
-    from tools.whitespace_tools import WhitespaceTools
-    WHITESPACE_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    WHITESPACE_TOOLS_MODULE_AVAILABLE = False
-    print("Whitespace Tools module not available")
-
-# Text Statistics module import
-try:
-    from tools.text_statistics_tool import TextStatistics
-    TEXT_STATISTICS_MODULE_AVAILABLE = True
-except ImportError:
-    TEXT_STATISTICS_MODULE_AVAILABLE = False
-    print("Text Statistics module not available")
-
-# Hash Generator module import
-try:
-    from tools.hash_generator import HashGenerator
-    HASH_GENERATOR_MODULE_AVAILABLE = True
-except ImportError:
-    HASH_GENERATOR_MODULE_AVAILABLE = False
-    print("Hash Generator module not available")
-
-# Markdown Tools module import
-try:
-    from tools.markdown_tools import MarkdownTools
-    MARKDOWN_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    MARKDOWN_TOOLS_MODULE_AVAILABLE = False
-    print("Markdown Tools module not available")
-
-# String Escape Tool module import
-try:
-    from tools.string_escape_tool import StringEscapeTool
-    STRING_ESCAPE_TOOL_MODULE_AVAILABLE = True
-except ImportError:
-    STRING_ESCAPE_TOOL_MODULE_AVAILABLE = False
-    print("String Escape Tool module not available")
-
-# Number Base Converter module import
-try:
-    from tools.number_base_converter import NumberBaseConverter
-    NUMBER_BASE_CONVERTER_MODULE_AVAILABLE = True
-except ImportError:
-    NUMBER_BASE_CONVERTER_MODULE_AVAILABLE = False
-    print("Number Base Converter module not available")
-
-# Text Wrapper module import
-try:
-    from tools.text_wrapper import TextWrapper
-    TEXT_WRAPPER_MODULE_AVAILABLE = True
-except ImportError:
-    TEXT_WRAPPER_MODULE_AVAILABLE = False
-    print("Text Wrapper module not available")
-
-# Slug Generator module import
-try:
-    from tools.slug_generator import SlugGenerator
-    SLUG_GENERATOR_MODULE_AVAILABLE = True
-except ImportError:
-    SLUG_GENERATOR_MODULE_AVAILABLE = False
-    print("Slug Generator module not available")
-
-# Column Tools module import
-try:
-    from tools.column_tools import ColumnTools
-    COLUMN_TOOLS_MODULE_AVAILABLE = True
-except ImportError:
-    COLUMN_TOOLS_MODULE_AVAILABLE = False
-    print("Column Tools module not available")
-
-# Timestamp Converter module import
-try:
-    from tools.timestamp_converter import TimestampConverter
-    TIMESTAMP_CONVERTER_MODULE_AVAILABLE = True
-except ImportError:
-    TIMESTAMP_CONVERTER_MODULE_AVAILABLE = False
-    print("Timestamp Converter module not available")
-
-# ASCII Art Generator module import
-try:
-    from tools.ascii_art_generator import ASCIIArtGenerator
-    ASCII_ART_GENERATOR_MODULE_AVAILABLE = True
-except ImportError:
-    ASCII_ART_GENERATOR_MODULE_AVAILABLE = False
-    print("ASCII Art Generator module not available")
-
-# MCP Manager module import
-try:
-    from tools.mcp_widget import MCPManager
-    MCP_MANAGER_MODULE_AVAILABLE = True
-except ImportError:
-    MCP_MANAGER_MODULE_AVAILABLE = False
-    print("MCP Manager module not available")
-
-try:
-    from huggingface_hub import InferenceClient
-    from huggingface_hub.utils import HfHubHTTPError
-    HUGGINGFACE_AVAILABLE = True
-except ImportError:
-    HUGGINGFACE_AVAILABLE = False
-
-
 
 # Async processing imports
 try:
@@ -522,19 +283,34 @@ class StartupProfiler:
     """
     Startup profiling utility to diagnose slow initialization.
     
+    Also tracks time-to-first-window against BUDGETS_MS: module imports are
+    recorded as the "Module Imports" stage and the first idle pass of the
+    event loop as "First Window", both measured from the start of pomera.py.
+    tests/test_startup_budget.py fails when a budget is exceeded.
+    
     Usage:
         profiler = StartupProfiler()
         profiler.start("Stage Name")
         # ... do work ...
         profiler.end("Stage Name")
         profiler.summary()  # Prints timing report to console
+        profiler.check_budget()  # Stages over budget
     """
     
-    def __init__(self, enabled: bool = True):
+    IMPORTS_STAGE = "Module Imports"
+    FIRST_WINDOW_STAGE = "First Window"
+    
+    # Budgets in milliseconds from the start of pomera.py
+    BUDGETS_MS: Dict[str, float] = {
+        IMPORTS_STAGE: 500.0,
+        FIRST_WINDOW_STAGE: 5000.0,
+    }
+    
+    def __init__(self, enabled: bool = True, start_time: Optional[float] = None):
         self.enabled = enabled
         self.stages: Dict[str, Dict[str, float]] = {}
         self.order: List[str] = []
-        self._total_start = time.perf_counter()
+        self._total_start = start_time if start_time is not None else time.perf_counter()
     
     def start(self, stage_name: str) -> None:
         """Start timing a stage."""
@@ -550,6 +326,18 @@ class StartupProfiler:
             return
         self.stages[stage_name]["end"] = time.perf_counter()
     
+    def record(self, stage_name: str, start: float, end: float) -> None:
+        """Record a stage timed elsewhere (perf_counter values)."""
+        if not self.enabled:
+            return
+        self.stages[stage_name] = {"start": start, "end": end}
+        if stage_name not in self.order:
+            self.order.append(stage_name)
+    
+    def mark_first_window(self) -> None:
+        """Record the time from the start of pomera.py until the main window is up."""
+        self.record(self.FIRST_WINDOW_STAGE, self._total_start, time.perf_counter())
+    
     def duration(self, stage_name: str) -> float:
         """Get duration of a completed stage in milliseconds."""
         if stage_name not in self.stages:
@@ -559,6 +347,26 @@ class StartupProfiler:
             return 0.0
         return (stage["end"] - stage["start"]) * 1000
     
+    def check_budget(self, budgets: Optional[Dict[str, float]] = None) -> List[str]:
+        """
+        Compare recorded stages with their budgets.
+        
+        Args:
+            budgets: Stage name to milliseconds (defaults to BUDGETS_MS)
+            
+        Returns:
+            One message per recorded stage over its budget
+        """
+        budgets = self.BUDGETS_MS if budgets is None else budgets
+        violations = []
+        for stage_name, budget_ms in budgets.items():
+            if stage_name not in self.stages:
+                continue
+            duration_ms = self.duration(stage_name)
+            if duration_ms > budget_ms:
+                violations.append(f"{stage_name}: {duration_ms:.1f}ms exceeds budget of {budget_ms:.0f}ms")
+        return violations
+    
     def summary(self) -> str:
         """Print formatted timing summary to console and return as string."""
         if not self.enabled:
@@ -576,7 +384,10 @@ class StartupProfiler:
             duration_ms = self.duration(stage_name)
             bar_length = min(int(duration_ms / 50), 30)  # 50ms per char, max 30
             bar = "█" * bar_length
-            status = "SLOW" if duration_ms > 500 else ""
+            if duration_ms > self.BUDGETS_MS.get(stage_name, float("inf")):
+                status = "OVER BUDGET"
+            else:
+                status = "SLOW" if duration_ms > 500 and stage_name not in self.BUDGETS_MS else ""
             lines.append(f"  {stage_name:40} {duration_ms:7.1f}ms {bar} {status}")
         
         lines.append("-" * 60)
@@ -588,8 +399,10 @@ class StartupProfiler:
         return report
 
 
-# Global startup profiler instance (enabled by default for diagnostics)
-_startup_profiler = StartupProfiler(enabled=True)
+# Global startup profiler instance (enabled by default for diagnostics),
+# timed from the first line of pomera.py
+_startup_profiler = StartupProfiler(enabled=True, start_time=_MODULE_IMPORT_START)
+_startup_profiler.record(StartupProfiler.IMPORTS_STAGE, _MODULE_IMPORT_START, time.perf_counter())
 
 
 class AppConfig:
@@ -871,6 +684,10 @@ class PromeraAIApp(tk.Tk):
         global DATABASE_SETTINGS_AVAILABLE
         super().__init__()
         
+        # Tools registered with _register_lazy_tool, created on first access
+        self._lazy_tools = {}
+        self._lazy_tools_lock = threading.RLock()
+        
         # Start profiling from here
         _startup_profiler.start("Database/Settings Init")
         
@@ -1127,8 +944,15 @@ class PromeraAIApp(tk.Tk):
         # Schedule background maintenance tasks
         self._schedule_maintenance_tasks()
         
-        # Print startup profiling report
+        # Print startup profiling report once the first window is up
+        self.after_idle(self._report_startup_profile)
+
+    def _report_startup_profile(self):
+        """Records time-to-first-window and prints the startup profiling report."""
+        _startup_profiler.mark_first_window()
         _startup_profiler.summary()
+        for violation in _startup_profiler.check_budget():
+            self.logger.warning(f"Startup budget exceeded - {violation}")
 
     def _schedule_maintenance_tasks(self):
         """Schedule periodic background maintenance tasks using Task Scheduler."""
@@ -1991,11 +1815,16 @@ class PromeraAIApp(tk.Tk):
         Returns:
             The tool instance or None if not available
         """
+        instance = self._create_tool_with_loader(tool_name, *args, **kwargs)
+        setattr(self, attr_name, instance)
+        return instance
+
+    def _create_tool_with_loader(self, tool_name: str, *args, **kwargs):
+        """Create a tool instance through the Tool Loader, or None if it is not available."""
         if TOOL_LOADER_AVAILABLE and self.tool_loader:
             if self.tool_loader.is_available(tool_name):
                 instance = self.tool_loader.create_instance(tool_name, *args, **kwargs)
                 if instance:
-                    setattr(self, attr_name, instance)
                     self.logger.info(f"{tool_name} initialized via Tool Loader")
                     return instance
                 else:
@@ -2003,10 +1832,47 @@ class PromeraAIApp(tk.Tk):
             else:
                 error = self.tool_loader.get_load_error(tool_name)
                 self.logger.debug(f"{tool_name} not available: {error}")
-        
-        setattr(self, attr_name, None)
         return None
 
+    def _register_lazy_tool(self, attr_name: str, factory, description: str = ""):
+        """
+        Register a tool that is created on first access of self.<attr_name>.
+        
+        The factory is registered with the App Context as "tool.<attr_name>"
+        and resolved by __getattr__, so startup does not import the tool's
+        module. The factory may return None if the tool is unavailable.
+        
+        Args:
+            attr_name: Attribute name on self (e.g., 'case_tool')
+            factory: Zero-argument callable creating the tool
+            description: Tool name for the App Context listing
+        """
+        self.__dict__.pop(attr_name, None)
+        if self.app_context:
+            service_name = f"tool.{attr_name}"
+            self.app_context.register_lazy(service_name, factory, description=description, overwrite=True)
+            self._lazy_tools[attr_name] = lambda: self.app_context.get(service_name)
+        else:
+            self._lazy_tools[attr_name] = factory
+
+    def __getattr__(self, name):
+        """Creates lazily registered tools on first access, otherwise defers to Tk."""
+        lazy_tools = self.__dict__.get('_lazy_tools')
+        if lazy_tools is not None and name in lazy_tools:
+            with self._lazy_tools_lock:
+                if name in self.__dict__:
+                    return self.__dict__[name]
+                getter = lazy_tools[name]
+                try:
+                    instance = getter()
+                except Exception as e:
+                    self.logger.warning(f"{name} could not be created: {e}")
+                    instance = None
+                setattr(self, name, instance)
+                del lazy_tools[name]
+                return instance
+        return super().__getattr__(name)
+
     def _is_tool_available(self, tool_name: str, legacy_flag: bool = None) -> bool:
         """
         Check if a tool is available using Tool Loader or legacy flag.
@@ -2026,10 +1892,12 @@ class PromeraAIApp(tk.Tk):
 
     def _init_tools_batch(self):
         """
-        Initialize multiple tools using the Tool Loader.
+        Register tools for lazy creation using the Tool Loader.
         
         This method replaces repetitive if/else blocks for tool initialization
-        with a data-driven approach using the Tool Loader.
+        with a data-driven approach using the Tool Loader. Each tool is
+        registered with _register_lazy_tool and created the first time its
+        attribute is used, so no tool module is imported during startup.
         """
         # Define tools to initialize: (tool_name, attr_name, legacy_flag, args)
         tools_to_init = [
@@ -2059,58 +1927,63 @@ class PromeraAIApp(tk.Tk):
             ("ASCII Art Generator", "ascii_art_generator", ASCII_ART_GENERATOR_MODULE_AVAILABLE, ()),
         ]
         
-        initialized_count = 0
-        failed_count = 0
-        
-        for tool_name, attr_name, legacy_flag, args in tools_to_init:
-            instance = None
-            
-            if TOOL_LOADER_AVAILABLE and self.tool_loader:
-                # Try Tool Loader first
-                instance = self._init_tool_with_loader(tool_name, attr_name, *args)
-            
-            # If Tool Loader didn't work, fall through to legacy init
-            if instance:
-                initialized_count += 1
-            elif legacy_flag:
-                # Fallback to legacy initialization — instantiate directly
-                try:
-                    tool_class_map = {
-                        "base64_tools": ("tools.base64_tools", "Base64Tools"),
-                        "case_tool": ("tools.case_tool", "CaseTool"),
-                        "email_header_analyzer": ("tools.email_header_analyzer", "EmailHeaderAnalyzerProcessor"),
-                        "url_link_extractor": ("tools.url_link_extractor", "URLLinkExtractorProcessor"),
-                        "regex_extractor": ("tools.regex_extractor", "RegexExtractorProcessor"),
-                        "url_parser": ("tools.url_parser", "URLParserProcessor"),
-                        "word_frequency_counter": ("tools.word_frequency_counter", "WordFrequencyCounter"),
-                        "sorter_tools": ("tools.sorter_tools", "SorterToolsProcessor"),
-                        "translator_tools": ("tools.translator_tools", "TranslatorToolsProcessor"),
-                        "email_extraction_tool": ("tools.email_extraction_tool", "EmailExtractionProcessor"),
-                        "string_escape_tool": ("tools.string_escape_tool", "StringEscapeProcessor"),
-                        "number_base_converter": ("tools.number_base_converter", "NumberBaseConverterV2"),
-                        "text_wrapper": ("tools.text_wrapper", "TextWrapperProcessor"),
-                        "slug_generator": ("tools.slug_generator", "SlugGeneratorProcessor"),
-                        "timestamp_converter": ("tools.timestamp_converter", "TimestampConverterV2"),
-                    }
+        # Legacy fallback classes, used when the Tool Loader cannot create a tool
+        tool_class_map = {
+            "base64_tools": ("tools.base64_tools", "Base64Tools"),
+            "case_tool": ("tools.case_tool", "CaseTool"),
+            "email_header_analyzer": ("tools.email_header_analyzer", "EmailHeaderAnalyzerProcessor"),
+            "url_link_extractor": ("tools.url_link_extractor", "URLLinkExtractorProcessor"),
+            "regex_extractor": ("tools.regex_extractor", "RegexExtractorProcessor"),
+            "url_parser": ("tools.url_parser", "URLParserProcessor"),
+            "word_frequency_counter": ("tools.word_frequency_counter", "WordFrequencyCounter"),
+            "sorter_tools": ("tools.sorter_tools", "SorterToolsProcessor"),
+            "translator_tools": ("tools.translator_tools", "TranslatorToolsProcessor"),
+            "email_extraction_tool": ("tools.email_extraction_tool", "EmailExtractionProcessor"),
+            "string_escape_tool": ("tools.string_escape_tool", "StringEscapeProcessor"),
+            "number_base_converter": ("tools.number_base_converter", "NumberBaseConverterV2"),
+            "text_wrapper": ("tools.text_wrapper", "TextWrapperProcessor"),
+            "slug_generator": ("tools.slug_generator", "SlugGeneratorProcessor"),
+            "timestamp_converter": ("tools.timestamp_converter", "TimestampConverterV2"),
+        }
+
+        def make_factory(tool_name, attr_name, legacy_flag, args):
+            def create_tool():
+                instance = None
+                
+                if TOOL_LOADER_AVAILABLE and self.tool_loader:
+                    # Try Tool Loader first
+                    instance = self._create_tool_with_loader(tool_name, *args)
+                
+                # If Tool Loader didn't work, fall through to legacy init
+                if instance:
+                    return instance
+                elif legacy_flag:
+                    # Fallback to legacy initialization — instantiate directly
                     if attr_name in tool_class_map:
                         mod_name, cls_name = tool_class_map[attr_name]
                         import importlib
                         mod = importlib.import_module(mod_name)
                         cls = getattr(mod, cls_name)
-                        setattr(self, attr_name, cls())
-                        initialized_count += 1
                         self.logger.debug(f"{tool_name} initialized via legacy fallback")
-                    else:
-                        setattr(self, attr_name, None)
-                        self.logger.debug(f"{tool_name} has no legacy class mapping")
-                except Exception as e:
-                    setattr(self, attr_name, None)
-                    self.logger.warning(f"{tool_name} legacy init failed: {e}")
+                        return cls()
+                    self.logger.debug(f"{tool_name} has no legacy class mapping")
+                return None
+            return create_tool
+        
+        registered_count = 0
+        unavailable_count = 0
+        
+        for tool_name, attr_name, legacy_flag, args in tools_to_init:
+            if legacy_flag or (TOOL_LOADER_AVAILABLE and self.tool_loader
+                               and self.tool_loader.is_installed(tool_name)):
+                self._register_lazy_tool(attr_name, make_factory(tool_name, attr_name, legacy_flag, args),
+                                         tool_name)
+                registered_count += 1
             else:
                 setattr(self, attr_name, None)
-                failed_count += 1
+                unavailable_count += 1
         
-        self.logger.info(f"Tool batch initialization: {initialized_count} loaded, {failed_count} unavailable")
+        self.logger.info(f"Tool batch initialization: {registered_count} registered, {unavailable_count} unavailable")
 
     def global_undo(self, event=None):
         """Global undo handler that works on the currently focused text widget."""
@@ -2277,8 +2150,8 @@ class PromeraAIApp(tk.Tk):
             self.logger.info("Skipping save_settings during initialization")
             return
             
-        input_contents = [tab.text.get("1.0", tk.END).strip() for tab in self.input_tabs]
-        output_contents = [tab.text.get("1.0", tk.END).strip() for tab in self.output_tabs]
+        input_contents = self._get_tab_contents("input")
+        output_contents = self._get_tab_contents("output")
         
         self.settings["input_tabs"] = input_contents
         self.settings["output_tabs"] = output_contents
@@ -2305,7 +2178,8 @@ class PromeraAIApp(tk.Tk):
                 
                 # Only force disk backup every 5 seconds to prevent freezing during typing
                 if current_time - self._last_disk_backup_time > 5.0:
-                    self.db_settings_manager.connection_manager.backup_to_disk()
+                    self.db_settings_manager.flush_pending_writes()
+                    self.db_settings_manager.connection_manager.backup_to_disk(background=True)
                     self._last_disk_backup_time = current_time
                     self.logger.info("Settings saved to database")
                 else:
@@ -2349,32 +2223,92 @@ class PromeraAIApp(tk.Tk):
         non_empty_outputs = sum(1 for content in output_tabs_data if content.strip())
         self.logger.info(f"Loading state - {non_empty_inputs} non-empty input tabs, {non_empty_outputs} non-empty output tabs")
         
-        for i, content in enumerate(input_tabs_data):
-            if content.strip():
-                self.logger.info(f"Loading input tab {i+1}: '{content[:50]}...' ({len(content)} chars)")
-            self.input_tabs[i].text.insert("1.0", content)
-            
-        for i, content in enumerate(output_tabs_data):
-            if content.strip():
-                self.logger.info(f"Loading output tab {i+1}: '{content[:50]}...' ({len(content)} chars)")
-            self.output_tabs[i].text.config(state="normal")
-            self.output_tabs[i].text.insert("1.0", content)
-            self.output_tabs[i].text.config(state="disabled")
-        
-        self.input_notebook.select(self.settings.get("active_input_tab", 0))
-        self.output_notebook.select(self.settings.get("active_output_tab", 0))
-        
-        # Verify content after loading
-        loaded_input_contents = [tab.text.get("1.0", tk.END).strip() for tab in self.input_tabs]
-        loaded_output_contents = [tab.text.get("1.0", tk.END).strip() for tab in self.output_tabs]
-        actual_non_empty_inputs = sum(1 for content in loaded_input_contents if content)
-        actual_non_empty_outputs = sum(1 for content in loaded_output_contents if content)
-        self.logger.info(f"After loading - {actual_non_empty_inputs} non-empty input tabs, {actual_non_empty_outputs} non-empty output tabs in UI")
+        # Only the active tabs are filled now; the rest are inserted in the
+        # background (or when selected), so large hidden tabs do not delay startup
+        self._pending_tab_restore = {}
+        for tab_type, tabs, contents in (("input", self.input_tabs, input_tabs_data),
+                                         ("output", self.output_tabs, output_tabs_data)):
+            for i, content in enumerate(contents[:len(tabs)]):
+                if content.strip():
+                    self.logger.info(f"Loading {tab_type} tab {i+1}: '{content[:50]}...' ({len(content)} chars)")
+                self._pending_tab_restore[(tab_type, i)] = content
+        
+        active_input = self.settings.get("active_input_tab", 0)
+        active_output = self.settings.get("active_output_tab", 0)
+        self._restore_tab_content("input", active_input)
+        self._restore_tab_content("output", active_output)
+        self.input_notebook.select(active_input)
+        self.output_notebook.select(active_output)
+        self.after_idle(self._restore_next_pending_tab)
         
         self.update_all_stats()
         self.update_tab_labels()
 
 
+    def _restore_tab_content(self, tab_type, index):
+        """
+        Inserts saved content into a tab that has not been restored yet.
+
+        A tab that was written to first (paste, tool output, MCP set_text)
+        keeps what was written and its saved content is dropped.
+        """
+        pending = getattr(self, '_pending_tab_restore', None)
+        if not pending:
+            return
+        content = pending.pop((tab_type, index), None)
+        if content is None:
+            return
+        tab = (self.input_tabs if tab_type == "input" else self.output_tabs)[index]
+        if not self._is_tab_empty(tab):
+            self.logger.debug(f"{tab_type} tab {index+1} was written to before restore, keeping its text")
+            return
+        if tab_type == "output":
+            tab.text.config(state="normal")
+        tab.text.delete("1.0", tk.END)
+        tab.text.insert("1.0", content)
+        if tab_type == "output":
+            tab.text.config(state="disabled")
+
+    def _restore_next_pending_tab(self):
+        """Restores one hidden tab per idle callback until all are loaded."""
+        pending = getattr(self, '_pending_tab_restore', None)
+        if not pending:
+            return
+        tab_type, index = next(iter(pending))
+        self._restore_tab_content(tab_type, index)
+        if pending:
+            self.after_idle(self._restore_next_pending_tab)
+        else:
+            self.logger.debug("All saved tabs restored")
+
+    def _discard_pending_tab(self, widget):
+        """Drops the saved content of an unrestored tab whose text widget just changed."""
+        pending = getattr(self, '_pending_tab_restore', None)
+        if not pending:
+            return
+        for tab_type, tabs in (("input", self.input_tabs), ("output", self.output_tabs)):
+            for i, tab in enumerate(tabs):
+                if tab.text is widget:
+                    if pending.pop((tab_type, i), None) is not None:
+                        self.logger.debug(f"{tab_type} tab {i+1} changed before restore, saved content dropped")
+                    return
+
+    @staticmethod
+    def _is_tab_empty(tab):
+        return tab.text.compare("end-1c", "==", "1.0")
+
+    def _get_tab_contents(self, tab_type):
+        """Returns the text of all tabs, using saved content for tabs not yet restored."""
+        tabs = self.input_tabs if tab_type == "input" else self.output_tabs
+        pending = getattr(self, '_pending_tab_restore', None) or {}
+        contents = []
+        for i, tab in enumerate(tabs):
+            if (tab_type, i) in pending and self._is_tab_empty(tab):
+                contents.append(pending[(tab_type, i)].strip())
+            else:
+                contents.append(tab.text.get("1.0", tk.END).strip())
+        return contents
+
     def setup_logging(self):
         """Configures the logging system for the application."""
         self.logger = logging.getLogger("PromeraAIApp")
@@ -2471,35 +2405,37 @@ class PromeraAIApp(tk.Tk):
         ui_settings = perf_settings.get("ui_optimizations", {})
         AppConfig.DEBOUNCE_DELAY = ui_settings.get("debounce_delay_ms", 300)
         
-        # Initialize Find & Replace widget if available
+        # Initialize Find & Replace widget if available (created on first use)
         if FIND_REPLACE_MODULE_AVAILABLE:
             self.settings_manager = PromeraAISettingsManager(self)
-            self.find_replace_widget = FindReplaceWidget(self, self.settings_manager, self.logger, self.dialog_manager)
-            self.logger.info("Find & Replace module initialized")
+            self._register_lazy_tool(
+                "find_replace_widget",
+                lambda: FindReplaceWidget(self, self.settings_manager, self.logger, self.dialog_manager),
+                "Find & Replace Text")
         else:
             self.find_replace_widget = None
             self.logger.warning("Find & Replace module not available")
             
         # ============================================================
         # BATCH TOOL INITIALIZATION
-        # Uses Tool Loader when available for lazy loading and
-        # centralized error tracking. Falls back to legacy imports.
+        # Tools are registered with the App Context and created on first
+        # access. Uses Tool Loader when available, falls back to legacy imports.
         # ============================================================
         self._init_tools_batch()
         
         # Special case tools that require constructor arguments
         # Folder File Reporter needs 'self' reference
         if FOLDER_FILE_REPORTER_MODULE_AVAILABLE:
-            self.folder_file_reporter = FolderFileReporterAdapter(self)
-            self.logger.info("Folder File Reporter module initialized")
+            self._register_lazy_tool("folder_file_reporter", lambda: FolderFileReporterAdapter(self),
+                                     "Folder File Reporter")
         else:
             self.folder_file_reporter = None
             self.logger.warning("Folder File Reporter module not available")
         
         # HTML Extraction Tool needs logger reference
         if HTML_EXTRACTION_TOOL_MODULE_AVAILABLE:
-            self.html_extraction_tool = HTMLExtractionTool(self.logger)
-            self.logger.info("HTML Extraction Tool module initialized")
+            self._register_lazy_tool("html_extraction_tool", lambda: HTMLExtractionTool(self.logger),
+                                     "HTML Extraction Tool")
         else:
             self.html_extraction_tool = None
             self.logger.warning("HTML Extraction Tool module not available")
@@ -2517,8 +2453,7 @@ class PromeraAIApp(tk.Tk):
 
         # Initialize MCP Manager
         if MCP_MANAGER_MODULE_AVAILABLE:
-            self.mcp_manager = MCPManager()
-            self.logger.info("MCP Manager module initialized")
+            self._register_lazy_tool("mcp_manager", lambda: MCPManager(), "MCP Manager")
         else:
             self.mcp_manager = None
 
@@ -2624,25 +2559,15 @@ class PromeraAIApp(tk.Tk):
 
         
     def setup_audio(self):
-        """Initializes the PyAudio stream for Morse code playback."""
-        global PYAUDIO_AVAILABLE
+        """
+        Prepares Morse code audio state.
+        
+        No audio device is opened at startup: Morse playback lives in the
+        Translator Tools widget, which opens its PyAudio stream on first use.
+        """
         self.audio_stream = None
         self.pyaudio_instance = None
 
-        
-        if PYAUDIO_AVAILABLE:
-            try:
-                self.pyaudio_instance = pyaudio.PyAudio()
-                self.audio_stream = self.pyaudio_instance.open(format=pyaudio.paFloat32,
-                                                     channels=1,
-                                                     rate=AppConfig.SAMPLE_RATE,
-                                                     output=True)
-                self.logger.info("PyAudio initialized successfully.")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize PyAudio: {e}")
-                PYAUDIO_AVAILABLE = False
-
-
     def create_widgets(self):
         """Creates and arranges all the GUI widgets in the main window."""
         # Create menu bar
@@ -7424,7 +7349,11 @@ class PromeraAIApp(tk.Tk):
             # Get content efficiently - only first 50 chars to avoid processing large content
             try:
                 # Get only the first few lines to extract first characters efficiently
-                content_sample = tab.text.get("1.0", "3.0")  # First 2 lines should be enough
+                pending = (getattr(self, '_pending_tab_restore', None) or {}).get((cache_key_prefix, i))
+                if pending is not None:
+                    content_sample = pending[:1000]
+                else:
+                    content_sample = tab.text.get("1.0", "3.0")  # First 2 lines should be enough
                 content_hash = hash(content_sample)
                 
                 # Check cache
@@ -7809,6 +7738,8 @@ class PromeraAIApp(tk.Tk):
         
         Updates visibility states for all input tabs when using visibility-aware updates.
         """
+        self._restore_tab_content("input", self.input_notebook.index(self.input_notebook.select()))
+        
         # Update visibility states if visibility monitor is available
         if hasattr(self, 'visibility_monitor') and self.visibility_monitor:
             active_index = self.input_notebook.index(self.input_notebook.select())
@@ -7847,6 +7778,8 @@ class PromeraAIApp(tk.Tk):
         
         Updates visibility states for all output tabs when using visibility-aware updates.
         """
+        self._restore_tab_content("output", self.output_notebook.index(self.output_notebook.select()))
+        
         # Update visibility states if visibility monitor is available
         if hasattr(self, 'visibility_monitor') and self.visibility_monitor:
             active_index = self.output_notebook.index(self.output_notebook.select())
@@ -9068,6 +9001,8 @@ class PromeraAIApp(tk.Tk):
 
     def export_to_pdf(self, filename, text):
         """Helper function to create a PDF file."""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
         c = canvas.Canvas(filename, pagesize=letter)
         width, height = letter
         text_object = c.beginText(40, height - 40)
@@ -9079,6 +9014,7 @@ class PromeraAIApp(tk.Tk):
 
     def export_to_docx(self, filename, text):
         """Helper function to create a DOCX file."""
+        from docx import Document
         doc = Document()
         doc.add_paragraph(text)
         doc.save(filename)
@@ -10467,6 +10403,8 @@ class PromeraAIApp(tk.Tk):
 
         src_widget = getattr(event, 'widget', None)
         if not src_widget: return
+        # Whatever was written wins over saved content still waiting to be restored
+        self._discard_pending_tab(src_widget)
         try:
             for i, tab in enumerate(getattr(self, 'diff_input_tabs', [])):
                 if tab.text is src_widget:
@@ -43,6 +43,11 @@ Author: Pomera AI Commander
 License: MIT
 """
 
+import time
+
+# Startup is measured from here; see core.mcp.startup_metrics
+_SERVER_START = time.perf_counter()
+
 import sys
 import os
 import json
@@ -69,6 +74,17 @@ except ImportError:
     __version__ = "unknown"
 
 
+def report_missing_dependencies():
+    """Log missing optional dependencies to stderr."""
+    try:
+        from core.dependency_registry import get_startup_summary
+        dep_summary = get_startup_summary()
+        if dep_summary:
+            print(dep_summary, file=sys.stderr, flush=True)
+    except Exception:
+        pass  # Non-critical — don't block startup
+
+
 def main():
     """Main entry point for the Pomera MCP server."""
     # MCP JSON-RPC is UTF-8, and several tool descriptions/results contain
@@ -106,6 +122,43 @@ def main():
         default="{}",
         help="JSON arguments for --call (default: {})"
     )
+    parser.add_argument(
+        "--workers",
+        metavar="N",
+        type=int,
+        default=int(os.environ.get("POMERA_MCP_WORKERS", "0") or 0),
+        help="Run tools/call requests concurrently on N worker threads "
+             "(default: 0 = sequential; env: POMERA_MCP_WORKERS)"
+    )
+    parser.add_argument(
+        "--result-cache-mb",
+        metavar="MB",
+        type=int,
+        default=None,
+        help="Memoize results of pure tool calls in an in-memory cache of MB megabytes "
+             "(default: 0 = off; env: POMERA_MCP_RESULT_CACHE_MB)"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        default=os.environ.get("POMERA_MCP_METRICS_FILE"),
+        help="Periodically export latency histograms to PATH: Prometheus text, "
+             "or JSON lines if PATH ends in .jsonl (env: POMERA_MCP_METRICS_FILE)"
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        metavar="SECONDS",
+        type=float,
+        default=30.0,
+        help="Seconds between metrics exports (default: 30)"
+    )
+    parser.add_argument(
+        "--toolsets",
+        metavar="NAMES",
+        default=os.environ.get("POMERA_MCP_TOOLSETS"),
+        help="Comma-separated toolsets to expose: core, search, ai, tools "
+             "(default: all; env: POMERA_MCP_TOOLSETS)"
+    )
     parser.add_argument(
         "--data-dir",
         metavar="PATH",
@@ -131,31 +184,49 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Debug logging enabled")
     
+    if args.result_cache_mb is not None:
+        from core.mcp.result_cache import configure_result_cache
+        configure_result_cache(args.result_cache_mb)
+    
     # Import MCP modules
     try:
-        from core.mcp.tool_registry import ToolRegistry
+        from core.mcp.tool_manifest import LazyToolRegistry
         from core.mcp.server_stdio import StdioMCPServer
+        from core.mcp.startup_metrics import set_startup_start
+        from core.mcp.toolset_config import DEFAULT_TOOLSETS, get_tools_for_toolsets
     except ImportError as e:
         logger.error(f"Failed to import MCP modules: {e}")
         logger.error("Make sure you're running from the Pomera-AI-Commander directory")
         sys.exit(1)
     
-    # Create tool registry
+    startup = set_startup_start(_SERVER_START)
+    startup.mark(startup.IMPORTS)
+    
+    toolsets = DEFAULT_TOOLSETS
+    enabled_tools = None
+    if args.toolsets:
+        toolsets = [name.strip() for name in args.toolsets.split(",") if name.strip()]
+        try:
+            enabled_tools = get_tools_for_toolsets(toolsets)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    # Create tool registry (served from the tool manifest until the first call)
     try:
-        registry = ToolRegistry()
+        registry = LazyToolRegistry(enabled_tools=enabled_tools)
         logger.info(f"Loaded {len(registry)} tools")
     except Exception as e:
         logger.error(f"Failed to create tool registry: {e}")
         sys.exit(1)
+    startup.mark(startup.REGISTRY_READY)
+    startup.set_info(toolsets=list(toolsets), tool_count=len(registry))
     
-    # Startup dependency check — log missing optional deps to stderr
-    try:
-        from core.dependency_registry import get_startup_summary
-        dep_summary = get_startup_summary()
-        if dep_summary:
-            print(dep_summary, file=sys.stderr, flush=True)
-    except Exception:
-        pass  # Non-critical — don't block startup
+    # One-shot modes check dependencies up front; the server defers the
+    # check until the client has its initialize reply
+    if args.list_tools or args.call:
+        report_missing_dependencies()
+    else:
+        startup.after_initialize(report_missing_dependencies, "dependency_probe")
     
     # List tools mode
     if args.list_tools:
@@ -205,12 +276,20 @@ def main():
     server = StdioMCPServer(
         tool_registry=registry,
         server_name="pomera-mcp-server",
-        server_version=__version__
+        server_version=__version__,
+        max_workers=args.workers
     )
     
     logger.info("Starting Pomera MCP Server...")
     logger.info(f"Available tools: {', '.join(registry.get_tool_names())}")
     
+    if args.metrics_file:
+        from core.mcp.metrics import mcp_metrics
+        mcp_metrics.start_file_export(args.metrics_file, interval_s=args.metrics_interval)
+    
+    ready_ms = startup.mark(startup.SERVER_READY)
+    logger.info(f"Ready to serve after {ready_ms:.0f}ms")
+    
     try:
         # Run synchronously (simpler for stdio)
         server.run_sync()
@@ -219,6 +298,9 @@ def main():
     except Exception as e:
         logger.exception(f"Server error: {e}")
         sys.exit(1)
+    finally:
+        if args.metrics_file:
+            mcp_metrics.stop_file_export()
     
     logger.info("Server shutdown complete")
 
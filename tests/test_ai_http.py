@@ -0,0 +1,124 @@
+"""
+Tests for core.ai_http, the pooled per-provider sessions used for AI calls.
+
+Requests go to a local stub HTTP server, so no network access or API keys
+are needed.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.ai_http as ai_http
+from core.ai_http import AISession, ai_post, get_ai_session, get_ai_session_stats
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON endpoint that can fail the first N requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            failing = server.failures > 0
+            if failing:
+                server.failures -= 1
+        if failing:
+            self.send_response(server.failure_status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubProviderHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = 0
+    server.failures = 0
+    server.failure_status = 503
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fresh_sessions(monkeypatch):
+    monkeypatch.setattr(ai_http, "_sessions", {})
+    monkeypatch.setattr(ai_http, "RETRY_BACKOFF_FACTOR", 0)
+    yield
+    ai_http.close_ai_sessions()
+
+
+class TestAISession:
+
+    def test_connections_are_reused(self, stub_server, fresh_sessions):
+        for _ in range(5):
+            response = ai_post("Stub", stub_server.url, json={"prompt": "hi"})
+            assert response.json() == {"ok": True}
+        stats = get_ai_session("Stub").get_stats()
+        assert stats["requests"] == 5
+        assert stats["http_attempts"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+        assert stats["reuse_rate"] == "80.0%"
+
+    @pytest.mark.parametrize("status", [429, 503])
+    def test_retries_throttled_and_unavailable(self, stub_server, fresh_sessions, status):
+        stub_server.failures = 2
+        stub_server.failure_status = status
+        response = ai_post("Stub", stub_server.url, json={})
+        assert response.status_code == 200
+        assert stub_server.hits == 3
+        assert get_ai_session("Stub").get_stats()["requests"] == 1
+
+    def test_gives_up_after_retry_budget(self, stub_server, fresh_sessions):
+        stub_server.failures = 10
+        response = ai_post("Stub", stub_server.url, json={})
+        assert response.status_code == 503
+        assert stub_server.hits == ai_http.RETRY_TOTAL + 1
+
+    def test_client_errors_are_not_retried(self, stub_server, fresh_sessions):
+        stub_server.failures = 1
+        stub_server.failure_status = 400
+        assert ai_post("Stub", stub_server.url, json={}).status_code == 400
+        assert stub_server.hits == 1
+
+    def test_default_timeout(self, monkeypatch):
+        seen = []
+        monkeypatch.setattr(ai_http.requests.Session, "request",
+                            lambda self, method, url, **kwargs: seen.append(kwargs["timeout"]))
+        monkeypatch.setenv("POMERA_AI_READ_TIMEOUT", "42")
+        session = AISession("Stub")
+        session.post("http://example.invalid", timeout=None)
+        session.post("http://example.invalid")
+        session.post("http://example.invalid", timeout=5)
+        assert seen == [(ai_http.DEFAULT_CONNECT_TIMEOUT, 42.0)] * 2 + [5]
+
+    def test_sessions_are_per_provider(self, stub_server, fresh_sessions):
+        assert get_ai_session("OpenAI") is get_ai_session("OpenAI")
+        assert get_ai_session("OpenAI") is not get_ai_session("Anthropic AI")
+        ai_post("OpenAI", stub_server.url, json={})
+        stats = {s["provider"]: s for s in get_ai_session_stats()}
+        assert stats["OpenAI"]["requests"] == 1
+        assert stats["Anthropic AI"]["requests"] == 0
@@ -1055,9 +1055,9 @@ class TestNormalizeThinkingParams:
 
 class TestMonkeypatchedPayloads:
     """Test actual payloads sent by research_anthropic() and deep_reasoning_anthropic()
-    via monkeypatched requests.post.
+    via monkeypatched ai_post.
     
-    These tests intercept requests.post calls to capture JSON payloads,
+    These tests intercept ai_post calls (the pooled provider session) to capture JSON payloads,
     then assert on the captured data. No try/except - real failures are real.
     """
     
@@ -1123,13 +1123,20 @@ class TestMonkeypatchedPayloads:
         
         return mock_post
     
+    @classmethod
+    def _patch_post(cls, monkeypatch, captured_payloads):
+        """Route the engine's ai_post calls to a capturing mock_post."""
+        import core.ai_research_engine
+        mock_post = cls._make_mock_post(captured_payloads)
+        monkeypatch.setattr(core.ai_research_engine, "ai_post",
+                            lambda provider, url, **kwargs: mock_post(url, **kwargs))
+    
     def test_deep_reasoning_opus_48_payload(self, monkeypatch):
         """Verify deep reasoning sends xhigh effort + adaptive thinking for Opus 4.8."""
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.deep_reasoning_anthropic(
@@ -1140,7 +1147,7 @@ class TestMonkeypatchedPayloads:
             max_tokens=128000
         )
         
-        assert len(captured) >= 1, "Expected at least 1 requests.post call"
+        assert len(captured) >= 1, "Expected at least 1 ai_post call"
         payload = captured[0]["payload"]
         assert payload["thinking"] == {"type": "adaptive", "display": "summarized"}
         assert payload["output_config"] == {"effort": "xhigh"}
@@ -1150,10 +1157,9 @@ class TestMonkeypatchedPayloads:
     def test_deep_reasoning_opus_46_adaptive_no_inflation(self, monkeypatch):
         """Opus 4.6: adaptive thinking, effort clamped to max, max_tokens NOT inflated."""
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.deep_reasoning_anthropic(
@@ -1164,7 +1170,7 @@ class TestMonkeypatchedPayloads:
             max_tokens=16000
         )
         
-        assert len(captured) >= 1, "Expected at least 1 requests.post call"
+        assert len(captured) >= 1, "Expected at least 1 ai_post call"
         payload = captured[0]["payload"]
         assert payload["max_tokens"] == 16000, f"Expected 16000 (no inflation), got {payload['max_tokens']}"
         assert payload["thinking"] == {"type": "adaptive", "display": "summarized"}
@@ -1173,10 +1179,9 @@ class TestMonkeypatchedPayloads:
     def test_deep_reasoning_opus_48_no_inflation(self, monkeypatch):
         """Opus 4.8: max_tokens should NOT be inflated by thinking_budget."""
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.deep_reasoning_anthropic(
@@ -1187,7 +1192,7 @@ class TestMonkeypatchedPayloads:
             max_tokens=16000
         )
         
-        assert len(captured) >= 1, "Expected at least 1 requests.post call"
+        assert len(captured) >= 1, "Expected at least 1 ai_post call"
         payload = captured[0]["payload"]
         assert payload["max_tokens"] == 16000, f"Expected 16000 (no inflation), got {payload['max_tokens']}"
         assert payload["thinking"]["type"] == "adaptive"
@@ -1195,10 +1200,9 @@ class TestMonkeypatchedPayloads:
     def test_research_twostage_opus_48_payload(self, monkeypatch):
         """Verify two-stage research sends correct thinking + effort for Opus 4.8."""
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.research_anthropic(
@@ -1210,7 +1214,7 @@ class TestMonkeypatchedPayloads:
             max_tokens=128000
         )
         
-        assert len(captured) >= 2, f"Expected >= 2 requests.post calls for two-stage, got {len(captured)}"
+        assert len(captured) >= 2, f"Expected >= 2 ai_post calls for two-stage, got {len(captured)}"
         stage2 = captured[1]["payload"]
         assert stage2["thinking"] == {"type": "adaptive", "display": "summarized"}
         assert stage2.get("output_config") == {"effort": "high"}
@@ -1224,10 +1228,9 @@ class TestMonkeypatchedPayloads:
         With re-clamp: max_tokens stays at 16384, thinking_budget reduced to fit.
         """
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.deep_reasoning_anthropic(
@@ -1238,7 +1241,7 @@ class TestMonkeypatchedPayloads:
             max_tokens=64000  # will be clamped to 16384
         )
         
-        assert len(captured) >= 1, "Expected at least 1 requests.post call"
+        assert len(captured) >= 1, "Expected at least 1 ai_post call"
         payload = captured[0]["payload"]
         # max_tokens must not exceed model's 16K limit
         assert payload["max_tokens"] <= 16384, f"Expected <= 16384 (Opus 4.5 max), got {payload['max_tokens']}"
@@ -1252,10 +1255,9 @@ class TestMonkeypatchedPayloads:
     def test_research_twostage_opus_45_budget_normalized(self, monkeypatch):
         """Opus 4.5 two-stage: budget_tokens must be < max_tokens in stage 2."""
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.research_anthropic(
@@ -1277,10 +1279,9 @@ class TestMonkeypatchedPayloads:
     def test_research_single_opus_45_budget_normalized(self, monkeypatch):
         """Opus 4.5 single mode: budget_tokens must be < max_tokens."""
         from core.ai_research_engine import AIResearchEngine
-        import requests
         
         captured = []
-        monkeypatch.setattr(requests, "post", self._make_mock_post(captured))
+        self._patch_post(monkeypatch, captured)
         
         engine = AIResearchEngine()
         engine.research_anthropic(
@@ -0,0 +1,214 @@
+"""
+Tests for ContentHashCache: the segmented-LRU memory tier and the sharded
+append-only disk tier (core.result_disk_store).
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.content_hash_cache import ContentHashCache, ProcessingResultCache
+from core.result_disk_store import ResultDiskStore, SHARD_COUNT
+
+# Writes and reads back keys that all land in shard "a", with shards small
+# enough to compact repeatedly; exits 1 if any key returns another's data
+SHARED_SHARD_WORKER = """
+import sys, time
+from core.result_disk_store import ResultDiskStore, SHARD_COUNT
+directory, worker = sys.argv[1], int(sys.argv[2])
+disk = ResultDiskStore(directory, max_disk_mb=SHARD_COUNT)
+written = []
+for i in range(300):
+    key = "a" + f"{worker:x}" + f"{i:030x}"
+    disk.put(key, {"tool_name": "T"}, key.encode() * 200, time.time(), time.time() + 60)
+    written.append(key)
+    for other in written[-5:]:
+        record = disk.get(other)
+        if record is not None and record[1] != other.encode() * 200:
+            sys.exit(1)
+"""
+
+
+def cached_text(cache, content, tool="Case Tool", settings=None):
+    result = cache.get_cached_result(content, tool, settings or {})
+    if isinstance(result, bytes):
+        result = cache._decompress_content(result)
+    return result
+
+
+def store(cache, content, tool="Case Tool", settings=None, result=None):
+    cache.cache_result(content, result or content.upper(), tool, settings or {}, 5.0)
+
+
+class TestMemoryTier:
+
+    def test_hit_and_miss(self):
+        cache = ContentHashCache()
+        store(cache, "hello")
+        assert cached_text(cache, "hello") == "HELLO"
+        assert cached_text(cache, "hello", settings={"mode": "lower"}) is None
+        assert cache.metrics.hits == 1 and cache.metrics.misses == 1
+
+    def test_entries_hit_again_survive_eviction(self):
+        cache = ContentHashCache(max_entries=4)
+        store(cache, "kept")
+        assert cached_text(cache, "kept") == "KEPT"
+        assert cached_text(cache, "kept") == "KEPT"  # promoted to the protected segment
+        for i in range(10):
+            store(cache, f"once {i}")
+        assert cached_text(cache, "kept") == "KEPT"
+        assert len(cache.cache) + len(cache.protected) <= 4
+        assert cache.metrics.evictions == 7
+
+    def test_size_limit(self):
+        cache = ContentHashCache(max_cache_size_mb=1, enable_compression=False)
+        for i in range(12):
+            store(cache, f"{i}" + "x" * 200_000)
+        assert cache.metrics.cache_size_bytes <= 1024 * 1024
+
+    def test_per_entry_ttl(self, monkeypatch):
+        cache = ContentHashCache()
+        cache.tool_cache_settings["Short Tool"] = {"priority": "medium", "ttl_hours": 1}
+        store(cache, "a", tool="Short Tool")
+        store(cache, "a")
+        later = time.time() + 2 * 3600
+        monkeypatch.setattr(time, "time", lambda: later)
+        assert cached_text(cache, "a", tool="Short Tool") is None
+        assert cached_text(cache, "a") == "A"
+
+    def test_processing_result_cache(self):
+        calls = []
+        processing = ProcessingResultCache(ContentHashCache())
+
+        def processor(text):
+            calls.append(text)
+            return text[::-1]
+
+        assert processing.process_with_cache("abc", "Case Tool", {}, processor) == ("cba", False)
+        assert processing.process_with_cache("abc", "Case Tool", {}, processor) == ("cba", True)
+        assert calls == ["abc"]
+
+
+class TestDiskTier:
+
+    def make(self, tmp_path, **kwargs):
+        return ContentHashCache(enable_persistence=True, cache_dir=str(tmp_path), **kwargs)
+
+    def test_results_survive_restart(self, tmp_path):
+        cache = self.make(tmp_path)
+        store(cache, "persisted", settings={"mode": "upper"})
+        reopened = self.make(tmp_path)
+        assert reopened.disk_store.get_stats()["shards_indexed"] == 0
+        assert cached_text(reopened, "persisted", settings={"mode": "upper"}) == "PERSISTED"
+        assert reopened.metrics.disk_hits == 1
+        assert reopened.disk_store.get_stats()["shards_indexed"] == 1
+        # Now served from memory
+        assert cached_text(reopened, "persisted", settings={"mode": "upper"}) == "PERSISTED"
+        assert reopened.metrics.disk_hits == 1
+
+    def test_uncompressed_memory_tier_reads_disk(self, tmp_path):
+        store(self.make(tmp_path, enable_compression=False), "plain")
+        reopened = self.make(tmp_path, enable_compression=False)
+        assert reopened.get_cached_result("plain", "Case Tool", {}) == "PLAIN"
+
+    def test_large_results_go_to_disk_only(self, tmp_path):
+        cache = self.make(tmp_path)
+        big = "y" * 2_000_000
+        store(cache, big, result=big + "!")
+        assert len(cache.cache) == 0
+        assert cached_text(cache, big) == big + "!"
+
+    def test_expired_disk_records_are_ignored(self, tmp_path, monkeypatch):
+        store(self.make(tmp_path), "old", tool="Base64 Encoder/Decoder")
+        later = time.time() + 7 * 3600
+        monkeypatch.setattr(time, "time", lambda: later)
+        assert cached_text(self.make(tmp_path), "old", tool="Base64 Encoder/Decoder") is None
+
+    def test_clear_tool_and_all(self, tmp_path):
+        cache = self.make(tmp_path)
+        store(cache, "one")
+        store(cache, "two", tool="Number Sorter")
+        cache.clear_cache("Case Tool")
+        reopened = self.make(tmp_path)
+        assert cached_text(reopened, "one") is None
+        assert cached_text(reopened, "two", tool="Number Sorter") == "TWO"
+        reopened.clear_cache()
+        assert cached_text(self.make(tmp_path), "two", tool="Number Sorter") is None
+
+
+class TestResultDiskStore:
+
+    def test_last_record_wins_and_tombstones(self, tmp_path):
+        disk = ResultDiskStore(tmp_path)
+        key = "ab" * 16
+        future = time.time() + 60
+        disk.put(key, {"tool_name": "T"}, b"first", 1.0, future)
+        disk.put(key, {"tool_name": "T"}, b"second", 2.0, future)
+        assert ResultDiskStore(tmp_path).get(key)[1] == b"second"
+        disk.delete(key)
+        assert ResultDiskStore(tmp_path).get(key) is None
+
+    def test_truncated_record_is_dropped(self, tmp_path):
+        disk = ResultDiskStore(tmp_path)
+        key = "0" * 32
+        disk.put(key, {"tool_name": "T"}, b"data", 1.0, time.time() + 60)
+        shard = tmp_path / "results-0.log"
+        size = shard.stat().st_size
+        with open(shard, "ab") as f:
+            f.write(b"\x00" * 10)
+        reopened = ResultDiskStore(tmp_path)
+        assert reopened.get(key)[1] == b"data"
+        assert shard.stat().st_size == size
+
+    def test_compaction_bounds_shard_size(self, tmp_path):
+        disk = ResultDiskStore(tmp_path, max_disk_mb=SHARD_COUNT)  # 1 MB per shard
+        payload = os.urandom(100_000)
+        keys = ["f" + f"{i:031x}" for i in range(30)]
+        for key in keys:
+            disk.put(key, {"tool_name": "T"}, payload, time.time(), time.time() + 60)
+        assert (tmp_path / "results-f.log").stat().st_size <= 1024 * 1024
+        assert disk.get_stats()["compactions"] >= 1
+        reopened = ResultDiskStore(tmp_path)
+        assert reopened.get(keys[-1])[1] == payload
+        assert reopened.get(keys[0]) is None
+
+    def test_stores_sharing_a_directory(self, tmp_path):
+        first, second = ResultDiskStore(tmp_path), ResultDiskStore(tmp_path)
+        future = time.time() + 60
+        first.put("c1" * 16, {"tool_name": "T"}, b"one", 1.0, future)
+        second.put("c2" * 16, {"tool_name": "T"}, b"two", 1.0, future)
+        first.put("c3" * 16, {"tool_name": "T"}, b"three", 1.0, future)
+        assert first.get("c2" * 16)[1] == b"two"
+        assert second.get("c3" * 16)[1] == b"three"
+
+        # A compaction in one store is picked up by the other
+        second.put("c1" * 16, {"tool_name": "T"}, b"uno", 2.0, future)
+        second._compact(second._shards[0xc])
+        assert first.get("c1" * 16)[1] == b"uno"
+        assert first.get("c3" * 16)[1] == b"three"
+
+    def test_stale_index_is_never_served(self, tmp_path):
+        disk = ResultDiskStore(tmp_path)
+        future = time.time() + 60
+        disk.put("d1" * 16, {"tool_name": "T"}, b"one", 1.0, future)
+        disk.put("d2" * 16, {"tool_name": "T"}, b"two", 1.0, future)
+        shard = disk._shards[0xd]
+        shard.index[bytes.fromhex("d2" * 16)].offset = 0
+        assert disk.get("d2" * 16) is None
+        assert disk.get_stats()["key_mismatches"] == 1
+        assert disk.get("d2" * 16)[1] == b"two"
+
+    def test_two_processes_share_a_shard(self, tmp_path):
+        workers = [subprocess.Popen([sys.executable, "-c", SHARED_SHARD_WORKER, str(tmp_path), str(worker)],
+                                    cwd=PROJECT_ROOT)
+                   for worker in range(2)]
+        assert [worker.wait(timeout=120) for worker in workers] == [0, 0]
+        disk = ResultDiskStore(tmp_path)
+        for worker in range(2):
+            key = "a" + f"{worker:x}" + f"{299:030x}"
+            assert disk.get(key)[1] == key.encode() * 200
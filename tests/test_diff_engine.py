@@ -0,0 +1,187 @@
+"""
+Tests for the patience/Myers line diff engine (core.diff_engine) and its use
+in core.diff_utils.
+
+Run directly for a benchmark against difflib.SequenceMatcher on 10k, 100k
+and 1M-line files:
+
+    python tests/test_diff_engine.py
+"""
+
+import difflib
+import os
+import random
+import sys
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.diff_engine import LineMatcher, similarity_ratio, unified_diff
+from core.diff_utils import compute_similarity_score, generate_compact_diff, generate_unified_diff
+
+
+def random_edit(rng, lines, edits, alphabet):
+    edited = list(lines)
+    for _ in range(edits):
+        position = rng.randint(0, len(edited))
+        choice = rng.random()
+        if choice < 0.4:
+            edited.insert(position, rng.choice(alphabet))
+        elif edited and choice < 0.8:
+            del edited[min(position, len(edited) - 1)]
+        elif edited:
+            edited[min(position, len(edited) - 1)] = rng.choice(alphabet)
+    return edited
+
+
+def make_file(rng, lines, change_rate=0.01):
+    """A file of mostly unique lines and an edited copy of it."""
+    original = [f"line {i}: value = {rng.random():.6f}" for i in range(lines)]
+    modified = list(original)
+    for _ in range(int(lines * change_rate)):
+        modified[rng.randrange(len(modified))] = "changed"
+    for _ in range(int(lines * change_rate / 2)):
+        modified.insert(rng.randrange(len(modified)), "}")
+    return original, modified
+
+
+def assert_valid_opcodes(a, b, opcodes):
+    """Opcodes cover both sequences in order and rebuild b from a."""
+    position = (0, 0)
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == position
+        if tag == 'equal':
+            assert a[i1:i2] == b[j1:j2]
+        rebuilt.extend(b[j1:j2])
+        position = (i2, j2)
+    assert position == (len(a), len(b))
+    assert rebuilt == list(b)
+
+
+class TestLineMatcher:
+
+    @pytest.mark.parametrize("algorithm", ["patience", "myers"])
+    def test_random_edits_produce_valid_opcodes(self, algorithm):
+        rng = random.Random(7)
+        for _ in range(500):
+            a = [rng.choice("abcdefg") for _ in range(rng.randint(0, 30))]
+            b = random_edit(rng, a, rng.randint(0, 6), "abcdefghxyz")
+            assert_valid_opcodes(a, b, LineMatcher(a, b, algorithm=algorithm).get_opcodes())
+
+    def test_myers_is_minimal(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            a = [rng.choice("abcde") for _ in range(rng.randint(0, 25))]
+            b = random_edit(rng, a, rng.randint(0, 5), "abcdexy")
+            expected = difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+            assert LineMatcher(a, b, algorithm="myers").ratio() >= expected - 1e-9
+
+    def test_unique_lines_anchor_moved_blocks(self):
+        a = ["def f():", "    return 1", "", "def g():", "    return 2", ""]
+        b = ["def g():", "    return 2", "", "def f():", "    return 1", ""]
+        opcodes = LineMatcher(a, b).get_opcodes()
+        assert_valid_opcodes(a, b, opcodes)
+        assert sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == 'equal') == 3
+
+    def test_cost_limit_reports_replacement(self):
+        a = ["x", "y"] * 50
+        b = ["y", "z"] * 50
+        opcodes = LineMatcher(a, b, algorithm="myers", max_cost=4).get_opcodes()
+        assert opcodes == [('replace', 0, 100, 0, 100)]
+
+    def test_interface_matches_sequence_matcher(self):
+        a = ["a", "b", "c", "d"]
+        b = ["a", "x", "c", "d", "e"]
+        matcher = LineMatcher(a, b)
+        expected = difflib.SequenceMatcher(None, a, b, autojunk=False)
+        assert matcher.get_matching_blocks() == [tuple(block) for block in expected.get_matching_blocks()]
+        assert matcher.get_opcodes() == expected.get_opcodes()
+        assert list(matcher.get_grouped_opcodes(1)) == list(expected.get_grouped_opcodes(1))
+        assert matcher.ratio() == expected.ratio()
+        assert LineMatcher([], []).get_opcodes() == []
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            LineMatcher([], [], algorithm="histogram")
+
+
+class TestUnifiedDiff:
+
+    def test_same_format_as_difflib(self):
+        a = [f"{i}\n" for i in range(40)]
+        b = list(a)
+        b[5] = "five\n"
+        del b[20]
+        b.append("end\n")
+        for n in (0, 1, 3):
+            assert list(unified_diff(a, b, "old", "new", n=n)) == \
+                list(difflib.unified_diff(a, b, "old", "new", n=n))
+        assert list(unified_diff(a, a, "old", "new")) == []
+        assert list(unified_diff([], ["x\n"], "old", "new")) == list(difflib.unified_diff([], ["x\n"], "old", "new"))
+
+    def test_diff_utils_uses_engine(self):
+        original = "alpha\nbeta\ngamma\n"
+        modified = "alpha\nBETA\ngamma\n"
+        assert generate_unified_diff(original, modified) == (
+            "--- Original\n+++ Modified\n@@ -1,3 +1,3 @@\n alpha\n-beta\n+BETA\n gamma\n")
+        assert generate_compact_diff(original, modified) == "-2: beta\n+2: BETA"
+
+
+class TestSimilarity:
+
+    def test_matches_difflib_on_small_texts(self):
+        original = "The quick brown fox\njumps over\nthe lazy dog\n" * 20
+        modified = original.replace("lazy", "sleepy")
+        expected = difflib.SequenceMatcher(None, original, modified, autojunk=False).ratio()
+        assert similarity_ratio(original, modified) == pytest.approx(expected)
+        assert compute_similarity_score(original, original) == 100.0
+        assert compute_similarity_score("", "") == 100.0
+        assert compute_similarity_score("abc", "") == 0.0
+
+    def test_large_texts_are_fast(self):
+        original, modified = make_file(random.Random(1), 50_000)
+        start = time.perf_counter()
+        score = compute_similarity_score("\n".join(original), "\n".join(modified))
+        assert time.perf_counter() - start < 10
+        assert 95 < score < 100
+
+
+def benchmark(lines, rng, with_difflib):
+    original, modified = make_file(rng, lines)
+    start = time.perf_counter()
+    opcodes = LineMatcher(original, modified).get_opcodes()
+    engine_seconds = time.perf_counter() - start
+    difflib_seconds = None
+    if with_difflib:
+        start = time.perf_counter()
+        difflib.SequenceMatcher(None, original, modified, autojunk=False).get_opcodes()
+        difflib_seconds = time.perf_counter() - start
+    return engine_seconds, difflib_seconds, len(opcodes)
+
+
+@pytest.mark.slow
+class TestDiffBenchmark:
+
+    def test_100k_lines(self):
+        engine_seconds, _, _ = benchmark(100_000, random.Random(0), with_difflib=False)
+        assert engine_seconds < 10
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'lines':>10} {'patience':>10} {'difflib':>10} {'opcodes':>9}")
+    for lines in (10_000, 100_000, 1_000_000):
+        # difflib is skipped at 1M lines to keep the benchmark short
+        engine_seconds, difflib_seconds, opcodes = benchmark(lines, rng, with_difflib=lines <= 100_000)
+        difflib_text = f"{difflib_seconds:9.2f}s" if difflib_seconds is not None else f"{'skipped':>10}"
+        print(f"{lines:>10,} {engine_seconds:9.2f}s {difflib_text} {opcodes:>9,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
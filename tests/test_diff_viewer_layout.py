@@ -0,0 +1,120 @@
+"""
+Tests for the Diff Viewer's batched rendering: build_diff_layout computes
+rows, tag ranges and diff positions without Tk, and tags are applied with
+multi-range Tcl calls.
+"""
+
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.diff_engine import LineMatcher
+from tools.diff_viewer import (DiffViewerWidget, TAG_BATCH_PAIRS, _tag_line_ranges,
+                               build_diff_layout)
+
+
+def layout_for(left, right):
+    return build_diff_layout(LineMatcher(left, right).get_opcodes(), left, right)
+
+
+class RecordingWidget:
+    """Stands in for a tk.Text, recording the Tcl commands it is sent."""
+
+    def __init__(self):
+        self.calls = []
+        self.tk = SimpleNamespace(call=lambda *args: self.calls.append(args))
+
+    def __str__(self):
+        return ".text"
+
+
+class TestBuildDiffLayout:
+
+    def test_rows_are_aligned(self):
+        layout = layout_for(["same", "old", "gone", "end"], ["same", "new", "end", "added"])
+        assert layout.left_rows == ["same", "old", "gone", "end", ""]
+        assert layout.right_rows == ["same", "new", "", "end", "added"]
+        assert layout.left_text == "same\nold\ngone\nend\n\n"
+
+    def test_tags_positions_and_counts(self):
+        layout = layout_for(["a", "b", "c", "d", "e"], ["a", "x", "y", "d", "e", "f", "g"])
+        assert layout.left_tags == {"modification": [(2, 3)]}
+        assert layout.right_tags == {"modification": [(2, 3)], "addition": [(6, 7)]}
+        assert layout.diff_positions == [(2, "modification"), (3, "modification"),
+                                         (6, "addition"), (7, "addition")]
+        assert layout.counts == {"additions": 2, "deletions": 0, "modifications": 2}
+        assert layout.modified_rows == [(2, "b", "x"), (3, "c", "y")]
+
+    def test_replaced_blank_lines_are_additions_and_deletions(self):
+        layout = build_diff_layout([("replace", 0, 2, 0, 1)], ["", "old"], ["new"])
+        assert layout.left_rows == ["", "old"]
+        assert layout.right_rows == ["new", ""]
+        assert layout.counts == {"additions": 1, "deletions": 1, "modifications": 0}
+        assert layout.left_tags == {"deletion": [(2, 2)]}
+        assert layout.right_tags == {"addition": [(1, 1)]}
+
+    def test_empty_side(self):
+        layout = build_diff_layout([("insert", 0, 0, 0, 3)], [], ["a", "", "c"])
+        assert layout.left_text == "\n\n\n"
+        assert layout.right_tags == {"addition": [(1, 3)]}
+        assert layout.counts["additions"] == 3
+
+    def test_large_layout_is_fast(self):
+        left = [f"line {i}" for i in range(200_000)]
+        right = [line if i % 50 else line + " changed" for i, line in enumerate(left)]
+        start = time.perf_counter()
+        layout = layout_for(left, right)
+        assert time.perf_counter() - start < 10
+        assert layout.counts["modifications"] == 4000
+        assert len(layout.left_tags["modification"]) == 4000
+
+
+class TestBatchedTags:
+
+    def test_line_ranges_become_few_calls(self):
+        widget = RecordingWidget()
+        ranges = [(row, row) for row in range(1, 2 * TAG_BATCH_PAIRS + 2, 2)]
+        _tag_line_ranges(widget, "addition", ranges)
+        assert len(widget.calls) == 2
+        assert widget.calls[0][:5] == (".text", "tag", "add", "addition", "1.0")
+        assert widget.calls[0][5] == "2.0"
+        assert sum(len(call) - 4 for call in widget.calls) == 2 * len(ranges)
+
+    def test_remove_and_empty(self):
+        widget = RecordingWidget()
+        _tag_line_ranges(widget, "deletion", [], remove=True)
+        _tag_line_ranges(widget, "deletion", [(3, 5)], remove=True)
+        assert widget.calls == [(".text", "tag", "remove", "deletion", "3.0", "6.0")]
+
+
+class InlineViewer:
+    """The DiffViewerWidget methods that compute inline highlighting, without Tk."""
+
+    logger = logging.getLogger(__name__)
+    _highlight_word_diffs = DiffViewerWidget._highlight_word_diffs
+    _apply_word_diff = DiffViewerWidget._apply_word_diff
+    _apply_char_diff = DiffViewerWidget._apply_char_diff
+
+    def __init__(self, char_level=False):
+        self.settings = {"char_level_diff": char_level}
+
+
+class TestInlineSpans:
+
+    def test_word_spans(self):
+        deleted, added = [], []
+        InlineViewer()._highlight_word_diffs(7, "the quick fox", "the slow fox", deleted, added)
+        assert deleted == ["7.4", "7.9"]
+        assert added == ["7.4", "7.8"]
+
+    def test_char_spans(self):
+        deleted, added = [], []
+        InlineViewer(char_level=True)._highlight_word_diffs(2, "cat", "cut", deleted, added)
+        assert deleted == ["2.1", "2.2"]
+        assert added == ["2.1", "2.2"]
@@ -0,0 +1,185 @@
+"""
+Tests for the single-pass find/replace engine in core.mcp.find_replace_diff:
+replace_all() replaces, counts matches and affected lines, and renders the
+compact diff from one regex scan plus a newline offset index.
+
+Run directly for a benchmark on a match-dense 20 MB log:
+
+    python tests/test_find_replace_single_pass.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import core.mcp.find_replace_diff as find_replace_diff
+from core.diff_utils import generate_compact_diff
+from core.mcp.find_replace_diff import LineIndex, execute_replace, preview_replace, replace_all
+
+
+def lines_affected_by_rescan(pattern, text):
+    """The original per-match prefix count, kept as the reference."""
+    return len(set(text[:m.start()].count('\n') + 1 for m in pattern.finditer(text)))
+
+
+class TestLineIndex:
+
+    def test_line_of(self):
+        index = LineIndex("ab\n\ncd\n")
+        assert index.starts == [0, 3, 4, 7]
+        assert [index.line_of(offset) for offset in range(8)] == [0, 0, 0, 1, 2, 2, 2, 3]
+        assert index.line_of(5, lo=2) == 2
+        assert [index.line_end(line) for line in range(4)] == [2, 3, 6, 7]
+
+    def test_cr_and_crlf_line_breaks(self):
+        index = LineIndex("ab\r\rcd\r\nef")
+        assert index.starts == [0, 3, 4, 8]
+        assert [index.line_end(line) for line in range(4)] == [2, 3, 6, 10]
+        assert index.line_of(7) == 2
+
+
+class TestReplaceAll:
+
+    @pytest.mark.parametrize("find, replace, flags", [
+        ("foo", "qux", 0),
+        (r"(\w+) (\w+)", r"\2 \1", 0),
+        ("bar\n", "", 0),
+        ("\n", "\n\n", 0),
+        ("^", "> ", re.MULTILINE),
+        ("o.*?b", "#", re.DOTALL),
+        ("foo|bar", r"[\g<0>]", re.IGNORECASE),
+    ])
+    def test_same_counts_as_rescan(self, find, replace, flags):
+        rng = random.Random(find)
+        pattern = re.compile(find, flags)
+        for _ in range(200):
+            text = "\n".join(rng.choice(["foo", "bar", "", "foo bar", "FOO"]) for _ in range(rng.randint(0, 10)))
+            result = replace_all(pattern, replace, text)
+            assert result.modified_text == pattern.sub(replace, text)
+            assert result.match_count == len(pattern.findall(text))
+            assert result.lines_affected == lines_affected_by_rescan(pattern, text)
+
+    def test_diff_matches_line_diff(self):
+        text = "alpha\nbeta\ngamma\nbeta\n\ndelta beta\n"
+        for find, replace in [("beta", "BETA"), ("a\n", "a;\n"), ("^", "> "), ("beta\n", "")]:
+            pattern = re.compile(find, re.MULTILINE)
+            expected = generate_compact_diff(text, pattern.sub(replace, text), max_lines=50)
+            assert replace_all(pattern, replace, text).diff == expected, find
+
+    @pytest.mark.parametrize("eol", ["\r", "\r\n", "\v"])
+    def test_diff_matches_line_diff_for_other_line_breaks(self, eol):
+        text = "alpha\nbeta\ngamma\nbeta\n\ndelta beta\n".replace("\n", eol)
+        for find, replace in [("beta", "BETA"), ("a" + eol, "a;" + eol), ("beta" + eol, ""), (eol, "\n")]:
+            pattern = re.compile(re.escape(find))
+            expected = generate_compact_diff(text, pattern.sub(replace, text), max_lines=50)
+            assert replace_all(pattern, replace, text).diff == expected, (eol, find)
+
+    def test_cr_only_lines_are_counted(self):
+        result = replace_all(re.compile("b"), "B", "a\rb\rc\rb\r")
+        assert result.lines_affected == 2
+        assert result.diff == "-2: b\n+2: B\n-4: b\n+4: B"
+        # CRLF to LF changes no line
+        assert replace_all(re.compile("\r"), "", "a\r\nb\r\n").diff == "No differences found."
+        # A replacement that joins "\r" and "\n" into one line break
+        assert replace_all(re.compile("x"), "x\r", "x\nbar\r").diff == "No differences found."
+        assert replace_all(re.compile("\r\n"), "\n", "foo\rx\r\r\nx").diff == "-3: "
+
+    def test_inserted_lines_are_numbered(self):
+        result = replace_all(re.compile("b"), "b\nnew", "a\nb\nc\nb\n")
+        assert result.diff == "+3: new\n+6: new"
+        assert result.lines_affected == 2
+
+    def test_unchanged_replacement(self):
+        result = replace_all(re.compile("x"), "x", "x\ny\nx")
+        assert (result.match_count, result.lines_affected) == (2, 2)
+        assert result.diff == "No differences found."
+
+    def test_truncation(self):
+        text = "\n".join(f"item {i}" for i in range(100))
+        diff = replace_all(re.compile("item"), "entry", text, max_diff_lines=5).diff.splitlines()
+        assert diff == [f"-{i + 1}: item {i}" for i in range(5)] + ["... (5+ changes, truncated)"]
+        assert replace_all(re.compile("item"), "entry", text, max_diff_lines=0).diff == "No differences found."
+
+    def test_hunks_are_bounded(self, monkeypatch):
+        sizes = []
+        line_matcher = find_replace_diff.LineMatcher
+
+        def recording_matcher(a, b):
+            sizes.append(len(a))
+            return line_matcher(a, b)
+
+        monkeypatch.setattr(find_replace_diff, "LineMatcher", recording_matcher)
+        text = "x\n" * 5_000
+        result = replace_all(re.compile("x"), "y", text, max_diff_lines=10_000)
+        assert result.diff.count("\n") + 1 == 10_000
+        assert max(sizes) <= find_replace_diff._DiffBuilder.HUNK_MAX_LINES
+
+
+class TestToolFunctions:
+
+    def test_preview_and_execute(self):
+        text = "a=1\nb=2\na=3\n"
+        preview = preview_replace(text, r"a=(\d)", r"a=\1\1")
+        assert preview == {"success": True, "match_count": 2, "lines_affected": 2,
+                           "diff": "-1: a=1\n+1: a=11\n-3: a=3\n+3: a=33"}
+        executed = execute_replace(text, r"a=(\d)", r"a=\1\1", save_to_notes=False)
+        assert executed["modified_text"] == "a=11\nb=2\na=33\n"
+        assert (executed["replacements"], executed["lines_affected"]) == (2, 2)
+
+    def test_no_matches_and_errors(self):
+        assert preview_replace("abc", "x", "y")["diff"] == "No matches found."
+        assert execute_replace("abc", "x", "y")["replacements"] == 0
+        assert preview_replace("abc", "(b)", r"\2")["success"] is False
+
+
+def make_log(megabytes, rng):
+    lines, size = [], 0
+    while size < megabytes * 1_000_000:
+        level = "ERROR" if rng.random() < 0.25 else "INFO"
+        line = (f"2024-05-01T12:{rng.randrange(60):02d}:{rng.randrange(60):02d} {level} "
+                f"worker-{rng.randrange(64)} request {rng.randrange(10**9)} handled in {rng.randrange(1000)}ms")
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def benchmark(megabytes, rng):
+    text = make_log(megabytes, rng)
+    timings = {}
+    start = time.perf_counter()
+    preview = preview_replace(text, r"ERROR (worker-\d+)", r"WARN \1")
+    timings["preview"] = time.perf_counter() - start
+    start = time.perf_counter()
+    executed = execute_replace(text, r"\bhandled\b", "done", save_to_notes=False)
+    timings["execute"] = time.perf_counter() - start
+    assert preview["success"] and executed["success"]
+    return len(text) / 1_000_000, preview["match_count"], executed["replacements"], timings
+
+
+@pytest.mark.slow
+class TestFindReplaceBenchmark:
+
+    def test_20mb(self):
+        _, _, replacements, timings = benchmark(20, random.Random(0))
+        assert replacements > 100_000
+        assert timings["execute"] < 30
+
+
+def main():
+    size, preview_matches, replacements, timings = benchmark(20, random.Random(0))
+    print(f"find/replace on a {size:.1f} MB log")
+    print(f"  preview: {preview_matches:,} matches in {timings['preview']:.2f}s")
+    print(f"  execute: {replacements:,} matches in {timings['execute']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Tests for incremental, page-deduplicated database backups
+(core.incremental_backup) and their use by BackupManager and
+DatabaseConnectionManager.
+
+Run directly for a benchmark of backup time and bytes written per
+generation:
+
+    python tests/test_incremental_backup.py
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.backup_manager import BackupManager, BackupRotationPolicy, BackupTrigger
+from core.database_connection_manager import DatabaseConnectionManager
+from core.incremental_backup import PageStore, read_manifest, snapshot_database
+
+
+def make_database(path, rows=5000, seed=0):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO notes (body) VALUES (?)",
+                     [("".join(rng.choice("abcdefgh ") for _ in range(200)),) for _ in range(rows)])
+    conn.commit()
+    return conn
+
+
+def edit_rows(conn, count, seed):
+    rng = random.Random(seed)
+    max_id = conn.execute("SELECT MAX(id) FROM notes").fetchone()[0]
+    for _ in range(count):
+        conn.execute("UPDATE notes SET body = ? WHERE id = ?",
+                     (f"edited {rng.random()}", rng.randint(1, max_id)))
+    conn.commit()
+
+
+def table_rows(conn):
+    return conn.execute("SELECT id, body FROM notes ORDER BY id").fetchall()
+
+
+class TestPageStore:
+
+    def test_new_generation_stores_only_changed_pages(self, tmp_path):
+        conn = make_database(tmp_path / "source.db")
+        store = PageStore(tmp_path / "backups")
+        first = store.create_generation(tmp_path / "source.db", tmp_path / "backups" / "g1.gen")
+        edit_rows(conn, 1, seed=1)
+        second = store.create_generation(tmp_path / "source.db", tmp_path / "backups" / "g2.gen")
+        store.close()
+
+        assert first["new_pages"] == first["page_count"] > 10
+        assert 1 <= second["new_pages"] <= 3
+        assert second["bytes_written"] < first["bytes_written"] / 10
+
+    def test_snapshot_includes_uncheckpointed_wal(self, tmp_path):
+        conn = make_database(tmp_path / "source.db")
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        conn.execute("INSERT INTO notes (body) VALUES ('only in the wal')")
+        conn.commit()
+        assert os.path.getsize(tmp_path / "source.db-wal") > 0
+
+        restored = sqlite3.connect(":memory:")
+        restored.deserialize(snapshot_database(conn))
+        assert table_rows(restored) == table_rows(conn)
+
+    def test_restore_to_file_and_connection(self, tmp_path):
+        conn = make_database(tmp_path / "source.db")
+        store = PageStore(tmp_path / "backups")
+        manifest = tmp_path / "backups" / "g1.gen"
+        store.create_generation(conn, manifest)
+        expected = table_rows(conn)
+        edit_rows(conn, 50, seed=2)
+
+        target = tmp_path / "restored.db"
+        (tmp_path / "restored.db-wal").write_bytes(b"stale")
+        store.restore_generation(manifest, target)
+        assert not (tmp_path / "restored.db-wal").exists()
+        restored = sqlite3.connect(str(target))
+        assert restored.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert table_rows(restored) == expected
+
+        memory = sqlite3.connect(":memory:")
+        store.restore_generation(manifest, memory)
+        assert table_rows(memory) == expected
+        store.close()
+
+    def test_collect_garbage_keeps_referenced_pages(self, tmp_path):
+        conn = make_database(tmp_path / "source.db")
+        store = PageStore(tmp_path / "backups")
+        store.create_generation(conn, tmp_path / "backups" / "g1.gen")
+        edit_rows(conn, 20, seed=3)
+        store.create_generation(conn, tmp_path / "backups" / "g2.gen")
+
+        assert store.collect_garbage() == 0
+        (tmp_path / "backups" / "g1.gen").unlink()
+        assert store.collect_garbage() > 0
+        _, digests = read_manifest(tmp_path / "backups" / "g2.gen")
+        assert store.get_stats()["stored_pages"] == len(set(digests))
+
+        store.restore_generation(tmp_path / "backups" / "g2.gen", tmp_path / "restored.db")
+        assert table_rows(sqlite3.connect(str(tmp_path / "restored.db"))) == table_rows(conn)
+        store.close()
+
+    def test_background_generation(self, tmp_path):
+        make_database(tmp_path / "source.db").close()
+        store = PageStore(tmp_path / "backups")
+        future = store.submit_generation(str(tmp_path / "source.db"), tmp_path / "backups" / "g1.gen")
+        assert future.result(timeout=30)["page_count"] > 0
+        store.close()
+
+
+class TestBackupManager:
+
+    def test_backup_and_restore_generation(self, tmp_path):
+        make_database(tmp_path / "settings.db").close()
+        connection_manager = DatabaseConnectionManager(str(tmp_path / "settings.db"),
+                                                       enable_performance_monitoring=False)
+        connection_manager.set_backup_interval(0)
+        expected = table_rows(connection_manager.get_connection())
+        manager = BackupManager(backup_dir=str(tmp_path / "backups"))
+
+        info = manager.backup_database_async(connection_manager).result(timeout=30)
+        assert info.filepath.endswith(".gen")
+        assert info.metadata["generation"]["new_pages"] == info.metadata["generation"]["page_count"]
+
+        edit_rows(connection_manager.get_connection(), 10, seed=4)
+        assert manager.restore_from_backup(connection_manager, info.filepath)
+        assert table_rows(connection_manager.get_connection()) == expected
+
+        manager.close()
+        connection_manager.close_all_connections()
+
+    def test_rotation_collects_pages(self, tmp_path):
+        conn = make_database(tmp_path / "settings.db")
+        connection_manager = DatabaseConnectionManager(str(tmp_path / "settings.db"),
+                                                       enable_performance_monitoring=False)
+        connection_manager.set_backup_interval(0)
+        manager = BackupManager(backup_dir=str(tmp_path / "backups"),
+                                rotation_policy=BackupRotationPolicy(max_backups=1))
+        first = manager.backup_database(connection_manager, BackupTrigger.MANUAL)
+        os.rename(first.filepath, str(tmp_path / "backups" / "old.gen"))
+        first.filepath = str(tmp_path / "backups" / "old.gen")
+        first.timestamp = first.timestamp.replace(year=first.timestamp.year - 1)
+
+        conn.execute("DELETE FROM notes")
+        conn.commit()
+        conn.execute("VACUUM")
+        manager.backup_database(connection_manager, BackupTrigger.MANUAL)
+
+        assert not os.path.exists(first.filepath)
+        assert manager.page_store.get_stats()["pages_collected"] > 0
+        manager.close()
+        connection_manager.close_all_connections()
+
+
+class TestBackupToDisk:
+
+    def test_background_backup_to_disk(self, tmp_path):
+        make_database(tmp_path / "settings.db").close()
+        connection_manager = DatabaseConnectionManager(str(tmp_path / "settings.db"),
+                                                       backup_path=str(tmp_path / "copy.db"),
+                                                       enable_performance_monitoring=False)
+        connection_manager.set_backup_interval(0)
+        expected = table_rows(connection_manager.get_connection())
+        assert connection_manager.backup_to_disk(background=True)
+
+        deadline = time.time() + 30
+        while connection_manager.last_backup is None and time.time() < deadline:
+            time.sleep(0.01)
+        connection_manager.close_all_connections()
+        assert table_rows(sqlite3.connect(str(tmp_path / "copy.db"))) == expected
+
+
+def run_generations(directory, rows, generations, edits_per_generation):
+    """Back up a database repeatedly, editing a few rows between backups."""
+    conn = make_database(os.path.join(directory, "bench.db"), rows=rows)
+    store = PageStore(os.path.join(directory, "backups"))
+    results = []
+    for generation in range(generations):
+        manifest = os.path.join(directory, "backups", f"g{generation}.gen")
+        results.append(store.create_generation(conn, manifest))
+        edit_rows(conn, edits_per_generation, seed=generation)
+    store.close()
+    conn.close()
+    return results
+
+
+@pytest.mark.slow
+class TestBackupBenchmark:
+
+    def test_incremental_generations_are_small(self, tmp_path):
+        results = run_generations(str(tmp_path), rows=50_000, generations=5, edits_per_generation=10)
+        full = results[0]["bytes_written"]
+        for result in results[1:]:
+            assert result["bytes_written"] < full / 5
+
+
+def main():
+    import tempfile
+
+    for rows in (10_000, 100_000):
+        with tempfile.TemporaryDirectory() as directory:
+            results = run_generations(directory, rows=rows, generations=6, edits_per_generation=20)
+        print(f"{rows:,} rows ({results[0]['database_bytes'] / 1e6:.1f} MB database)")
+        for index, result in enumerate(results):
+            print(f"  generation {index}: {result['seconds'] * 1000:8.1f} ms, "
+                  f"{result['new_pages']:6,} new pages, {result['bytes_written']:>10,} bytes written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
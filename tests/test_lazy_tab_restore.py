@@ -0,0 +1,118 @@
+"""
+Tests for the lazy restore of saved tab content in pomera.py: hidden tabs
+are filled from idle callbacks after startup, and text that reaches a tab
+before its turn (paste, tool output, MCP set_text) must not be overwritten.
+
+The tab text widgets are small stand-ins for tk.Text so the tests run
+without a display.
+"""
+
+import importlib.util
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# pomera.py, not the pomera/ package next to it
+_spec = importlib.util.spec_from_file_location("pomera_app", os.path.join(PROJECT_ROOT, "pomera.py"))
+pomera_app = sys.modules.get("pomera_app") or importlib.util.module_from_spec(_spec)
+if "pomera_app" not in sys.modules:
+    sys.modules["pomera_app"] = pomera_app
+    _spec.loader.exec_module(pomera_app)
+PromeraAIApp = pomera_app.PromeraAIApp
+
+
+class FakeText:
+    """The subset of tk.Text the restore code uses."""
+
+    def __init__(self):
+        self.content = ""
+
+    def compare(self, first, op, second):
+        assert (first, op, second) == ("end-1c", "==", "1.0")
+        return self.content == ""
+
+    def get(self, start, end):
+        return self.content + "\n"
+
+    def delete(self, start, end):
+        self.content = ""
+
+    def insert(self, index, text):
+        self.content = text if index == "1.0" else self.content + text
+
+    def config(self, **options):
+        pass
+
+
+class FakeApp:
+    _restore_tab_content = PromeraAIApp._restore_tab_content
+    _restore_next_pending_tab = PromeraAIApp._restore_next_pending_tab
+    _discard_pending_tab = PromeraAIApp._discard_pending_tab
+    _is_tab_empty = staticmethod(PromeraAIApp._is_tab_empty)
+    _get_tab_contents = PromeraAIApp._get_tab_contents
+
+    def __init__(self, saved_inputs, saved_outputs):
+        self.logger = Mock()
+        self.idle = []
+        self.input_tabs = [SimpleNamespace(text=FakeText()) for _ in saved_inputs]
+        self.output_tabs = [SimpleNamespace(text=FakeText()) for _ in saved_outputs]
+        self._pending_tab_restore = {}
+        for tab_type, contents in (("input", saved_inputs), ("output", saved_outputs)):
+            for i, content in enumerate(contents):
+                self._pending_tab_restore[(tab_type, i)] = content
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        while self.idle:
+            self.idle.pop(0)()
+
+
+def restored_app():
+    app = FakeApp(["saved in 1", "saved in 2", "saved in 3"], ["saved out 1", "saved out 2"])
+    app._restore_tab_content("input", 0)
+    app._restore_tab_content("output", 0)
+    app.after_idle(app._restore_next_pending_tab)
+    return app
+
+
+class TestLazyTabRestore:
+
+    def test_idle_restore_fills_all_tabs(self):
+        app = restored_app()
+        app.run_idle()
+        assert [tab.text.content for tab in app.input_tabs] == ["saved in 1", "saved in 2", "saved in 3"]
+        assert [tab.text.content for tab in app.output_tabs] == ["saved out 1", "saved out 2"]
+        assert app._pending_tab_restore == {}
+
+    def test_text_written_before_restore_is_kept(self):
+        app = restored_app()
+        # Tool output and an MCP set_text arrive before the idle callbacks run
+        app.output_tabs[1].text.insert("1.0", "fresh output")
+        app.input_tabs[2].text.insert("1.0", "pasted")
+        assert app._get_tab_contents("input") == ["saved in 1", "saved in 2", "pasted"]
+        app.run_idle()
+        assert app.output_tabs[1].text.content == "fresh output"
+        assert app.input_tabs[2].text.content == "pasted"
+        assert app.input_tabs[1].text.content == "saved in 2"
+
+    def test_cleared_tab_stays_cleared(self):
+        app = restored_app()
+        # A write that leaves the tab empty is seen through <<Modified>>
+        app.input_tabs[1].text.delete("1.0", "end")
+        app._discard_pending_tab(app.input_tabs[1].text)
+        app.run_idle()
+        assert app.input_tabs[1].text.content == ""
+        assert app._get_tab_contents("input") == ["saved in 1", "", "saved in 3"]
+
+    def test_selecting_a_tab_restores_it_first(self):
+        app = restored_app()
+        app._restore_tab_content("input", 2)
+        assert app.input_tabs[2].text.content == "saved in 3"
+        assert ("input", 2) not in app._pending_tab_restore
@@ -0,0 +1,228 @@
+"""
+Tests for concurrent tools/call dispatch in StdioMCPServer.
+
+Covers:
+1. Fast tools are not queued behind slow ones (out-of-order responses)
+2. Responses are keyed by request id and written whole (locked writer)
+3. notifications/cancelled answers queued and running calls with a
+   cancellation error and signals cooperative handlers to stop
+4. Non-tool messages are answered inline while tools run
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from core.mcp.schema import MCPErrorCode
+from core.mcp.server_stdio import StdioMCPServer, is_request_cancelled
+from core.mcp.tool_registry import ToolRegistry, MCPToolAdapter
+
+
+class RecordingServer(StdioMCPServer):
+    """StdioMCPServer that records responses instead of printing them."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+        self.sent_event = threading.Event()
+
+    def _send_response(self, msg, timer=None):
+        with self._write_lock:
+            self.sent.append(msg.to_dict())
+            self.sent_event.set()
+
+    def responses(self):
+        return [m for m in self.sent if "id" in m]
+
+
+def _request(req_id, tool, **arguments):
+    return json.dumps({
+        "jsonrpc": "2.0", "id": req_id, "method": "tools/call",
+        "params": {"name": tool, "arguments": arguments},
+    })
+
+
+def _cancel(req_id):
+    return json.dumps({
+        "jsonrpc": "2.0", "method": "notifications/cancelled",
+        "params": {"requestId": req_id, "reason": "test"},
+    })
+
+
+@pytest.fixture
+def registry():
+    reg = ToolRegistry(register_builtins=False)
+    finished = []
+
+    def slow(args):
+        # Checks for cancellation between short steps, like a long-running handler
+        deadline = time.time() + args.get("seconds", 2.0)
+        while time.time() < deadline:
+            if is_request_cancelled():
+                finished.append("slow cancelled")
+                return "slow cancelled"
+            time.sleep(0.005)
+        finished.append("slow")
+        return "slow done"
+
+    def research(args):
+        # Stands in for pomera_ai_tools research, which runs on its own thread
+        while not is_request_cancelled():
+            time.sleep(0.005)
+        finished.append("research cancelled")
+        return "research cancelled"
+
+    def fast(args):
+        return args.get("text", "").upper()
+
+    reg.register(MCPToolAdapter("slow_tool", "Slow", {"type": "object"}, slow))
+    reg.register(MCPToolAdapter("fast_tool", "Fast", {"type": "object"}, fast))
+    reg.register(MCPToolAdapter("pomera_ai_tools", "Research", {"type": "object"}, research))
+    reg.finished = finished
+    return reg
+
+
+@pytest.fixture
+def server(registry):
+    srv = RecordingServer(tool_registry=registry, max_workers=2)
+    srv._start_executor()
+    yield srv
+    srv._shutdown_executor()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSequentialMode:
+    """max_workers=0 keeps the original blocking behaviour."""
+
+    def test_default_is_sequential(self, registry):
+        srv = RecordingServer(tool_registry=registry)
+        srv._start_executor()
+        assert srv._executor is None
+        srv._dispatch_line(_request(1, "fast_tool", text="abc"))
+        assert srv.responses()[0]["result"]["content"][0]["text"] == "ABC"
+        assert srv._get_session_diagnostics()["dispatch_mode"] == "sequential"
+
+
+class TestConcurrentDispatch:
+
+    def test_fast_tool_not_blocked_by_slow_tool(self, server):
+        server._dispatch_line(_request(1, "slow_tool", seconds=1.0))
+        server._dispatch_line(_request(2, "fast_tool", text="hi"))
+
+        assert _wait_for(lambda: len(server.responses()) >= 1)
+        first = server.responses()[0]
+        assert first["id"] == 2
+        assert first["result"]["content"][0]["text"] == "HI"
+
+        assert _wait_for(lambda: len(server.responses()) == 2)
+        assert server.responses()[1]["id"] == 1
+
+    def test_inline_messages_answered_while_tool_runs(self, server):
+        server._dispatch_line(_request(1, "slow_tool", seconds=0.5))
+        server._dispatch_line(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "ping"}))
+        # ping is answered synchronously on the reader thread
+        assert server.responses()[0]["id"] == 2
+
+    def test_unknown_tool_returns_error(self, server):
+        server._dispatch_line(_request(7, "no_such_tool"))
+        assert _wait_for(lambda: len(server.responses()) == 1)
+        assert "error" in server.responses()[0]
+
+    def test_duplicate_in_flight_id_rejected(self, server):
+        server._dispatch_line(_request(1, "slow_tool", seconds=0.5))
+        server._dispatch_line(_request(1, "fast_tool", text="x"))
+        assert server.responses()[0]["id"] == 1
+        assert "error" in server.responses()[0]
+
+    def test_diagnostics_report_in_flight(self, server):
+        server._dispatch_line(_request(1, "slow_tool", seconds=0.5))
+        assert _wait_for(lambda: server._in_flight.get(1) and server._in_flight[1].start)
+        diag = server._get_session_diagnostics()
+        assert diag["dispatch_mode"] == "concurrent"
+        assert diag["max_workers"] == 2
+        assert [r["id"] for r in diag["in_flight_requests"]] == [1]
+
+    def test_diagnostics_track_overlapping_calls(self, server):
+        server._dispatch_line(_request(1, "slow_tool", seconds=0.5))
+        server._dispatch_line(_request(2, "slow_tool", seconds=0.2))
+        assert _wait_for(lambda: len(server._get_session_diagnostics()["currently_executing"]) == 2)
+        executing = server._get_session_diagnostics()["currently_executing"]
+        assert sorted(r["id"] for r in executing) == [1, 2]
+
+        assert _wait_for(lambda: len(server.responses()) == 2)
+        diag = server._get_session_diagnostics()
+        assert diag["currently_executing"] == []
+        assert diag["total_requests"] == 2
+        assert diag["longest_request"]["tool"] == "slow_tool"
+        assert diag["longest_request"]["duration_ms"] >= 500
+
+
+class TestCancellation:
+
+    def test_cancel_running_call(self, server, registry):
+        server._dispatch_line(_request(1, "slow_tool", seconds=3.0))
+        assert _wait_for(lambda: server._in_flight.get(1) and server._in_flight[1].start)
+
+        start = time.time()
+        server._dispatch_line(_cancel(1))
+        # Answered at once with a cancellation error, and only once
+        assert server.responses() == [{
+            "jsonrpc": "2.0", "id": 1,
+            "error": {"code": MCPErrorCode.REQUEST_CANCELLED, "message": "Request cancelled: test"},
+        }]
+        assert _wait_for(lambda: 1 not in server._in_flight, timeout=2.0)
+        assert time.time() - start < 2.0
+        assert registry.finished == ["slow cancelled"]
+        assert len(server.responses()) == 1
+        assert server._get_session_diagnostics()["cancelled_requests"] == 1
+
+    def test_cancel_long_running_call(self, server, registry):
+        server._dispatch_line(_request(1, "pomera_ai_tools", action="research"))
+        assert _wait_for(lambda: server._in_flight.get(1) and server._in_flight[1].start)
+        server._dispatch_line(_cancel(1))
+        assert [r["id"] for r in server.responses()] == [1]
+        # The tool's own thread sees the cancellation and the worker stops waiting
+        assert _wait_for(lambda: 1 not in server._in_flight, timeout=2.0)
+        assert registry.finished == ["research cancelled"]
+        assert len(server.responses()) == 1
+
+    def test_cancel_queued_call(self, server, registry):
+        server._dispatch_line(_request(1, "slow_tool", seconds=0.5))
+        server._dispatch_line(_request(2, "slow_tool", seconds=0.5))
+        server._dispatch_line(_request(3, "fast_tool", text="queued"))
+        server._dispatch_line(_cancel(3))
+
+        server._shutdown_executor()
+        responses = {r["id"]: r for r in server.responses()}
+        assert sorted(responses) == [1, 2, 3]
+        assert responses[3]["error"]["code"] == MCPErrorCode.REQUEST_CANCELLED
+        assert "result" in responses[1] and "result" in responses[2]
+
+    def test_cancel_after_response_is_ignored(self, server):
+        server._dispatch_line(_request(1, "fast_tool", text="x"))
+        assert _wait_for(lambda: 1 not in server._in_flight)
+        server._dispatch_line(_cancel(1))
+        assert len(server.responses()) == 1 and "result" in server.responses()[0]
+
+    def test_pool_survives_cancellation(self, server):
+        server._dispatch_line(_request(1, "slow_tool", seconds=3.0))
+        assert _wait_for(lambda: server._in_flight.get(1) and server._in_flight[1].start)
+        server._dispatch_line(_cancel(1))
+        assert _wait_for(lambda: 1 not in server._in_flight)
+
+        for i in range(2, 6):
+            server._dispatch_line(_request(i, "fast_tool", text=str(i)))
+        assert _wait_for(lambda: len(server.responses()) == 5)
+
+    def test_cancel_unknown_request_is_ignored(self, server):
+        assert server._cancel_request(999) is False
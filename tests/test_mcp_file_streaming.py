@@ -0,0 +1,156 @@
+"""
+Tests for streaming file mode (stream=true) in MCP file I/O.
+
+Streaming must produce byte-identical output to the in-memory path for
+every supported operation, independent of chunk boundaries, while
+lifting the file size limit.
+"""
+import pytest
+
+import core.mcp.file_io_helpers as file_io
+from core.mcp.file_io_helpers import (
+    iter_line_blocks,
+    should_stream,
+    stream_file_output,
+)
+from core.mcp.tool_registry import ToolRegistry
+
+
+SAMPLE = (
+    "  3. alpha  beta\t\n"
+    "\n"
+    "beta\r\n"
+    "    indented    line\n"
+    "\tALPHA  beta\n"
+    "   \n"
+    "beta\n"
+    "form\x0cfeed\n"
+    "[12] ünïcödé  line next\n"
+    "last line without newline"
+)
+
+CASES = [
+    ("pomera_line_tools", {"operation": "remove_duplicates"}),
+    ("pomera_line_tools", {"operation": "remove_duplicates", "case_sensitive": False}),
+    ("pomera_line_tools", {"operation": "remove_empty"}),
+    ("pomera_line_tools", {"operation": "add_numbers", "number_format": "[1] "}),
+    ("pomera_line_tools", {"operation": "remove_numbers"}),
+    ("pomera_whitespace", {"operation": "trim"}),
+    ("pomera_whitespace", {"operation": "trim", "trim_mode": "trailing"}),
+    ("pomera_whitespace", {"operation": "remove_extra_spaces"}),
+    ("pomera_whitespace", {"operation": "tabs_to_spaces", "tab_size": 2}),
+    ("pomera_whitespace", {"operation": "spaces_to_tabs"}),
+    ("pomera_whitespace", {"operation": "normalize_endings", "line_ending": "crlf"}),
+    ("pomera_text_tools", {"action": "lines", "operation": "remove_empty"}),
+    ("pomera_text_tools", {"action": "whitespace", "operation": "trim"}),
+]
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return ToolRegistry()
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Force many chunk boundaries, including mid-line and mid-CRLF."""
+    monkeypatch.setattr(file_io, "STREAM_CHUNK_CHARS", 3)
+    monkeypatch.setattr(file_io, "STREAM_WRITE_BATCH_LINES", 2)
+
+
+def run(registry, tool, args, src, dst, stream):
+    result = registry.execute(tool, dict(args, text=str(src), text_is_file=True,
+                                         output_to_file=str(dst), stream=stream))
+    assert not result.isError
+    return result.content[0]["text"]
+
+
+class TestIterLineBlocks:
+
+    @pytest.mark.parametrize("text", [
+        "", "a", "a\n", "a\nb", "\n\n", "a\x0cb\n\x85c", "x  y\n",
+    ])
+    @pytest.mark.parametrize("size", [1, 2, 5, 100])
+    def test_matches_splitlines(self, text, size):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        lines = [line for block in iter_line_blocks(chunks) for line in block]
+        assert lines == text.splitlines()
+
+
+class TestStreamingEquivalence:
+
+    @pytest.mark.parametrize("tool,args", CASES)
+    def test_stream_matches_in_memory(self, registry, tmp_path, small_chunks, tool, args):
+        src = tmp_path / "in.txt"
+        src.write_bytes(SAMPLE.encode("utf-8"))
+        run(registry, tool, args, src, tmp_path / "mem.txt", stream=False)
+        message = run(registry, tool, args, src, tmp_path / "stream.txt", stream=True)
+        assert message.startswith("Content saved to:")
+        assert (tmp_path / "stream.txt").read_bytes() == (tmp_path / "mem.txt").read_bytes()
+
+    def test_encoding_fallback_restarts_output(self, registry, tmp_path, small_chunks):
+        src = tmp_path / "latin.txt"
+        src.write_bytes(("plain line\n" * 5 + "caf\xe9  bar\n").encode("latin-1"))
+        args = {"operation": "remove_extra_spaces"}
+        run(registry, "pomera_whitespace", args, src, tmp_path / "mem.txt", stream=False)
+        run(registry, "pomera_whitespace", args, src, tmp_path / "stream.txt", stream=True)
+        assert (tmp_path / "stream.txt").read_bytes() == (tmp_path / "mem.txt").read_bytes()
+        assert "café bar" in (tmp_path / "stream.txt").read_text(encoding="utf-8")
+
+    def test_in_place_rewrite(self, registry, tmp_path):
+        src = tmp_path / "same.txt"
+        src.write_text("b\n\na\n", encoding="utf-8")
+        run(registry, "pomera_line_tools", {"operation": "remove_empty"}, src, src, stream=True)
+        assert src.read_text(encoding="utf-8") == "b\na"
+        assert [p.name for p in tmp_path.iterdir()] == ["same.txt"]
+
+    def test_unsupported_operation_falls_back(self, registry, tmp_path):
+        src = tmp_path / "in.txt"
+        src.write_text("1\n2\n3", encoding="utf-8")
+        message = run(registry, "pomera_line_tools", {"operation": "reverse"},
+                      src, tmp_path / "out.txt", stream=True)
+        assert "streamed" not in message
+        assert (tmp_path / "out.txt").read_text(encoding="utf-8") == "3\n2\n1"
+
+
+class TestStreamingLimits:
+
+    def test_large_file_streams_automatically(self, registry, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_io, "MAX_FILE_SIZE_BYTES", 64)
+        monkeypatch.setattr(file_io, "MAX_FILE_SIZE_MB", 64 / (1024 * 1024))
+        src = tmp_path / "big.log"
+        src.write_text("".join(f"  line {i % 7}  \n" for i in range(1000)), encoding="utf-8")
+        dst = tmp_path / "out.log"
+        args = {"text": str(src), "text_is_file": True, "output_to_file": str(dst),
+                "operation": "remove_duplicates"}
+        assert should_stream(args)
+        message = registry.execute("pomera_line_tools", args).content[0]["text"]
+        assert "streamed 7 lines" in message
+        assert dst.read_text(encoding="utf-8").splitlines() == [f"  line {i}  " for i in range(7)]
+
+    def test_requires_output_file(self, tmp_path):
+        src = tmp_path / "in.txt"
+        src.write_text("x", encoding="utf-8")
+        assert not should_stream({"text": str(src), "text_is_file": True, "stream": True})
+
+    def test_missing_input_reports_error(self, tmp_path):
+        message = stream_file_output(
+            {"text": str(tmp_path / "nope.txt"), "output_to_file": str(tmp_path / "o.txt")},
+            line_transform=lambda lines: lines,
+        )
+        assert "File not found" in message
+        assert not (tmp_path / "o.txt").exists()
+
+    def test_failed_transform_leaves_no_output(self, tmp_path):
+        src = tmp_path / "in.txt"
+        src.write_text("a\nb\n", encoding="utf-8")
+
+        def boom(lines):
+            for line in lines:
+                raise RuntimeError("boom")
+            yield ""
+
+        with pytest.raises(RuntimeError):
+            stream_file_output({"text": str(src), "output_to_file": str(tmp_path / "o.txt")},
+                               line_transform=boom)
+        assert [p.name for p in tmp_path.iterdir()] == ["in.txt"]
@@ -0,0 +1,186 @@
+"""
+Tests for core.mcp.metrics latency histograms, stage timing and export.
+"""
+
+import io
+import json
+import random
+import threading
+from contextlib import redirect_stdout
+
+import pytest
+
+from core.mcp.metrics import (
+    LatencyHistogram, MCPMetricsCollector, StageTimer, ToolMetrics, PROMETHEUS_BUCKETS_MS,
+)
+from core.mcp.server_stdio import StdioMCPServer
+from core.mcp.tool_registry import ToolRegistry, MCPToolAdapter
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(2, 1) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for v in values:
+            histogram.record(v)
+        for q in (50, 95, 99, 99.9):
+            exact = values[int(len(values) * q / 100) - 1]
+            assert exact <= histogram.percentile(q) <= exact * 1.07
+
+    def test_fixed_size_and_exact_aggregates(self):
+        histogram = LatencyHistogram()
+        size = len(histogram._counts)
+        for v in (0.0, 0.0004, 2.5, 1e9, -1):
+            histogram.record(v)
+        assert len(histogram._counts) == size
+        assert histogram.count == 5
+        assert histogram.min_ms == 0.0
+        assert histogram.max_ms == 1e9
+        assert histogram.percentile(100) == 1e9
+
+    def test_single_value(self):
+        histogram = LatencyHistogram()
+        histogram.record(12.3)
+        assert histogram.percentile(50) == 12.3
+        assert histogram.summary()["p99_ms"] == 12.3
+
+    def test_cumulative_counts(self):
+        histogram = LatencyHistogram()
+        for v in (0.2, 3, 3, 40, 7000):
+            histogram.record(v)
+        counts = dict(zip(PROMETHEUS_BUCKETS_MS, histogram.cumulative_counts(PROMETHEUS_BUCKETS_MS)))
+        assert counts[0.1] == 0
+        assert counts[0.25] == 1
+        assert counts[5] == 3
+        assert counts[50] == 4
+        assert counts[300000] == 5
+
+
+class TestToolMetrics:
+
+    def test_percentiles_cover_whole_session(self):
+        metrics = ToolMetrics()
+        for _ in range(990):
+            metrics.record(1.0)
+        for _ in range(10):
+            metrics.record(500.0)
+        data = metrics.to_dict()
+        assert data["p50_ms"] == 1.0
+        assert data["p99_ms"] == 1.0
+        assert data["max_ms"] == 500.0
+        metrics.record(500.0)
+        assert metrics.to_dict()["p99_ms"] == 500.0
+
+    def test_stage_timer(self):
+        timer = StageTimer()
+        timer.mark("parse")
+        timer.mark("handler")
+        timer.mark("handler")
+        assert list(timer.stages) == ["parse", "handler"]
+        assert all(v >= 0 for v in timer.stages.values())
+
+
+def _server():
+    registry = ToolRegistry(register_builtins=False)
+    registry.register(MCPToolAdapter("echo", "Echo", {"type": "object"},
+                                     lambda args: args.get("text", "")))
+    return StdioMCPServer(tool_registry=registry)
+
+
+def _call(req_id, text="hi"):
+    return json.dumps({"jsonrpc": "2.0", "id": req_id, "method": "tools/call",
+                       "params": {"name": "echo", "arguments": {"text": text}}})
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    import core.mcp.metrics as metrics_module
+    collector = MCPMetricsCollector()
+    monkeypatch.setattr(metrics_module, "mcp_metrics", collector)
+    return collector
+
+
+class TestStageRecording:
+
+    def test_sequential_dispatch_records_all_stages(self, metrics):
+        server = _server()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            for i in range(3):
+                server._dispatch_line(_call(i))
+        assert len(out.getvalue().splitlines()) == 3
+        stages = metrics.get_stats()["per_tool"]["echo"]["stages"]
+        assert list(stages) == ["parse", "validate", "handler", "serialize", "write"]
+        assert all(s["count"] == 3 for s in stages.values())
+
+    def test_concurrent_dispatch_adds_queue_stage(self, metrics):
+        server = _server()
+        server.max_workers = 2
+        server._start_executor()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            server._dispatch_line(_call(1))
+            server._shutdown_executor()
+        assert "queue" in metrics.get_stats()["per_tool"]["echo"]["stages"]
+
+    def test_unknown_tool_not_recorded(self, metrics):
+        server = _server()
+        with redirect_stdout(io.StringIO()):
+            server._dispatch_line(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                                              "params": {"name": "nope"}}))
+        assert metrics.get_stats()["per_tool"] == {}
+
+    def test_stage_breakdown(self, metrics):
+        metrics.record_stages("a", {"parse": 1.0, "handler": 3.0})
+        breakdown = metrics.get_stats()["stage_breakdown"]
+        assert breakdown["handler"]["share"] == "75.0%"
+        assert list(breakdown) == ["parse", "handler"]
+
+
+class TestExport:
+
+    @pytest.fixture
+    def collector(self):
+        collector = MCPMetricsCollector()
+        collector.record("pomera_notes", 4.0, 10)
+        collector.record("pomera_notes", 40.0, 10, success=False, error_msg="x")
+        collector.record_stages("pomera_notes", {"parse": 0.2, "handler": 4.0})
+        return collector
+
+    def test_prometheus_text(self, collector):
+        text = collector.export_prometheus()
+        assert '# TYPE pomera_mcp_tool_latency_ms histogram' in text
+        assert 'pomera_mcp_tool_calls_total{tool="pomera_notes"} 2' in text
+        assert 'pomera_mcp_tool_errors_total{tool="pomera_notes"} 1' in text
+        assert 'pomera_mcp_tool_latency_ms_bucket{tool="pomera_notes",le="5"} 1' in text
+        assert 'pomera_mcp_tool_latency_ms_bucket{tool="pomera_notes",le="+Inf"} 2' in text
+        assert 'pomera_mcp_stage_latency_ms_count{tool="pomera_notes",stage="parse"} 1' in text
+
+    def test_json_lines(self, collector):
+        rows = [json.loads(line) for line in collector.export_json_lines().splitlines()]
+        assert [r["stage"] for r in rows] == ["total", "parse", "handler"]
+        assert rows[0]["calls"] == 2
+
+    def test_write_export_formats(self, collector, tmp_path):
+        prom = tmp_path / "mcp.prom"
+        collector.write_export(str(prom))
+        collector.write_export(str(prom))
+        assert prom.read_text().count("# TYPE pomera_mcp_tool_calls_total") == 1
+
+        jsonl = tmp_path / "mcp.jsonl"
+        collector.write_export(str(jsonl))
+        collector.write_export(str(jsonl))
+        assert len(jsonl.read_text().splitlines()) == 6
+
+        with pytest.raises(ValueError):
+            collector.write_export(str(prom), fmt="xml")
+
+    def test_periodic_export_writes_final_snapshot(self, collector, tmp_path):
+        path = tmp_path / "live.prom"
+        collector.start_file_export(str(path), interval_s=3600)
+        assert collector.get_stats()["export_file"] == str(path)
+        collector.stop_file_export()
+        assert "pomera_notes" in path.read_text()
+        assert not [t for t in threading.enumerate() if t.name == "mcp-metrics-export"]
@@ -0,0 +1,132 @@
+"""
+Tests for the opt-in MCP result cache (core.mcp.result_cache) in front of
+ToolRegistry.execute.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import core.mcp.result_cache as result_cache
+from core.mcp.result_cache import UNCACHEABLE_TOOLS, configure_result_cache, get_result_cache_stats
+from core.mcp.tool_registry import MCPToolAdapter, ToolRegistry, pure_actions
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return ToolRegistry()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(result_cache, "_result_cache", None)
+    monkeypatch.setattr(result_cache, "_configured", False)
+    yield configure_result_cache(8)
+
+
+def counting_adapter(name="counting", pure=pure_actions("run"), output="result"):
+    calls = []
+
+    def handler(args):
+        calls.append(args)
+        return output if isinstance(output, str) else output(args)
+
+    adapter = MCPToolAdapter(name=name, description="", input_schema={}, handler=handler, pure=pure)
+    return adapter, calls
+
+
+class TestResultCache:
+
+    def test_pure_calls_are_memoized(self, registry, cache):
+        text = "The quick brown fox. " * 2000
+        first = registry.execute("pomera_text_stats", {"text": text})
+        second = registry.execute("pomera_analysis", {"action": "stats", "text": text})
+        assert first.to_dict() == second.to_dict()
+        stats = get_result_cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["tools"]["pomera_analysis"] == {"hits": 1, "misses": 1}
+
+    def test_key_ignores_argument_order(self, cache):
+        registry = ToolRegistry(register_builtins=False)
+        adapter, calls = counting_adapter()
+        registry.register(adapter)
+        registry.execute("counting", {"action": "run", "a": 1, "b": [1, 2]})
+        registry.execute("counting", {"b": [1, 2], "a": 1, "action": "run"})
+        registry.execute("counting", {"action": "run", "a": 2, "b": [1, 2]})
+        assert len(calls) == 2
+
+    def test_impure_calls_run_every_time(self, cache):
+        registry = ToolRegistry(register_builtins=False)
+        adapter, calls = counting_adapter(pure=pure_actions("run", impure_values={"mode": {"random"}}))
+        registry.register(adapter)
+        for args in ({"action": "other"}, {"action": "run", "mode": "random"},
+                     {"action": "run", "text_is_file": True}, {"action": "run", "output_to_file": "x"}):
+            registry.execute("counting", args)
+            registry.execute("counting", args)
+        assert len(calls) == 8
+
+    def test_uncacheable_tools_are_never_memoized(self, cache):
+        registry = ToolRegistry(register_builtins=False)
+        adapter, calls = counting_adapter(name="pomera_notes")
+        registry.register(adapter)
+        registry.execute("pomera_notes", {"action": "run"})
+        registry.execute("pomera_notes", {"action": "run"})
+        assert len(calls) == 2 and "pomera_notes" in UNCACHEABLE_TOOLS
+
+    def test_generators_are_not_memoized(self, registry, cache):
+        args = {"action": "generate", "type": "uuid"}
+        first = registry.execute("pomera_data_tools", args).content[0]["text"]
+        second = registry.execute("pomera_data_tools", args).content[0]["text"]
+        assert first != second
+        assert get_result_cache_stats()["misses"] == 0
+
+    def test_errors_are_not_cached(self, cache):
+        registry = ToolRegistry(register_builtins=False)
+        adapter, calls = counting_adapter()
+        adapter.handler = lambda args: calls.append(args) or 1 / 0
+        registry.register(adapter)
+        assert registry.execute("counting", {"action": "run"}).isError
+        assert registry.execute("counting", {"action": "run"}).isError
+        assert len(calls) == 2
+
+    def test_byte_budget_evicts(self, monkeypatch):
+        monkeypatch.setattr(result_cache, "_result_cache", None)
+        monkeypatch.setattr(result_cache, "_configured", False)
+        configure_result_cache(1)
+        registry = ToolRegistry(register_builtins=False)
+        adapter, _ = counting_adapter(output=lambda args: "x" * 300_000 + str(args["n"]))
+        registry.register(adapter)
+        for n in range(10):
+            registry.execute("counting", {"action": "run", "n": n})
+        stats = get_result_cache_stats()
+        assert stats["size_mb"] <= 1
+        assert stats["evictions"] > 0
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(result_cache, "_result_cache", None)
+        monkeypatch.setattr(result_cache, "_configured", False)
+        monkeypatch.delenv(result_cache.RESULT_CACHE_ENV, raising=False)
+        registry = ToolRegistry(register_builtins=False)
+        adapter, calls = counting_adapter()
+        registry.register(adapter)
+        registry.execute("counting", {"action": "run"})
+        registry.execute("counting", {"action": "run"})
+        assert len(calls) == 2
+        assert get_result_cache_stats()["enabled"] is False
+
+    def test_enabled_from_environment(self, monkeypatch):
+        monkeypatch.setattr(result_cache, "_result_cache", None)
+        monkeypatch.setattr(result_cache, "_configured", False)
+        monkeypatch.setenv(result_cache.RESULT_CACHE_ENV, "4")
+        assert result_cache.get_result_cache().max_mb == 4
+
+    def test_stats_in_diagnose(self, registry, cache):
+        result = registry.execute("pomera_system", {"action": "diagnose"})
+        diagnose = json.loads(result.content[0]["text"])
+        assert diagnose["performance"]["result_cache"]["enabled"] is True
@@ -0,0 +1,240 @@
+"""
+MCP server startup benchmark: time to the first initialize and tools/list
+replies, RSS after init and per-module import cost (python -X importtime),
+for every toolset in core.mcp.toolset_config, plus the startup report that
+pomera_diagnose serves from core.mcp.startup_metrics.
+
+Every measurement starts a fresh pomera_mcp_server.py process and talks to
+it over stdio like a real client.
+
+Run directly for the per-toolset report:
+
+    python tests/test_mcp_startup_benchmark.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.mcp.startup_metrics import StartupMetrics, current_rss
+from core.mcp.toolset_config import TOOLSET_DEFINITIONS
+
+SERVER_PATH = os.path.join(PROJECT_ROOT, "pomera_mcp_server.py")
+
+# Time to the first initialize reply; generous so slow CI machines pass
+INITIALIZE_BUDGET_MS = 2000
+
+# Modules that must not load before the first tools/call
+DEFERRED_MODULES = ("core.mcp.tool_registry", "tools.")
+
+
+def parse_importtime(stderr):
+    """
+    Parse python -X importtime output.
+
+    Returns:
+        {module: (self_us, cumulative_us)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def rss_of(pid):
+    """RSS of another process in MB, from /proc (None where unavailable)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class ServerProcess:
+    """pomera_mcp_server.py in a subprocess, spoken to over stdio."""
+
+    def __init__(self, data_dir, toolsets=None, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ["-X", "importtime"]
+        command += [SERVER_PATH, "--data-dir", str(data_dir)]
+        if toolsets:
+            command += ["--toolsets", ",".join(toolsets)]
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(
+            command, cwd=PROJECT_ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, text=True, encoding="utf-8",
+        )
+        self._next_id = 0
+
+    def request(self, method, params=None):
+        """Send a request and return (reply, ms since the process started)."""
+        self._next_id += 1
+        message = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        assert line, f"server exited: {self.close()[-2000:]}"
+        return json.loads(line), elapsed_ms
+
+    def call_tool(self, name, arguments):
+        reply, _ = self.request("tools/call", {"name": name, "arguments": arguments})
+        return reply["result"]["content"][0]["text"]
+
+    def close(self):
+        """Close stdin, wait for exit and return stderr."""
+        self.process.stdin.close()
+        stderr = self.process.stderr.read()
+        self.process.wait(timeout=30)
+        self.process.stdout.close()
+        self.process.stderr.close()
+        return stderr
+
+
+def measure(data_dir, toolsets=None):
+    """One cold start: initialize, tools/list, RSS, then per-module import costs."""
+    server = ServerProcess(data_dir, toolsets, importtime=True)
+    _, initialize_ms = server.request("initialize", {"clientInfo": {"name": "startup-benchmark"}})
+    reply, tools_list_ms = server.request("tools/list")
+    rss_mb = rss_of(server.process.pid)
+    modules = parse_importtime(server.close())
+    return {
+        "toolsets": toolsets or sorted(TOOLSET_DEFINITIONS),
+        "initialize_ms": initialize_ms,
+        "tools_list_ms": tools_list_ms,
+        "rss_mb": rss_mb,
+        "tools": sorted(tool["name"] for tool in reply["result"]["tools"]),
+        "modules": modules,
+    }
+
+
+def best_of(runs, data_dir, toolsets=None):
+    return min((measure(data_dir, toolsets) for _ in range(runs)), key=lambda run: run["initialize_ms"])
+
+
+def slowest_imports(modules, count=10):
+    """Modules with the highest cumulative import cost."""
+    return sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:count]
+
+
+class TestParseImporttime:
+
+    def test_parse(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   _io\n"
+                  "import time:      2009 |      43407 | site\n"
+                  "2026-01-01 00:00:00 - __main__ - INFO - Loaded 13 tools\n")
+        assert parse_importtime(stderr) == {"_io": (120, 120), "site": (2009, 43407)}
+
+
+class TestStartupMetrics:
+
+    def test_stages_are_marked_once(self):
+        metrics = StartupMetrics(start=time.perf_counter())
+        first = metrics.mark(metrics.IMPORTS)
+        assert first is not None and metrics.mark(metrics.IMPORTS) is None
+        assert metrics.stage(metrics.IMPORTS) == first
+        metrics.mark(metrics.SERVER_READY)
+        metrics.set_info(toolsets=["core"], tool_count=4)
+        stats = metrics.get_stats()
+        assert list(stats["stages_ms"]) == ["imports", "server_ready"]
+        assert stats["toolsets"] == ["core"] and stats["modules_after_init"] > 0
+        assert stats["rss_after_init_mb"] is None or stats["rss_after_init_mb"] > 0
+
+    def test_tasks_wait_for_initialize(self):
+        import threading
+        metrics = StartupMetrics()
+        done = threading.Event()
+        metrics.after_initialize(done.set, "probe")
+        assert not done.wait(0.05)
+        assert metrics.get_stats()["pending_deferred_tasks"] == ["probe"]
+        metrics.mark(metrics.FIRST_INITIALIZE)
+        assert done.wait(5)
+        late = threading.Event()
+        metrics.after_initialize(late.set)
+        assert late.wait(5)
+
+    def test_current_rss(self):
+        rss, source = current_rss()
+        assert source in ("proc", "psutil", "peak", "unavailable")
+        assert rss is None or rss > 0
+
+
+class TestServerStartup:
+
+    @pytest.mark.parametrize("toolset", sorted(TOOLSET_DEFINITIONS))
+    def test_toolset_startup(self, toolset, tmp_path):
+        run = measure(tmp_path, [toolset])
+        assert run["tools"] == sorted(TOOLSET_DEFINITIONS[toolset])
+        assert run["initialize_ms"] < INITIALIZE_BUDGET_MS
+        assert run["modules"], "no -X importtime output"
+        deferred = [name for name in run["modules"] if name.startswith(DEFERRED_MODULES)]
+        assert deferred == []
+
+    def test_unknown_toolset(self, tmp_path):
+        completed = subprocess.run(
+            [sys.executable, SERVER_PATH, "--data-dir", str(tmp_path), "--toolsets", "core,nope"],
+            cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60,
+        )
+        assert completed.returncode != 0
+        assert "Unknown toolset 'nope'" in completed.stderr
+
+    def test_diagnose_reports_startup(self, tmp_path):
+        server = ServerProcess(tmp_path, ["core"])
+        try:
+            server.request("initialize", {})
+            server.request("tools/list")
+            report = json.loads(server.call_tool("pomera_diagnose", {}))["startup"]
+        finally:
+            server.close()
+        stages = report["stages_ms"]
+        assert list(stages) == ["imports", "registry_ready", "server_ready", "first_initialize",
+                                "first_tools_list"]
+        assert report["toolsets"] == ["core"] and report["tool_count"] == len(TOOLSET_DEFINITIONS["core"])
+        assert report["deferred_ms"]["registry_build"] > 0
+        assert report["modules_now"] > report["modules_after_init"]
+
+
+@pytest.mark.slow
+class TestStartupBenchmark:
+
+    def test_all_toolsets_within_budget(self, tmp_path):
+        for toolset in [None] + [[name] for name in sorted(TOOLSET_DEFINITIONS)]:
+            run = best_of(3, tmp_path, toolset)
+            assert run["initialize_ms"] < INITIALIZE_BUDGET_MS / 2, run["toolsets"]
+
+
+def main():
+    data_dir = tempfile.mkdtemp(prefix="pomera-startup-")
+    runs = [best_of(5, data_dir)] + [best_of(5, data_dir, [name]) for name in sorted(TOOLSET_DEFINITIONS)]
+    print(f"{'toolsets':<26} {'tools':>5} {'initialize':>11} {'tools/list':>11} {'RSS':>9} {'modules':>8}")
+    for run in runs:
+        rss = f"{run['rss_mb']:.1f}MB" if run["rss_mb"] is not None else "n/a"
+        print(f"{','.join(run['toolsets']):<26} {len(run['tools']):>5} {run['initialize_ms']:>9.1f}ms "
+              f"{run['tools_list_ms']:>9.1f}ms {rss:>9} {len(run['modules']):>8}")
+    print("\nslowest imports before the first reply (all toolsets, cumulative):")
+    for name, (self_us, cumulative_us) in slowest_imports(runs[0]["modules"]):
+        print(f"  {cumulative_us / 1000:>7.1f}ms  {name}  (self {self_us / 1000:.1f}ms)")
+    return 1 if any(run["initialize_ms"] >= INITIALIZE_BUDGET_MS for run in runs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
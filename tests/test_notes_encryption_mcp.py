@@ -328,6 +328,90 @@ class TestEncryptionStatus:
         assert "🔒 Output: ENCRYPTED" in metadata2
 
 
+class TestKeyCache:
+    """Test the process-wide key cache and batch APIs."""
+
+    def test_key_derived_once(self):
+        """Repeated encrypt/decrypt calls reuse one derived key."""
+        from core.note_encryption import NoteKeyManager
+
+        calls = []
+
+        def factory():
+            calls.append(1)
+            from core.note_encryption import _derive_system_encryption_key
+            return _derive_system_encryption_key()
+
+        manager = NoteKeyManager(key_factory=factory)
+        for _ in range(5):
+            manager.decrypt_many(manager.encrypt_many(["secret"]))
+
+        if ENCRYPTION_AVAILABLE:
+            assert len(calls) == 1
+            stats = manager.get_stats()
+            assert stats["key_derivations"] == 1
+            assert stats["key_cache_hits"] >= 9
+            assert stats["fields_decrypted"] == 5
+
+    def test_failed_derivation_not_cached(self):
+        """A failed derivation is retried on the next call."""
+        from core.note_encryption import NoteKeyManager
+
+        manager = NoteKeyManager(key_factory=lambda: None)
+        assert manager.encrypt_many(["a", "b"]) == ["a", "b"]
+        manager.encrypt_many(["c"])
+        if ENCRYPTION_AVAILABLE:
+            assert manager.get_stats()["key_derivations"] == 2
+
+    def test_concurrent_counters(self):
+        """Stats stay exact when several threads share the manager."""
+        if not ENCRYPTION_AVAILABLE:
+            pytest.skip("Encryption not available")
+        import threading
+        from core.note_encryption import NoteKeyManager
+
+        manager = NoteKeyManager()
+        manager.get_fernet()
+
+        def worker():
+            for _ in range(200):
+                manager.get_fernet()
+                manager.decrypt_many(["plain", "text"])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = manager.get_stats()
+        assert stats["key_derivations"] == 1
+        assert stats["key_cache_hits"] == 8 * 200
+        assert stats["fields_decrypted"] == 8 * 200 * 2
+
+    def test_batch_round_trip(self):
+        """Batch APIs keep order and pass through empty/plain values."""
+        if not ENCRYPTION_AVAILABLE:
+            pytest.skip("Encryption not available")
+        from core.note_encryption import encrypt_note_fields, decrypt_note_fields
+
+        values = ["one", "", None, "three"]
+        encrypted = encrypt_note_fields(values)
+        assert encrypted[0].startswith("ENC:")
+        assert encrypted[1] == "" and encrypted[2] is None
+        assert decrypt_note_fields(encrypted) == values
+
+    def test_batch_decrypt_mixed_rows(self):
+        """Plain, encrypted and corrupt values can be decrypted in one batch."""
+        if not ENCRYPTION_AVAILABLE:
+            pytest.skip("Encryption not available")
+        from core.note_encryption import decrypt_note_fields
+
+        encrypted = encrypt_note_content("hidden")
+        result = decrypt_note_fields(["plain", encrypted, "ENC:not-valid"])
+        assert result == ["plain", "hidden", "ENC:not-valid"]
+
+
 class TestEdgeCases:
     """Test edge cases and error conditions."""
     
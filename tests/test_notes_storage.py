@@ -0,0 +1,185 @@
+"""
+Tests for core.notes_storage pooled notes.db connections.
+
+Covers connection reuse, WAL configuration, transaction handling,
+thread safety, and MCP notes handlers running on the shared pool.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from core.notes_storage import (
+    NotesConnectionPool, PooledConnection, get_notes_pool, close_notes_pools,
+    get_notes_pool_stats,
+)
+
+
+@pytest.fixture
+def notes_db(tmp_path):
+    """Create a notes.db with the same schema as NotesWidget."""
+    db_path = str(tmp_path / "notes.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            Created TEXT, Modified TEXT, Title TEXT, Input TEXT, Output TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE VIRTUAL TABLE notes_fts USING fts5(
+            Title, Input, Output, content='notes', content_rowid='id'
+        )
+    ''')
+    conn.executescript('''
+        CREATE TRIGGER notes_after_insert AFTER INSERT ON notes BEGIN
+            INSERT INTO notes_fts(rowid, Title, Input, Output)
+            VALUES (new.id, new.Title, new.Input, new.Output);
+        END;
+    ''')
+    conn.commit()
+    conn.close()
+    yield db_path
+    close_notes_pools()
+
+
+class TestNotesConnectionPool:
+
+    def test_connection_is_reused(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        first = pool.acquire()
+        first.close()
+        second = pool.acquire()
+        assert second is first
+        second.close()
+        stats = pool.get_stats()
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 1
+        pool.close_all()
+
+    def test_wal_and_row_factory(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+            conn.execute("INSERT INTO notes (Title) VALUES ('t')")
+            row = conn.execute("SELECT Title FROM notes").fetchone()
+            assert row["Title"] == "t"
+        assert pool.get_stats()["wal_enabled"] is True
+        pool.close_all()
+
+    def test_context_manager_commits(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO notes (Title) VALUES ('kept')")
+        check = sqlite3.connect(notes_db)
+        assert check.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 1
+        check.close()
+        pool.close_all()
+
+    def test_context_manager_rolls_back_on_error(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO notes (Title) VALUES ('lost')")
+                raise RuntimeError("boom")
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 0
+        pool.close_all()
+
+    def test_release_rolls_back_uncommitted_work(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        conn = pool.acquire()
+        conn.execute("INSERT INTO notes (Title) VALUES ('uncommitted')")
+        conn.close()
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 0
+        pool.close_all()
+
+    def test_idle_connections_bounded(self, notes_db):
+        pool = NotesConnectionPool(notes_db, pool_size=2)
+        conns = [pool.acquire() for _ in range(4)]
+        assert pool.get_stats()["checked_out"] == 4
+        for c in conns:
+            c.close()
+        stats = pool.get_stats()
+        assert stats["idle"] == 2
+        assert stats["checked_out"] == 0
+        pool.close_all()
+
+    def test_double_close_is_harmless(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        conn = pool.acquire()
+        conn.close()
+        conn.close()
+        assert pool.get_stats()["idle"] == 1
+        pool.close_all()
+
+    def test_closed_pool_refuses_checkout(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        pool.close_all()
+        with pytest.raises(sqlite3.ProgrammingError):
+            pool.acquire()
+
+    def test_deleted_database_drops_idle_connections(self, notes_db, tmp_path):
+        pool = NotesConnectionPool(notes_db)
+        pool.acquire().close()
+        os.remove(notes_db)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(notes_db + suffix):
+                os.remove(notes_db + suffix)
+        conn = pool.acquire()
+        assert pool.get_stats()["connections_created"] == 2
+        conn.close()
+        pool.close_all()
+
+    def test_concurrent_writers(self, notes_db):
+        pool = NotesConnectionPool(notes_db)
+        errors = []
+
+        def writer(n):
+            try:
+                for i in range(25):
+                    with pool.connection() as conn:
+                        conn.execute("INSERT INTO notes (Title) VALUES (?)", (f"{n}-{i}",))
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 100
+        assert pool.get_stats()["connections_created"] <= 4
+        pool.close_all()
+
+
+class TestSharedPools:
+
+    def test_same_path_shares_pool(self, notes_db):
+        assert get_notes_pool(notes_db) is get_notes_pool(os.path.join(os.path.dirname(notes_db), ".", "notes.db"))
+        assert any(s["db_path"] == notes_db for s in get_notes_pool_stats())
+
+    def test_mcp_handlers_use_pool(self, notes_db, monkeypatch):
+        from core.mcp.tool_registry import ToolRegistry
+
+        monkeypatch.setattr(ToolRegistry, "_get_notes_db_path", lambda self: notes_db)
+        registry = ToolRegistry(register_builtins=False)
+
+        conn = registry._get_notes_connection()
+        assert isinstance(conn, PooledConnection)
+        conn.close()
+
+        for i in range(5):
+            result = registry._handle_notes_save({"title": f"note {i}", "input_content": "x"})
+            assert "saved successfully" in result
+        assert "note 4" in registry._handle_notes_list({})
+
+        stats = get_notes_pool(notes_db).get_stats()
+        assert stats["connections_created"] == 1
+        assert stats["checked_out"] == 0
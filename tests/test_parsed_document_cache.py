@@ -0,0 +1,139 @@
+"""
+Tests for parse-once caching in core.semantic_diff: FormatParser.load()
+validates and parses each input once, and compare_2way/compare_3way reuse
+parsed documents, detections and stats across calls.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import core.semantic_diff as semantic_diff
+from core.semantic_diff import FormatParser, ParsedDocumentCache, SemanticDiffEngine
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh process-wide cache for each test."""
+    fresh = ParsedDocumentCache()
+    monkeypatch.setattr(semantic_diff, "_parsed_document_cache", fresh)
+    return fresh
+
+
+def fail_if_called(*args, **kwargs):
+    raise AssertionError("input parsed more than once")
+
+
+class TestFormatParserLoad:
+
+    def test_valid_json_is_parsed_once(self, cache, monkeypatch):
+        monkeypatch.setattr(FormatParser, "validate_format", staticmethod(fail_if_called))
+        monkeypatch.setattr(FormatParser, "parse", staticmethod(fail_if_called))
+        document = FormatParser.load('{"a": [1, 2]}', 'json')
+        assert document.get_data() == {"a": [1, 2]}
+        assert document.validation["valid"] is True
+        assert document.warnings == []
+        assert FormatParser.load('{"a": [1, 2]}', 'json') is document
+        assert cache.get_stats()["hits"] == 1
+
+    def test_same_results_as_validate_and_parse(self, cache):
+        cases = [('{"a": 1,}', 'json'), ('{"a": ', 'json'), ('a: [1, 2', 'yaml'), ('', 'yaml'),
+                 ('KEY=1\nbroken line\n', 'env'), ('one\ntwo', 'text')]
+        for text, format in cases:
+            document = FormatParser.load(text, format)
+            assert document.validation == FormatParser.validate_format(text, format)
+            try:
+                expected = FormatParser.parse(text, format)
+            except ValueError as e:
+                with pytest.raises(ValueError, match=str(e)[:20]):
+                    document.get_data()
+            else:
+                assert document.get_data() == expected
+
+    def test_auto_detection_is_memoized(self, cache, monkeypatch):
+        calls = []
+        detect = FormatParser.detect_format_with_confidence
+
+        def counting_detect(text):
+            calls.append(text)
+            return detect(text)
+
+        monkeypatch.setattr(FormatParser, "detect_format_with_confidence", staticmethod(counting_detect))
+        for _ in range(3):
+            assert FormatParser.load("name: x\nport: 1\n", 'auto').format == 'yaml'
+            assert FormatParser.detect_format("name: x\nport: 1\n") == 'yaml'
+        assert len(calls) == 1
+
+    def test_byte_budget(self):
+        cache = ParsedDocumentCache(max_bytes=100)
+        big = json.dumps({"k": "x" * 200})
+        assert cache.load(big, 'json') is not cache.load(big, 'json')
+        first = cache.load('{"a": "' + "x" * 50 + '"}', 'json')
+        cache.load('{"b": "' + "x" * 50 + '"}', 'json')
+        assert cache.get_stats()["documents"] == 1
+        assert cache.load('{"a": "' + "x" * 50 + '"}', 'json') is not first
+
+
+class TestStats:
+
+    def test_single_pass_stats(self):
+        data = {"a": {"b": [1, {"c": None}], "d": {}}, "e": []}
+        assert FormatParser.calculate_stats(data) == {
+            "total_keys": 5, "total_values": 2, "nesting_depth": 4,
+            "data_size_bytes": len(json.dumps(data)),
+        }
+        assert FormatParser.calculate_stats(7)["nesting_depth"] == 0
+
+    def test_deep_nesting(self):
+        data = current = {}
+        for _ in range(5000):
+            current["n"] = {}
+            current = current["n"]
+        assert FormatParser._collect_stats(data) == (5000, 0, 5000)
+
+    def test_document_stats_are_computed_once(self, cache, monkeypatch):
+        document = FormatParser.load('{"a": {"b": 1}}', 'json')
+        assert document.stats()["total_keys"] == 2
+        monkeypatch.setattr(FormatParser, "calculate_stats", staticmethod(fail_if_called))
+        stats = document.stats()
+        stats["total_keys"] = 99
+        assert document.stats()["total_keys"] == 2
+
+
+class TestEngineSharesDocuments:
+
+    def test_repeated_compare_2way(self, cache):
+        engine = SemanticDiffEngine()
+        before, after = '{"a": 1, "b": [1, 2]}', '{"a": 2, "b": [1, 2]}'
+        first = engine.compare_2way(before, after, 'auto', {'include_stats': True})
+        assert cache.get_stats()["misses"] == 2
+        second = engine.compare_2way(before, after, 'auto', {'include_stats': True})
+        assert cache.get_stats()["misses"] == 2
+        assert first.changes == second.changes == [
+            {'type': 'modified', 'path': 'a', 'old_value': 1, 'new_value': 2}]
+        assert first.before_stats == second.before_stats
+
+    def test_errors_and_warnings_unchanged(self, cache):
+        engine = SemanticDiffEngine()
+        result = engine.compare_2way('{"a": ', '{"a": 1}', 'json')
+        assert not result.success
+        assert result.error.startswith("Invalid JSON")
+        result = engine.compare_2way("A=1\noops\n", "A=2\n", 'env')
+        assert result.warnings == ["Before: Line 2: Missing '=' delimiter in ENV line: oops"]
+
+    def test_merge_does_not_modify_cached_documents(self, cache):
+        base = '{"a": {"x": 1, "y": 2}, "b": 1}'
+        yours = '{"a": {"p": 1, "q": 2, "r": 3}, "b": 1}'
+        theirs = '{"a": {"x": 5, "y": 2}, "b": 1}'
+        engine = SemanticDiffEngine()
+        first = engine.compare_3way(base, yours, theirs, 'json', {'conflict_strategy': 'keep_yours'})
+        second = engine.compare_3way(base, yours, theirs, 'json', {'conflict_strategy': 'keep_yours'})
+        assert first.success and first.merged == second.merged
+        assert FormatParser.load(yours, 'json').get_data() == json.loads(yours)
+        assert FormatParser.load(base, 'json').get_data() == json.loads(base)
@@ -0,0 +1,147 @@
+"""
+Tests for the partitioned 3-way merge: diff_against_base() splits the
+base→yours and base→theirs diffs by top-level key across a process pool,
+and compare_3way(partitioned=True) returns the same SmartMergeResult.
+
+Run directly for a benchmark on synthetic 50 MB configs:
+
+    python tests/test_partitioned_merge.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import core.structural_diff as structural_diff
+from core.semantic_diff import SemanticDiffEngine
+from core.structural_diff import StructuralDiff, diff_against_base
+
+OPTIONS = {'ignore_order': False, 'report_repetition': True, 'verbose_level': 2}
+
+
+def make_config(services, rng):
+    """A config keyed by service name, about 730 bytes of indented JSON per service."""
+    return {
+        f"service-{i}": {
+            'image': f"registry.local/app-{i}:{rng.randint(1, 99)}",
+            'replicas': rng.randint(1, 9),
+            'env': {f"VAR_{j}": f"value-{i}-{j}-{rng.random():.6f}" for j in range(10)},
+            'ports': [{'container': 8000 + j, 'host': 18000 + i % 1000 + j} for j in range(2)],
+            'labels': {'team': rng.choice(['core', 'web', 'data']), 'tier': rng.choice(['a', 'b'])},
+        } for i in range(services)
+    }
+
+
+def edit(config, rng, changes):
+    edited = json.loads(json.dumps(config))
+    names = list(edited)
+    for _ in range(changes):
+        service = edited[rng.choice(names)]
+        choice = rng.random()
+        if choice < 0.4:
+            service['replicas'] += 1
+        elif choice < 0.7:
+            service['env'][f"EXTRA_{rng.randrange(100)}"] = 'x'
+        elif choice < 0.9:
+            service['labels'].pop('tier', None)
+        else:
+            service['ports'].append({'container': 9999, 'host': 19999})
+    edited[f"service-new-{rng.randrange(1000)}"] = {'image': 'new', 'replicas': 1}
+    del edited[rng.choice(names)]
+    return edited
+
+
+def make_merge_inputs(services, rng, changes):
+    base = make_config(services, rng)
+    return base, edit(base, rng, changes), edit(base, rng, changes)
+
+
+class TestDiffAgainstBase:
+
+    def test_same_views_as_structural_diff(self):
+        rng = random.Random(5)
+        base, yours, theirs = make_merge_inputs(60, rng, 40)
+        theirs['service-3'] = ['replaced', 'by', 'a', 'list']
+        views = diff_against_base(base, [yours, theirs, base], OPTIONS, max_workers=2)
+        for other, view in zip([yours, theirs, base], views):
+            expected = StructuralDiff(base, other, OPTIONS).to_deepdiff_view()
+            assert list(view) == list(expected)
+            for report_type in expected:
+                assert list(view[report_type].items()) == list(expected[report_type].items())
+
+    def test_mostly_different_roots(self):
+        base = {'a': {'x': 1}, 'b': {'x': 2}, 'c': {'x': 3}}
+        other = {'a': {'x': 2}, 'd': 1, 'e': 2, 'f': 3, 'g': 4}
+        assert diff_against_base(base, [other], OPTIONS, max_workers=2) == \
+            [StructuralDiff(base, other, OPTIONS).to_deepdiff_view()]
+
+    def test_falls_back_without_a_pool(self, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise OSError("no processes here")
+
+        monkeypatch.setattr(structural_diff, "ProcessPoolExecutor", no_pool)
+        base, yours, theirs = make_merge_inputs(10, random.Random(1), 5)
+        expected = [StructuralDiff(base, other, OPTIONS).to_deepdiff_view() for other in (yours, theirs)]
+        assert diff_against_base(base, [yours, theirs], OPTIONS, max_workers=4) == expected
+        assert diff_against_base(base, [yours, theirs], OPTIONS, max_workers=1) == expected
+        assert diff_against_base([1, {'a': 1}], [[2, {'a': 2}]], OPTIONS, max_workers=4) == \
+            [StructuralDiff([1, {'a': 1}], [2, {'a': 2}], OPTIONS).to_deepdiff_view()]
+
+
+class TestPartitionedCompare3Way:
+
+    @pytest.mark.parametrize("strategy", ["report", "keep_yours", "keep_theirs"])
+    def test_same_merge_result(self, strategy):
+        base, yours, theirs = (json.dumps(config) for config in make_merge_inputs(40, random.Random(9), 30))
+        engine = SemanticDiffEngine()
+        options = {'conflict_strategy': strategy}
+        sequential = engine.compare_3way(base, yours, theirs, 'json', options)
+        partitioned = engine.compare_3way(base, yours, theirs, 'json',
+                                          dict(options, partitioned=True, max_workers=2))
+        assert sequential.success and sequential.conflict_count > 0
+        assert asdict(partitioned) == asdict(sequential)
+
+
+def benchmark(megabytes, rng, worker_counts):
+    base, yours, theirs = make_merge_inputs(megabytes * 1370, rng, 500)
+    texts = [json.dumps(config, indent=2) for config in (base, yours, theirs)]
+    engine = SemanticDiffEngine()
+    runs = [("sequential", {})] + [(f"{workers} workers", {'partitioned': True, 'max_workers': workers})
+                                   for workers in worker_counts]
+    timings = {}
+    for label, options in runs:
+        start = time.perf_counter()
+        result = engine.compare_3way(*texts, 'json', dict(options, conflict_strategy='keep_yours'))
+        timings[label] = time.perf_counter() - start
+        assert result.success
+    return len(texts[0]) / 1_000_000, timings, result.auto_merged_count
+
+
+@pytest.mark.slow
+class TestPartitionedMergeBenchmark:
+
+    def test_5mb(self):
+        _, timings, _ = benchmark(5, random.Random(0), [2])
+        assert timings["2 workers"] < 60
+
+
+def main():
+    worker_counts = sorted({2, os.cpu_count() or 1})
+    size, timings, merged = benchmark(50, random.Random(0), worker_counts)
+    print(f"3-way merge of {size:.1f} MB configs ({merged:,} merged changes, {os.cpu_count()} CPUs)")
+    for label, seconds in timings.items():
+        print(f"  {label:>12}: {seconds:6.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+MCP integration tests for pomera_pipeline.
+
+Verifies that chained steps match the equivalent sequence of separate
+tool calls, that errors name the failing step, and that file I/O and
+per-step timings work.
+"""
+
+import json
+
+import pytest
+
+from core.mcp.tool_registry import get_registry
+
+
+def get_text(result):
+    """Extract text from an MCP result."""
+    return result.content[0].get("text", "")
+
+
+@pytest.fixture(scope="module")
+def tool_registry():
+    return get_registry()
+
+
+SAMPLE = "  banana \n apple\n\n banana\ncherry  \n"
+
+STEPS = [
+    {"tool": "pomera_whitespace", "arguments": {"operation": "trim"}},
+    {"tool": "pomera_line_tools", "arguments": {"operation": "remove_empty"}},
+    {"tool": "pomera_line_tools", "arguments": {"operation": "remove_duplicates"}},
+    {"tool": "pomera_sort", "arguments": {"sort_type": "alphabetical"}},
+]
+
+
+class TestPipelineRegistration:
+
+    def test_tool_listed(self, tool_registry):
+        names = {t.name for t in tool_registry.list_tools()}
+        assert "pomera_pipeline" in names
+
+    def test_registered_by_v2_text_module(self):
+        from core.mcp.tools import ToolRegistryV2
+        v2 = ToolRegistryV2(enabled_tools={"pomera_pipeline", "pomera_text_tools"})
+        result = v2.execute("pomera_pipeline", {
+            "text": "b\na",
+            "steps": [{"tool": "pomera_sort", "arguments": {"sort_type": "alphabetical"}}],
+        })
+        assert not result.isError
+        assert get_text(result) == "a\nb"
+
+
+class TestPipelineExecution:
+
+    def test_matches_sequential_calls(self, tool_registry):
+        text = SAMPLE
+        for step in STEPS:
+            args = dict(step["arguments"], text=text)
+            text = get_text(tool_registry.execute(step["tool"], args))
+
+        result = tool_registry.execute("pomera_pipeline", {"text": SAMPLE, "steps": STEPS})
+        assert not result.isError
+        assert get_text(result) == text
+
+    def test_consolidated_tool_names(self, tool_registry):
+        result = tool_registry.execute("pomera_pipeline", {
+            "text": "hello world",
+            "steps": [
+                {"tool": "pomera_text_tools", "arguments": {"action": "case", "mode": "upper"}},
+                {"tool": "pomera_text_tools", "arguments": {"action": "lines", "operation": "reverse"}},
+            ],
+        })
+        assert get_text(result) == "HELLO WORLD"
+
+    def test_include_timings(self, tool_registry):
+        result = tool_registry.execute("pomera_pipeline", {
+            "text": SAMPLE, "steps": STEPS, "include_timings": True,
+        })
+        data = json.loads(get_text(result))
+        assert [s["step"] for s in data["steps"]] == [1, 2, 3, 4]
+        assert all(s["ms"] >= 0 for s in data["steps"])
+        assert data["steps"][-1]["output_chars"] == len(data["result"])
+        assert data["total_ms"] >= 0
+
+    def test_file_input_and_output(self, tool_registry, tmp_path):
+        src = tmp_path / "in.txt"
+        dst = tmp_path / "out.txt"
+        src.write_text("b\na\n", encoding="utf-8")
+        result = tool_registry.execute("pomera_pipeline", {
+            "text": str(src), "text_is_file": True, "output_to_file": str(dst),
+            "steps": [{"tool": "pomera_sort", "arguments": {"sort_type": "alphabetical"}}],
+        })
+        assert not result.isError
+        assert dst.read_text(encoding="utf-8").split() == ["a", "b"]
+
+
+class TestPipelineErrors:
+
+    @pytest.mark.parametrize("steps,message", [
+        ([], "non-empty"),
+        ([{"arguments": {}}], "Step 1"),
+        ([{"tool": "pomera_nope"}], "Tool not found"),
+        ([{"tool": "pomera_notes", "arguments": {"action": "list"}}], "cannot be chained"),
+        ([{"tool": "pomera_pipeline", "arguments": {"steps": []}}], "cannot be nested"),
+        ([{"tool": "pomera_sort", "arguments": {"text": "x"}}], "managed by the pipeline"),
+    ])
+    def test_invalid_steps(self, tool_registry, steps, message):
+        result = tool_registry.execute("pomera_pipeline", {"text": "x", "steps": steps})
+        assert message in get_text(result)
+
+    def test_too_many_steps(self, tool_registry):
+        steps = [{"tool": "pomera_sort", "arguments": {"sort_type": "alphabetical"}}] * 51
+        result = tool_registry.execute("pomera_pipeline", {"text": "x", "steps": steps})
+        assert "maximum" in get_text(result)
+
+    def test_cancelled_request_stops_between_steps(self, tool_registry, monkeypatch):
+        import threading
+        from core.mcp import server_stdio
+        cancel_event = threading.Event()
+        cancel_event.set()
+        monkeypatch.setattr(server_stdio._request_context, "cancel_event", cancel_event, raising=False)
+        result = tool_registry.execute("pomera_pipeline", {"text": SAMPLE, "steps": STEPS})
+        assert "cancelled before step 1" in get_text(result)
+
+    def test_failing_step_stops_pipeline(self, tool_registry):
+        steps = [
+            {"tool": "pomera_line_tools", "arguments": {"operation": "bogus"}},
+            {"tool": "pomera_case_transform", "arguments": {"mode": "upper"}},
+        ]
+        result = tool_registry.execute("pomera_pipeline", {"text": "a\nb\n", "steps": steps})
+        assert result.isError
+        assert get_text(result).startswith("Step 1 (pomera_line_tools) failed: Unknown operation: bogus")
+
+    def test_error_text_in_input_is_not_a_failure(self, tool_registry):
+        steps = [{"tool": "pomera_line_tools", "arguments": {"operation": "remove_empty"}}]
+        result = tool_registry.execute("pomera_pipeline", {"text": "Error: disk full\n\nok\n", "steps": steps})
+        assert not result.isError
+        assert get_text(result).startswith("Error: disk full")
@@ -0,0 +1,189 @@
+"""
+Tests for compact find/replace rollback records (core.mcp.rollback_store):
+texts are stored once per content hash, replacement results are stored as
+edits against their original, and recall rebuilds either text on demand.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import core.mcp.rollback_store as rollback_store
+from core.mcp.find_replace_diff import FindReplaceOperation, execute_replace, recall_operation
+from core.mcp.rollback_store import RollbackStore, apply_edits, decode_edits, encode_edits
+from core.mcp.tool_registry import get_registry
+
+
+@pytest.fixture
+def notes_db(tmp_path):
+    db_path = str(tmp_path / "notes.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            Created TEXT, Modified TEXT, Title TEXT, Input TEXT, Output TEXT
+        )
+    ''')
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def store(notes_db):
+    return RollbackStore(lambda: sqlite3.connect(notes_db))
+
+
+def make_notes(notes_db):
+    """notes_handler and notes_getter over the test database."""
+    def save(title, input_content, output_content):
+        conn = sqlite3.connect(notes_db)
+        cursor = conn.execute('INSERT INTO notes (Title, Input, Output) VALUES (?, ?, ?)',
+                              (title, input_content, output_content))
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    def get(note_id):
+        conn = sqlite3.connect(notes_db)
+        row = conn.execute('SELECT id, Title, Input, Output FROM notes WHERE id = ?', (note_id,)).fetchone()
+        conn.close()
+        return row and {'id': row[0], 'title': row[1], 'input_content': row[2], 'output_content': row[3]}
+
+    return save, get
+
+
+def blob_rows(notes_db):
+    conn = sqlite3.connect(notes_db)
+    rows = conn.execute('SELECT hash, kind, depth, length(data) FROM find_replace_blobs').fetchall()
+    conn.close()
+    return rows
+
+
+def edits_for(text, find, replace):
+    return [(m.start(), m.end(), m.expand(replace)) for m in re.finditer(find, text)]
+
+
+def make_log(lines):
+    return "\n".join(f"2024-05-01 worker-{i % 50} status=ok request={i * 7919 % 100003}" for i in range(lines))
+
+
+class TestEdits:
+
+    def test_round_trip(self):
+        base = "one two three two"
+        for edits in ([], [(4, 7, "2")], [(0, 3, "1"), (4, 7, "2"), (14, 17, "")]):
+            data = encode_edits(edits)
+            assert decode_edits(data) == edits
+        assert apply_edits(base, [(4, 7, "2"), (14, 17, "deux")]) == "one 2 three deux"
+
+
+class TestRollbackStore:
+
+    def test_save_and_load(self, store, notes_db):
+        original = make_log(2_000)
+        modified = original.replace("status=ok", "status=OK")
+        hashes = store.save(original, edits_for(original, "status=ok", "status=OK"), modified)
+        fresh = RollbackStore(lambda: sqlite3.connect(notes_db))
+        assert fresh.load(hashes[0]) == original
+        assert fresh.load(hashes[1]) == modified
+        assert fresh.load("0" * 64) is None
+        kinds = sorted(kind for _, kind, _, _ in blob_rows(notes_db))
+        assert kinds == ["edits", "zlib"]
+
+    def test_repeated_and_chained_operations_share_storage(self, store, notes_db):
+        save, _ = make_notes(notes_db)
+        original = make_log(5_000)
+        for _ in range(3):
+            execute_replace(original, r"status=ok", "status=OK", notes_handler=save, rollback_store=store)
+        assert len(blob_rows(notes_db)) == 2
+
+        text = original
+        for worker in range(5):
+            text = execute_replace(text, rf"worker-{worker}\b", f"w{worker}", notes_handler=save,
+                                   rollback_store=store)["modified_text"]
+        rows = blob_rows(notes_db)
+        assert sum(kind == "zlib" for _, kind, _, _ in rows) == 1
+        stored = sum(size for _, _, _, size in rows)
+        assert stored < len(original) // 5
+
+    def test_edit_chains_are_bounded(self, store, notes_db, monkeypatch):
+        monkeypatch.setattr(rollback_store, "MAX_EDIT_CHAIN", 3)
+        text = make_log(500)
+        for i in range(8):
+            edits = edits_for(text, f"worker-{i}\\b", f"w{i}")
+            modified = apply_edits(text, edits)
+            store.save(text, edits, modified)
+            text = modified
+        assert max(depth for _, _, depth, _ in blob_rows(notes_db)) <= 3
+        assert RollbackStore(lambda: sqlite3.connect(notes_db)).load(
+            rollback_store.text_hash(text)) == text
+
+    def test_deleted_notes_are_pruned(self, store, notes_db, monkeypatch):
+        monkeypatch.setattr(rollback_store, "PRUNE_GRACE_SECONDS", -1)
+        save, _ = make_notes(notes_db)
+        first = execute_replace(make_log(100), "ok", "OK", notes_handler=save, rollback_store=store)
+        execute_replace(make_log(200), "ok", "OK", notes_handler=save, rollback_store=store)
+        assert len(blob_rows(notes_db)) == 4
+
+        conn = sqlite3.connect(notes_db)
+        conn.execute('DELETE FROM notes WHERE id = ?', (first["note_id"],))
+        conn.commit()
+        conn.close()
+        execute_replace(make_log(300), "ok", "OK", notes_handler=save, rollback_store=store)
+        assert len(blob_rows(notes_db)) == 4
+
+
+class TestRecall:
+
+    def test_compact_record(self, store, notes_db):
+        save, get = make_notes(notes_db)
+        original = make_log(20_000)
+        result = execute_replace(original, r"worker-(\d+)", r"w\1", ['i'], notes_handler=save, rollback_store=store)
+        note = get(result["note_id"])
+        assert len(note['input_content']) + len(note['output_content']) < 1_000
+
+        recalled = recall_operation(result["note_id"], get, store)
+        assert recalled["success"]
+        assert recalled["original_text"] == original
+        assert recalled["modified_text"] == result["modified_text"]
+        assert recalled["flags"] == ['i'] and recalled["match_count"] == 20_000
+
+        only_original = recall_operation(result["note_id"], get, RollbackStore(lambda: sqlite3.connect(notes_db)),
+                                         texts="original")
+        assert only_original["original_text"] == original and "modified_text" not in only_original
+        assert recall_operation(result["note_id"], get)["success"] is False
+
+    def test_legacy_record(self, notes_db):
+        save, get = make_notes(notes_db)
+        result = execute_replace("a1 b2", r"\d", "#", notes_handler=save)
+        assert json.loads(get(result["note_id"])['output_content'])["original_text"] == "a1 b2"
+        recalled = recall_operation(result["note_id"], get, texts="modified")
+        assert recalled["modified_text"] == "a# b#" and "original_text" not in recalled
+        assert FindReplaceOperation.from_json(get(result["note_id"])['output_content']).match_count == 2
+
+
+class TestFindReplaceTool:
+
+    def test_execute_and_recall(self, notes_db, monkeypatch):
+        registry = get_registry()
+        monkeypatch.setattr(type(registry), '_get_notes_db_path', lambda self: notes_db)
+        monkeypatch.setattr(registry, '_rollback_store', None)
+        text = make_log(1_000)
+        executed = json.loads(registry.execute('pomera_find_replace_diff', {
+            'operation': 'execute', 'text': text, 'find_pattern': 'status=ok', 'replace_pattern': 'status=OK',
+        }).content[0]['text'])
+        assert executed["note_id"] > 0
+        recalled = json.loads(registry.execute('pomera_find_replace_diff', {
+            'operation': 'recall', 'note_id': executed["note_id"], 'recall_text': 'original',
+        }).content[0]['text'])
+        assert recalled["original_text"] == text
+        assert "modified_text" not in recalled
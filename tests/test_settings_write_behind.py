@@ -0,0 +1,147 @@
+"""
+Tests for write-behind settings persistence in DatabaseSettingsManager.
+
+Setting changes made through the settings proxies are staged as table
+rows, coalesced on a timer and flushed in one transaction; only rows whose
+value changed are written and only the changed subtrees are validated.
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+from core.database_settings_manager import DatabaseSettingsManager
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+
+    def make(write_delay=60.0):
+        manager = DatabaseSettingsManager(
+            db_path=str(tmp_path / "settings.db"),
+            backup_path=str(tmp_path / "settings_backup.db"),
+            enable_performance_monitoring=False,
+            enable_auto_backup=False,
+            write_delay=write_delay,
+        )
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+def db_rows(tmp_path, query, params=()):
+    conn = sqlite3.connect(str(tmp_path / "settings.db"))
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+
+class TestWriteBehind:
+
+    def test_changes_are_coalesced(self, make_manager, tmp_path):
+        manager = make_manager()
+        settings = manager.settings
+        settings.keys()  # load the proxy cache, as the app does at startup
+        settings["selected_tool"] = "Case Tool"
+        settings["selected_tool"] = "Sorter Tools"
+        settings["tool_settings"]["Case Tool"]["mode"] = "Upper"
+
+        assert manager.get_write_stats()["pending_rows"] == 2
+        assert db_rows(tmp_path, "SELECT value FROM core_settings WHERE key = 'selected_tool'") != \
+            [("Sorter Tools",)]
+
+        assert manager.flush_pending_writes()
+        stats = manager.get_write_stats()
+        assert stats["flushes"] == 1 and stats["rows_written"] == 2
+        assert db_rows(tmp_path, "SELECT value FROM core_settings WHERE key = 'selected_tool'") == \
+            [("Sorter Tools",)]
+        assert db_rows(tmp_path, "SELECT setting_value FROM tool_settings "
+                                 "WHERE tool_name = 'Case Tool' AND setting_path = 'mode'") == [("Upper",)]
+
+    def test_only_changed_tab_rows_are_written(self, make_manager, tmp_path):
+        manager = make_manager()
+        manager.settings["input_tabs"] = ["one"] * 7
+        manager.flush_pending_writes()
+        written = manager.get_write_stats()["rows_written"]
+
+        manager.settings["input_tabs"] = ["one"] * 6 + ["two"]
+        manager.flush_pending_writes()
+        stats = manager.get_write_stats()
+        assert stats["rows_written"] == written + 1
+        # 6 tab_content rows plus the 7 tab_content_refs rows
+        assert stats["rows_unchanged"] == 13
+        assert db_rows(tmp_path, "SELECT content FROM tab_content "
+                                 "WHERE tab_type = 'input' AND tab_index = 6") == [("two",)]
+
+    def test_reads_see_pending_changes(self, make_manager):
+        manager = make_manager()
+        manager.settings["debug_level"] = "DEBUG"
+        manager.set_tool_setting("Sorter Tools", "order", "descending")
+        assert manager.settings["debug_level"] == "DEBUG"
+        assert manager.get_setting("debug_level") == "DEBUG"
+        assert manager.get_tool_settings("Sorter Tools")["order"] == "descending"
+        assert manager.load_settings()["debug_level"] == "DEBUG"
+
+    def test_timer_flushes(self, make_manager, tmp_path):
+        manager = make_manager(write_delay=0.05)
+        manager.settings["export_path"] = "/tmp/exports"
+        deadline = time.time() + 5
+        while manager.get_write_stats()["pending_rows"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert db_rows(tmp_path, "SELECT value FROM core_settings WHERE key = 'export_path'") == \
+            [("/tmp/exports",)]
+
+    def test_close_flushes(self, make_manager, tmp_path):
+        manager = make_manager()
+        manager.settings["font_settings"]["text_font"]["size"] = 15
+        manager.close()
+        assert db_rows(tmp_path, "SELECT value FROM font_settings "
+                                 "WHERE font_type = 'text_font' AND property = 'size'") == [("15",)]
+
+    def test_nested_change_rewrites_containing_row(self, make_manager):
+        manager = make_manager()
+        manager.settings["window"] = {"width": 800, "height": 600}
+        manager.set_setting("window.width", 1024)
+        manager.flush_pending_writes()
+        assert manager.get_setting("window") == {"width": 1024, "height": 600}
+
+
+class TestSaveSettings:
+
+    def test_only_changed_subtrees_are_validated_and_written(self, make_manager, monkeypatch):
+        manager = make_manager()
+        settings = manager.load_settings()
+        settings["debug_level"] = "WARNING"
+        settings["tool_settings"]["Case Tool"] = {"mode": "Lower"}
+
+        validated = []
+        original = manager.data_validator.validate_settings_changes
+        monkeypatch.setattr(manager.data_validator, "validate_settings_changes",
+                            lambda changes: validated.append(changes) or original(changes))
+
+        assert manager.save_settings(settings)
+        assert validated == [{"debug_level": "WARNING",
+                              "tool_settings": {"Case Tool": {"mode": "Lower"}}}]
+        assert manager.get_write_stats()["rows_written"] == 2
+        assert manager.get_setting("debug_level") == "WARNING"
+        assert manager.get_tool_settings("Case Tool")["mode"] == "Lower"
+
+    def test_unchanged_save_writes_nothing(self, make_manager):
+        manager = make_manager()
+        assert manager.save_settings(manager.load_settings())
+        assert manager.get_write_stats()["rows_written"] == 0
+
+    def test_persists_across_managers(self, make_manager):
+        manager = make_manager()
+        manager.settings["selected_tool"] = "Line Tools"
+        manager.settings["output_tabs"] = ["out"] + [""] * 6
+        manager.close()
+        reopened = make_manager()
+        assert reopened.settings["selected_tool"] == "Line Tools"
+        assert reopened.settings["output_tabs"][0] == "out"
@@ -0,0 +1,254 @@
+"""
+Startup budget tests: pomera.py defers optional dependencies and tool modules
+to first use, and StartupProfiler.BUDGETS_MS bounds module import time and
+time-to-first-window.
+
+Imports are measured in a fresh interpreter so modules loaded by other tests
+do not hide regressions. The first-window check needs a display and is
+skipped without one.
+
+Run directly for the import timing report:
+
+    python tests/test_startup_budget.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import tkinter as tk
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.app_context import AppContext
+from tools.tool_loader import DeferredClass, ToolLoader, ToolSpec, module_available
+
+POMERA_PATH = os.path.join(PROJECT_ROOT, "pomera.py")
+
+# Packages that must only load when their feature is first used
+DEFERRED_PACKAGES = [
+    "reportlab", "docx", "numpy", "pyaudio", "huggingface_hub", "requests",
+    "openai", "anthropic", "google.generativeai", "deepdiff", "yaml",
+]
+
+# tools.* modules the main module may import up front
+EAGER_TOOL_MODULES = {"tools", "tools.tool_loader"}
+
+IMPORT_PROBE = r'''
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location("pomera_app", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+sys.modules["pomera_app"] = module
+spec.loader.exec_module(module)
+profiler = module._startup_profiler
+print(json.dumps({
+    "modules": sorted(sys.modules),
+    "import_ms": profiler.duration(profiler.IMPORTS_STAGE),
+    "violations": profiler.check_budget(),
+}))
+'''
+
+FIRST_WINDOW_PROBE = r'''
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location("pomera_app", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+sys.modules["pomera_app"] = module
+spec.loader.exec_module(module)
+app = module.PromeraAIApp()
+app.update()
+profiler = module._startup_profiler
+result = {
+    "modules": sorted(sys.modules),
+    "first_window_ms": profiler.duration(profiler.FIRST_WINDOW_STAGE),
+    "violations": profiler.check_budget(),
+}
+app.destroy()
+print("STARTUP_RESULT " + json.dumps(result))
+'''
+
+
+def display_available():
+    try:
+        root = tk.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def run_probe(probe, env=None):
+    completed = subprocess.run(
+        [sys.executable, "-c", probe, POMERA_PATH],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    line = [line for line in completed.stdout.splitlines() if line.startswith(("{", "STARTUP_RESULT "))][-1]
+    return json.loads(line.split(" ", 1)[1] if line.startswith("STARTUP_RESULT ") else line)
+
+
+def deferred_packages_loaded(modules):
+    return sorted(name for name in modules
+                  if any(name == package or name.startswith(package + ".") for package in DEFERRED_PACKAGES))
+
+
+def tool_modules_loaded(modules):
+    return sorted(name for name in modules
+                  if (name == "tools" or name.startswith("tools.")) and name not in EAGER_TOOL_MODULES)
+
+
+@pytest.fixture(scope="module")
+def import_probe():
+    # Best of two runs; the first may also be writing bytecode caches
+    runs = [run_probe(IMPORT_PROBE) for _ in range(2)]
+    return min(runs, key=lambda run: run["import_ms"])
+
+
+class TestDeferredImports:
+
+    def test_optional_dependencies_not_imported(self, import_probe):
+        assert deferred_packages_loaded(import_probe["modules"]) == []
+
+    def test_tool_modules_not_imported(self, import_probe):
+        assert tool_modules_loaded(import_probe["modules"]) == []
+
+    def test_import_budget(self, import_probe):
+        assert import_probe["violations"] == [], import_probe["violations"]
+
+
+class TestStartupProfiler:
+
+    @pytest.fixture
+    def profiler_class(self):
+        from importlib.util import module_from_spec, spec_from_file_location
+        spec = spec_from_file_location("pomera_budget_test", POMERA_PATH)
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.StartupProfiler
+
+    def test_check_budget(self, profiler_class):
+        profiler = profiler_class(start_time=0.0)
+        profiler.record("Module Imports", 0.0, 0.25)
+        profiler.record("Create Widgets", 1.0, 1.5)
+        assert profiler.check_budget({"Module Imports": 300}) == []
+        assert profiler.check_budget({"Module Imports": 200, "First Window": 100}) == [
+            "Module Imports: 250.0ms exceeds budget of 200ms"]
+        assert "OVER BUDGET" not in profiler.summary()
+
+        profiler.mark_first_window()
+        assert profiler.duration("First Window") > 0
+        assert profiler.order == ["Module Imports", "Create Widgets", "First Window"]
+
+    def test_summary_flags_stages_over_budget(self, profiler_class, capsys):
+        profiler = profiler_class(start_time=0.0)
+        profiler.record(profiler.IMPORTS_STAGE, 0.0, profiler.BUDGETS_MS[profiler.IMPORTS_STAGE] / 1000 + 1)
+        assert "OVER BUDGET" in profiler.summary()
+        assert len(profiler.check_budget()) == 1
+
+
+class TestLazyTools:
+    """_register_lazy_tool and __getattr__ on the app, without creating a window."""
+
+    @pytest.fixture
+    def app(self):
+        from importlib.util import module_from_spec, spec_from_file_location
+        spec = spec_from_file_location("pomera_lazy_test", POMERA_PATH)
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+        app = object.__new__(module.PromeraAIApp)
+        app._lazy_tools = {}
+        app._lazy_tools_lock = threading.RLock()
+        app.app_context = AppContext()
+        app.logger = module.logging.getLogger("test_startup_budget")
+        return app
+
+    def test_created_once_on_first_access(self, app):
+        created = []
+        app._register_lazy_tool("case_tool", lambda: created.append(1) or object(), "Case Tool")
+        assert created == [] and app.app_context.has("tool.case_tool")
+        first = app.case_tool
+        assert app.case_tool is first and app.app_context.get("tool.case_tool") is first
+        assert created == [1]
+        assert "case_tool" not in app._lazy_tools
+
+    def test_unavailable_tools_resolve_to_none(self, app):
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ImportError("missing dependency")
+
+        app._register_lazy_tool("html_extraction_tool", broken)
+        app._register_lazy_tool("mcp_manager", lambda: calls.append(1))
+        assert app.html_extraction_tool is None and app.mcp_manager is None
+        assert app.html_extraction_tool is None and app.mcp_manager is None
+        assert calls == [1, 1]
+
+    def test_without_app_context(self, app):
+        app.app_context = None
+        app._register_lazy_tool("line_tools", lambda: "line tools")
+        assert app.line_tools == "line tools"
+
+
+class TestToolLoaderWithoutImports:
+
+    def test_module_available(self):
+        assert module_available("tools.case_tool")
+        assert not module_available("tools.no_such_tool")
+        assert not module_available("no_such_package.module")
+
+    def test_listing_does_not_import(self, tmp_path, monkeypatch):
+        (tmp_path / "startup_probe_tool.py").write_text("class ProbeTool:\n    pass\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        loader = ToolLoader({
+            "Probe": ToolSpec(name="Probe", module_path="startup_probe_tool", class_name="ProbeTool"),
+            "Missing": ToolSpec(name="Missing", module_path="startup_missing_tool", class_name="Missing"),
+        })
+        assert loader.get_available_tools() == ["Probe"]
+        assert loader.search_tools("probe") and "startup_probe_tool" not in sys.modules
+        assert loader.create_instance("Probe") is not None
+        assert "startup_probe_tool" in sys.modules
+        sys.modules.pop("startup_probe_tool")
+
+    def test_deferred_class(self):
+        deferred = DeferredClass("fractions", "Fraction")
+        assert not deferred.is_loaded
+        assert deferred(1, 2) * 2 == 1
+        assert deferred.from_float(0.5) == deferred(1, 2)
+        assert deferred.is_loaded and "loaded" in repr(deferred)
+        with pytest.raises(ImportError):
+            DeferredClass("tools.no_such_tool", "Tool")()
+
+
+@pytest.mark.skipif(not display_available(), reason="Tkinter display not available")
+class TestFirstWindowBudget:
+
+    def test_first_window_within_budget(self, tmp_path):
+        env = dict(os.environ, HOME=str(tmp_path), APPDATA=str(tmp_path),
+                   XDG_CONFIG_HOME=str(tmp_path / "config"), XDG_DATA_HOME=str(tmp_path / "data"),
+                   POMERA_CONFIG_DIR=str(tmp_path / "config"))
+        result = run_probe(FIRST_WINDOW_PROBE, env=env)
+        assert result["first_window_ms"] > 0
+        assert result["violations"] == [], result["violations"]
+        assert deferred_packages_loaded(result["modules"]) == []
+
+
+def main():
+    runs = [run_probe(IMPORT_PROBE) for _ in range(3)]
+    best = min(runs, key=lambda run: run["import_ms"])
+    timings = ", ".join(f"{run['import_ms']:.1f}" for run in runs)
+    print(f"pomera.py module imports: best of 3 {best['import_ms']:.1f}ms (runs: {timings})")
+    print(f"  modules loaded: {len(best['modules'])}")
+    print(f"  deferred packages loaded: {deferred_packages_loaded(best['modules']) or 'none'}")
+    print(f"  tool modules loaded: {tool_modules_loaded(best['modules']) or 'none'}")
+    for violation in best["violations"]:
+        print(f"  OVER BUDGET {violation}")
+    return 1 if best["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
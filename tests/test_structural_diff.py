@@ -0,0 +1,209 @@
+"""
+Tests for the Merkle-hashed structural diff (core.structural_diff) used by
+SemanticDiffEngine.compare_2way. Its report must be identical to DeepDiff's,
+including path formats and ordering.
+
+Run directly for a benchmark against DeepDiff on 10 MB and 100 MB JSON:
+
+    python tests/test_structural_diff.py
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import pytest
+from deepdiff import DeepDiff
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.semantic_diff import SemanticDiffEngine
+from core.semantic_diff_operators import CaseInsensitiveStringOperator
+from core.structural_diff import StructuralDiff
+
+
+def diff_config(ignore_order=False, case_insensitive=False):
+    config = {'ignore_order': ignore_order, 'report_repetition': True, 'verbose_level': 2}
+    if case_insensitive:
+        config['custom_operators'] = [CaseInsensitiveStringOperator()]
+    return config
+
+
+def assert_same_as_deepdiff(t1, t2, ignore_order=False, case_insensitive=False):
+    config = diff_config(ignore_order, case_insensitive)
+    expected = DeepDiff(t1, t2, **config)
+    actual = StructuralDiff(t1, t2, config, case_insensitive=case_insensitive).to_deepdiff_view()
+    assert sorted(actual) == sorted(expected)
+    for report_type, entries in expected.items():
+        if isinstance(entries, dict):
+            assert list(actual[report_type].items()) == list(entries.items()), report_type
+        else:
+            assert list(actual[report_type]) == list(entries), report_type
+
+
+def random_leaf(rng):
+    return rng.choice(["a", "A", "b", "c'd", -1, 0, 1, 2, 1.0, 2.5, True, False, None])
+
+
+def random_tree(rng, depth):
+    if depth == 0 or rng.random() < 0.3:
+        return random_leaf(rng)
+    if rng.random() < 0.5:
+        return {rng.choice(["a", "b", "c", "d", 1, "c'd"]): random_tree(rng, depth - 1)
+                for _ in range(rng.randint(0, 5))}
+    return [random_tree(rng, depth - 1) for _ in range(rng.randint(0, 5))]
+
+
+def mutate(rng, tree):
+    if isinstance(tree, dict):
+        tree = {key: mutate(rng, value) if rng.random() < 0.4 else value
+                for key, value in tree.items() if rng.random() > 0.15}
+        if rng.random() < 0.2:
+            tree[rng.choice(["e", "a"])] = random_tree(rng, 2)
+        return tree
+    if isinstance(tree, list):
+        tree = [mutate(rng, item) if rng.random() < 0.4 else item for item in tree]
+        if rng.random() < 0.2:
+            tree.append(random_tree(rng, 2))
+        if rng.random() < 0.2:
+            rng.shuffle(tree)
+        return tree
+    return random_leaf(rng) if rng.random() < 0.5 else tree
+
+
+class TestMatchesDeepDiff:
+
+    @pytest.mark.parametrize("ignore_order", [False, True])
+    @pytest.mark.parametrize("case_insensitive", [False, True])
+    def test_random_documents(self, ignore_order, case_insensitive):
+        rng = random.Random(11)
+        for _ in range(400):
+            before = random_tree(rng, 4)
+            assert_same_as_deepdiff(before, mutate(rng, before), ignore_order, case_insensitive)
+
+    def test_type_changes(self):
+        assert_same_as_deepdiff({'a': 1, 'b': True, 'c': None, 'd': 1},
+                                {'a': 1.0, 'b': 1, 'c': 'x', 'd': [1]})
+
+    def test_mostly_different_dict_is_one_change(self):
+        assert_same_as_deepdiff({'x': {'a': 1, 'b': 2, 'c': 3, 'd': 4}},
+                                {'x': {'a': 1, 'e': 2, 'f': 3, 'g': 4}})
+
+    def test_key_paths(self):
+        assert_same_as_deepdiff({"it's": 1, 'k': {2: 'a'}, 'q"': 0}, {"it's": 2, 'k': {2: 'b'}, 'q"': 1})
+
+    def test_lists(self):
+        assert_same_as_deepdiff({'l': [1, 2, 3, 4]}, {'l': [1, 3, 4, 5]})
+        assert_same_as_deepdiff([{'a': 1}, {'b': 2}], [{'a': 2}])
+        assert_same_as_deepdiff([{'a': 1}, {'b': 2}], [{'b': 2}, {'a': 1}, {'c': 3}], ignore_order=True)
+
+    def test_nan_is_always_changed(self):
+        assert_same_as_deepdiff({'x': math.nan}, {'x': math.nan})
+
+    def test_reordered_keys_and_items_are_skipped(self):
+        before = {'a': [{'x': 1}, {'y': 2}], 'b': {'c': 1, 'd': 2}}
+        after = {'b': {'d': 2, 'c': 1}, 'a': [{'y': 2}, {'x': 1}]}
+        diff = StructuralDiff(before, after, diff_config(ignore_order=True))
+        assert diff.to_deepdiff_view() == {}
+        assert diff.stats['delegated'] == 0
+
+
+class TestCompare2Way:
+
+    def test_large_document_only_walks_changes(self):
+        before = make_document(2_000, random.Random(3))
+        after = json.loads(json.dumps(before))
+        after['services'][1234]['replicas'] += 1
+        after['services'][7]['env']['NEW'] = 'x'
+        del after['services'][500]['env']['VAR_1']
+
+        diff = StructuralDiff(before, after, diff_config())
+        assert [change[:2] for change in diff.iter_changes()] == [
+            ('dictionary_item_added', "root['services'][7]['env']['NEW']"),
+            ('dictionary_item_removed', "root['services'][500]['env']['VAR_1']"),
+            ('values_changed', "root['services'][1234]['replicas']"),
+        ]
+        assert diff.stats['delegated'] == 0
+        assert diff.stats['subtrees_skipped'] >= 2_000 - 3
+
+        result = SemanticDiffEngine().compare_2way(json.dumps(before), json.dumps(after), 'json')
+        assert result.success
+        assert result.summary == {'modified': 1, 'added': 1, 'removed': 1}
+        assert [change['path'] for change in result.changes] == [
+            'services[1234]replicas', 'services[7]env.NEW', 'services[500]env.VAR_1']
+
+
+def make_document(services, rng):
+    """A deployment-style config with nested dicts and lists."""
+    return {
+        'version': 3,
+        'services': [{
+            'id': i,
+            'name': f"svc-{i}",
+            'replicas': rng.randint(1, 9),
+            'env': {f"VAR_{j}": f"value-{i}-{j}-{rng.random():.6f}" for j in range(8)},
+            'ports': [8000 + i % 100, 9000],
+            'labels': {'team': rng.choice(['core', 'web', 'data']), 'tier': rng.choice(['a', 'b'])},
+        } for i in range(services)],
+    }
+
+
+def make_pair(megabytes, rng, changes=50):
+    # About 560 bytes of indented JSON per service
+    before = make_document(int(megabytes * 1_000_000 / 560), rng)
+    after = json.loads(json.dumps(before))
+    for _ in range(changes):
+        service = rng.choice(after['services'])
+        service['replicas'] += 1
+        service['env'][f"EXTRA_{rng.randrange(1000)}"] = 'x'
+    return before, after
+
+
+def benchmark(megabytes, rng, with_deepdiff):
+    before, after = make_pair(megabytes, rng)
+    config = diff_config()
+    start = time.perf_counter()
+    changes = len(list(StructuralDiff(before, after, config).iter_changes()))
+    structural_seconds = time.perf_counter() - start
+    deepdiff_seconds = None
+    if with_deepdiff:
+        start = time.perf_counter()
+        DeepDiff(before, after, **config)
+        deepdiff_seconds = time.perf_counter() - start
+    before_text, after_text = json.dumps(before, indent=2), json.dumps(after, indent=2)
+    start = time.perf_counter()
+    result = SemanticDiffEngine().compare_2way(before_text, after_text, 'json')
+    compare_seconds = time.perf_counter() - start
+    assert result.success
+    return len(before_text) / 1_000_000, structural_seconds, deepdiff_seconds, compare_seconds, changes
+
+
+@pytest.mark.slow
+class TestStructuralDiffBenchmark:
+
+    def test_10mb(self):
+        _, structural_seconds, _, compare_seconds, changes = benchmark(10, random.Random(0), with_deepdiff=False)
+        assert changes == 100
+        assert structural_seconds < 10
+        assert compare_seconds < 30
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'size':>8} {'structural':>11} {'deepdiff':>10} {'compare_2way':>13} {'changes':>8}")
+    for megabytes in (10, 100):
+        # DeepDiff is skipped at 100 MB to keep the benchmark short
+        size, structural_seconds, deepdiff_seconds, compare_seconds, changes = benchmark(
+            megabytes, rng, with_deepdiff=megabytes <= 10)
+        deepdiff_text = f"{deepdiff_seconds:9.2f}s" if deepdiff_seconds is not None else f"{'skipped':>10}"
+        print(f"{size:7.1f}M {structural_seconds:10.2f}s {deepdiff_text} {compare_seconds:12.2f}s {changes:>8,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
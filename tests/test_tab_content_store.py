@@ -0,0 +1,155 @@
+"""
+Tests for content-addressed tab storage (core.tab_content_store).
+
+Large tabs are stored as compressed blobs in tab_blobs, referenced from
+tab_content_refs; unchanged tabs write nothing and small edits are stored
+as deltas against the previous blob.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from core.database_settings_manager import DatabaseSettingsManager
+from core.tab_content_store import MAX_DELTA_CHAIN, TabContentStore, common_affixes
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+
+    def make():
+        manager = DatabaseSettingsManager(
+            db_path=str(tmp_path / "settings.db"),
+            backup_path=str(tmp_path / "settings_backup.db"),
+            enable_performance_monitoring=False,
+            enable_auto_backup=False,
+            write_delay=60.0,
+        )
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+def db_rows(tmp_path, query):
+    conn = sqlite3.connect(str(tmp_path / "settings.db"))
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+def large_text(size=200_000, seed=7):
+    rng = random.Random(seed)
+    return "".join(rng.choice("abcdefgh \n") for _ in range(size))
+
+
+def save_input_tabs(manager, first, *rest):
+    tabs = [first, *rest] + [""] * (7 - 1 - len(rest))
+    manager.settings["input_tabs"] = tabs
+    manager.flush_pending_writes()
+
+
+class TestBlobStorage:
+
+    def test_large_tab_round_trip(self, make_manager, tmp_path):
+        text = large_text()
+        manager = make_manager()
+        save_input_tabs(manager, text, "small")
+        manager.close()
+
+        assert db_rows(tmp_path, "SELECT content FROM tab_content "
+                                 "WHERE tab_type = 'input' AND tab_index = 0") == [("",)]
+        assert db_rows(tmp_path, "SELECT encoding, size FROM tab_blobs") == [("zlib", len(text))]
+
+        settings = make_manager().load_settings()
+        assert settings["input_tabs"][0] == text
+        assert settings["input_tabs"][1] == "small"
+
+    def test_small_tabs_stay_inline(self, make_manager, tmp_path):
+        save_input_tabs(make_manager(), "hello")
+        assert db_rows(tmp_path, "SELECT content FROM tab_content "
+                                 "WHERE tab_type = 'input' AND tab_index = 0") == [("hello",)]
+        assert db_rows(tmp_path, "SELECT COUNT(*) FROM tab_blobs") == [(0,)]
+
+    def test_unchanged_tab_writes_no_blob(self, make_manager):
+        text = large_text()
+        manager = make_manager()
+        save_input_tabs(manager, text)
+        save_input_tabs(manager, text)
+        stats = manager.migration_manager.tab_store.get_stats()
+        assert stats["full_blobs"] == 1
+        assert stats["unchanged"] >= 1
+        assert stats["delta_blobs"] == 0
+
+    def test_small_edit_is_stored_as_delta(self, make_manager, tmp_path):
+        text = large_text()
+        edited = text[:5000] + "inserted" + text[5000:]
+        manager = make_manager()
+        save_input_tabs(manager, text)
+        save_input_tabs(manager, edited)
+        manager.close()
+
+        rows = db_rows(tmp_path, "SELECT encoding, depth, length(data) FROM tab_blobs ORDER BY depth")
+        assert [(encoding, depth) for encoding, depth, _ in rows] == [("zlib", 0), ("delta", 1)]
+        assert rows[1][2] < 100
+
+        reopened = make_manager()
+        assert reopened.load_settings()["input_tabs"][0] == edited
+
+    def test_delta_chain_is_bounded(self, make_manager, tmp_path):
+        text = large_text()
+        manager = make_manager()
+        for i in range(MAX_DELTA_CHAIN + 2):
+            text = text + str(i)
+            save_input_tabs(manager, text)
+        manager.close()
+
+        assert max(depth for (depth,) in db_rows(tmp_path, "SELECT depth FROM tab_blobs")) \
+            < MAX_DELTA_CHAIN
+        assert make_manager().load_settings()["input_tabs"][0] == text
+
+    def test_rewritten_tab_prunes_old_blobs(self, make_manager, tmp_path):
+        manager = make_manager()
+        save_input_tabs(manager, large_text(seed=1))
+        save_input_tabs(manager, large_text(seed=2))
+        assert db_rows(tmp_path, "SELECT COUNT(*) FROM tab_blobs") == [(1,)]
+
+        save_input_tabs(manager, "now small")
+        assert db_rows(tmp_path, "SELECT COUNT(*) FROM tab_blobs") == [(0,)]
+        assert db_rows(tmp_path, "SELECT content_hash FROM tab_content_refs "
+                                 "WHERE tab_type = 'input' AND tab_index = 0") == [(None,)]
+        manager.close()
+        assert make_manager().load_settings()["input_tabs"][0] == "now small"
+
+
+class TestTabContentStore:
+
+    def test_tab_rows(self):
+        store = TabContentStore(threshold_chars=10)
+        content_row, ref_row, blob_row = store.tab_rows("output", 2, "x" * 20)
+        assert content_row == ("output", 2, "")
+        assert ref_row[2] == blob_row[0]
+        assert store.tab_rows("output", 2, "x" * 20)[2] is None
+
+    @pytest.mark.parametrize("old, new, expected", [
+        (b"", b"", (0, 0)),
+        (b"abc", b"abc", (3, 0)),
+        (b"abcdef", b"abXdef", (2, 3)),
+        (b"aaaa", b"aaaaaa", (4, 0)),
+        (b"abc", b"", (0, 0)),
+        (b"xbc", b"ybc", (0, 2)),
+    ])
+    def test_common_affixes(self, old, new, expected):
+        assert common_affixes(old, new) == expected
+
+    def test_common_affixes_across_blocks(self):
+        old = bytes(200_000)
+        new = old[:150_000] + b"\x01" + old[150_000:]
+        prefix, suffix = common_affixes(old, new)
+        assert prefix + suffix == len(old)
+        assert old[:prefix] + b"\x01" + old[len(old) - suffix:] == new
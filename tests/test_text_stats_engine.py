@@ -0,0 +1,235 @@
+"""
+Tests for core.text_stats_engine, the single-pass statistics scanner.
+
+The scanner must agree with the reference definitions (the regex passes
+the Text Statistics tool used to run) and must give the same result no
+matter how the text is chunked. Run this file directly for a throughput
+benchmark on 1, 10 and 100 MB inputs.
+"""
+
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.text_stats_engine import TextScanner, scan_text
+
+
+def reference_stats(text):
+    """The per-statistic regex passes the scanner replaces."""
+    words = re.findall(r'\b\w+\b', text.lower())
+    lines = text.splitlines()
+    return {
+        "words": len(words),
+        "lines": len(lines),
+        "non_empty_lines": len([line for line in lines if line.strip()]),
+        "sentences": len([s for s in re.split(r'[.!?]+', text) if s.strip()]),
+        "paragraphs": len([p for p in re.split(r'\n\s*\n', text) if p.strip()]),
+        "whitespace": sum(1 for c in text if c.isspace()),
+        "punctuation": sum(1 for c in text if unicodedata.category(c).startswith('P')),
+        "bytes": len(text.encode('utf-8')),
+        "frequencies": list(Counter(words).items()),
+    }
+
+
+def scanned_stats(result):
+    return {
+        "words": result.word_count,
+        "lines": result.line_count,
+        "non_empty_lines": result.non_empty_lines,
+        "sentences": result.sentence_count,
+        "paragraphs": result.paragraph_count,
+        "whitespace": result.whitespace_count,
+        "punctuation": result.punctuation_count,
+        "bytes": result.byte_count,
+        "frequencies": list(result.word_frequencies.items()),
+    }
+
+
+ALPHABET = ['a', 'B', 'cé', '_', '7', ' ', ' ', '\n', '\n', '\t', '.', '!', '?',
+            ',', '-', '«', '\r\n', '  \n', '\xa0', '\r', '\x0c', '\u2028']
+
+
+def random_texts(count, seed=1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 40)))
+
+
+class TestDefinitions:
+
+    @pytest.mark.parametrize("text", [
+        "Hello world. How are you? Fine!",
+        "Wait... what?! Really.",
+        "\n\nFirst para.\n\n\nSecond para\n  \nThird\n",
+        "trailing blank line\n   ",
+        "one\r\ntwo\r\n\r\nthree",
+        "a. . b",
+        "...",
+        "snake_case and naïve café",
+        "a\rb\rc",
+        "one\r\n\r\ntwo\r\n",
+        "x\u2028\u2028y\x0cz\x1c",
+        "\r\n  \rend.\r",
+    ])
+    def test_matches_reference(self, text):
+        assert scanned_stats(scan_text(text)) == reference_stats(text)
+
+    def test_random_texts_match_reference(self):
+        for text in random_texts(3000):
+            if text.strip():
+                assert scanned_stats(scan_text(text)) == reference_stats(text), repr(text)
+
+    def test_blank_text(self):
+        result = scan_text("  \n\t\n")
+        assert result.line_count == 2
+        assert result.non_empty_lines == 0
+        assert result.word_count == result.sentence_count == result.paragraph_count == 0
+        assert scan_text("").char_count == 0
+
+    def test_lines_split_like_splitlines(self):
+        for text, lines, non_empty in [
+            ("a\rb\rc", 3, 3),
+            ("a\r\nb\r\n", 2, 2),
+            ("a\r\rb\r", 3, 2),
+            ("a\u2028b\u2029\u2029c", 4, 3),
+            ("a\x0cb\x1c \x85c", 4, 3),
+        ]:
+            result = scan_text(text)
+            assert (result.line_count, result.non_empty_lines) == (lines, non_empty), repr(text)
+
+    def test_char_counts(self):
+        result = scan_text("héllo wörld\t!\r\n")
+        assert result.char_count == 15
+        assert result.byte_count == 17
+        assert result.char_count_no_spaces == 11
+
+    def test_top_words(self):
+        result = scan_text("The cat and the dog. The cat sat. A dog, a cat")
+        assert result.top_words(2) == [("cat", 3), ("dog", 2)]
+        assert result.top_words(1, exclude=()) == [("the", 3)]
+        assert result.unique_words == 6
+        assert result.avg_word_length == pytest.approx(32 / 12)
+
+
+class TestChunking:
+
+    def test_small_chunks_and_feeds(self):
+        rng = random.Random(5)
+        for text in random_texts(1000, seed=2):
+            expected = scanned_stats(scan_text(text))
+            assert scanned_stats(scan_text(text, chunk_chars=3)) == expected
+            scanner = TextScanner(chunk_chars=2)
+            step = rng.randint(1, 6)
+            for i in range(0, len(text), step):
+                scanner.feed(text[i:i + step])
+            assert scanned_stats(scanner.finish()) == expected, repr(text)
+
+    def test_text_without_whitespace(self):
+        text = "abc+def/" * 5000
+        scanner = TextScanner(chunk_chars=100)
+        for i in range(0, len(text), 999):
+            scanner.feed(text[i:i + 999])
+        result = scanner.finish()
+        assert result.word_count == 10000
+        assert scanner._pending == ''
+
+
+class TestCallers:
+
+    TEXT = "Alpha beta. Gamma delta!\n\nEpsilon beta?\nzeta"
+
+    def test_all_callers_agree(self):
+        from core.optimized_pattern_engine import OptimizedPatternEngine
+        from core.progressive_stats_calculator import ProgressiveStatsCalculator
+        from core.smart_stats_calculator import SmartStatsCalculator
+        from tools.text_statistics_tool import TextStatisticsProcessor
+
+        tool = TextStatisticsProcessor.analyze_text(self.TEXT)
+        structure = OptimizedPatternEngine().analyze_text_structure(self.TEXT)
+        progressive = ProgressiveStatsCalculator()._calculate_stats_fast(self.TEXT)
+        smart = SmartStatsCalculator()._calculate_stats_impl(self.TEXT, "hash")
+
+        expected = (7, 4, 4)
+        assert (tool["word_count"], tool["line_count"], tool["sentence_count"]) == expected
+        for stats in (structure, progressive, smart):
+            assert (stats.word_count, stats.line_count, stats.sentence_count) == expected
+        assert tool["paragraph_count"] == structure.paragraph_count == smart.paragraph_count == 2
+        assert tool["top_words"][0] == ("beta", 2)
+        assert smart.unique_words == tool["unique_words"] == 6
+
+    def test_progressive_chunks_match_fast_path(self):
+        from core.progressive_stats_calculator import ProgressiveStatsCalculator
+
+        text = (self.TEXT + " ") * 3000
+        calculator = ProgressiveStatsCalculator(chunk_size=997)
+        results = []
+        calculator.calculate_progressive(text, callback=results.append)
+        deadline = time.time() + 30
+        while not results and time.time() < deadline:
+            time.sleep(0.01)
+        fast = calculator._calculate_stats_fast(text)
+        assert results[0].chunk_processed
+        assert (results[0].word_count, results[0].sentence_count, results[0].line_count) == \
+            (fast.word_count, fast.sentence_count, fast.line_count)
+
+
+WORDS = ("the quick brown fox jumps over lazy dog lorem ipsum dolor sit amet "
+         "consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore").split()
+
+
+def make_text(size_mb, seed=1):
+    """Synthetic prose of roughly size_mb megabytes."""
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(2000):
+        sentences = [
+            ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 15))).capitalize()
+            + rng.choice('.!?')
+            for _ in range(rng.randint(2, 6))
+        ]
+        paragraphs.append(' '.join(sentences))
+    block = '\n\n'.join(paragraphs)
+    size = int(size_mb * 1024 * 1024)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def measure_throughput(size_mb):
+    """Return (MB/s, result) for scanning a size_mb input."""
+    text = make_text(size_mb)
+    start = time.perf_counter()
+    result = scan_text(text)
+    elapsed = time.perf_counter() - start
+    return size_mb / elapsed, result
+
+
+@pytest.mark.slow
+class TestThroughput:
+
+    @pytest.mark.parametrize("size_mb", [1, 10])
+    def test_throughput(self, size_mb):
+        mb_per_s, result = measure_throughput(size_mb)
+        assert result.word_count > 0
+        # Generous floor; typical throughput is above 10 MB/s
+        assert mb_per_s > 1.0
+
+
+def main():
+    for size_mb in (1, 10, 100):
+        mb_per_s, result = measure_throughput(size_mb)
+        print(f"{size_mb:>4} MB: {mb_per_s:6.1f} MB/s "
+              f"({result.word_count:,} words, {result.sentence_count:,} sentences)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
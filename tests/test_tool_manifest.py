@@ -0,0 +1,147 @@
+"""
+Tests for core.mcp.tool_manifest and lazy MCP server startup.
+
+Covers manifest freshness against the live registry, LazyToolRegistry
+behaviour before and after the real registry is built, stale-manifest
+fallback, and tools/list caching in ToolRegistry.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from core.mcp.tool_manifest import (
+    LazyToolRegistry, build_manifest, load_manifest, MANIFEST_PATH,
+)
+from core.mcp.tool_registry import ToolRegistry, MCPToolAdapter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def eager_registry():
+    return ToolRegistry()
+
+
+class TestManifest:
+
+    def test_committed_manifest_is_fresh(self, eager_registry):
+        manifest = load_manifest()
+        assert manifest is not None, (
+            "tool_manifest.json is stale; run: python -m core.mcp.tool_manifest"
+        )
+        assert manifest == build_manifest(eager_registry)
+
+    def test_stale_fingerprint_is_rejected(self, tmp_path):
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["fingerprint"] = "0" * 64
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps(manifest), encoding="utf-8")
+        assert load_manifest(str(path)) is None
+
+    def test_missing_manifest(self, tmp_path):
+        assert load_manifest(str(tmp_path / "missing.json")) is None
+
+
+class TestLazyToolRegistry:
+
+    def test_discovery_matches_eager_registry(self, eager_registry):
+        lazy = LazyToolRegistry()
+        assert not lazy.is_loaded
+        assert [t.to_dict() for t in lazy.list_tools()] == \
+            [t.to_dict() for t in eager_registry.list_tools()]
+        assert lazy.get_tool_names() == eager_registry.get_tool_names()
+        assert len(lazy) == len(eager_registry)
+        assert "pomera_text_tools" in lazy
+        assert "pomera_case_transform" in lazy  # legacy alias
+        assert "pomera_nope" not in lazy
+        assert not lazy.is_loaded
+
+    def test_execute_builds_registry_once(self):
+        lazy = LazyToolRegistry()
+        result = lazy.execute("pomera_case_transform", {"text": "abc", "mode": "upper"})
+        assert not result.isError
+        assert result.content[0]["text"] == "ABC"
+        assert lazy.is_loaded
+        real = lazy._registry
+        lazy.execute("pomera_text_tools", {"action": "case", "text": "x", "mode": "upper"})
+        assert lazy._registry is real
+
+    def test_enabled_tools_filter(self):
+        lazy = LazyToolRegistry(enabled_tools={"pomera_sort", "pomera_notes"})
+        assert sorted(lazy.get_tool_names()) == ["pomera_notes", "pomera_text_tools"]
+        assert "pomera_smart_diff" not in lazy
+        lazy.get_tool("pomera_notes")
+        assert sorted(lazy.get_tool_names()) == ["pomera_notes", "pomera_text_tools"]
+
+    def test_stale_manifest_loads_eagerly(self, tmp_path):
+        lazy = LazyToolRegistry(manifest_path=str(tmp_path / "missing.json"))
+        assert lazy.is_loaded
+        assert "pomera_text_tools" in lazy
+
+    def test_register_after_load(self):
+        lazy = LazyToolRegistry()
+        lazy.register(MCPToolAdapter(
+            name="custom_tool", description="Custom",
+            input_schema={"type": "object", "properties": {}},
+            handler=lambda args: "ok",
+        ))
+        assert "custom_tool" in lazy.get_tool_names()
+        assert lazy.execute("custom_tool", {}).content[0]["text"] == "ok"
+
+
+class TestToolListCache:
+
+    def test_list_tools_invalidated_on_change(self):
+        registry = ToolRegistry(register_builtins=False)
+        assert registry.list_tools() == []
+        registry.register(MCPToolAdapter(
+            name="a", description="A", input_schema={}, handler=lambda args: "",
+        ))
+        assert [t.name for t in registry.list_tools()] == ["a"]
+        registry.unregister("a")
+        assert registry.list_tools() == []
+
+    def test_cached_list_is_a_copy(self, eager_registry):
+        tools = eager_registry.list_tools()
+        tools.clear()
+        assert len(eager_registry.list_tools()) == len(eager_registry)
+
+
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from core.mcp.server_stdio import StdioMCPServer
+from core.mcp.tool_manifest import LazyToolRegistry
+server = StdioMCPServer(tool_registry=LazyToolRegistry())
+tools = server.registry.list_tools()
+elapsed = time.perf_counter() - start
+print(elapsed, len(tools), "core.mcp.tool_registry" in sys.modules, "tkinter" in sys.modules)
+"""
+
+
+@pytest.mark.slow
+class TestStartupBenchmark:
+
+    def test_lazy_startup_skips_tool_registry(self):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60, check=True,
+        ).stdout.split()
+        elapsed, count, registry_imported, tk_imported = output
+        assert int(count) >= 13
+        assert registry_imported == "False"
+        assert tk_imported == "False"
+        # Generous budget: the point is that handlers are not imported at all
+        assert float(elapsed) < 2.0
+
+    def test_first_call_after_lazy_start(self):
+        start = time.perf_counter()
+        lazy = LazyToolRegistry()
+        lazy.execute("pomera_text_tools", {"action": "case", "text": "a", "mode": "upper"})
+        assert time.perf_counter() - start < 5.0
@@ -0,0 +1,236 @@
+"""
+Tests for the prebuilt tool search index (core.tool_search_index) behind
+ToolLoader.search_tools and ToolSearchPalette._fuzzy_search: matches agree
+with a plain scan, extended queries reuse earlier matches, and the index is
+rebuilt only when the tool set changes.
+
+Run directly for a per-keystroke benchmark with 500 plugin tools registered:
+
+    python tests/test_tool_search_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import core.tool_search_index as tool_search_index
+from core.tool_search_index import RAPIDFUZZ_AVAILABLE, ToolSearchIndex, normalize
+from core.tool_search_widget import ToolSearchPalette
+from tools.tool_loader import TOOL_SPECS, ToolLoader, ToolSpec
+
+WORDS = ("text json csv merge lint format convert extract hash encode decode sort filter "
+         "regex url http yaml xml markdown table date time number color image log diff").split()
+
+TYPED_QUERIES = ["hash generator", "extract email", "json merge", "csae tool", "markdown table",
+                 "url", "timestamp", "line numbers"]
+
+
+def builtin_entries():
+    return [(name, spec.description, spec.aliases) for name, spec in TOOL_SPECS.items()]
+
+
+def plugin_entries(count, rng):
+    entries = []
+    for i in range(count):
+        first, second, third = rng.sample(WORDS, 3)
+        entries.append((f"{first.title()} {second.title()} Plugin {i}",
+                        f"{third} {first} helper for {second} files", []))
+    return entries
+
+
+def scan(entries, query, prefix):
+    """Reference: plain scan over names and aliases."""
+    query = normalize(query)
+    matches = []
+    for name, _, aliases in entries:
+        keys = [normalize(key) for key in [name] + list(aliases)]
+        if any(key.startswith(query) if prefix else query in key for key in keys):
+            matches.append(name)
+    return matches
+
+
+def keystroke(index, partial):
+    """What the palette asks the index for when the search box holds ``partial``."""
+    if len(partial) <= 2:
+        index.prefix_matches(partial) or index.name_matches(partial)
+    else:
+        index.search(partial, limit=15, score_cutoff=50)
+        index.name_matches(partial)
+        index.prefix_matches(partial)
+
+
+def type_query(index, query):
+    for end in range(1, len(query) + 1):
+        keystroke(index, query[:end])
+
+
+def palette_for(loader):
+    palette = object.__new__(ToolSearchPalette)
+    palette._tool_loader = loader
+    palette._search_index = None
+    palette._search_index_key = None
+    return palette
+
+
+class TestToolSearchIndex:
+
+    @pytest.fixture
+    def entries(self):
+        return builtin_entries() + plugin_entries(200, random.Random(1))
+
+    def test_prefix_and_name_matches_agree_with_scan(self, entries):
+        index = ToolSearchIndex(entries)
+        rng = random.Random(2)
+        queries = ["", "c", "ca", "case", "url", "Line", "tool", "  hash  gen", "zzz", "b64"]
+        queries += [name.lower()[rng.randrange(3):][:rng.randint(1, 8)] for name, _, _ in rng.sample(entries, 40)]
+        for query in queries:
+            assert index.prefix_matches(query) == scan(entries, query, prefix=True), query
+            assert index.name_matches(query) == scan(entries, query, prefix=False), query
+
+    def test_extended_queries_reuse_earlier_matches(self, entries):
+        typed, fresh = ToolSearchIndex(entries), ToolSearchIndex(entries)
+        for query in TYPED_QUERIES:
+            type_query(typed, query)
+        for query in TYPED_QUERIES:
+            for end in range(1, len(query) + 1):
+                partial = query[:end]
+                assert typed.name_matches(partial) == ToolSearchIndex(entries).name_matches(partial)
+                assert typed.prefix_matches(partial) == fresh.prefix_matches(partial)
+                assert typed.search(partial, 15, 50) == ToolSearchIndex(entries).search(partial, 15, 50)
+
+    @pytest.mark.skipif(not RAPIDFUZZ_AVAILABLE, reason="rapidfuzz not available")
+    def test_search_finds_best_match(self, entries):
+        from rapidfuzz import fuzz
+        index = ToolSearchIndex(entries)
+        for query in ["hash generator", "case", "email header", "timestamp", "markdown"]:
+            query = normalize(query)
+            # Name and description, or the aliases when those score higher
+            scores = [(max(fuzz.WRatio(query, normalize(f"{name} {description}")),
+                           fuzz.WRatio(query, " ".join(normalize(a) for a in aliases))), name)
+                      for name, description, aliases in entries]
+            best_score = max(score for score, _ in scores)
+            best_name = next(name for score, name in scores if score == best_score)
+            assert index.search(query, limit=1)[0] == (best_name, best_score), query
+        # No shared trigram: names are scored first
+        assert index.search("csae", limit=1)[0][0] == "Case Tool"
+
+    def test_substring_fallback(self, monkeypatch):
+        monkeypatch.setattr(tool_search_index, "RAPIDFUZZ_AVAILABLE", False)
+        index = ToolSearchIndex(builtin_entries())
+        assert index.search("case tool") == [("Case Tool", 100)]
+        assert index.search("hash")[0] == ("Hash Generator", 90)
+        assert ("Case Tool", 60) in index.search("uppercase")
+        assert index.search("nothing like this") == []
+
+    def test_aliases(self):
+        index = ToolSearchIndex(builtin_entries())
+        assert index.prefix_matches("epo") == ["Timestamp Converter"]
+        assert "Base64 Encoder/Decoder" in index.name_matches("b64")
+        assert index.search("checksum", limit=1)[0][0] == "Hash Generator"
+
+    @pytest.mark.skipif(not RAPIDFUZZ_AVAILABLE, reason="rapidfuzz not available")
+    def test_aliases_do_not_lower_description_scores(self):
+        index = ToolSearchIndex(builtin_entries())
+        # "b64" is scored apart from "Base64 Encoder/Decoder ..."
+        assert index.search("encode", limit=1)[0] == ("Base64 Encoder/Decoder", 90)
+        assert index.search("b64", limit=1)[0] == ("Base64 Encoder/Decoder", 100)
+
+
+class TestToolLoaderIndex:
+
+    def test_rebuilt_only_when_tools_change(self):
+        loader = ToolLoader()
+        index = loader.get_search_index()
+        loader.search_tools("case")
+        loader.get_grouped_tools()
+        assert loader.get_search_index() is index
+
+        loader.register_tool(ToolSpec(name="Zebra Formatter", module_path="tools.case_tool",
+                                      class_name="CaseTool", aliases=["stripes"]))
+        rebuilt = loader.get_search_index()
+        assert rebuilt is not index
+        assert loader.search_tools("stripes", limit=1)[0][0] == "Zebra Formatter"
+        assert "Zebra Formatter" in [name for name, _ in loader.get_grouped_tools()]
+
+        loader.unregister_tool("Zebra Formatter")
+        assert "Zebra Formatter" not in loader.get_search_index().names
+        assert "Zebra Formatter" not in [name for name, _ in loader.get_grouped_tools()]
+
+    def test_unavailable_tools(self):
+        loader = ToolLoader({
+            "Case Tool": TOOL_SPECS["Case Tool"],
+            "Missing Tool": ToolSpec(name="Missing Tool", module_path="tools.no_such_tool", class_name="Missing"),
+        })
+        assert [name for name, _, _ in loader.search_tools("tool")] == ["Case Tool"]
+        assert {name for name, _, _ in loader.search_tools("tool", include_unavailable=True)} == {
+            "Case Tool", "Missing Tool"}
+
+
+class TestPaletteSearch:
+
+    def test_palette_uses_loader_specs(self):
+        palette = palette_for(ToolLoader())
+        tools = [name for name, _ in palette._tool_loader.get_grouped_tools()]
+        assert palette._fuzzy_search(tools, "Ca") == ["Case Tool"]
+        assert palette._fuzzy_search(tools, "epoch")[0] == "Timestamp Converter"
+        assert palette._fuzzy_search(tools, "encode")[0] == "Base64 Encoder/Decoder"
+        assert palette._fuzzy_search(tools, "url")[:3] == ["URL Link Extractor", "URL Parser", "URL Reader"]
+
+        index = palette._search_index
+        palette._fuzzy_search(tools, "hash")
+        assert palette._search_index is index
+        palette._fuzzy_search(tools[:-1], "hash")
+        assert palette._search_index is not index
+
+    def test_without_loader(self):
+        palette = palette_for(None)
+        tools = ["Case Tool", "Hash Generator", "URL Parser", "Cron Tool"]
+        assert palette._fuzzy_search(tools, "") == tools
+        assert palette._fuzzy_search(tools, "c") == ["Case Tool", "Cron Tool"]
+        assert palette._fuzzy_search(tools, "se") == ["Case Tool", "URL Parser"]
+        assert "URL Parser" in palette._fuzzy_search(tools, "parser")
+
+
+def benchmark(plugins):
+    entries = builtin_entries() + plugin_entries(plugins, random.Random(0))
+    start = time.perf_counter()
+    index = ToolSearchIndex(entries)
+    build_ms = (time.perf_counter() - start) * 1000
+    keystrokes = []
+    for query in TYPED_QUERIES:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            keystroke(index, query[:end])
+            keystrokes.append((time.perf_counter() - start) * 1000)
+    keystrokes.sort()
+    return len(entries), build_ms, keystrokes
+
+
+@pytest.mark.slow
+class TestToolSearchBenchmark:
+
+    def test_keystrokes_with_500_plugins(self):
+        _, _, keystrokes = benchmark(500)
+        median = keystrokes[len(keystrokes) // 2]
+        assert median < 1.0, f"median keystroke {median:.2f}ms"
+
+
+def main():
+    for plugins in (0, 100, 500):
+        tools, build_ms, keystrokes = benchmark(plugins)
+        median = keystrokes[len(keystrokes) // 2]
+        p95 = keystrokes[int(len(keystrokes) * 0.95)]
+        print(f"{tools:>4} tools: index built in {build_ms:.1f}ms, per keystroke "
+              f"median {median:.3f}ms, p95 {p95:.3f}ms, max {keystrokes[-1]:.3f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
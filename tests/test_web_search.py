@@ -0,0 +1,207 @@
+"""
+Tests for multi-engine web search and the search result cache.
+
+Engines are pointed at a local stub HTTP server via SEARCH_ENDPOINTS, so
+no network access or real API keys are needed.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.mcp.web_search as web_search
+from core.mcp.tool_registry import ToolRegistry
+from core.mcp.web_search import (
+    SearchResultCache, fan_out, merge_results, normalize_url,
+)
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    """Answers tavily (POST), brave (GET) and serper (POST) style requests."""
+
+    def do_GET(self):
+        self._answer()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._answer()
+
+    def _answer(self):
+        engine = self.path.strip("/").split("?")[0]
+        server = self.server
+        server.hits[engine] = server.hits.get(engine, 0) + 1
+        time.sleep(server.delays.get(engine, 0))
+        if engine in server.failing:
+            self.send_response(500)
+            self.end_headers()
+            return
+        urls = server.urls[engine]
+        if engine == "tavily":
+            body = {"results": [{"title": u, "content": "", "url": u} for u in urls]}
+        elif engine == "brave":
+            body = {"web": {"results": [{"title": u, "description": "", "url": u} for u in urls]}}
+        else:
+            body = {"organic": [{"title": u, "snippet": "", "link": u} for u in urls]}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSearchHandler)
+    server.daemon_threads = True
+    server.hits = {}
+    server.delays = {}
+    server.failing = set()
+    server.urls = {
+        "tavily": ["https://example.com/a", "https://example.com/b"],
+        "brave": ["http://www.example.com/a/", "https://example.com/c"],
+        "serper": ["https://example.com/d?utm_source=x", "https://example.com/b#top"],
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    for engine in ("tavily", "brave", "serper"):
+        monkeypatch.setitem(web_search.SEARCH_ENDPOINTS, engine, f"{base}/{engine}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SearchResultCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(web_search, "_search_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ToolRegistry(register_builtins=False)
+    monkeypatch.setattr(registry, "_get_encrypted_web_search_api_key", lambda engine: "test-key")
+    return registry
+
+
+def search(registry, **args):
+    return json.loads(registry._handle_web_search(dict({"query": "pomera"}, **args)))
+
+
+class TestHelpers:
+
+    def test_normalize_url(self):
+        assert normalize_url("HTTP://WWW.Example.com:80/a/?utm_source=x&b=2&a=1#frag") == \
+            "https://example.com/a?a=1&b=2"
+        assert normalize_url("https://example.com:8443/") == "https://example.com:8443"
+
+    def test_merge_interleaves_and_dedupes(self):
+        merged = merge_results({
+            "one": [{"url": "https://a.com/"}, {"url": "https://b.com"}],
+            "two": [{"url": "http://www.a.com"}, {"url": "https://c.com"}, {"url": ""}],
+        }, count=10)
+        assert [r["url"] for r in merged] == ["https://a.com/", "https://b.com", "https://c.com"]
+        assert merged[0]["sources"] == ["one", "two"]
+
+    def test_fan_out_returns_at_quorum(self):
+        release = threading.Event()
+        late = []
+        outcome = fan_out({
+            "fast": lambda: [{"url": "https://a.com"}],
+            "slow": lambda: release.wait(5) and [{"url": "https://b.com"}],
+            "broken": lambda: 1 / 0,
+        }, quorum=1, timeout=5, on_result=lambda name, results: late.append(name))
+        assert list(outcome.results) == ["fast"]
+        assert "slow" in outcome.timed_out
+        release.set()
+        deadline = time.time() + 5
+        while "slow" not in late and time.time() < deadline:
+            time.sleep(0.01)
+        assert "slow" in late
+
+    def test_fan_out_timeout(self):
+        outcome = fan_out({"slow": lambda: time.sleep(1) or []}, quorum=1, timeout=0.1)
+        assert outcome.results == {}
+        assert outcome.timed_out == ["slow"]
+        assert outcome.elapsed_ms < 900
+
+
+class TestSearchResultCache:
+
+    def test_ttl_and_key(self, tmp_path):
+        cache = SearchResultCache(str(tmp_path / "c.db"), ttl_seconds=60)
+        cache.put("brave", "Some  Query", 5, [{"url": "u"}])
+        assert cache.get("brave", "some query", 5) == [{"url": "u"}]
+        assert cache.get("brave", "some query", 6) is None
+        assert cache.get("tavily:basic", "some query", 5) is None
+        cache.ttl_seconds = -1
+        assert cache.get("brave", "some query", 5) is None
+        assert cache.purge_expired() == 1
+        cache.close()
+
+
+class TestWebSearchTool:
+
+    def test_single_engine_is_cached(self, registry, stub_server, cache):
+        first = search(registry, engine="brave", count=2)
+        assert first["success"] and first["count"] == 2
+        second = search(registry, engine="brave", count=2)
+        assert second["cached"] is True
+        assert second["results"] == first["results"]
+        assert stub_server.hits == {"brave": 1}
+        search(registry, engine="brave", count=2, use_cache=False)
+        assert stub_server.hits == {"brave": 2}
+
+    def test_fan_out_merges_and_dedupes(self, registry, stub_server, cache):
+        result = search(registry, engines=["tavily", "brave", "serper"], quorum=3, count=10)
+        assert result["success"]
+        urls = [r["url"] for r in result["results"]]
+        assert urls == ["https://example.com/a", "https://example.com/d?utm_source=x",
+                        "https://example.com/b", "https://example.com/c"]
+        assert result["results"][0]["sources"] == ["tavily", "brave"]
+        assert {s["status"] for s in result["engine_status"].values()} == {"ok"}
+
+    def test_fan_out_quorum_skips_slow_engine(self, registry, stub_server, cache):
+        stub_server.delays["serper"] = 2
+        start = time.perf_counter()
+        result = search(registry, engines=["tavily", "brave", "serper"], quorum=2, timeout=5)
+        assert time.perf_counter() - start < 1.5
+        assert result["engine_status"]["serper"] == {"status": "incomplete"}
+        assert result["engine_status"]["tavily"]["status"] == "ok"
+
+    def test_fan_out_uses_cache_toward_quorum(self, registry, stub_server, cache):
+        search(registry, engines=["tavily", "brave"], quorum=2)
+        result = search(registry, engines=["tavily", "brave"], quorum=2)
+        assert {s["status"] for s in result["engine_status"].values()} == {"cached"}
+        assert stub_server.hits == {"tavily": 1, "brave": 1}
+
+    def test_fan_out_reports_errors(self, registry, stub_server, cache):
+        stub_server.failing.add("brave")
+        result = search(registry, engines=["tavily", "brave"], quorum=2)
+        assert result["success"]
+        assert result["engine_status"]["brave"]["status"] == "error"
+        assert "test-key" not in json.dumps(result)
+
+    def test_fan_out_validates_engines(self, registry):
+        result = search(registry, engines=["tavily", "bing"])
+        assert not result["success"]
+        assert "bing" in result["error"]
+
+    def test_missing_key_skips_engine(self, registry, stub_server, cache, monkeypatch):
+        monkeypatch.setattr(registry, "_get_encrypted_web_search_api_key",
+                            lambda engine: "" if engine == "serper" else "test-key")
+        result = search(registry, engines=["brave", "serper"], quorum=1)
+        assert result["engine_status"]["serper"]["status"] == "skipped"
+        single = search(registry, engine="serper")
+        assert single == {"success": False,
+                          "error": "Serper API key required. Configure in Web Search settings."}
@@ -24,7 +24,11 @@ import logging
 import subprocess
 import os
 import sys
-from typing import Dict, Any, List, Optional
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.diff_engine import LineMatcher
 
 # Import optimized components when available
 try:
@@ -76,6 +80,127 @@ class TextWithLineNumbers(tk.Frame):
             event.widget.edit_modified(False)
 
 
+# Index pairs passed to one Tcl "tag add/remove" call
+TAG_BATCH_PAIRS = 2000
+
+# Lines above and below the viewport that get word/char highlighting
+INLINE_HIGHLIGHT_MARGIN = 50
+
+
+@dataclass
+class DiffLayout:
+    """
+    Side-by-side rendering of a diff, computed without touching Tk.
+
+    Rows are 1-based text widget lines. Tag ranges are inclusive
+    (first_row, last_row) runs of consecutive rows.
+    """
+    left_rows: List[str] = field(default_factory=list)
+    right_rows: List[str] = field(default_factory=list)
+    left_tags: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+    right_tags: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+    diff_positions: List[Tuple[int, str]] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=lambda: {"additions": 0, "deletions": 0, "modifications": 0})
+    modified_rows: List[Tuple[int, str, str]] = field(default_factory=list)
+
+    @staticmethod
+    def _text(rows: List[str]) -> str:
+        return "\n".join(rows) + "\n" if rows else ""
+
+    @property
+    def left_text(self) -> str:
+        return self._text(self.left_rows)
+
+    @property
+    def right_text(self) -> str:
+        return self._text(self.right_rows)
+
+    def _add_row(self, left: str, right: str, tag: Optional[str] = None,
+                 left_tag: Optional[str] = None, right_tag: Optional[str] = None) -> int:
+        self.left_rows.append(left)
+        self.right_rows.append(right)
+        row = len(self.left_rows)
+        for tags, name in ((self.left_tags, left_tag or tag), (self.right_tags, right_tag or tag)):
+            if name is None:
+                continue
+            ranges = tags.setdefault(name, [])
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return row
+
+    def add_equal(self, left: str, right: str) -> None:
+        self._add_row(left, right)
+
+    def add_deletion(self, left: str) -> None:
+        row = self._add_row(left, "", left_tag='deletion')
+        self.diff_positions.append((row, 'deletion'))
+        self.counts["deletions"] += 1
+
+    def add_addition(self, right: str) -> None:
+        row = self._add_row("", right, right_tag='addition')
+        self.diff_positions.append((row, 'addition'))
+        self.counts["additions"] += 1
+
+    def add_modification(self, left: str, right: str) -> None:
+        row = self._add_row(left, right, tag='modification')
+        self.diff_positions.append((row, 'modification'))
+        self.counts["modifications"] += 1
+        self.modified_rows.append((row, left, right))
+
+
+def build_diff_layout(opcodes, left_raw: List[str], right_raw: List[str]) -> DiffLayout:
+    """
+    Lay out diff opcodes as aligned rows with the tags of each side.
+
+    Replaced blocks are paired line by line and padded with blank rows;
+    a pair with text on both sides is a modification.
+    """
+    layout = DiffLayout()
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                layout.add_equal(left_raw[i], right_raw[j])
+        elif tag == 'delete':
+            for i in range(i1, i2):
+                layout.add_deletion(left_raw[i])
+        elif tag == 'insert':
+            for j in range(j1, j2):
+                layout.add_addition(right_raw[j])
+        elif tag == 'replace':
+            input_block = left_raw[i1:i2]
+            output_block = right_raw[j1:j2]
+            # Pad blocks to same length
+            size = max(len(input_block), len(output_block))
+            input_block += [""] * (size - len(input_block))
+            output_block += [""] * (size - len(output_block))
+            for line1, line2 in zip(input_block, output_block):
+                if line1 and line2:
+                    layout.add_modification(line1, line2)
+                elif line1:
+                    layout.add_deletion(line1)
+                elif line2:
+                    layout.add_addition(line2)
+    return layout
+
+
+def _tag_line_ranges(widget, tag: str, ranges: List[Tuple[int, int]], remove: bool = False) -> None:
+    """Add or remove a tag on whole-line ranges with a few Tcl calls."""
+    indices = []
+    for first, last in ranges:
+        indices.append(f"{first}.0")
+        indices.append(f"{last + 1}.0")
+    _tag_indices(widget, tag, indices, remove)
+
+
+def _tag_indices(widget, tag: str, indices: List[str], remove: bool = False) -> None:
+    """Add or remove a tag on (start, end) index pairs, TAG_BATCH_PAIRS pairs per call."""
+    step = 2 * TAG_BATCH_PAIRS
+    for start in range(0, len(indices), step):
+        widget.tk.call(str(widget), "tag", "remove" if remove else "add", tag, *indices[start:start + step])
+
+
 class DiffViewerWidget:
     """
     A comprehensive diff viewer widget that provides side-by-side text comparison
@@ -124,6 +249,11 @@ class DiffViewerWidget:
         self.similarity_score = 0.0
         self.diff_summary_bar = None
         
+        # Modified rows still waiting for word/char highlighting ({row: (left, right)})
+        self._inline_pending = {}
+        self._inline_rows = []
+        self._inline_widgets = None
+        
         # Regex filter mode flags
         self.input_regex_mode = tk.BooleanVar(value=False)
         self.output_regex_mode = tk.BooleanVar(value=False)
@@ -405,6 +535,7 @@ class DiffViewerWidget:
             
             active_input_tab.text.yview(*args)
             active_output_tab.text.yview(*args)
+            self._highlight_visible_lines()
             
             # Update line numbers if available
             if hasattr(active_input_tab, '_on_text_modified'):
@@ -429,6 +560,7 @@ class DiffViewerWidget:
             
             active_input_tab.text.yview_scroll(delta, "units")
             active_output_tab.text.yview_scroll(delta, "units")
+            self._highlight_visible_lines()
             
             # Update line numbers if available
             if hasattr(active_input_tab, '_on_text_modified'):
@@ -445,6 +577,9 @@ class DiffViewerWidget:
         # Update tab labels when content changes
         self.update_tab_labels()
         
+        # Keyboard scrolling may have brought modified lines into view
+        self._highlight_visible_lines()
+        
         # Update statistics
         self.update_statistics()
         
@@ -727,25 +862,24 @@ class DiffViewerWidget:
         self.current_diff_index = -1
         self.diff_counts = {"additions": 0, "deletions": 0, "modifications": 0}
         self.similarity_score = 0.0
+        self._inline_pending = {}
+        self._inline_rows = []
+        self._inline_widgets = None
 
         # Handle empty texts
         if not input_text.strip() and not output_text.strip():
             self._update_diff_summary()
             return
         elif not input_text.strip():
-            for i, line in enumerate(output_text.splitlines()):
-                input_widget.insert(tk.END, '\n')
-                output_widget.insert(tk.END, line + '\n', 'addition')
-                self.diff_positions.append((i + 1, 'addition'))
-                self.diff_counts["additions"] += 1
+            right_raw = output_text.splitlines()
+            self._render_layout(input_widget, output_widget,
+                                build_diff_layout([('insert', 0, 0, 0, len(right_raw))], [], right_raw))
             self._update_diff_summary()
             return
         elif not output_text.strip():
-            for i, line in enumerate(input_text.splitlines()):
-                input_widget.insert(tk.END, line + '\n', 'deletion')
-                output_widget.insert(tk.END, '\n')
-                self.diff_positions.append((i + 1, 'deletion'))
-                self.diff_counts["deletions"] += 1
+            left_raw = input_text.splitlines()
+            self._render_layout(input_widget, output_widget,
+                                build_diff_layout([('delete', 0, len(left_raw), 0, 0)], left_raw, []))
             self._update_diff_summary()
             return
 
@@ -755,80 +889,24 @@ class DiffViewerWidget:
         left_cmp = [l["cmp"] for l in left_lines]
         right_cmp = [r["cmp"] for r in right_lines]
         
+        layout = None
         try:
-            matcher = difflib.SequenceMatcher(None, left_cmp, right_cmp, autojunk=False)
+            matcher = LineMatcher(left_cmp, right_cmp)
             
             # Compute similarity score
             self.similarity_score = matcher.ratio() * 100
             
-            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-                if tag == 'equal':
-                    for i in range(i1, i2):
-                        input_widget.insert(tk.END, left_lines[i]["raw"] + '\n')
-                        output_widget.insert(tk.END, right_lines[j1 + (i - i1)]["raw"] + '\n')
-                        
-                elif tag == 'delete':
-                    for i in range(i1, i2):
-                        input_widget.insert(tk.END, left_lines[i]["raw"] + '\n', 'deletion')
-                        output_widget.insert(tk.END, '\n')
-                        # Get line number AFTER inserting (current line minus 1 since cursor is on next line)
-                        actual_line = int(input_widget.index(tk.INSERT).split('.')[0]) - 1
-                        if actual_line < 1:
-                            actual_line = 1
-                        self.diff_positions.append((actual_line, 'deletion'))
-                        self.diff_counts["deletions"] += 1
-                        
-                elif tag == 'insert':
-                    for j in range(j1, j2):
-                        input_widget.insert(tk.END, '\n')
-                        output_widget.insert(tk.END, right_lines[j]["raw"] + '\n', 'addition')
-                        # Get line number AFTER inserting
-                        actual_line = int(input_widget.index(tk.INSERT).split('.')[0]) - 1
-                        if actual_line < 1:
-                            actual_line = 1
-                        self.diff_positions.append((actual_line, 'addition'))
-                        self.diff_counts["additions"] += 1
-                        
-                elif tag == 'replace':
-                    input_block = [l["raw"] for l in left_lines[i1:i2]]
-                    output_block = [r["raw"] for r in right_lines[j1:j2]]
-                    
-                    # Pad blocks to same length
-                    while len(input_block) < len(output_block): 
-                        input_block.append("")
-                    while len(output_block) < len(input_block): 
-                        output_block.append("")
-                    
-                    for line1, line2 in zip(input_block, output_block):
-                        if line1 and line2: 
-                            self._highlight_word_diffs(input_widget, [line1], output_widget, [line2])
-                            # Get line number AFTER inserting
-                            actual_line = int(input_widget.index(tk.INSERT).split('.')[0]) - 1
-                            if actual_line < 1:
-                                actual_line = 1
-                            self.diff_positions.append((actual_line, 'modification'))
-                            self.diff_counts["modifications"] += 1
-                        elif line1:
-                            input_widget.insert(tk.END, line1 + '\n', 'deletion')
-                            output_widget.insert(tk.END, '\n')
-                            actual_line = int(input_widget.index(tk.INSERT).split('.')[0]) - 1
-                            if actual_line < 1:
-                                actual_line = 1
-                            self.diff_positions.append((actual_line, 'deletion'))
-                            self.diff_counts["deletions"] += 1
-                        elif line2:
-                            input_widget.insert(tk.END, '\n')
-                            output_widget.insert(tk.END, line2 + '\n', 'addition')
-                            actual_line = int(input_widget.index(tk.INSERT).split('.')[0]) - 1
-                            if actual_line < 1:
-                                actual_line = 1
-                            self.diff_positions.append((actual_line, 'addition'))
-                            self.diff_counts["additions"] += 1
-                            
+            layout = build_diff_layout(matcher.get_opcodes(),
+                                       [l["raw"] for l in left_lines],
+                                       [r["raw"] for r in right_lines])
+            self._render_layout(input_widget, output_widget, layout)
         except Exception as e:
             self.logger.error(f"Error in diff computation: {e}")
+            input_widget.delete("1.0", tk.END)
+            output_widget.delete("1.0", tk.END)
             input_widget.insert(tk.END, input_text)
             output_widget.insert(tk.END, output_text)
+            layout = None
         
         # Reset scroll position
         input_widget.yview_moveto(0)
@@ -836,8 +914,8 @@ class DiffViewerWidget:
         self._setup_sync()
         
         # Detect moved lines if enabled
-        if self.settings.get("detect_moved", False):
-            self._detect_moved_lines(input_widget, output_widget)
+        if layout is not None and self.settings.get("detect_moved", False):
+            self._detect_moved_lines(input_widget, output_widget, layout)
         
         # Apply syntax highlighting if enabled
         if self.settings.get("syntax_highlight", False):
@@ -850,46 +928,92 @@ class DiffViewerWidget:
         # Update diff summary bar
         self._update_diff_summary()
     
-    def _detect_moved_lines(self, input_widget, output_widget):
+    def _render_layout(self, input_widget, output_widget, layout):
+        """
+        Insert both sides of a diff layout and apply its line tags in bulk.
+
+        Each side is inserted with a single call and each tag is applied with
+        a few multi-range "tag add" calls, so rendering costs a handful of Tcl
+        round-trips instead of several per line. Word/char highlighting of
+        modified lines is deferred to _highlight_visible_lines().
+        """
+        input_widget.insert("1.0", layout.left_text)
+        output_widget.insert("1.0", layout.right_text)
+        for tag, ranges in layout.left_tags.items():
+            _tag_line_ranges(input_widget, tag, ranges)
+        for tag, ranges in layout.right_tags.items():
+            _tag_line_ranges(output_widget, tag, ranges)
+
+        self.diff_positions = layout.diff_positions
+        self.diff_counts = dict(layout.counts)
+
+        self._inline_pending = {row: (line1, line2) for row, line1, line2 in layout.modified_rows}
+        self._inline_rows = [row for row, _, _ in layout.modified_rows]
+        self._inline_widgets = (input_widget, output_widget, len(layout.left_rows))
+        self._highlight_visible_lines()
+
+    def _highlight_visible_lines(self):
+        """Apply word/char highlighting to modified lines in or near the viewport."""
+        if not self._inline_pending or not self._inline_widgets:
+            return
+        input_widget, output_widget, row_count = self._inline_widgets
+        try:
+            # Skip if the text was edited or filtered since the diff was rendered
+            if int(input_widget.index("end-1c").split('.')[0]) != row_count + 1:
+                return
+            first = int(input_widget.index("@0,0").split('.')[0])
+            last = int(input_widget.index(f"@0,{input_widget.winfo_height()}").split('.')[0])
+        except (tk.TclError, ValueError):
+            return
+
+        lo = bisect_left(self._inline_rows, first - INLINE_HIGHLIGHT_MARGIN)
+        hi = bisect_right(self._inline_rows, last + INLINE_HIGHLIGHT_MARGIN)
+        deleted, added = [], []
+        for row in self._inline_rows[lo:hi]:
+            pair = self._inline_pending.pop(row, None)
+            if pair is not None:
+                self._highlight_word_diffs(row, pair[0], pair[1], deleted, added)
+        try:
+            _tag_indices(input_widget, 'inline_del', deleted)
+            _tag_indices(output_widget, 'inline_add', added)
+        except tk.TclError as e:
+            self.logger.error(f"Error applying inline diff highlighting: {e}")
+
+    def _detect_moved_lines(self, input_widget, output_widget, layout):
         """
         Detect lines that were moved (appear in both delete and insert sections).
         Re-tags them as 'moved' instead of deletion/addition.
         """
         try:
-            # Get all lines with deletion tag from input
+            # Deleted lines on the left and added lines on the right, by content
             deleted_lines = {}
-            for tag_range in input_widget.tag_ranges("deletion"):
-                if isinstance(tag_range, str):
-                    continue
-                # Get line number from index
-                line_num = int(str(tag_range).split('.')[0])
-                line_content = input_widget.get(f"{line_num}.0", f"{line_num}.end").strip()
-                if line_content:
-                    deleted_lines[line_content.lower()] = line_num
-            
-            # Get all lines with addition tag from output
+            for first, last in layout.left_tags.get('deletion', []):
+                for row in range(first, last + 1):
+                    line_content = layout.left_rows[row - 1].strip()
+                    if line_content:
+                        deleted_lines[line_content.lower()] = row
+
             added_lines = {}
-            for tag_range in output_widget.tag_ranges("addition"):
-                if isinstance(tag_range, str):
-                    continue
-                line_num = int(str(tag_range).split('.')[0])
-                line_content = output_widget.get(f"{line_num}.0", f"{line_num}.end").strip()
-                if line_content:
-                    added_lines[line_content.lower()] = line_num
-            
+            for first, last in layout.right_tags.get('addition', []):
+                for row in range(first, last + 1):
+                    line_content = layout.right_rows[row - 1].strip()
+                    if line_content:
+                        added_lines[line_content.lower()] = row
+
             # Find lines that appear in both (moved lines)
-            moved_count = 0
+            input_moved = []
+            output_moved = []
             for content, input_line in deleted_lines.items():
                 if content in added_lines:
-                    output_line = added_lines[content]
-                    # Re-tag as moved in both widgets
-                    input_widget.tag_remove("deletion", f"{input_line}.0", f"{input_line}.end+1c")
-                    input_widget.tag_add("moved", f"{input_line}.0", f"{input_line}.end+1c")
-                    
-                    output_widget.tag_remove("addition", f"{output_line}.0", f"{output_line}.end+1c")
-                    output_widget.tag_add("moved", f"{output_line}.0", f"{output_line}.end+1c")
-                    
-                    moved_count += 1
+                    input_moved.append((input_line, input_line))
+                    output_moved.append((added_lines[content], added_lines[content]))
+
+            # Re-tag as moved in both widgets
+            _tag_line_ranges(input_widget, 'deletion', input_moved, remove=True)
+            _tag_line_ranges(input_widget, 'moved', input_moved)
+            _tag_line_ranges(output_widget, 'addition', output_moved, remove=True)
+            _tag_line_ranges(output_widget, 'moved', output_moved)
+            moved_count = len(input_moved)
             
             # Update counts
             if moved_count > 0:
@@ -960,69 +1084,65 @@ class DiffViewerWidget:
         except Exception as e:
             self.logger.error(f"Error applying syntax highlighting: {e}")
 
-    def _highlight_word_diffs(self, w1, lines1, w2, lines2):
+    def _highlight_word_diffs(self, row, line1, line2, deleted, added):
         """
-        Highlight word-level differences within a 'replace' block.
+        Collect word- or character-level differences of a modified row.
         
         Args:
-            w1: First text widget
-            lines1: Lines for first widget
-            w2: Second text widget  
-            lines2: Lines for second widget
+            row: Text widget line of the pair (same on both sides)
+            line1: Left line
+            line2: Right line
+            deleted: Receives index pairs to tag 'inline_del' on the left
+            added: Receives index pairs to tag 'inline_add' on the right
         """
         # Check if character-level diff is enabled
-        use_char_diff = self.settings.get("char_level_diff", False)
-        
-        for line1, line2 in zip(lines1, lines2):
-            w1.insert(tk.END, line1 + '\n', 'modification')
-            w2.insert(tk.END, line2 + '\n', 'modification')
-
-            line_start1 = w1.index(f"{w1.index(tk.INSERT)} -1 lines linestart")
-            line_start2 = w2.index(f"{w2.index(tk.INSERT)} -1 lines linestart")
-
-            if use_char_diff:
-                # Character-level diff
-                self._apply_char_diff(w1, line1, line_start1, w2, line2, line_start2)
-            else:
-                # Word-level diff
-                self._apply_word_diff(w1, line1, line_start1, w2, line2, line_start2)
+        if self.settings.get("char_level_diff", False):
+            spans1, spans2 = self._apply_char_diff(line1, line2)
+        else:
+            spans1, spans2 = self._apply_word_diff(line1, line2)
+        for start, end in spans1:
+            deleted.extend((f"{row}.{start}", f"{row}.{end}"))
+        for start, end in spans2:
+            added.extend((f"{row}.{start}", f"{row}.{end}"))
     
-    def _apply_word_diff(self, w1, line1, line_start1, w2, line2, line_start2):
-        """Apply word-level diff highlighting."""
+    def _apply_word_diff(self, line1, line2):
+        """Column spans of word-level differences on each side."""
+        spans1, spans2 = [], []
         try:
             words1 = re.split(r'(\s+)', line1)
             words2 = re.split(r'(\s+)', line2)
+            offsets1 = [0]
+            for word in words1:
+                offsets1.append(offsets1[-1] + len(word))
+            offsets2 = [0]
+            for word in words2:
+                offsets2.append(offsets2[-1] + len(word))
             
             matcher = difflib.SequenceMatcher(None, words1, words2)
 
             for tag, i1, i2, j1, j2 in matcher.get_opcodes():
                 if tag == 'delete' or tag == 'replace':
-                    start_char1 = len("".join(words1[:i1]))
-                    end_char1 = len("".join(words1[:i2]))
-                    w1.tag_add('inline_del', f"{line_start1}+{start_char1}c", f"{line_start1}+{end_char1}c")
+                    spans1.append((offsets1[i1], offsets1[i2]))
                 if tag == 'insert' or tag == 'replace':
-                    start_char2 = len("".join(words2[:j1]))
-                    end_char2 = len("".join(words2[:j2]))
-                    w2.tag_add('inline_add', f"{line_start2}+{start_char2}c", f"{line_start2}+{end_char2}c")
+                    spans2.append((offsets2[j1], offsets2[j2]))
         except Exception as e:
             self.logger.error(f"Error in word-level diff highlighting: {e}")
+        return spans1, spans2
     
-    def _apply_char_diff(self, w1, line1, line_start1, w2, line2, line_start2):
-        """Apply character-level diff highlighting."""
+    def _apply_char_diff(self, line1, line2):
+        """Column spans of character-level differences on each side."""
+        spans1, spans2 = [], []
         try:
-            # Split into individual characters
-            chars1 = list(line1)
-            chars2 = list(line2)
-            
-            matcher = difflib.SequenceMatcher(None, chars1, chars2)
+            matcher = difflib.SequenceMatcher(None, line1, line2)
 
             for tag, i1, i2, j1, j2 in matcher.get_opcodes():
                 if tag == 'delete' or tag == 'replace':
-                    w1.tag_add('inline_del', f"{line_start1}+{i1}c", f"{line_start1}+{i2}c")
+                    spans1.append((i1, i2))
                 if tag == 'insert' or tag == 'replace':
-                    w2.tag_add('inline_add', f"{line_start2}+{j1}c", f"{line_start2}+{j2}c")
+                    spans2.append((j1, j2))
         except Exception as e:
             self.logger.error(f"Error in character-level diff highlighting: {e}")
+        return spans1, spans2
 
     def clear_all_input_tabs(self):
         """Clear all input tabs."""
@@ -1221,6 +1341,7 @@ class DiffViewerWidget:
             # Scroll to make the line visible (centered if possible)
             input_widget.see(line_index)
             output_widget.see(line_index)
+            self._highlight_visible_lines()
             
             # Force update of line numbers if available
             if hasattr(active_input_tab, '_on_text_modified'):
@@ -17,6 +17,7 @@ import tkinter as tk
 from tkinter import ttk
 import random
 import re
+import hashlib
 
 
 class LineToolsProcessor:
@@ -28,13 +29,7 @@ class LineToolsProcessor:
         lines = text.splitlines()
         
         if mode == "keep_first":
-            seen = set()
-            result = []
-            for line in lines:
-                key = line if case_sensitive else line.lower()
-                if key not in seen:
-                    seen.add(key)
-                    result.append(line)
+            result = LineToolsProcessor.iter_remove_duplicates(lines, case_sensitive)
         else:  # keep_last
             seen = {}
             for i, line in enumerate(lines):
@@ -44,38 +39,54 @@ class LineToolsProcessor:
         
         return '\n'.join(result)
     
+    @staticmethod
+    def iter_remove_duplicates(lines, case_sensitive=True, hash_keys=False):
+        """
+        Yield lines not seen before (keep_first semantics).
+        
+        With hash_keys, only a 16-byte digest of each distinct line is
+        remembered, which keeps memory small when streaming large files.
+        """
+        seen = set()
+        for line in lines:
+            key = line if case_sensitive else line.lower()
+            if hash_keys:
+                key = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            if key not in seen:
+                seen.add(key)
+                yield line
+    
     @staticmethod
     def remove_empty_lines(text, preserve_single=False):
         """Remove empty or whitespace-only lines."""
-        lines = text.splitlines()
-        
-        if preserve_single:
-            result = []
-            prev_empty = False
-            for line in lines:
-                is_empty = not line.strip()
-                if is_empty:
-                    if not prev_empty:
-                        result.append('')
-                    prev_empty = True
-                else:
-                    result.append(line)
-                    prev_empty = False
-        else:
-            result = [line for line in lines if line.strip()]
-        
-        return '\n'.join(result)
+        return '\n'.join(LineToolsProcessor.iter_remove_empty_lines(text.splitlines(), preserve_single))
+    
+    @staticmethod
+    def iter_remove_empty_lines(lines, preserve_single=False):
+        """Yield non-empty lines, optionally collapsing blank runs to one empty line."""
+        prev_empty = False
+        for line in lines:
+            is_empty = not line.strip()
+            if not is_empty:
+                yield line
+            elif preserve_single and not prev_empty:
+                yield ''
+            prev_empty = is_empty
     
     @staticmethod
     def add_line_numbers(text, format_style="1. ", start_number=1, skip_empty=False):
         """Add line numbers to each line."""
-        lines = text.splitlines()
-        result = []
+        return '\n'.join(LineToolsProcessor.iter_add_line_numbers(
+            text.splitlines(), format_style, start_number, skip_empty))
+    
+    @staticmethod
+    def iter_add_line_numbers(lines, format_style="1. ", start_number=1, skip_empty=False):
+        """Yield lines prefixed with consecutive numbers."""
         num = start_number
         
         for line in lines:
             if skip_empty and not line.strip():
-                result.append(line)
+                yield line
             else:
                 if format_style == "1. ":
                     prefix = f"{num}. "
@@ -87,22 +98,20 @@ class LineToolsProcessor:
                     prefix = f"{num}: "
                 else:
                     prefix = f"{num}. "
-                result.append(f"{prefix}{line}")
+                yield f"{prefix}{line}"
                 num += 1
-        
-        return '\n'.join(result)
     
     @staticmethod
     def remove_line_numbers(text):
         """Remove line numbers from the beginning of each line."""
-        lines = text.splitlines()
-        result = []
-        pattern = r'^(\d+[\.\)\:]?\s*|\[\d+\]\s*)'
-        
+        return '\n'.join(LineToolsProcessor.iter_remove_line_numbers(text.splitlines()))
+    
+    @staticmethod
+    def iter_remove_line_numbers(lines):
+        """Yield lines with leading line numbers stripped."""
+        pattern = re.compile(r'^(\d+[\.\)\:]?\s*|\[\d+\]\s*)')
         for line in lines:
-            result.append(re.sub(pattern, '', line))
-        
-        return '\n'.join(result)
+            yield pattern.sub('', line)
     
     @staticmethod
     def reverse_lines(text):
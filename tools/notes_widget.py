@@ -90,22 +90,14 @@ class NotesWidget:
     
     @contextmanager
     def get_db_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Provide a managed database connection."""
-        conn = None
+        """Provide a managed database connection from the shared notes pool."""
+        from core.notes_storage import get_notes_pool
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10.0)
-            conn.row_factory = sqlite3.Row
-            conn.execute('PRAGMA foreign_keys = ON')
-            conn.execute('PRAGMA journal_mode=WAL')
-            yield conn
+            with get_notes_pool(self.db_path).connection() as conn:
+                yield conn
         except Exception as e:
             self.logger.error(f"Database connection error: {e}")
-            if conn:
-                conn.rollback()
             raise
-        finally:
-            if conn:
-                conn.close()
     
     def _sanitize_text(self, text: str) -> str:
         """
@@ -18,8 +18,8 @@ Features:
 
 import tkinter as tk
 from tkinter import ttk
-import re
-from collections import Counter
+
+from core.text_stats_engine import scan_text
 
 
 class TextStatisticsProcessor:
@@ -42,62 +42,24 @@ class TextStatisticsProcessor:
                 "top_words": []
             }
         
-        # Character counts
-        char_count = len(text)
-        char_count_no_spaces = len(text.replace(' ', '').replace('\t', '').replace('\n', '').replace('\r', ''))
-        
-        # Word count
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_count = len(words)
-        
-        # Line count
-        lines = text.splitlines()
-        line_count = len(lines)
-        non_empty_lines = len([l for l in lines if l.strip()])
-        
-        # Sentence count (approximate)
-        sentences = re.split(r'[.!?]+', text)
-        sentence_count = len([s for s in sentences if s.strip()])
-        
-        # Paragraph count
-        paragraphs = re.split(r'\n\s*\n', text)
-        paragraph_count = len([p for p in paragraphs if p.strip()])
-        
-        # Average word length
-        if words:
-            avg_word_length = sum(len(w) for w in words) / len(words)
-        else:
-            avg_word_length = 0
+        stats = scan_text(text)
+        word_count = stats.word_count
         
         # Reading time
         reading_time_seconds = (word_count / words_per_minute) * 60 if words_per_minute > 0 else 0
         
-        # Unique words
-        unique_words = len(set(words))
-        
-        # Top words (excluding common stop words)
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                      'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
-                      'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-                      'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'it', 'its',
-                      'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'we', 'they'}
-        
-        filtered_words = [w for w in words if w not in stop_words and len(w) > 1]
-        word_freq = Counter(filtered_words)
-        top_words = word_freq.most_common(frequency_count)
-        
         return {
-            "char_count": char_count,
-            "char_count_no_spaces": char_count_no_spaces,
+            "char_count": stats.char_count,
+            "char_count_no_spaces": stats.char_count_no_spaces,
             "word_count": word_count,
-            "line_count": line_count,
-            "non_empty_lines": non_empty_lines,
-            "sentence_count": sentence_count,
-            "paragraph_count": paragraph_count,
-            "avg_word_length": round(avg_word_length, 2),
+            "line_count": stats.line_count,
+            "non_empty_lines": stats.non_empty_lines,
+            "sentence_count": stats.sentence_count,
+            "paragraph_count": stats.paragraph_count,
+            "avg_word_length": round(stats.avg_word_length, 2),
             "reading_time_seconds": round(reading_time_seconds),
-            "unique_words": unique_words,
-            "top_words": top_words
+            "unique_words": stats.unique_words,
+            "top_words": stats.top_words(frequency_count)
         }
     
     @staticmethod
@@ -258,13 +220,13 @@ class TextStatisticsWidget(ttk.Frame):
         if not input_text.strip():
             return
         
-        # Use the same word extraction logic as analyze_text
-        words = re.findall(r'\b\w+\b', input_text.lower())
-        if not words:
+        # Same scanner and word definition as analyze_text
+        stats = scan_text(input_text)
+        if not stats.word_count:
             result = "No words found."
         else:
-            word_counts = Counter(words)
-            total_words = len(words)
+            word_counts = stats.word_frequencies
+            total_words = stats.word_count
             
             report = []
             report.append("=" * 50)
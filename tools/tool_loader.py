@@ -8,20 +8,15 @@ Author: Pomera AI Commander Team
 """
 
 import importlib
+import importlib.util
 import logging
 import threading
 from typing import Dict, Any, Optional, Callable, Type, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
-# Optional rapidfuzz for fuzzy search
-try:
-    from rapidfuzz import fuzz, process
-    RAPIDFUZZ_AVAILABLE = True
-except ImportError:
-    fuzz = None
-    process = None
-    RAPIDFUZZ_AVAILABLE = False
+# Fuzzy search (rapidfuzz is optional; the index falls back to substring matching)
+from core.tool_search_index import RAPIDFUZZ_AVAILABLE, ToolSearchIndex
 
 
 logger = logging.getLogger(__name__)
@@ -55,6 +50,7 @@ class ToolSpec:
         description: Tool description for UI/help
         is_widget: True if the class is a full widget (not just a tool class)
         available_flag: Legacy flag name for backwards compatibility
+        aliases: Other names the tool is found by in search
     """
     name: str
     module_path: str
@@ -65,6 +61,7 @@ class ToolSpec:
     description: str = ""
     is_widget: bool = False
     available_flag: str = ""  # e.g., "CASE_TOOL_MODULE_AVAILABLE"
+    aliases: List[str] = field(default_factory=list)
 
 
 # Complete tool specifications registry
@@ -84,7 +81,8 @@ TOOL_SPECS: Dict[str, ToolSpec] = {
         class_name="FindReplaceWidget",
         category=ToolCategory.CORE,
         description="Find and replace text with regex support",
-        available_flag="FIND_REPLACE_MODULE_AVAILABLE"
+        available_flag="FIND_REPLACE_MODULE_AVAILABLE",
+        aliases=["search and replace", "substitute", "sed"]
     ),
     "Diff Viewer": ToolSpec(
         name="Diff Viewer",
@@ -172,7 +170,8 @@ TOOL_SPECS: Dict[str, ToolSpec] = {
         widget_class="Base64ToolsWidget",
         category=ToolCategory.CONVERSION,
         description="Encode and decode Base64",
-        available_flag="BASE64_TOOLS_MODULE_AVAILABLE"
+        available_flag="BASE64_TOOLS_MODULE_AVAILABLE",
+        aliases=["b64"]
     ),
     "JSON/XML Tool": ToolSpec(
         name="JSON/XML Tool",
@@ -188,7 +187,8 @@ TOOL_SPECS: Dict[str, ToolSpec] = {
         class_name="HashGenerator",
         category=ToolCategory.CONVERSION,
         description="Generate MD5, SHA1, SHA256 and other hashes",
-        available_flag="HASH_GENERATOR_MODULE_AVAILABLE"
+        available_flag="HASH_GENERATOR_MODULE_AVAILABLE",
+        aliases=["checksum", "digest"]
     ),
     "Number Base Converter": ToolSpec(
         name="Number Base Converter",
@@ -204,7 +204,8 @@ TOOL_SPECS: Dict[str, ToolSpec] = {
         class_name="TimestampConverter",
         category=ToolCategory.CONVERSION,
         description="Convert between timestamp formats",
-        available_flag="TIMESTAMP_CONVERTER_MODULE_AVAILABLE"
+        available_flag="TIMESTAMP_CONVERTER_MODULE_AVAILABLE",
+        aliases=["epoch", "unix time", "date"]
     ),
     "String Escape Tool": ToolSpec(
         name="String Escape Tool",
@@ -308,7 +309,8 @@ TOOL_SPECS: Dict[str, ToolSpec] = {
         class_name="TextStatistics",
         category=ToolCategory.ANALYSIS,
         description="Text stats, character/word/line counts, word frequency",
-        available_flag="TEXT_STATISTICS_MODULE_AVAILABLE"
+        available_flag="TEXT_STATISTICS_MODULE_AVAILABLE",
+        aliases=["word count", "character count"]
     ),
     "Cron Tool": ToolSpec(
         name="Cron Tool",
@@ -327,7 +329,8 @@ TOOL_SPECS: Dict[str, ToolSpec] = {
         category=ToolCategory.UTILITY,
         is_widget=True,
         description="Make HTTP requests",
-        available_flag="CURL_TOOL_MODULE_AVAILABLE"
+        available_flag="CURL_TOOL_MODULE_AVAILABLE",
+        aliases=["http client", "rest api"]
     ),
     "List Comparator": ToolSpec(
         name="List Comparator",
@@ -479,6 +482,74 @@ SUB_TOOL_PARENTS = {
     for sub in subs
 }
 
+
+def module_available(module_path: str) -> bool:
+    """
+    Check whether a module can be found, without importing it.
+    
+    Parent packages are imported by the lookup, the module itself is not.
+    A module that is found may still fail to import if one of its own
+    imports is missing; that surfaces on first use.
+    
+    Args:
+        module_path: Dotted module path (e.g., "tools.case_tool")
+        
+    Returns:
+        True if the module is already imported or can be located
+    """
+    try:
+        return importlib.util.find_spec(module_path) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class DeferredClass:
+    """
+    Stand-in for a class whose module is imported on first use.
+    
+    Calling it creates an instance of the real class, and attribute access
+    is forwarded to the real class, so code written against the class keeps
+    working while the import is deferred until then.
+    
+    Usage:
+        NotesWidget = DeferredClass("tools.notes_widget", "NotesWidget")
+        widget = NotesWidget(parent, app)  # imports tools.notes_widget here
+    """
+    
+    def __init__(self, module_path: str, class_name: str):
+        self.module_path = module_path
+        self.class_name = class_name
+        self._resolved: Optional[Type] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_loaded(self) -> bool:
+        """True once the real class has been imported."""
+        return self._resolved is not None
+    
+    def resolve(self) -> Type:
+        """Import the module and return the real class."""
+        if self._resolved is None:
+            with self._lock:
+                if self._resolved is None:
+                    module = importlib.import_module(self.module_path)
+                    self._resolved = getattr(module, self.class_name)
+                    logger.debug(f"Loaded deferred class: {self.module_path}.{self.class_name}")
+        return self._resolved
+    
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__') or name in ('_resolved', '_lock'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "deferred"
+        return f"<DeferredClass {self.module_path}.{self.class_name} ({state})>"
+
+
 class ToolLoader:
     """
     Centralized tool loading with lazy initialization.
@@ -486,7 +557,7 @@ class ToolLoader:
     Benefits:
     - Single place to manage all tool imports
     - Lazy loading - tools only loaded when first accessed
-    - Clean availability checking
+    - Clean availability checking; listing tools does not import them
     - Reduces startup time
     - Caches loaded modules and classes
     
@@ -519,6 +590,12 @@ class ToolLoader:
         self._availability_cache: Dict[str, bool] = {}
         self._load_errors: Dict[str, str] = {}
         self._widget_classes: Dict[str, Type] = {}
+        # Bumped whenever the tool set or an availability result changes;
+        # listings and search indexes below are rebuilt when it moves on
+        self.specs_version = 0
+        self._grouped_tools: Optional[Tuple[int, List[Tuple[str, bool]]]] = None
+        self._search_indexes: Dict[bool, Tuple[int, ToolSearchIndex]] = {}
+        self._index_lock = threading.Lock()
     
     def register_tool(self, spec: ToolSpec) -> None:
         """
@@ -532,6 +609,7 @@ class ToolLoader:
         self._availability_cache.pop(spec.name, None)
         self._loaded_classes.pop(spec.name, None)
         self._load_errors.pop(spec.name, None)
+        self.specs_version += 1
         logger.debug(f"Registered tool: {spec.name}")
     
     def unregister_tool(self, name: str) -> bool:
@@ -549,6 +627,7 @@ class ToolLoader:
             self._availability_cache.pop(name, None)
             self._loaded_classes.pop(name, None)
             self._load_errors.pop(name, None)
+            self.specs_version += 1
             return True
         return False
     
@@ -577,9 +656,31 @@ class ToolLoader:
         except ImportError as e:
             self._availability_cache[tool_name] = False
             self._load_errors[tool_name] = str(e)
+            # Listings assumed it was installed
+            self.specs_version += 1
             logger.debug(f"Tool '{tool_name}' not available: {e}")
             return False
     
+    def is_installed(self, tool_name: str) -> bool:
+        """
+        Check if a tool's module can be found, without importing it.
+        
+        Used for listing tools at startup. Once a tool has been imported (or
+        failed to import) through is_available, that result is returned.
+        
+        Args:
+            tool_name: Name of the tool
+            
+        Returns:
+            True if the tool module can be located
+        """
+        if tool_name in self._availability_cache:
+            return self._availability_cache[tool_name]
+        spec = self._specs.get(tool_name)
+        if spec is None:
+            return False
+        return module_available(spec.module_path)
+    
     def get_tool_class(self, tool_name: str) -> Optional[Type]:
         """
         Get the tool class (lazy loaded).
@@ -670,10 +771,12 @@ class ToolLoader:
         """
         Get list of all available tool names.
         
+        Tools are not imported; see is_installed.
+        
         Returns:
             List of tool names that can be loaded
         """
-        return [name for name in self._specs.keys() if self.is_available(name)]
+        return [name for name in self._specs.keys() if self.is_installed(name)]
     
     def get_all_tool_names(self) -> List[str]:
         """
@@ -696,7 +799,7 @@ class ToolLoader:
         """
         return [
             name for name, spec in self._specs.items()
-            if spec.category == category and self.is_available(name)
+            if spec.category == category and self.is_installed(name)
         ]
     
     def get_processing_tools(self) -> List[str]:
@@ -711,7 +814,7 @@ class ToolLoader:
         """
         return [
             name for name, spec in self._specs.items()
-            if self.is_available(name) and not spec.is_widget
+            if self.is_installed(name) and not spec.is_widget
         ]
     
     def get_processing_tools_by_category(self, category: ToolCategory) -> List[str]:
@@ -726,7 +829,7 @@ class ToolLoader:
         """
         return [
             name for name, spec in self._specs.items()
-            if spec.category == category and self.is_available(name) and not spec.is_widget
+            if spec.category == category and self.is_installed(name) and not spec.is_widget
         ]
     
     def get_grouped_tools(self) -> List[Tuple[str, bool]]:
@@ -740,6 +843,11 @@ class ToolLoader:
             List of tuples: (tool_name, is_sub_tool)
             is_sub_tool is True for tools that belong under a parent
         """
+        cached = self._grouped_tools
+        if cached is not None and cached[0] == self.specs_version:
+            return list(cached[1])
+        version = self.specs_version
+        
         # Get all processing tools (excludes widgets)
         all_tools = set(self.get_processing_tools())
         
@@ -766,7 +874,8 @@ class ToolLoader:
                         result.append((child, True))
                         processed.add(child)
         
-        return result
+        self._grouped_tools = (version, result)
+        return list(result)
     
     def get_tool_spec(self, tool_name: str) -> Optional[ToolSpec]:
         """
@@ -835,8 +944,39 @@ class ToolLoader:
         self._availability_cache.clear()
         self._load_errors.clear()
         self._widget_classes.clear()
+        self.specs_version += 1
         logger.debug("Tool loader cache cleared")
     
+    def get_search_index(self, include_unavailable: bool = False) -> ToolSearchIndex:
+        """
+        Get the search index over tool names, descriptions and aliases.
+        
+        Built on first use and rebuilt only after the tool set changes
+        (register_tool, unregister_tool, clear_cache, a failed import).
+        
+        Args:
+            include_unavailable: Whether to index tools that are not installed
+            
+        Returns:
+            ToolSearchIndex for the current tool set
+        """
+        cached = self._search_indexes.get(include_unavailable)
+        if cached is not None and cached[0] == self.specs_version:
+            return cached[1]
+        with self._index_lock:
+            cached = self._search_indexes.get(include_unavailable)
+            if cached is not None and cached[0] == self.specs_version:
+                return cached[1]
+            version = self.specs_version
+            index = ToolSearchIndex(
+                (name, spec.description, spec.aliases)
+                for name, spec in list(self._specs.items())
+                if include_unavailable or self.is_installed(name)
+            )
+            self._search_indexes[include_unavailable] = (version, index)
+            logger.debug(f"Built tool search index ({len(index)} tools)")
+            return index
+    
     def search_tools(
         self,
         query: str,
@@ -844,10 +984,11 @@ class ToolLoader:
         include_unavailable: bool = False
     ) -> List[Tuple[str, int, 'ToolCategory']]:
         """
-        Fuzzy search tools by name and description.
+        Fuzzy search tools by name, description and aliases.
         
         Uses rapidfuzz for fuzzy matching if available, otherwise falls back
-        to simple substring matching.
+        to simple substring matching. Queries run against the prebuilt
+        index from get_search_index.
         
         Args:
             query: Search query string
@@ -858,64 +999,18 @@ class ToolLoader:
             List of tuples: (tool_name, match_score, category)
             Score is 0-100, higher is better match
         """
+        index = self.get_search_index(include_unavailable)
         if not query:
             # Return all tools sorted alphabetically
-            tools = self.get_available_tools() if not include_unavailable else list(self._specs.keys())
-            return [(name, 100, self._specs[name].category) for name in sorted(tools)[:limit]]
-        
-        # Build search data: name -> searchable text
-        search_data = {}
-        for name, spec in self._specs.items():
-            if not include_unavailable and not self.is_available(name):
-                continue
-            # Combine name and description for searching
-            search_text = f"{name} {spec.description}"
-            search_data[name] = search_text
-        
-        if not search_data:
-            return []
-        
-        results: List[Tuple[str, int, ToolCategory]] = []
-        
-        if RAPIDFUZZ_AVAILABLE and process is not None:
-            # Use rapidfuzz for proper fuzzy matching
-            matches = process.extract(
-                query,
-                search_data,
-                scorer=fuzz.WRatio,
-                limit=limit
-            )
-            
-            for match in matches:
-                tool_name = match[2]  # Key from dict
-                score = int(match[1])  # Score 0-100
-                if score >= 30:  # Minimum relevance threshold
-                    category = self._specs[tool_name].category
-                    results.append((tool_name, score, category))
-        else:
-            # Fallback to simple substring matching
-            query_lower = query.lower()
-            for name, search_text in search_data.items():
-                text_lower = search_text.lower()
-                if query_lower in text_lower:
-                    # Score based on position and exact match
-                    if name.lower() == query_lower:
-                        score = 100
-                    elif name.lower().startswith(query_lower):
-                        score = 90
-                    elif query_lower in name.lower():
-                        score = 80
-                    else:
-                        score = 60  # Match in description only
-                    
-                    category = self._specs[name].category
-                    results.append((name, score, category))
-            
-            # Sort by score descending, then name ascending
-            results.sort(key=lambda x: (-x[1], x[0]))
-            results = results[:limit]
+            return [(name, 100, self._specs[name].category) for name in sorted(index.names)[:limit]]
         
-        return results
+        # Minimum relevance threshold for fuzzy matches
+        score_cutoff = 30 if RAPIDFUZZ_AVAILABLE else 0
+        return [
+            (name, int(score), self._specs[name].category)
+            for name, score in index.search(query, limit=limit, score_cutoff=score_cutoff)
+            if name in self._specs
+        ]
 
     def get_legacy_flags(self) -> Dict[str, bool]:
         """
@@ -10,20 +10,12 @@ from tkinter import ttk, messagebox
 import base64
 import threading
 import time
+from importlib.util import find_spec
 
-# Try to import NumPy for Morse code audio generation
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
-
-# Try to import PyAudio for Morse code audio
-try:
-    import pyaudio
-    PYAUDIO_AVAILABLE = True
-except ImportError:
-    PYAUDIO_AVAILABLE = False
+# NumPy and PyAudio are only needed for Morse code audio. They are imported
+# when playback first starts; at import time only check they are installed.
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+PYAUDIO_AVAILABLE = find_spec("pyaudio") is not None
 
 
 class TranslatorToolsProcessor:
@@ -99,9 +91,6 @@ class TranslatorToolsWidget(ttk.Frame):
         self.audio_stream = None
         self.pyaudio_instance = None
         
-        # Initialize PyAudio if available
-        self.setup_audio()
-        
         self.create_widgets()
         self.load_settings()
     
@@ -164,11 +153,12 @@ executable small and portable."""
             return True
 
     def setup_audio(self):
-        """Initialize PyAudio for Morse code audio playback."""
-        if not PYAUDIO_AVAILABLE:
+        """Initialize PyAudio for Morse code audio playback (called on first playback)."""
+        if not PYAUDIO_AVAILABLE or self.audio_stream:
             return
             
         try:
+            import pyaudio
             self.pyaudio_instance = pyaudio.PyAudio()
             self.audio_stream = self.pyaudio_instance.open(
                 format=pyaudio.paFloat32,
@@ -230,8 +220,8 @@ executable small and portable."""
         ).pack(side=tk.LEFT, padx=5)
         ttk.Label(button_frame, text="⌨ Ctrl+Enter", foreground="gray").pack(side=tk.LEFT, padx=(0, 5))
         
-        # Audio button (only if PyAudio is available)
-        if PYAUDIO_AVAILABLE and self.audio_stream:
+        # Audio button (only if PyAudio is installed; the stream opens on first use)
+        if PYAUDIO_AVAILABLE:
             self.play_morse_button = ttk.Button(
                 button_frame, 
                 text="Play Morse Audio", 
@@ -328,6 +318,7 @@ executable small and portable."""
             print("Morse playback is already in progress.")
             return
             
+        self.setup_audio()
         if not PYAUDIO_AVAILABLE or not self.audio_stream:
             self._show_audio_setup_instructions("PyAudio")
             return
@@ -389,6 +380,7 @@ executable small and portable."""
             sample_count = int(TranslatorToolsProcessor.SAMPLE_RATE * duration)
             return array.array('f', [0.0] * sample_count)
         
+        import numpy as np
         tone_freq = TranslatorToolsProcessor.TONE_FREQUENCY
         t = np.linspace(0, duration, int(TranslatorToolsProcessor.SAMPLE_RATE * duration), False)
         tone = np.sin(tone_freq * t * 2 * np.pi)
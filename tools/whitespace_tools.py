@@ -23,35 +23,35 @@ class WhitespaceToolsProcessor:
     @staticmethod
     def trim_lines(text, mode="both"):
         """Trim whitespace from lines."""
-        lines = text.splitlines()
-        result = []
-        
+        return '\n'.join(WhitespaceToolsProcessor.iter_trim_lines(text.splitlines(), mode))
+    
+    @staticmethod
+    def iter_trim_lines(lines, mode="both"):
+        """Yield lines with leading and/or trailing whitespace removed."""
         for line in lines:
             if mode == "leading":
-                result.append(line.lstrip())
+                yield line.lstrip()
             elif mode == "trailing":
-                result.append(line.rstrip())
+                yield line.rstrip()
             else:  # both
-                result.append(line.strip())
-        
-        return '\n'.join(result)
+                yield line.strip()
     
     @staticmethod
     def remove_extra_spaces(text, preserve_indent=False):
         """Collapse multiple spaces to single space."""
-        lines = text.splitlines()
-        result = []
-        
+        return '\n'.join(WhitespaceToolsProcessor.iter_remove_extra_spaces(text.splitlines(), preserve_indent))
+    
+    @staticmethod
+    def iter_remove_extra_spaces(lines, preserve_indent=False):
+        """Yield lines with runs of spaces collapsed."""
+        spaces = re.compile(r' {2,}')
         for line in lines:
             if preserve_indent:
                 stripped = line.lstrip()
                 indent = line[:len(line) - len(stripped)]
-                collapsed = re.sub(r' {2,}', ' ', stripped)
-                result.append(indent + collapsed)
+                yield indent + spaces.sub(' ', stripped)
             else:
-                result.append(re.sub(r' {2,}', ' ', line))
-        
-        return '\n'.join(result)
+                yield spaces.sub(' ', line)
     
     @staticmethod
     def tabs_to_spaces(text, tab_size=4):
@@ -61,21 +61,21 @@ class WhitespaceToolsProcessor:
     @staticmethod
     def spaces_to_tabs(text, tab_size=4):
         """Convert leading spaces to tabs."""
-        lines = text.splitlines()
-        result = []
-        
+        return '\n'.join(WhitespaceToolsProcessor.iter_spaces_to_tabs(text.splitlines(), tab_size))
+    
+    @staticmethod
+    def iter_spaces_to_tabs(lines, tab_size=4):
+        """Yield lines with leading spaces converted to tabs."""
         for line in lines:
             if not line.strip():
-                result.append(line)
+                yield line
                 continue
             
             stripped = line.lstrip(' ')
             leading_spaces = len(line) - len(stripped)
             tabs = leading_spaces // tab_size
             remaining_spaces = leading_spaces % tab_size
-            result.append('\t' * tabs + ' ' * remaining_spaces + stripped)
-        
-        return '\n'.join(result)
+            yield '\t' * tabs + ' ' * remaining_spaces + stripped
     
     @staticmethod
     def normalize_line_endings(text, ending="lf"):